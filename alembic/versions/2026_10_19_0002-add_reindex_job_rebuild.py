@@ -0,0 +1,36 @@
+"""add rebuild flag to reindex jobs
+
+Revision ID: add_reindex_job_rebuild
+Revises: add_index_outbox
+Create Date: 2026-10-19 00:02:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "add_reindex_job_rebuild"
+down_revision: Union[str, None] = "add_index_outbox"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "reindex_jobs",
+        sa.Column(
+            "rebuild",
+            sa.Boolean(),
+            nullable=False,
+            server_default=sa.false(),
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("reindex_jobs", "rebuild")
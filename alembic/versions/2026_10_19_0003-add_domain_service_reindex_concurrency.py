@@ -0,0 +1,31 @@
+"""add reindex concurrency to domain services
+
+Revision ID: add_service_reindex_concurrency
+Revises: add_reindex_job_rebuild
+Create Date: 2026-10-19 00:03:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "add_service_reindex_concurrency"
+down_revision: Union[str, None] = "add_reindex_job_rebuild"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "domain_services",
+        sa.Column("reindex_concurrency", sa.Integer(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("domain_services", "reindex_concurrency")
@@ -0,0 +1,55 @@
+"""add reindex checkpoints table
+
+Revision ID: add_reindex_checkpoints
+Revises: add_service_reindex_concurrency
+Create Date: 2026-10-19 00:04:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "add_reindex_checkpoints"
+down_revision: Union[str, None] = "add_service_reindex_concurrency"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "reindex_checkpoints",
+        sa.Column("id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column(
+            "job_id",
+            sa.UUID(as_uuid=True),
+            sa.ForeignKey("reindex_jobs.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("service_id", sa.UUID(as_uuid=True), nullable=False),
+        sa.Column("entity_type", sa.String(), nullable=False),
+        sa.Column(
+            "pages_done", sa.Integer(), nullable=False, server_default=sa.text("0")
+        ),
+        sa.Column("next_cursor", sa.String(), nullable=True),
+        sa.Column(
+            "cursor_paged", sa.Boolean(), nullable=False, server_default=sa.false()
+        ),
+        sa.Column("total_pages", sa.Integer(), nullable=True),
+        sa.Column("indexed", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("failed", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("completed", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.UniqueConstraint("job_id", "service_id", "entity_type"),
+    )
+    op.create_index("ix_reindex_checkpoints_job_id", "reindex_checkpoints", ["job_id"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_reindex_checkpoints_job_id", table_name="reindex_checkpoints")
+    op.drop_table("reindex_checkpoints")
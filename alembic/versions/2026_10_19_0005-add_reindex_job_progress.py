@@ -0,0 +1,58 @@
+"""add progress counters to reindex jobs
+
+Revision ID: add_reindex_job_progress
+Revises: add_reindex_checkpoints
+Create Date: 2026-10-19 00:05:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "add_reindex_job_progress"
+down_revision: Union[str, None] = "add_reindex_checkpoints"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTERS = (
+    "entities_fetched",
+    "entities_indexed",
+    "entities_failed",
+    "entities_skipped",
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("reindex_jobs", sa.Column("progress", sa.Float(), nullable=True))
+    for name in COUNTERS:
+        op.add_column(
+            "reindex_jobs",
+            sa.Column(name, sa.Integer(), nullable=False, server_default=sa.text("0")),
+        )
+    op.add_column(
+        "reindex_jobs", sa.Column("entities_total", sa.Integer(), nullable=True)
+    )
+    op.add_column(
+        "reindex_jobs", sa.Column("docs_per_second", sa.Float(), nullable=True)
+    )
+    op.add_column("reindex_jobs", sa.Column("eta_seconds", sa.Float(), nullable=True))
+    op.add_column(
+        "reindex_jobs", sa.Column("progress_updated_at", sa.DateTime(), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in (
+        "progress_updated_at",
+        "eta_seconds",
+        "docs_per_second",
+        "entities_total",
+        *reversed(COUNTERS),
+        "progress",
+    ):
+        op.drop_column("reindex_jobs", name)
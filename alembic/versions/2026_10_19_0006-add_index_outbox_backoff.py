@@ -0,0 +1,37 @@
+"""add retry backoff to the index outbox
+
+Revision ID: add_index_outbox_backoff
+Revises: add_reindex_job_progress
+Create Date: 2026-10-19 00:06:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "add_index_outbox_backoff"
+down_revision: Union[str, None] = "add_reindex_job_progress"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "index_outbox", sa.Column("next_attempt_at", sa.DateTime(), nullable=True)
+    )
+    # Claims look up older pending rows of the same entity
+    op.create_index(
+        "ix_index_outbox_entity",
+        "index_outbox",
+        ["source", "entity_type", "entity_id", "id"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_index_outbox_entity", table_name="index_outbox")
+    op.drop_column("index_outbox", "next_attempt_at")
@@ -0,0 +1,31 @@
+"""add skipped count to reindex checkpoints
+
+Revision ID: add_reindex_checkpoint_skipped
+Revises: add_index_outbox_backoff
+Create Date: 2026-10-19 00:07:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "add_reindex_checkpoint_skipped"
+down_revision: Union[str, None] = "add_index_outbox_backoff"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "reindex_checkpoints",
+        sa.Column("skipped", sa.Integer(), nullable=False, server_default=sa.text("0")),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("reindex_checkpoints", "skipped")
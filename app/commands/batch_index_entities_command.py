@@ -3,14 +3,20 @@ Command for batch indexing entities from a domain service.
 """
 
 import logging
-from typing import Optional, Dict, Any
+from dataclasses import replace
+from typing import Optional, Dict, Any, List, Set
 from datetime import datetime
 from sqlalchemy.orm import Session
 
+from app.providers.base import SearchProvider
+from app.providers.batching import BatchWriteError
 from app.models.domain_service import DomainService
 from app.utils.domain_service_client import DomainServiceClient
 from app.utils.document_builder import build_document_from_api_response
 from app.providers.factory import get_providers
+from app.providers.fanout import ProviderResult, fan_out_with_settings
+from app.providers.shadow_index import IndexRebuild
+from app.utils.reindex_planner import PageBatch, ProviderLimiter
 from app.config import get_settings
 from app.settings_manager import SettingsManager
 
@@ -41,6 +47,11 @@ class BatchIndexEntitiesCommand:
         updated_before: Optional[datetime] = None,
         page: int = 1,
         per_page: int = 100,
+        force: bool = False,
+        rebuild: Optional[IndexRebuild] = None,
+        cursor: Optional[str] = None,
+        providers: Optional[List[SearchProvider]] = None,
+        provider_limiter: Optional[ProviderLimiter] = None,
     ) -> Dict[str, Any]:
         """
         Execute batch indexing for a specific entity type.
@@ -52,9 +63,84 @@ class BatchIndexEntitiesCommand:
             updated_before: Optional datetime filter
             page: Page number (default: 1)
             per_page: Items per page (default: 100)
+            force: Write every document even if unchanged since the last write
+            rebuild: Load the documents into the shadow indexes of this rebuild
+                instead of the live indexes
+            cursor: Cursor of the batch, for services paging by cursor
+                (replaces page)
+            providers: Providers to write to (defaults to the enabled ones);
+                passed in when called from worker threads, which must not
+                use the database session
+            provider_limiter: Optional cap on concurrent writes per provider
 
         Returns:
-            Dict with batch indexing results (entities indexed, etc.)
+            Dict with batch indexing results (entities indexed, etc.), with
+            total_pages and next_cursor when the domain service reports them
+            (cursor_paged tells whether it reports a next_cursor at all)
+        """
+        batch = self.fetch_page(
+            service,
+            entity_type,
+            updated_after=updated_after,
+            updated_before=updated_before,
+            page=page,
+            per_page=per_page,
+            cursor=cursor,
+        )
+        if not batch.items:
+            return {"indexed": 0, "failed": 0, "entities": []}
+
+        # Get enabled providers
+        if rebuild:
+            providers = rebuild.providers
+        elif providers is None:
+            providers = get_providers(self.settings, self.settings_manager)
+        if not providers:
+            self.logger.warning("No search providers enabled")
+            return {"indexed": 0, "failed": 0, "entities": []}
+
+        batch = self.build_documents(batch, entity_type)
+        result = self.write_documents(
+            batch.items,
+            providers,
+            force=force,
+            rebuild=rebuild,
+            provider_limiter=provider_limiter,
+        )
+        result["failed"] += batch.failed
+        result.update(
+            total_in_page=batch.total_in_page,
+            total_pages=batch.total_pages,
+            next_cursor=batch.next_cursor,
+            cursor_paged=batch.cursor_paged,
+        )
+        return result
+
+    def fetch_page(
+        self,
+        service: DomainService,
+        entity_type: str,
+        updated_after: Optional[datetime] = None,
+        updated_before: Optional[datetime] = None,
+        page: int = 1,
+        per_page: int = 100,
+        cursor: Optional[str] = None,
+    ) -> PageBatch:
+        """
+        Fetch one page of entities from a domain service.
+
+        Args:
+            service: The domain service to query
+            entity_type: The entity type to fetch
+            updated_after: Optional datetime filter
+            updated_before: Optional datetime filter
+            page: Page number (default: 1)
+            per_page: Items per page (default: 100)
+            cursor: Cursor of the batch, for services paging by cursor
+                (replaces page)
+
+        Returns:
+            PageBatch of the entities and the pagination the service reports
         """
         # Format datetime filters as ISO 8601 strings
         updated_after_str = updated_after.isoformat() if updated_after else None
@@ -69,6 +155,7 @@ class BatchIndexEntitiesCommand:
             updated_before=updated_before_str,
             page=page,
             per_page=per_page,
+            cursor=cursor,
         )
 
         # Extract entities from response
@@ -79,19 +166,34 @@ class BatchIndexEntitiesCommand:
             self.logger.warning(
                 f"No entities returned from batch ingest for {entity_type}"
             )
-            return {"indexed": 0, "failed": 0, "entities": []}
+            return PageBatch()
 
-        # Get enabled providers
-        providers = get_providers(self.settings, self.settings_manager)
-        if not providers:
-            self.logger.warning("No search providers enabled")
-            return {"indexed": 0, "failed": 0, "entities": []}
+        pagination = response.get("pagination") or {}
+        return PageBatch(
+            items=entities,
+            total_in_page=len(entities),
+            total_pages=pagination.get("total_pages"),
+            next_cursor=pagination.get("next_cursor"),
+            cursor_paged="next_cursor" in pagination,
+            total=pagination.get("total"),
+        )
 
-        # Build all documents first
+    def build_documents(self, batch: PageBatch, entity_type: str) -> PageBatch:
+        """
+        Build the search documents of a fetched page.
+
+        Args:
+            batch: The fetched page of entities
+            entity_type: The entity type of the page
+
+        Returns:
+            PageBatch of the documents, counting entities that could not be
+            built as failed
+        """
         documents: list[Dict[str, Any]] = []
         failed_count = 0
 
-        for entity in entities:
+        for entity in batch.items:
             entity_id = str(entity.get("id", ""))
             if not entity_id:
                 self.logger.warning(f"Entity missing ID, skipping: {entity}")
@@ -113,32 +215,116 @@ class BatchIndexEntitiesCommand:
                 )
                 failed_count += 1
 
+        return replace(batch, items=documents, failed=batch.failed + failed_count)
+
+    def write_documents(
+        self,
+        documents: List[Dict[str, Any]],
+        providers: List[SearchProvider],
+        force: bool = False,
+        rebuild: Optional[IndexRebuild] = None,
+        provider_limiter: Optional[ProviderLimiter] = None,
+    ) -> Dict[str, Any]:
+        """
+        Upsert documents to every provider concurrently.
+
+        Args:
+            documents: The documents to write
+            providers: Providers to write to
+            force: Write every document even if unchanged since the last write
+            rebuild: Write to the shadow indexes of this rebuild instead of
+                the live indexes
+            provider_limiter: Optional cap on concurrent writes per provider
+
+        Returns:
+            Dict with the indexed, failed and skipped (unchanged) entity
+            counts, and the same counts by provider. An entity counts as
+            failed if any provider failed to write it, as skipped if every
+            provider left it unchanged, and as indexed otherwise.
+        """
         if not documents:
-            return {
-                "indexed": 0,
-                "failed": failed_count,
-                "entities": [],
-                "total_in_page": len(entities),
-            }
+            return {"indexed": 0, "failed": 0, "skipped": 0, "entities": []}
 
-        # Upsert batch to all providers
-        indexed_count = 0
         indexed_entities = [doc.get("id") for doc in documents]
+        document_ids = [self._document_id(doc) for doc in documents]
+        failed_ids: Set[str] = set()
+        skipped_ids = set(document_ids)
+        provider_results: Dict[str, Dict[str, Any]] = {}
 
-        for provider in providers:
-            try:
-                provider.upsert_batch(documents)
-                indexed_count += len(documents)
-            except Exception as e:
+        if rebuild:
+            providers = rebuild.shadow_providers(documents)
+
+        results = fan_out_with_settings(
+            self.settings,
+            providers,
+            lambda provider: provider.upsert_batch(documents, force=force),
+            "upsert_batch",
+            # Waiting for a write slot does not count against the timeout
+            slot=(
+                (lambda provider: provider_limiter.slot(provider.name))
+                if provider_limiter
+                else None
+            ),
+        )
+        for result in results:
+            if result.succeeded:
+                provider_failed_ids: Set[str] = set()
+            elif isinstance(result.exception, BatchWriteError):
+                # Chunks that were written still count as indexed
+                provider_failed_ids = set(result.exception.failed_ids)
+            else:
+                provider_failed_ids = set(document_ids)
+            provider_skipped_ids = self._skipped_ids(document_ids, result)
+
+            if not result.succeeded:
                 self.logger.error(
-                    f"Failed to batch index {len(documents)} entities to {provider.name}: {e}",
-                    exc_info=True,
+                    f"Failed to batch index {len(provider_failed_ids)} of "
+                    f"{len(documents)} entities to {result.provider}: {result.error}"
                 )
-                failed_count += len(documents)
+            failed_ids |= provider_failed_ids
+            skipped_ids &= provider_skipped_ids
+            provider_results[result.provider] = {
+                "indexed": len(documents)
+                - len(provider_failed_ids)
+                - len(provider_skipped_ids),
+                "failed": len(provider_failed_ids),
+                "skipped": len(provider_skipped_ids),
+                "error": result.error,
+            }
 
+        failed_count = sum(1 for i in document_ids if i in failed_ids)
+        skipped_count = sum(
+            1 for i in document_ids if i in skipped_ids and i not in failed_ids
+        )
+        indexed_count = len(documents) - failed_count - skipped_count
         return {
-            "indexed": indexed_count,
+            # Nothing is written without providers
+            "indexed": indexed_count if results else 0,
             "failed": failed_count,
+            "skipped": skipped_count if results else 0,
             "entities": indexed_entities,
-            "total_in_page": len(entities),
+            "providers": provider_results,
         }
+
+    @staticmethod
+    def _document_id(document: Dict[str, Any]) -> str:
+        """Get the object ID providers report for a document."""
+        return str(document.get("objectID") or document.get("id"))
+
+    @staticmethod
+    def _skipped_ids(document_ids: List[str], result: ProviderResult) -> Set[str]:
+        """
+        Get the documents a provider did not send, as unchanged or invalid.
+
+        Providers that split batches report the chunks they sent; other
+        providers, and writes spooled by the circuit breaker, report none,
+        so nothing counts as skipped.
+        """
+        if isinstance(result.exception, BatchWriteError):
+            chunks = result.exception.results
+        elif result.succeeded and isinstance(result.value, list):
+            chunks = result.value
+        else:
+            return set()
+        sent = {object_id for chunk in chunks for object_id in chunk.object_ids}
+        return set(document_ids) - sent
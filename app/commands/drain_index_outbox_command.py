@@ -0,0 +1,282 @@
+"""
+Command for draining a batch of the index outbox.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.constants.outbox_action import OutboxAction
+from app.models.domain_service import DomainService
+from app.models.index_outbox import IndexOutbox
+from app.providers.base import get_index_name
+from app.providers.factory import get_providers
+from app.providers.fanout import fan_out_with_settings
+from app.repositories.domain_service_repository import DomainServiceRepository
+from app.repositories.index_outbox_repository import IndexOutboxRepository
+from app.settings_manager import SettingsManager
+from app.utils.document_builder import build_document_from_api_response
+from app.utils.domain_service_client import DomainServiceClient, EntityResponse
+
+logger = logging.getLogger(__name__)
+
+EntityKey = Tuple[str, str, str]
+
+
+def _entity_key(row: IndexOutbox) -> EntityKey:
+    return (row.source, row.entity_type, row.entity_id)
+
+
+class DrainIndexOutboxCommand:
+    """Command to claim, coalesce and write one batch of outbox rows."""
+
+    def __init__(self, db: Session):
+        """
+        Initialize the drain command.
+
+        Args:
+            db: Database session (the claim transaction)
+        """
+        self.db = db
+        self.settings = get_settings()
+        self.settings_manager = SettingsManager(db)
+        self.outbox_repository = IndexOutboxRepository(db)
+        self.domain_service_repository = DomainServiceRepository(db)
+        self.domain_client = DomainServiceClient()
+
+    def execute(self) -> Dict[str, int]:
+        """
+        Drain one batch of the outbox.
+
+        Rows are claimed with FOR UPDATE SKIP LOCKED, so several drainers can
+        run side by side; every row of an entity is claimed by one drainer.
+        Rows for the same entity are coalesced: the entity is fetched once
+        and written once, and the latest action wins. Rows are deleted in the
+        claim transaction only after every provider accepted the write;
+        failures count an attempt and leave the row for a later batch, after
+        an exponential backoff.
+
+        Returns:
+            Dict with counts of claimed, written, deleted, skipped and failed rows
+        """
+        counts = {"claimed": 0, "written": 0, "deleted": 0, "skipped": 0, "failed": 0}
+        rows = self.outbox_repository.claim_batch(
+            self.settings.index_outbox_batch_size,
+            self.settings.index_outbox_max_attempts,
+        )
+        if not rows:
+            self.db.commit()
+            return counts
+        counts["claimed"] = len(rows)
+        row_ids = [row.id for row in rows]
+
+        try:
+            self._drain(rows, counts)
+        except Exception as e:
+            logger.error(f"Draining {len(rows)} outbox rows failed: {e}", exc_info=True)
+            self.db.rollback()
+            rows = self.outbox_repository.lock_rows(row_ids)
+            self._record_failure(rows, str(e))
+            counts.update(written=0, deleted=0, skipped=0, failed=len(rows))
+        self.db.commit()
+        return counts
+
+    def _drain(self, rows: List[IndexOutbox], counts: Dict[str, int]) -> None:
+        """Process claimed rows, settling or failing each entity's rows."""
+        rows_by_entity: Dict[EntityKey, List[IndexOutbox]] = {}
+        for row in rows:
+            rows_by_entity.setdefault(_entity_key(row), []).append(row)
+        # Rows are claimed oldest first, so the last row is the latest action
+        latest = {key: entity_rows[-1] for key, entity_rows in rows_by_entity.items()}
+
+        def settle(keys: List[EntityKey], count: str) -> None:
+            for key in keys:
+                self.outbox_repository.delete_rows(rows_by_entity[key])
+                counts[count] += len(rows_by_entity[key])
+
+        def fail(keys: List[EntityKey], error: str) -> None:
+            for key in keys:
+                self._record_failure(rows_by_entity[key], error)
+                counts["failed"] += len(rows_by_entity[key])
+
+        providers = get_providers(self.settings, self.settings_manager)
+        if not providers:
+            fail(list(latest), "No providers enabled")
+            return
+
+        upserts = [
+            key for key, row in latest.items() if row.action == OutboxAction.UPSERT
+        ]
+        deletes = [
+            key for key, row in latest.items() if row.action == OutboxAction.DELETE
+        ]
+
+        # Sessions are not thread-safe, so services are resolved up front
+        services = self._resolve_services(list(latest.values()))
+        documents, responses, skipped, gone, fetch_errors = self._fetch_documents(
+            [latest[key] for key in upserts], services
+        )
+        # Entities the domain service no longer has are removed from the index
+        deletes.extend(gone)
+        settle(skipped, "skipped")
+        for key, error in fetch_errors.items():
+            fail([key], error)
+
+        if documents:
+            results = fan_out_with_settings(
+                self.settings,
+                providers,
+                lambda provider: provider.upsert_batch(list(documents.values())),
+                "outbox_upsert",
+            )
+            failed = [r for r in results if not r.succeeded]
+            if failed:
+                fail(
+                    list(documents),
+                    "; ".join(f"{r.provider}: {r.error}" for r in failed),
+                )
+            else:
+                for response in responses:
+                    self.domain_client.save_entity_validators(response)
+                settle(list(documents), "written")
+
+        if deletes:
+            ids_by_index: Dict[str, List[str]] = {}
+            for source, entity_type, entity_id in deletes:
+                ids_by_index.setdefault(get_index_name(source, entity_type), []).append(
+                    entity_id
+                )
+
+            def delete_all(provider) -> None:
+                for index_name, ids in ids_by_index.items():
+                    provider.delete_batch(index_name, ids)
+
+            results = fan_out_with_settings(
+                self.settings, providers, delete_all, "outbox_delete"
+            )
+            failed = [r for r in results if not r.succeeded]
+            if failed:
+                fail(deletes, "; ".join(f"{r.provider}: {r.error}" for r in failed))
+            else:
+                # An entity re-created with the same ID is fetched in full
+                # instead of answered with a 304
+                for key in deletes:
+                    self._forget_validators(latest[key], services)
+                settle(deletes, "deleted")
+
+    def _resolve_services(
+        self, rows: List[IndexOutbox]
+    ) -> Dict[str, Optional[DomainService]]:
+        """Resolve the domain service of every event type of the rows."""
+        services: Dict[str, Optional[DomainService]] = {}
+        for row in rows:
+            if row.event_type not in services:
+                services[row.event_type] = (
+                    self.domain_service_repository.resolve_service_for_event(
+                        row.event_type
+                    )
+                )
+        return services
+
+    def _forget_validators(
+        self, row: IndexOutbox, services: Dict[str, Optional[DomainService]]
+    ) -> None:
+        """Drop the stored validators of the entity of a row."""
+        service = services.get(row.event_type)
+        if service:
+            self.domain_client.forget_entity_validators(
+                base_url=service.base_url,
+                entity_type=row.entity_type,
+                entity_id=row.entity_id,
+                indexes_path_prefix=service.indexes_path_prefix,
+            )
+
+    def _record_failure(self, rows: List[IndexOutbox], error: str) -> None:
+        """Count a failed attempt on rows, backing them off per the settings."""
+        self.outbox_repository.record_failure(
+            rows,
+            error,
+            retry_base_seconds=self.settings.index_outbox_retry_base_seconds,
+            retry_max_seconds=self.settings.index_outbox_retry_max_seconds,
+        )
+
+    def _fetch_documents(
+        self,
+        rows: List[IndexOutbox],
+        services: Dict[str, Optional[DomainService]],
+    ) -> Tuple[
+        Dict[EntityKey, Dict[str, Any]],
+        List[EntityResponse],
+        List[EntityKey],
+        List[EntityKey],
+        Dict[EntityKey, str],
+    ]:
+        """
+        Fetch and build the documents of the entities to upsert, concurrently.
+
+        Args:
+            rows: Latest rows of the entities to upsert
+            services: Domain services by event type
+
+        Returns:
+            Tuple of (documents by entity, responses whose validators to save,
+            entities with nothing to write, entities that no longer exist,
+            fetch errors by entity)
+        """
+
+        def fetch(row: IndexOutbox) -> Tuple[Optional[EntityResponse], Optional[str]]:
+            service = services[row.event_type]
+            if not service:
+                logger.warning(
+                    f"No domain service found for event type: {row.event_type}"
+                )
+                return None, None
+            if (
+                service.excluded_entities
+                and row.entity_type in service.excluded_entities
+            ):
+                return None, None
+            try:
+                return (
+                    self.domain_client.get_entity_conditional(
+                        base_url=service.base_url,
+                        indexes_path_prefix=service.indexes_path_prefix,
+                        entity_type=row.entity_type,
+                        entity_id=row.entity_id,
+                    ),
+                    None,
+                )
+            except Exception as e:
+                return None, str(e)
+
+        with ThreadPoolExecutor(
+            max_workers=max(self.settings.index_outbox_fetch_concurrency, 1),
+            thread_name_prefix="outbox-fetch",
+        ) as executor:
+            fetched = list(executor.map(fetch, rows))
+
+        documents: Dict[EntityKey, Dict[str, Any]] = {}
+        responses: List[EntityResponse] = []
+        skipped: List[EntityKey] = []
+        gone: List[EntityKey] = []
+        errors: Dict[EntityKey, str] = {}
+        for row, (response, error) in zip(rows, fetched):
+            key = _entity_key(row)
+            if error is not None:
+                errors[key] = error
+            elif response is not None and response.deleted:
+                gone.append(key)
+            elif response is None or response.not_modified:
+                skipped.append(key)
+            else:
+                documents[key] = build_document_from_api_response(
+                    source=row.source,
+                    entity_type=row.entity_type,
+                    entity_id=row.entity_id,
+                    domain_response=response.data,
+                )
+                responses.append(response)
+        return documents, responses, skipped, gone, errors
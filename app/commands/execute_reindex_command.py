@@ -3,18 +3,44 @@ Command for executing reindex jobs.
 """
 
 import logging
-from typing import Optional
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Iterator, List, Optional, Tuple
 from uuid import UUID
 from sqlalchemy.orm import Session
 
+from app.db import SessionLocal
+
 from app.repositories.reindex_repository import ReindexRepository
 from app.repositories.domain_service_repository import DomainServiceRepository
 from app.commands.batch_index_entities_command import BatchIndexEntitiesCommand
-from app.models.reindex_job import ReindexJobStatus
+from app.config import get_settings
+from app.models.domain_service import DomainService
+from app.models.reindex_job import ReindexJob, ReindexJobStatus
+from app.providers.base import SearchProvider
+from app.providers.factory import get_providers
+from app.providers.shadow_index import IndexRebuild
+from app.settings_manager import SettingsManager
+from app.utils.reindex_checkpoints import Checkpoint, CheckpointTracker
+from app.utils.reindex_progress import ProgressTracker, ReindexProgress
+from app.utils.reindex_planner import (
+    PageBatch,
+    ProviderLimiter,
+    ReindexPlanner,
+    UnitResult,
+    WorkUnit,
+)
 from tessera_sdk.infra.events.nats_router import NatsEventPublisher
 
 logger = logging.getLogger(__name__)
 
+# Margin for clock skew between Indexa and the domain services when the
+# catch-up pass after a rebuild asks for entities updated since it started
+CATCH_UP_SKEW = timedelta(minutes=1)
+
+REINDEX_PAGE_SIZE = 100
+
 
 class ExecuteReindexCommand:
     """Command to execute a reindex job."""
@@ -39,13 +65,17 @@ class ExecuteReindexCommand:
         self.reindex_repository = ReindexRepository(db)
         self.domain_service_repository = DomainServiceRepository(db)
         self.batch_command = BatchIndexEntitiesCommand(db)
+        self.settings = get_settings()
+        self.settings_manager = SettingsManager(db)
 
-    def execute(self, job_id: UUID) -> None:
+    def execute(self, job_id: UUID, resume: bool = False) -> None:
         """
         Execute a reindex job.
 
         Args:
             job_id: The ID of the reindex job to execute
+            resume: Continue from the checkpoints of a previous run instead
+                of starting over (rebuilds always start over)
         """
         job = self.reindex_repository.get_reindex_job(job_id)
         if not job:
@@ -61,42 +91,76 @@ class ExecuteReindexCommand:
             services = self._get_services_to_process(job)
             print(f"Services to process: {services}")
 
-            total_indexed = 0
-            total_failed = 0
-
-            # Process each service
-            for service in services:
-                # Get entity types to process
-                entity_types = job.entity_types or self._get_all_entity_types(service)
-                print(f"Entity types to process: {entity_types}")
-
-                for entity_type in entity_types:
-                    # Process paginated batches
-                    page = 1
-                    per_page = 100
-
-                    while True:
-                        # Execute batch indexing
-                        result = self.batch_command.execute(
-                            service=service,
-                            entity_type=entity_type,
-                            updated_after=job.updated_after,
-                            updated_before=job.updated_before,
-                            page=page,
-                            per_page=per_page,
-                        )
+            providers = get_providers(self.settings, self.settings_manager)
+            rebuild = IndexRebuild(providers, job.id) if job.rebuild else None
+            provider_limiter = ProviderLimiter(
+                {
+                    provider.name: self._get_provider_concurrency(provider.name)
+                    for provider in providers
+                }
+            )
+            pairs = self._get_entity_types_to_process(services, job)
+            units = [WorkUnit(service, entity_type) for service, entity_type in pairs]
+            checkpoints = self._get_checkpoint_tracker(job, resume)
+            run_units = checkpoints.resume_units(pairs) if checkpoints else units
+            progress = self._get_progress_tracker(
+                job, run_units, checkpoints.totals() if checkpoints and resume else None
+            )
 
-                        total_indexed += result.get("indexed", 0)
-                        total_failed += result.get("failed", 0)
-                        print(f"Total indexed: {total_indexed}")
-                        print(f"Total failed: {total_failed}")
+            try:
+                totals = self._run_units(
+                    run_units,
+                    services,
+                    providers,
+                    provider_limiter,
+                    updated_after=job.updated_after,
+                    updated_before=job.updated_before,
+                    force=job.force,
+                    rebuild=rebuild,
+                    checkpoints=checkpoints,
+                    progress=progress,
+                )
+                progress.finish()
+                self.logger.info(
+                    f"Reindex job {job_id} indexed {totals.indexed}, "
+                    f"failed {totals.failed}, skipped {totals.skipped} unchanged"
+                )
 
-                        # Check if there are more pages
-                        total_in_page = result.get("total_in_page", 0)
-                        if total_in_page < per_page:
-                            break  # Last page
+                if rebuild:
+                    if totals.failed:
+                        # Swapping would drop the documents of failed writes
+                        raise RuntimeError(
+                            f"Rebuild failed to write {totals.failed} documents, "
+                            "keeping the live indexes"
+                        )
+                    # Saves no progress, the heartbeat keeps the job from
+                    # looking stale and being resumed meanwhile
+                    with self._heartbeat(job_id):
+                        rebuild.swap()
+            except Exception:
+                progress.close()
+                if rebuild:
+                    rebuild.abort()
+                raise
 
-                        page += 1
+            if rebuild:
+                # Writes between the end of dual writes and the swap only
+                # reached the replaced indexes, so changes since the rebuild
+                # started are indexed again
+                with self._heartbeat(job_id):
+                    catch_up = self._run_units(
+                        units,
+                        services,
+                        providers,
+                        provider_limiter,
+                        updated_after=rebuild.started_at - CATCH_UP_SKEW,
+                        force=True,
+                    )
+                if catch_up.failed:
+                    raise RuntimeError(
+                        f"Catch-up after the rebuild swap failed to write "
+                        f"{catch_up.failed} documents"
+                    )
 
             # Update status to COMPLETED
             self.reindex_repository.update_reindex_job_status(
@@ -115,6 +179,211 @@ class ExecuteReindexCommand:
 
             raise
 
+    def _get_entity_types_to_process(
+        self, services: List[DomainService], job: ReindexJob
+    ) -> List[Tuple[DomainService, str]]:
+        """Get the (service, entity type) pairs to index for the job."""
+        pairs = []
+        for service in services:
+            entity_types = job.entity_types or self._get_all_entity_types(service)
+            print(f"Entity types to process: {entity_types}")
+            pairs.extend((service, entity_type) for entity_type in entity_types)
+        return pairs
+
+    def _run_units(
+        self,
+        units: List[WorkUnit],
+        services: List[DomainService],
+        providers: List[SearchProvider],
+        provider_limiter: ProviderLimiter,
+        updated_after: Optional[datetime] = None,
+        updated_before: Optional[datetime] = None,
+        force: bool = False,
+        rebuild: Optional[IndexRebuild] = None,
+        checkpoints: Optional[CheckpointTracker] = None,
+        progress: Optional[ProgressTracker] = None,
+    ) -> UnitResult:
+        """
+        Index work units through the fetch, build and write pipeline.
+
+        Pages are recorded in checkpoints and progress, if given.
+
+        Returns:
+            UnitResult with the indexed and failed counts of every page
+        """
+
+        def fetch_unit(unit: WorkUnit) -> PageBatch:
+            return self.batch_command.fetch_page(
+                service=unit.service,
+                entity_type=unit.entity_type,
+                updated_after=updated_after,
+                updated_before=updated_before,
+                page=unit.page,
+                cursor=unit.cursor,
+                per_page=REINDEX_PAGE_SIZE,
+            )
+
+        def build_unit(unit: WorkUnit, batch: PageBatch) -> PageBatch:
+            return self.batch_command.build_documents(batch, unit.entity_type)
+
+        def write_unit(unit: WorkUnit, batch: PageBatch) -> UnitResult:
+            result = self.batch_command.write_documents(
+                batch.items,
+                providers,
+                force=force,
+                rebuild=rebuild,
+                provider_limiter=provider_limiter,
+            )
+            return UnitResult(
+                indexed=result.get("indexed", 0),
+                failed=result.get("failed", 0) + batch.failed,
+                skipped=result.get("skipped", 0),
+            )
+
+        def on_result(unit: WorkUnit, batch: PageBatch, result: UnitResult) -> None:
+            if progress:
+                progress.record(unit, batch, result)
+            if checkpoints:
+                checkpoints.record(unit, batch, result)
+
+        planner = ReindexPlanner(
+            fetch_unit,
+            build_unit,
+            write_unit,
+            workers=self.settings.reindex_workers,
+            per_page=REINDEX_PAGE_SIZE,
+            # Every write fans out to all providers at once, so writers beyond
+            # the largest provider limit would only wait for slots
+            write_workers=min(
+                self.settings.reindex_write_workers,
+                provider_limiter.max_concurrency or self.settings.reindex_write_workers,
+            ),
+            max_buffered_pages=self.settings.reindex_buffered_pages,
+            service_limits={
+                str(service.id): service.reindex_concurrency
+                for service in services
+                if service.reindex_concurrency
+            },
+            default_service_limit=self.settings.reindex_service_concurrency,
+            on_result=on_result,
+            on_fetch=progress.record_fetch if progress else None,
+        )
+        try:
+            return planner.run(units)
+        finally:
+            if checkpoints:
+                checkpoints.flush()
+            if progress:
+                progress.flush()
+
+    @contextmanager
+    def _heartbeat(self, job_id: UUID) -> Iterator[None]:
+        """
+        Refresh the job's progress time while a phase that saves no progress
+        runs, so the job is not taken for stale.
+
+        The heartbeat runs on its own thread and database session, as the
+        phase blocks the command's session.
+        """
+        stop = threading.Event()
+
+        def beat() -> None:
+            while not stop.wait(self.settings.reindex_progress_interval_seconds):
+                db = SessionLocal()
+                try:
+                    ReindexRepository(db).touch_reindex_job(job_id)
+                except Exception as e:
+                    logger.warning(f"Failed to refresh reindex job {job_id}: {e}")
+                finally:
+                    db.close()
+
+        thread = threading.Thread(
+            target=beat, name=f"reindex-heartbeat-{job_id}", daemon=True
+        )
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def _get_progress_tracker(
+        self,
+        job: ReindexJob,
+        units: List[WorkUnit],
+        start: Optional[ReindexProgress] = None,
+    ) -> ProgressTracker:
+        """
+        Get the progress tracker of a run, continuing from the counts of the
+        checkpointed pages when resuming.
+        """
+        job_id = job.id
+
+        def save(progress: ReindexProgress) -> None:
+            try:
+                self.reindex_repository.update_reindex_job_progress(job_id, progress)
+            except Exception:
+                self.db.rollback()
+                raise
+
+        return ProgressTracker(
+            str(job_id),
+            units,
+            REINDEX_PAGE_SIZE,
+            save,
+            self.settings.reindex_progress_interval_seconds,
+            start=start,
+        )
+
+    def _get_checkpoint_tracker(
+        self, job: ReindexJob, resume: bool
+    ) -> Optional[CheckpointTracker]:
+        """
+        Get the checkpoint tracker of a run, loaded with the previous
+        checkpoints when resuming.
+
+        Rebuilds are not checkpointed: a failed rebuild drops its shadow
+        indexes, so it always starts over.
+        """
+        job_id = job.id
+        if not resume or job.rebuild:
+            self.reindex_repository.delete_checkpoints(job_id)
+        if job.rebuild:
+            if resume:
+                self.logger.info(f"Reindex job {job_id} is a rebuild, starting it over")
+            return None
+
+        def save(checkpoints: List[Checkpoint]) -> None:
+            try:
+                self.reindex_repository.save_checkpoints(job_id, checkpoints)
+            except Exception:
+                self.db.rollback()
+                raise
+
+        return CheckpointTracker(
+            REINDEX_PAGE_SIZE,
+            save,
+            self.settings.reindex_checkpoint_interval_seconds,
+            self.reindex_repository.get_checkpoints(job_id) if resume else (),
+        )
+
+    def _get_provider_concurrency(self, provider_name: str) -> int:
+        """Get the concurrent reindex writes allowed to a provider."""
+        value = self.settings_manager.get(
+            f"provider.{provider_name}.reindex_concurrency"
+        )
+        try:
+            return (
+                int(value)
+                if value is not None
+                else self.settings.reindex_provider_concurrency
+            )
+        except (TypeError, ValueError):
+            self.logger.warning(
+                f"Invalid reindex concurrency for {provider_name}: {value!r}"
+            )
+            return self.settings.reindex_provider_concurrency
+
     def _get_services_to_process(self, job):
         """Get list of domain services to process for the job."""
         all_services = self.domain_service_repository.get_all_enabled_services()
@@ -122,6 +391,11 @@ class ExecuteReindexCommand:
         print(f"All services: {all_services}")
         print(f"Domains: {job.domains}")
 
+        # Worker threads read the services' loaded attributes; detached
+        # instances are not refreshed (from another thread) after commits
+        for service in all_services:
+            self.db.expunge(service)
+
         if job.domains:
             # Filter by domains
             services = []
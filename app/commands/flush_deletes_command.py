@@ -0,0 +1,79 @@
+"""
+Command for flushing buffered document deletes to the providers.
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.providers.base import SearchProvider
+from app.providers.delete_buffer import DeleteBuffer
+from app.providers.factory import get_providers
+from app.providers.fanout import ProviderFanOutError, fan_out_with_settings
+from app.settings_manager import SettingsManager
+
+logger = logging.getLogger(__name__)
+
+
+class FlushDeletesCommand:
+    """Command to send buffered deletes as one delete_batch per index."""
+
+    def __init__(self, db: Session, delete_buffer: Optional[DeleteBuffer] = None):
+        """
+        Initialize the flush command.
+
+        Args:
+            db: Database session
+            delete_buffer: Optional delete buffer (defaults to the shared one)
+        """
+        self.settings = get_settings()
+        self.settings_manager = SettingsManager(db)
+        self.delete_buffer = delete_buffer or DeleteBuffer(self.settings)
+
+    def execute(self) -> int:
+        """
+        Flush the delete buffer until it is empty.
+
+        Returns:
+            int: Number of documents deleted
+
+        Raises:
+            ProviderFanOutError: If a provider failed; the popped deletes are
+                put back for the next flush
+        """
+        self.delete_buffer.close_window()
+
+        providers = get_providers(self.settings, self.settings_manager)
+        if not providers:
+            raise ValueError("No providers enabled")
+
+        deleted = 0
+        while True:
+            ids_by_index = self.delete_buffer.pop(self.settings.delete_flush_batch_size)
+            if not ids_by_index:
+                return deleted
+
+            results = fan_out_with_settings(
+                self.settings,
+                providers,
+                lambda provider: self._delete_all(provider, ids_by_index),
+                "delete_batch",
+            )
+            if any(not result.succeeded for result in results):
+                # Deletes are idempotent, providers that succeeded repeat them
+                self.delete_buffer.restore(ids_by_index)
+                raise ProviderFanOutError("delete_batch", results)
+
+            count = sum(len(ids) for ids in ids_by_index.values())
+            deleted += count
+            logger.info(f"Deleted {count} documents from {len(ids_by_index)} indexes")
+
+    @staticmethod
+    def _delete_all(
+        provider: SearchProvider, ids_by_index: Dict[str, List[str]]
+    ) -> None:
+        """Send one delete_batch per index to a provider."""
+        for index_name, object_ids in ids_by_index.items():
+            provider.delete_batch(index_name, object_ids)
@@ -5,18 +5,24 @@ Command for indexing a single entity from an event.
 from typing import Optional
 from sqlalchemy.orm import Session
 
+from app.models.domain_service import DomainService
 from app.models.event import Event
 from app.repositories.domain_service_repository import DomainServiceRepository
-from app.utils.event_router import route_event
+from app.utils.event_router import is_deletion_event, route_event
 from app.utils.domain_service_client import DomainServiceClient
 from app.utils.document_builder import (
     build_document_from_api_response,
     extract_entity_type_from_subject,
     extract_entity_id_from_subject,
 )
+from app.providers.base import get_index_name
+from app.providers.bulk_writer import enqueue_delete, enqueue_upsert
+from app.providers.delete_buffer import DeleteBuffer
 from app.providers.factory import get_providers
+from app.providers.fanout import ProviderFanOutError, fan_out_with_settings
 from app.config import get_settings
 from app.settings_manager import SettingsManager
+from app.tasks.flush_deletes_task import schedule_delete_flush
 from tessera_sdk.infra.events.nats_router import NatsEventPublisher
 from app.core.logging_config import get_logger
 
@@ -82,32 +88,111 @@ class IndexEntityCommand:
             )
             return
 
-        # Call domain service to get entity data
-        domain_response = self.domain_client.get_entity(
+        if is_deletion_event(event.event_type):
+            self._delete(domain_service, source, entity_type, entity_id)
+            return
+
+        # Call domain service to get entity data, revalidating with the
+        # ETag/Last-Modified of the last successfully indexed version
+        entity_response = self.domain_client.get_entity_conditional(
             base_url=domain_service.base_url,
             indexes_path_prefix=domain_service.indexes_path_prefix,
             entity_type=entity_type,
             entity_id=entity_id,
         )
+        if entity_response.not_modified:
+            self.logger.info(
+                "Entity %s/%s not modified, skipping indexing", entity_type, entity_id
+            )
+            return
+        if entity_response.deleted:
+            self._delete(domain_service, source, entity_type, entity_id)
+            return
 
         # Build document
         document = build_document_from_api_response(
             source=source,
             entity_type=entity_type,
             entity_id=entity_id,
-            domain_response=domain_response,
+            domain_response=entity_response.data,
         )
 
+        if self.settings.bulk_writer_enabled:
+            # The bulk writer batches the write to every provider and saves
+            # the validators once the flush succeeded
+            enqueue_upsert(
+                self.settings, document, validators=entity_response.validators
+            )
+            self.logger.info(
+                f"Queued entity {entity_type}/{entity_id} for bulk indexing"
+            )
+            return
+
         # Get enabled providers
         providers = get_providers(self.settings, self.settings_manager)
 
         if not providers:
             raise ValueError("No providers enabled")
 
+        # A delete of the entity still buffered would remove the document
+        # once flushed
+        DeleteBuffer(self.settings).discard(
+            get_index_name(source, entity_type), [entity_id]
+        )
+
         self.logger.info("Indexing entity %s/%s", entity_type, entity_id)
-        # Upsert to all enabled providers
-        for provider in providers:
-            provider.upsert(document)
-            self.logger.info(
-                f"Indexed entity {entity_type}/{entity_id} to {provider.name}"
-            )
+        # Upsert to all enabled providers concurrently
+        results = fan_out_with_settings(
+            self.settings,
+            providers,
+            lambda provider: provider.upsert(document),
+            "upsert",
+        )
+        for result in results:
+            if result.succeeded:
+                self.logger.info(
+                    f"Indexed entity {entity_type}/{entity_id} to {result.provider}"
+                )
+
+        if any(not result.succeeded for result in results):
+            # Validators are not saved so the next event refetches the entity;
+            # providers that already have it skip the write as unchanged
+            raise ProviderFanOutError("upsert", results)
+
+        # Only remember validators once every provider has the document
+        self.domain_client.save_entity_validators(entity_response)
+
+    def _delete(
+        self,
+        domain_service: DomainService,
+        source: str,
+        entity_type: str,
+        entity_id: str,
+    ) -> None:
+        """
+        Queue the removal of a deleted entity from every provider.
+
+        Deletes are coalesced: they go through the bulk writer when it is
+        enabled, otherwise into the delete buffer, which is flushed as one
+        delete_batch per index shortly after the first buffered delete.
+        The entity's validators are dropped, so an entity re-created with
+        the same ID is fetched in full instead of answered with a 304.
+
+        Args:
+            domain_service: The domain service owning the entity
+            source: Event source
+            entity_type: Entity type
+            entity_id: Entity ID
+        """
+        index_name = get_index_name(source, entity_type)
+        if self.settings.bulk_writer_enabled:
+            enqueue_delete(self.settings, index_name, entity_id)
+        elif DeleteBuffer(self.settings).add(index_name, [entity_id]):
+            schedule_delete_flush()
+        self.domain_client.forget_entity_validators(
+            base_url=domain_service.base_url,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            indexes_path_prefix=domain_service.indexes_path_prefix,
+        )
+        self.logger.info(f"Queued deletion of entity {entity_type}/{entity_id}")
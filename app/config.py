@@ -56,6 +56,13 @@ class Settings(BaseSettings):
     redis_namespace: str = Field(
         default="llama_index", json_schema_extra={"env": "REDIS_NAMESPACE"}
     )
+    cache_serializer: str = Field(
+        default="json", json_schema_extra={"env": "CACHE_SERIALIZER"}
+    )
+    cache_near_max_entries: int = Field(
+        default=0, json_schema_extra={"env": "CACHE_NEAR_MAX_ENTRIES"}
+    )
+    cache_near_ttl: int = Field(default=30, json_schema_extra={"env": "CACHE_NEAR_TTL"})
     service_account_client_id: str = Field(
         default="", json_schema_extra={"env": "SERVICE_ACCOUNT_CLIENT_ID"}
     )
@@ -80,6 +87,154 @@ class Settings(BaseSettings):
     nats_stream_name: str = Field(
         default="EVT_LINDEN", json_schema_extra={"env": "NATS_STREAM_NAME"}
     )
+    domain_conditional_fetch_enabled: bool = Field(
+        default=True, json_schema_extra={"env": "DOMAIN_CONDITIONAL_FETCH_ENABLED"}
+    )
+    entity_validator_ttl: int = Field(
+        default=7 * 24 * 3600, json_schema_extra={"env": "ENTITY_VALIDATOR_TTL"}
+    )
+    change_detection_enabled: bool = Field(
+        default=True, json_schema_extra={"env": "CHANGE_DETECTION_ENABLED"}
+    )
+    # Document hashes are kept one to two TTLs after their last write
+    document_hash_ttl_seconds: int = Field(
+        default=7 * 24 * 3600, json_schema_extra={"env": "DOCUMENT_HASH_TTL_SECONDS"}
+    )
+    provider_batch_max_records: int = Field(
+        default=1000, json_schema_extra={"env": "PROVIDER_BATCH_MAX_RECORDS"}
+    )
+    provider_batch_max_bytes: int = Field(
+        default=8 * 1024 * 1024, json_schema_extra={"env": "PROVIDER_BATCH_MAX_BYTES"}
+    )
+    provider_write_concurrency: int = Field(
+        default=4, json_schema_extra={"env": "PROVIDER_WRITE_CONCURRENCY"}
+    )
+    index_settings: Optional[str] = Field(
+        default=None, json_schema_extra={"env": "INDEX_SETTINGS"}
+    )
+    partial_updates_enabled: bool = Field(
+        default=True, json_schema_extra={"env": "PARTIAL_UPDATES_ENABLED"}
+    )
+    partial_update_max_ratio: float = Field(
+        default=0.5, json_schema_extra={"env": "PARTIAL_UPDATE_MAX_RATIO"}
+    )
+    partial_update_max_age_seconds: float = Field(
+        default=3600.0, json_schema_extra={"env": "PARTIAL_UPDATE_MAX_AGE_SECONDS"}
+    )
+    delete_flush_delay_seconds: float = Field(
+        default=2.0, json_schema_extra={"env": "DELETE_FLUSH_DELAY_SECONDS"}
+    )
+    delete_flush_batch_size: int = Field(
+        default=1000, json_schema_extra={"env": "DELETE_FLUSH_BATCH_SIZE"}
+    )
+    provider_timeout_seconds: float = Field(
+        default=30.0, json_schema_extra={"env": "PROVIDER_TIMEOUT_SECONDS"}
+    )
+    provider_max_retries: int = Field(
+        default=2, json_schema_extra={"env": "PROVIDER_MAX_RETRIES"}
+    )
+    provider_retry_backoff_seconds: float = Field(
+        default=0.5, json_schema_extra={"env": "PROVIDER_RETRY_BACKOFF_SECONDS"}
+    )
+    circuit_breaker_enabled: bool = Field(
+        default=True, json_schema_extra={"env": "CIRCUIT_BREAKER_ENABLED"}
+    )
+    circuit_breaker_failure_threshold: int = Field(
+        default=5, json_schema_extra={"env": "CIRCUIT_BREAKER_FAILURE_THRESHOLD"}
+    )
+    provider_spool_stream: str = Field(
+        default="indexa:spool", json_schema_extra={"env": "PROVIDER_SPOOL_STREAM"}
+    )
+    provider_spool_drain_interval_seconds: float = Field(
+        default=10.0,
+        json_schema_extra={"env": "PROVIDER_SPOOL_DRAIN_INTERVAL_SECONDS"},
+    )
+    provider_health_probe_interval_seconds: float = Field(
+        default=15.0,
+        json_schema_extra={"env": "PROVIDER_HEALTH_PROBE_INTERVAL_SECONDS"},
+    )
+    provider_health_max_age_seconds: float = Field(
+        default=60.0,
+        json_schema_extra={"env": "PROVIDER_HEALTH_MAX_AGE_SECONDS"},
+    )
+    # Pages a reindex fetches at once, overall and per domain service
+    # (overridden by the service's reindex_concurrency)
+    reindex_workers: int = Field(
+        default=16, json_schema_extra={"env": "REINDEX_WORKERS"}
+    )
+    reindex_service_concurrency: int = Field(
+        default=4, json_schema_extra={"env": "REINDEX_SERVICE_CONCURRENCY"}
+    )
+    # Reindex writer threads (capped by the largest provider reindex
+    # concurrency), and pages fetched ahead of the writers (a bound on the
+    # pages a reindex holds in memory)
+    reindex_write_workers: int = Field(
+        default=4, json_schema_extra={"env": "REINDEX_WRITE_WORKERS"}
+    )
+    reindex_buffered_pages: int = Field(
+        default=8, json_schema_extra={"env": "REINDEX_BUFFERED_PAGES"}
+    )
+    # Minimum seconds between saves of reindex checkpoints
+    reindex_checkpoint_interval_seconds: float = Field(
+        default=5.0,
+        json_schema_extra={"env": "REINDEX_CHECKPOINT_INTERVAL_SECONDS"},
+    )
+    # A running reindex job without saved progress for this long has no run
+    # left, and can be resumed
+    reindex_stale_after_seconds: float = Field(
+        default=300.0,
+        json_schema_extra={"env": "REINDEX_STALE_AFTER_SECONDS"},
+    )
+    # Minimum seconds between saves of reindex job progress
+    reindex_progress_interval_seconds: float = Field(
+        default=5.0,
+        json_schema_extra={"env": "REINDEX_PROGRESS_INTERVAL_SECONDS"},
+    )
+    # Concurrent reindex batch writes per provider (overridden by the
+    # provider.{name}.reindex_concurrency app setting)
+    reindex_provider_concurrency: int = Field(
+        default=4, json_schema_extra={"env": "REINDEX_PROVIDER_CONCURRENCY"}
+    )
+    index_outbox_enabled: bool = Field(
+        default=False, json_schema_extra={"env": "INDEX_OUTBOX_ENABLED"}
+    )
+    index_outbox_batch_size: int = Field(
+        default=500, json_schema_extra={"env": "INDEX_OUTBOX_BATCH_SIZE"}
+    )
+    index_outbox_max_attempts: int = Field(
+        default=10, json_schema_extra={"env": "INDEX_OUTBOX_MAX_ATTEMPTS"}
+    )
+    # Failed rows wait base * 2^(attempts - 1) seconds, up to max, before a retry
+    index_outbox_retry_base_seconds: float = Field(
+        default=1.0, json_schema_extra={"env": "INDEX_OUTBOX_RETRY_BASE_SECONDS"}
+    )
+    index_outbox_retry_max_seconds: float = Field(
+        default=300.0, json_schema_extra={"env": "INDEX_OUTBOX_RETRY_MAX_SECONDS"}
+    )
+    index_outbox_fetch_concurrency: int = Field(
+        default=8, json_schema_extra={"env": "INDEX_OUTBOX_FETCH_CONCURRENCY"}
+    )
+    index_outbox_poll_interval_seconds: float = Field(
+        default=1.0, json_schema_extra={"env": "INDEX_OUTBOX_POLL_INTERVAL_SECONDS"}
+    )
+    bulk_writer_enabled: bool = Field(
+        default=False, json_schema_extra={"env": "BULK_WRITER_ENABLED"}
+    )
+    bulk_writer_stream: str = Field(
+        default="indexa:bulk_writer", json_schema_extra={"env": "BULK_WRITER_STREAM"}
+    )
+    bulk_writer_shards: int = Field(
+        default=1, json_schema_extra={"env": "BULK_WRITER_SHARDS"}
+    )
+    bulk_writer_max_records: int = Field(
+        default=500, json_schema_extra={"env": "BULK_WRITER_MAX_RECORDS"}
+    )
+    bulk_writer_max_bytes: int = Field(
+        default=5 * 1024 * 1024, json_schema_extra={"env": "BULK_WRITER_MAX_BYTES"}
+    )
+    bulk_writer_max_delay_ms: int = Field(
+        default=1000, json_schema_extra={"env": "BULK_WRITER_MAX_DELAY_MS"}
+    )
     db_app_name: str = Field(
         default="indexa-api", json_schema_extra={"env": "DB_APP_NAME"}
     )
@@ -89,6 +244,13 @@ class Settings(BaseSettings):
     algolia_api_key: Optional[str] = Field(
         default=None, json_schema_extra={"env": "ALGOLIA_API_KEY"}
     )
+    algolia_write_consistency: str = Field(
+        default="accepted", json_schema_extra={"env": "ALGOLIA_WRITE_CONSISTENCY"}
+    )
+    # Gzip bulk write bodies; the Algolia API accepts gzipped requests
+    algolia_compress_requests: bool = Field(
+        default=True, json_schema_extra={"env": "ALGOLIA_COMPRESS_REQUESTS"}
+    )
     typesense_host: Optional[str] = Field(
         default=None, json_schema_extra={"env": "TYPESENSE_HOST"}
     )
@@ -98,6 +260,37 @@ class Settings(BaseSettings):
     typesense_port: int = Field(
         default=443, json_schema_extra={"env": "TYPESENSE_PORT"}
     )
+    local_search_path: Optional[str] = Field(
+        default=None, json_schema_extra={"env": "LOCAL_SEARCH_PATH"}
+    )
+    typesense_protocol: str = Field(
+        default="https", json_schema_extra={"env": "TYPESENSE_PROTOCOL"}
+    )
+    typesense_timeout_seconds: float = Field(
+        default=10.0, json_schema_extra={"env": "TYPESENSE_TIMEOUT_SECONDS"}
+    )
+    # Typesense does not decompress request bodies itself; enable when a
+    # proxy in front of it does
+    typesense_compress_requests: bool = Field(
+        default=False, json_schema_extra={"env": "TYPESENSE_COMPRESS_REQUESTS"}
+    )
+    # Rebuild swaps alias the live name; a name that is still a real
+    # collection is only dropped for its alias when this is enabled
+    typesense_alias_migration_enabled: bool = Field(
+        default=False, json_schema_extra={"env": "TYPESENSE_ALIAS_MIGRATION_ENABLED"}
+    )
+    request_compression_level: int = Field(
+        default=6, json_schema_extra={"env": "REQUEST_COMPRESSION_LEVEL"}
+    )
+    request_compression_min_bytes: int = Field(
+        default=1024, json_schema_extra={"env": "REQUEST_COMPRESSION_MIN_BYTES"}
+    )
+    # Encodings requested from domain services; responses are decoded
+    # transparently (br and zstd need the brotli / zstandard packages)
+    domain_service_accept_encoding: str = Field(
+        default="gzip, deflate",
+        json_schema_extra={"env": "DOMAIN_SERVICE_ACCEPT_ENCODING"},
+    )
 
     @model_validator(mode="before")
     def set_database_url(cls, values):
@@ -0,0 +1,8 @@
+import enum
+
+
+class OutboxAction(str, enum.Enum):
+    """Action recorded in an index outbox row."""
+
+    UPSERT = "upsert"
+    DELETE = "delete"
@@ -0,0 +1,10 @@
+import enum
+
+
+class WriteConsistency(str, enum.Enum):
+    """When a provider write call returns."""
+
+    # Return once the provider accepted the write; indexing completes later
+    ACCEPTED = "accepted"
+    # Block until the write is visible to searches
+    VISIBLE = "visible"
@@ -2,9 +2,6 @@ import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import get_settings
-import rollbar
-from rollbar.logger import RollbarHandler
-from rollbar.contrib.fastapi import ReporterMiddleware as RollbarMiddleware
 from fastapi_pagination import add_pagination
 from tessera_sdk.server.health import get_livez_readyz_router
 
@@ -14,8 +11,6 @@ from .routers import (
     reindex_job,
     provider,
 )
-from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
-from app.telemetry import setup_tracing
 from app.exceptions.handlers import register_exception_handlers
 from app.core.logging_config import get_logger
 from app.db import db_manager
@@ -40,6 +35,11 @@ def create_app(testing: bool = False, auth_middleware=None) -> FastAPI:
 
     app = FastAPI()
     if settings.is_production:
+        # Rollbar is only imported where it is used to keep startup fast
+        import rollbar
+        from rollbar.logger import RollbarHandler
+        from rollbar.contrib.fastapi import ReporterMiddleware as RollbarMiddleware
+
         # Initialize Rollbar SDK with your server-side access token
         rollbar.init(settings.rollbar_access_token, environment=settings.environment)
 
@@ -112,6 +112,10 @@ app = create_app()
 
 settings = get_settings()
 if settings.otel_enabled:
+    # OpenTelemetry SDK and exporters are only imported when tracing is on
+    from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+    from app.telemetry import setup_tracing
+
     tracer_provider = setup_tracing()  # Or use env/config
     FastAPIInstrumentor.instrument_app(app, tracer_provider=tracer_provider)
 
@@ -2,5 +2,14 @@ from app.models.user import User
 from app.models.event import Event
 from app.models.domain_service import DomainService
 from app.models.reindex_job import ReindexJob
+from app.models.reindex_checkpoint import ReindexCheckpoint
+from app.models.index_outbox import IndexOutbox
 
-__all__ = ["User", "Event", "DomainService", "ReindexJob"]
+__all__ = [
+    "User",
+    "Event",
+    "DomainService",
+    "ReindexJob",
+    "ReindexCheckpoint",
+    "IndexOutbox",
+]
@@ -1,6 +1,6 @@
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from app.models.mixins import TimestampMixin, SoftDeleteMixin
-from sqlalchemy import Boolean, Column, String
+from sqlalchemy import Boolean, Column, Integer, String
 import uuid
 
 from app.db import Base
@@ -20,6 +20,8 @@ class DomainService(Base, TimestampMixin, SoftDeleteMixin):
     indexes_path_prefix = Column(String, nullable=True)
     excluded_entities = Column(ARRAY(String), nullable=True)
     enabled = Column(Boolean, nullable=False, default=True)
+    # Pages reindexed at once; defaults to REINDEX_SERVICE_CONCURRENCY
+    reindex_concurrency = Column(Integer, nullable=True)
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -0,0 +1,31 @@
+from sqlalchemy.dialects.postgresql import UUID
+from app.models.mixins import TimestampMixin
+from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String
+
+from app.db import Base
+from app.constants.outbox_action import OutboxAction
+
+
+class IndexOutbox(Base, TimestampMixin):
+    """Pending index write, committed in the same transaction as its event."""
+
+    __tablename__ = "index_outbox"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    event_id = Column(UUID(as_uuid=True), nullable=True)
+    event_type = Column(String, nullable=False)  # Routes to the domain service
+    action = Column(String, nullable=False, default=OutboxAction.UPSERT)
+    source = Column(String, nullable=False)
+    entity_type = Column(String, nullable=False)
+    entity_id = Column(String, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(String, nullable=True)
+    # Failed rows are not claimed again before this time (UTC)
+    next_attempt_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_index_outbox_entity", "source", "entity_type", "entity_id", "id"),
+    )
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
@@ -0,0 +1,43 @@
+from sqlalchemy.dialects.postgresql import UUID
+from app.models.mixins import TimestampMixin
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    ForeignKey,
+    Integer,
+    String,
+    UniqueConstraint,
+)
+
+from app.db import Base
+
+
+class ReindexCheckpoint(Base, TimestampMixin):
+    """Progress of a reindex job through one entity type of one domain service."""
+
+    __tablename__ = "reindex_checkpoints"
+    __table_args__ = (UniqueConstraint("job_id", "service_id", "entity_type"),)
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    job_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("reindex_jobs.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    service_id = Column(UUID(as_uuid=True), nullable=False)
+    entity_type = Column(String, nullable=False)
+    # Pages 1..pages_done are written; a resume starts at the next one
+    pages_done = Column(Integer, nullable=False, default=0)
+    # Cursor of the next page, for services paging by cursor
+    next_cursor = Column(String, nullable=True)
+    cursor_paged = Column(Boolean, nullable=False, default=False)
+    total_pages = Column(Integer, nullable=True)
+    indexed = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    skipped = Column(Integer, nullable=False, default=0)  # Unchanged
+    completed = Column(Boolean, nullable=False, default=False)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
@@ -1,6 +1,6 @@
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from app.models.mixins import TimestampMixin, SoftDeleteMixin
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import Boolean, Column, Float, Integer, String, DateTime
 import uuid
 
 from app.db import Base
@@ -17,10 +17,23 @@ class ReindexJob(Base, TimestampMixin, SoftDeleteMixin):
     entity_types = Column(ARRAY(String), nullable=True)  # Filter by entity types
     updated_after = Column(DateTime, nullable=True)  # Date range filter
     updated_before = Column(DateTime, nullable=True)  # Date range filter
+    force = Column(Boolean, nullable=False, default=False)  # Skip change detection
+    # Load shadow indexes and swap them over the live ones
+    rebuild = Column(Boolean, nullable=False, default=False)
     status = Column(String, nullable=False, default=ReindexJobStatus.PENDING)
     started_at = Column(DateTime, nullable=True)
     completed_at = Column(DateTime, nullable=True)
     error_message = Column(String, nullable=True)
+    # Progress counters and estimates, saved periodically while running
+    progress = Column(Float, nullable=True)  # 0.0 to 1.0
+    entities_fetched = Column(Integer, nullable=False, default=0)
+    entities_indexed = Column(Integer, nullable=False, default=0)
+    entities_failed = Column(Integer, nullable=False, default=0)
+    entities_skipped = Column(Integer, nullable=False, default=0)  # Unchanged
+    entities_total = Column(Integer, nullable=True)
+    docs_per_second = Column(Float, nullable=True)
+    eta_seconds = Column(Float, nullable=True)
+    progress_updated_at = Column(DateTime, nullable=True)
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -2,20 +2,64 @@
 Algolia search provider implementation.
 """
 
+import copy
 import logging
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Set
+from algoliasearch.configs import SearchConfig
 from algoliasearch.search_client import SearchClient
 from algoliasearch.exceptions import AlgoliaException
+from algoliasearch.http.requester import Requester
+from algoliasearch.http.transporter import Request, Response, Transporter
+from algoliasearch.responses import MultipleResponse
 
+from app.constants.write_consistency import WriteConsistency
 from app.providers.base import SearchProvider
+from app.providers.batching import (
+    ChunkResult,
+    chunk_documents,
+    raise_for_failed_chunks,
+    send_chunks,
+)
+from app.providers.index_catalog import IndexSettings
+from app.providers.task_tracker import get_task_tracker
 from app.config import Settings
+from app.utils.compression import compress_request_body
 
 logger = logging.getLogger(__name__)
 
 
+class GzipRequester(Requester):
+    """Algolia requester that gzips request bodies worth compressing."""
+
+    def __init__(self, settings: Settings):
+        """
+        Initialize the requester.
+
+        Args:
+            settings: Application settings (compression level and threshold)
+        """
+        super().__init__()
+        self.settings = settings
+
+    def send(self, request: Request) -> Response:
+        """Send the request, its body gzipped if large enough."""
+        body, headers = compress_request_body(request.data_as_string, self.settings)
+        if headers:
+            # The transporter retries the same request on other hosts, so
+            # the original is left untouched
+            request = copy.copy(request)
+            request.data_as_string = body
+            request.headers = {**request.headers, **headers}
+        return super().send(request)
+
+
 class AlgoliaProvider(SearchProvider):
     """Algolia search provider implementation."""
 
+    # partialUpdateObjectNoCreate succeeds without writing when the object is
+    # missing (e.g. deleted concurrently), so its writes are never recorded
+    partial_updates_confirmed = False
+
     def __init__(self, settings: Settings):
         """
         Initialize Algolia provider.
@@ -29,19 +73,93 @@ class AlgoliaProvider(SearchProvider):
         self.app_id = settings.algolia_app_id
         self.api_key = settings.algolia_api_key
 
-        self.client = SearchClient.create(self.app_id, self.api_key)
+        if settings.algolia_compress_requests:
+            config = SearchConfig(self.app_id, self.api_key)
+            self.client = SearchClient(
+                Transporter(GzipRequester(settings), config), config
+            )
+        else:
+            self.client = SearchClient.create(self.app_id, self.api_key)
+        self.default_consistency = WriteConsistency(settings.algolia_write_consistency)
+        self.task_tracker = get_task_tracker(self.name)
+        self.batch_max_records = settings.provider_batch_max_records
+        self.batch_max_bytes = settings.provider_batch_max_bytes
+        self.write_concurrency = settings.provider_write_concurrency
+        if settings.partial_updates_enabled:
+            self.partial_update_max_ratio = settings.partial_update_max_ratio
+            self.partial_update_max_age_seconds = (
+                settings.partial_update_max_age_seconds
+            )
 
     @property
     def name(self) -> str:
         """Return the provider name."""
         return "algolia"
 
-    def upsert(self, document: Dict[str, Any]) -> None:
+    def _wait_for_task(self, index_name: str, task_id: int) -> None:
+        """Block until an Algolia task is published."""
+        self.client.init_index(index_name).wait_task(task_id)
+
+    def _complete_write(
+        self,
+        response: Any,
+        index_name: str,
+        operation: str,
+        consistency: Optional[WriteConsistency],
+    ) -> None:
+        """
+        Finish a write according to the requested consistency.
+
+        With VISIBLE the call blocks until Algolia has published every task.
+        With ACCEPTED the task IDs are handed to the task tracker, which
+        confirms them in the background.
+
+        Args:
+            response: IndexingResponse or MultipleResponse from the Algolia client
+            index_name: The index written to
+            operation: Operation name for metrics
+            consistency: Requested consistency
+        """
+        if self._resolve_consistency(consistency) == WriteConsistency.VISIBLE:
+            response.wait()
+            return
+
+        responses = (
+            response.responses if isinstance(response, MultipleResponse) else [response]
+        )
+        for indexing_response in responses:
+            for raw_response in indexing_response.raw_responses:
+                self.task_tracker.track(
+                    index_name, raw_response["taskID"], operation, self._wait_for_task
+                )
+
+    def _prepare_index(self, index_name: str, entity_type: str) -> None:
+        """
+        Push the settings of a new index before its first write.
+
+        Algolia creates indexes on first write, so a failure here only delays
+        the settings to the next write and does not fail the write itself.
+        """
+        try:
+            self._ensure_index_once(index_name, entity_type)
+        except AlgoliaException as e:
+            logger.warning(
+                f"Failed to apply settings to Algolia index {index_name}: {e}"
+            )
+
+    def upsert(
+        self,
+        document: Dict[str, Any],
+        force: bool = False,
+        consistency: Optional[WriteConsistency] = None,
+    ) -> None:
         """
         Upsert a single document to Algolia.
 
         Args:
             document: The document to upsert
+            force: Write even if the content is unchanged since the last write
+            consistency: Return on acceptance or wait for visibility
         """
         entity_type = document.get("type")
         source = document.get("source")
@@ -52,10 +170,31 @@ class AlgoliaProvider(SearchProvider):
             raise ValueError("Document must have a 'source' field")
 
         index_name = self._get_index_name(source, entity_type)
+        changed, hashes = self._skip_unchanged(index_name, [document], force)
+        if not changed:
+            logger.debug(
+                f"Document {document.get('id')} unchanged in Algolia index {index_name}, skipping"
+            )
+            return
+
+        _, partials, field_hashes = self._plan_partial_updates(
+            index_name, changed, force
+        )
+        self._prepare_index(index_name, entity_type)
         index = self.client.init_index(index_name)
 
         try:
-            index.save_object(document).wait()
+            if partials:
+                # Never creates the object, so a missing one is not left partial
+                response = index.partial_update_object(partials[0])
+            else:
+                response = index.save_object(document)
+            self._complete_write(response, index_name, "upsert", consistency)
+            if partials:
+                self._forget_partially_written(index_name, list(hashes))
+            else:
+                self._record_written(index_name, hashes)
+                self._record_fields(index_name, field_hashes, list(hashes))
             logger.debug(
                 f"Upserted document {document.get('id')} to Algolia index {index_name}"
             )
@@ -63,15 +202,33 @@ class AlgoliaProvider(SearchProvider):
             logger.error(f"Failed to upsert document to Algolia: {e}")
             raise
 
-    def upsert_batch(self, documents: List[Dict[str, Any]]) -> None:
+    def upsert_batch(
+        self,
+        documents: List[Dict[str, Any]],
+        force: bool = False,
+        consistency: Optional[WriteConsistency] = None,
+    ) -> List[ChunkResult]:
         """
         Upsert multiple documents to Algolia in batch.
 
+        Documents are grouped by index and split into chunks under the
+        configured record and byte limits. Chunks are sent concurrently.
+        Documents where only a few fields changed are sent as partial updates,
+        which never create missing objects and are not recorded as written.
+
         Args:
             documents: List of documents to upsert
+            force: Write even if the content is unchanged since the last write
+            consistency: Return on acceptance or wait for visibility
+
+        Returns:
+            List[ChunkResult]: Outcome of each chunk sent
+
+        Raises:
+            BatchWriteError: If one or more chunks failed
         """
         if not documents:
-            return
+            return []
 
         # Group documents by entity type (index name)
         documents_by_index: Dict[str, List[Dict[str, Any]]] = {}
@@ -95,38 +252,86 @@ class AlgoliaProvider(SearchProvider):
                 documents_by_index[index_name] = []
             documents_by_index[index_name].append(doc)
 
-        # Upsert to each index
+        chunks = []
+        hashes_by_index: Dict[str, Dict[str, str]] = {}
+        field_hashes_by_index: Dict[str, Dict[str, Dict[str, str]]] = {}
+        partial_ids_by_index: Dict[str, Set[str]] = {}
         for index_name, docs in documents_by_index.items():
-            index = self.client.init_index(index_name)
-            try:
-                index.save_objects(docs).wait()
+            changed, hashes = self._skip_unchanged(index_name, docs, force)
+            if not changed:
                 logger.debug(
-                    f"Upserted {len(docs)} documents to Algolia index {index_name}"
+                    f"All {len(docs)} documents unchanged in Algolia index {index_name}, skipping"
                 )
-            except AlgoliaException as e:
-                logger.error(
-                    f"Failed to batch upsert documents to Algolia index {index_name}: {e}"
+                continue
+            hashes_by_index[index_name] = hashes
+            self._prepare_index(index_name, changed[0]["type"])
+            full, partials, field_hashes = self._plan_partial_updates(
+                index_name, changed, force
+            )
+            field_hashes_by_index[index_name] = field_hashes
+            partial_ids_by_index[index_name] = set(map(self._get_object_id, partials))
+            # Full and partial documents are chunked apart, chunks never mix them
+            for group in (full, partials):
+                for chunk in chunk_documents(
+                    group, self.batch_max_records, self.batch_max_bytes
+                ):
+                    chunks.append((index_name, chunk))
+
+        def send(index_name: str, chunk: List[Dict[str, Any]]) -> None:
+            index = self.client.init_index(index_name)
+            object_ids = [self._get_object_id(doc) for doc in chunk]
+            partial = object_ids[0] in partial_ids_by_index[index_name]
+            if partial:
+                response = index.partial_update_objects(chunk)
+            else:
+                response = index.save_objects(chunk)
+            self._complete_write(response, index_name, "upsert_batch", consistency)
+            if partial:
+                # Unconfirmed, the next write diffs against the last full one
+                self._forget_partially_written(index_name, object_ids)
+                logger.debug(
+                    f"Partially updated {len(chunk)} documents in Algolia index {index_name}"
                 )
-                raise
+                return
+            hashes = hashes_by_index[index_name]
+            self._record_written(
+                index_name,
+                {
+                    object_id: hashes[object_id]
+                    for object_id in object_ids
+                    if object_id in hashes
+                },
+            )
+            self._record_fields(
+                index_name, field_hashes_by_index[index_name], object_ids
+            )
+            logger.debug(
+                f"Upserted {len(chunk)} documents to Algolia index {index_name}"
+            )
 
-    def delete(self, index_name: str, document_id: str) -> None:
+        results = send_chunks(chunks, send, self._get_object_id, self.write_concurrency)
+        return raise_for_failed_chunks(results)
+
+    def delete(
+        self,
+        index_name: str,
+        document_id: str,
+        consistency: Optional[WriteConsistency] = None,
+    ) -> None:
         """
         Delete a document from Algolia.
 
         Args:
+            index_name: The index to delete from
             document_id: The ID of the document to delete
+            consistency: Return on acceptance or wait for visibility
         """
-        # Note: We need the entity_type to know which index, but document_id format is "{type}_{id}"
-        # Extract entity_type from document_id
-        parts = document_id.split("_", 1)
-        if len(parts) != 2:
-            logger.warning(f"Invalid document_id format: {document_id}")
-            return
-
         index = self.client.init_index(index_name)
 
         try:
-            index.delete_object(document_id).wait()
+            response = index.delete_object(document_id)
+            self._complete_write(response, index_name, "delete", consistency)
+            self._forget_written(index_name, [document_id])
             logger.debug(
                 f"Deleted document {document_id} from Algolia index {index_name}"
             )
@@ -134,57 +339,115 @@ class AlgoliaProvider(SearchProvider):
             logger.error(f"Failed to delete document from Algolia: {e}")
             raise
 
-    def delete_batch(self, index_name: str, document_ids: List[str]) -> None:
+    def delete_batch(
+        self,
+        index_name: str,
+        document_ids: List[str],
+        consistency: Optional[WriteConsistency] = None,
+    ) -> None:
         """
         Delete multiple documents from Algolia in batch.
 
         Args:
+            index_name: The index to delete from
             document_ids: List of document IDs to delete
+            consistency: Return on acceptance or wait for visibility
         """
         if not document_ids:
             return
 
-        # Group document IDs by entity type (index name)
-        ids_by_index: Dict[str, List[str]] = {}
-        for doc_id in document_ids:
-            parts = doc_id.split("_", 1)
-            if len(parts) != 2:
-                logger.warning(f"Invalid document_id format: {doc_id}")
-                continue
+        index = self.client.init_index(index_name)
+        try:
+            response = index.delete_objects(document_ids)
+            self._complete_write(response, index_name, "delete_batch", consistency)
+            self._forget_written(index_name, document_ids)
+            logger.debug(
+                f"Deleted {len(document_ids)} documents from Algolia index {index_name}"
+            )
+        except AlgoliaException as e:
+            logger.error(
+                f"Failed to batch delete documents from Algolia index {index_name}: {e}"
+            )
+            raise
+
+    def ensure_index(
+        self, index_name: str, index_settings: Optional[IndexSettings] = None
+    ) -> None:
+        """
+        Apply the index settings in Algolia, creating the index if necessary.
 
-            if index_name not in ids_by_index:
-                ids_by_index[index_name] = []
-            ids_by_index[index_name].append(doc_id)
+        A new index gets every setting. An existing index only gets the
+        configured ones, so defaults never overwrite settings an operator
+        made on a live index.
 
-        # Delete from each index
-        for index_name, ids in ids_by_index.items():
+        Args:
+            index_name: The name of the index (should include prefix)
+            index_settings: Settings to apply (defaults to IndexSettings())
+        """
+        index_settings = index_settings or IndexSettings()
+        try:
             index = self.client.init_index(index_name)
-            try:
-                index.delete_objects(ids).wait()
-                logger.debug(
-                    f"Deleted {len(ids)} documents from Algolia index {index_name}"
-                )
-            except AlgoliaException as e:
-                logger.error(
-                    f"Failed to batch delete documents from Algolia index {index_name}: {e}"
-                )
-                raise
+            exists = index.exists()
+            payload = index_settings.to_algolia(configured_only=exists)
+            if not payload:
+                logger.debug(f"No configured settings for Algolia index {index_name}")
+                return
+            # Settings tasks are applied in order with the index's writes, so
+            # documents written next are indexed with these settings
+            index.set_settings(payload)
+            logger.info(f"Applied settings to Algolia index {index_name}")
+        except AlgoliaException as e:
+            logger.error(f"Failed to apply settings to Algolia index {index_name}: {e}")
+            raise
 
-    def ensure_index(self, index_name: str) -> None:
+    def prepare_shadow_index(
+        self, index_name: str, shadow_name: str, entity_type: Optional[str] = None
+    ) -> None:
         """
-        Ensure the index exists in Algolia (create if necessary).
+        Create a shadow index with the settings, synonyms and rules of the live one.
 
         Args:
-            index_name: The name of the index (should include prefix)
+            index_name: The live index
+            shadow_name: The shadow index to create
+            entity_type: The entity type stored in the index
         """
-        index = self.client.init_index(index_name)
-        # Algolia creates indices automatically on first write, so this is mostly a no-op
-        # But we can verify it exists
         try:
-            index.get_settings()
-            logger.debug(f"Algolia index {index_name} exists")
+            self.client.copy_index(
+                index_name, shadow_name, {"scope": ["settings", "synonyms", "rules"]}
+            ).wait()
         except AlgoliaException as e:
-            logger.warning(f"Algolia index {index_name} may not exist: {e}")
+            # A new index has nothing to copy
+            logger.info(f"Not copying Algolia index {index_name} metadata: {e}")
+        # Configured settings are applied over the copied ones
+        super().prepare_shadow_index(index_name, shadow_name, entity_type)
+
+    def swap_index(self, shadow_name: str, index_name: str) -> None:
+        """
+        Atomically replace a live index with a shadow index.
+
+        Moving an index over another replaces it in one operation, so
+        queries see either the old or the new records, never a mix.
+
+        Args:
+            shadow_name: The fully loaded shadow index
+            index_name: The live index to replace
+        """
+        self.client.move_index(shadow_name, index_name).wait()
+        self._forget_swapped(index_name, shadow_name)
+        logger.info(f"Moved Algolia index {shadow_name} over {index_name}")
+
+    def drop_index(self, index_name: str) -> None:
+        """
+        Delete an index and forget its stored hashes.
+
+        Args:
+            index_name: The name of the index
+        """
+        self.client.init_index(index_name).delete().wait()
+        if self.hash_store is not None:
+            self.hash_store.clear_index(self.name, index_name)
+        if self.index_catalog is not None:
+            self.index_catalog.forget(index_name)
 
     def healthcheck(self) -> bool:
         """
@@ -2,13 +2,73 @@
 Base search provider abstraction.
 """
 
+import copy
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
+
+from app.constants.write_consistency import WriteConsistency
+from app.providers.batching import document_size
+from app.providers.index_catalog import IndexCatalog, IndexSettings
+from app.utils.document_builder import (
+    VOLATILE_FIELDS,
+    compute_document_hash,
+    compute_field_hashes,
+)
+
+if TYPE_CHECKING:
+    from app.providers.batching import ChunkResult
+    from app.providers.document_hash_store import DocumentHashStore
+
+
+def get_index_name(source: Optional[str], entity_type: str) -> str:
+    """
+    Get the index name for a source and entity type.
+
+    Args:
+        source: The source string (e.g., "/identies", "/eventa", "/linden") or None
+        entity_type: The entity type
+
+    Returns:
+        The index name in the format "{cleaned_source}-{entity_type}"
+    """
+    cleaned_source = source.lstrip("/") if source else ""
+    return f"{cleaned_source}-{entity_type}"
 
 
 class SearchProvider(ABC):
     """Abstract base class for search providers."""
 
+    # Store of last-written content hashes, attached by the provider factory.
+    # When unset, every write is sent to the provider.
+    hash_store: Optional["DocumentHashStore"] = None
+
+    # Index name substitutions (live index -> shadow index) of provider copies
+    # made by with_index_redirects for rebuilds
+    index_redirects: Dict[str, str] = {}
+
+    # Indexes known to be set up, attached by the provider factory (shared
+    # across processes). A process-local catalog is created when unset.
+    index_catalog: Optional[IndexCatalog] = None
+
+    # Consistency used by write calls that do not request one explicitly
+    default_consistency: WriteConsistency = WriteConsistency.VISIBLE
+
+    # Largest size of a partial update relative to the full document for the
+    # partial path to be used. None disables partial updates.
+    partial_update_max_ratio: Optional[float] = None
+
+    # Age after which the field hashes of a document are no longer trusted
+    # as the base of a partial update, forcing a full write
+    partial_update_max_age_seconds: Optional[float] = None
+
+    # Whether a successful partial update is known to have reached an
+    # existing object. When False (updates that skip missing objects without
+    # reporting them), hashes are only recorded for full writes.
+    partial_updates_confirmed: bool = True
+
+    # Fields every partial update carries so the provider can route it
+    identity_fields = ("id", "objectID")
+
     def _clean_source(self, source: Optional[str]) -> str:
         """
         Clean the source by removing leading slash.
@@ -33,55 +93,360 @@ class SearchProvider(ABC):
             entity_type: The entity type
 
         Returns:
-            The index name in the format "{cleaned_source}-{entity_type}"
+            The index name in the format "{cleaned_source}-{entity_type}",
+            or the index it is redirected to
+        """
+        index_name = get_index_name(source, entity_type)
+        return self.index_redirects.get(index_name, index_name)
+
+    def with_index_redirects(self, redirects: Dict[str, str]) -> "SearchProvider":
+        """
+        Get a copy of the provider that writes to other indexes.
+
+        The copy shares the provider's clients. It skips change detection and
+        partial updates, as the stored hashes describe the original indexes.
+
+        Args:
+            redirects: Index name substitutions (e.g. live index -> shadow index)
+
+        Returns:
+            SearchProvider writing documents of redirected indexes elsewhere
+        """
+        clone = copy.copy(self)
+        clone.index_redirects = dict(redirects)
+        clone.hash_store = None
+        clone.partial_update_max_ratio = None
+        return clone
+
+    def prepare_shadow_index(
+        self, index_name: str, shadow_name: str, entity_type: Optional[str] = None
+    ) -> None:
+        """
+        Create an empty shadow index with the settings of a live index.
+
+        Args:
+            index_name: The live index
+            shadow_name: The shadow index to create
+            entity_type: The entity type stored in the index
+        """
+        if self.index_catalog is None:
+            self.index_catalog = IndexCatalog(self.name)
+        index_settings = self.index_catalog.settings_for(index_name, entity_type)
+        self.ensure_index(shadow_name, index_settings)
+        self.index_catalog.mark_applied(shadow_name, index_settings)
+
+    def _forget_swapped(self, index_name: str, shadow_name: str) -> None:
+        """Forget hashes and catalog entries invalidated by an index swap."""
+        # The live index now holds the shadow's documents, so stored hashes
+        # no longer describe its content
+        if self.hash_store is not None:
+            self.hash_store.clear_index(self.name, index_name)
+        if self.index_catalog is not None:
+            self.index_catalog.forget(index_name)
+            self.index_catalog.forget(shadow_name)
+
+    def _ensure_index_once(
+        self, index_name: str, entity_type: Optional[str] = None
+    ) -> None:
+        """
+        Set up an index on its first write, skipping indexes already set up.
+
+        Args:
+            index_name: The index about to be written to
+            entity_type: The entity type stored in the index
+        """
+        if self.index_catalog is None:
+            self.index_catalog = IndexCatalog(self.name)
+        # Shadow indexes get the settings configured for their live index
+        live_name = next(
+            (
+                live
+                for live, shadow in self.index_redirects.items()
+                if shadow == index_name
+            ),
+            index_name,
+        )
+        index_settings = self.index_catalog.settings_for(live_name, entity_type)
+        if self.index_catalog.is_applied(index_name, index_settings):
+            return
+        self.ensure_index(index_name, index_settings)
+        self.index_catalog.mark_applied(index_name, index_settings)
+
+    def _resolve_consistency(
+        self, consistency: Optional[WriteConsistency]
+    ) -> WriteConsistency:
+        """Return the requested consistency or the provider default."""
+        return consistency or self.default_consistency
+
+    def _get_object_id(self, document: Dict[str, Any]) -> str:
+        """Get the provider object ID of a document."""
+        return str(document.get("objectID") or document.get("id"))
+
+    def _skip_unchanged(
+        self, index_name: str, documents: List[Dict[str, Any]], force: bool = False
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+        """
+        Drop documents whose content hash matches the last write.
+
+        Args:
+            index_name: The index the documents are written to
+            documents: Candidate documents
+            force: Write every document regardless of its stored hash
+
+        Returns:
+            Tuple of (documents to write, hashes to record once the write succeeds)
         """
-        cleaned_source = self._clean_source(source)
-        return f"{cleaned_source}-{entity_type}"
+        if self.hash_store is None:
+            return documents, {}
+
+        hashes = {
+            self._get_object_id(doc): compute_document_hash(doc) for doc in documents
+        }
+        if force:
+            return documents, hashes
+
+        stored = self.hash_store.get_many(self.name, index_name, list(hashes))
+        changed = [
+            doc
+            for doc in documents
+            if stored.get(self._get_object_id(doc)) != hashes[self._get_object_id(doc)]
+        ]
+        return changed, {
+            self._get_object_id(doc): hashes[self._get_object_id(doc)]
+            for doc in changed
+        }
+
+    def _plan_partial_updates(
+        self, index_name: str, documents: List[Dict[str, Any]], force: bool = False
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], Dict[str, Dict[str, str]]]:
+        """
+        Split documents into full writes and partial updates.
+
+        Each document is diffed field by field against the field hashes of
+        its last write. A document is sent as a partial update (identity
+        fields, changed fields and volatile fields) when no field was removed
+        and the update is small enough compared to the full document.
+        Documents never written, forced writes, documents that lost a field
+        and documents whose field hashes are missing or older than
+        partial_update_max_age_seconds are written in full.
+
+        For providers whose partial updates are not confirmed, only the field
+        hashes of full documents are returned, so the stored hashes keep
+        describing the last full write.
+
+        Args:
+            index_name: The index the documents are written to
+            documents: Documents to write (already filtered by _skip_unchanged)
+            force: Write every document in full
+
+        Returns:
+            Tuple of (full documents, partial updates, field hashes to record
+            once the write succeeds)
+        """
+        if self.hash_store is None or self.partial_update_max_ratio is None:
+            return documents, [], {}
+
+        field_hashes = {
+            self._get_object_id(doc): compute_field_hashes(doc) for doc in documents
+        }
+        if force:
+            return documents, [], field_hashes
+
+        stored = self.hash_store.get_fields_many(
+            self.name,
+            index_name,
+            list(field_hashes),
+            max_age_seconds=self.partial_update_max_age_seconds,
+        )
+        full, partials = [], []
+        for doc in documents:
+            object_id = self._get_object_id(doc)
+            previous = stored.get(object_id)
+            current = field_hashes[object_id]
+            if previous is None or set(previous) - set(current):
+                full.append(doc)
+                continue
+
+            changed = {
+                key
+                for key, value in current.items()
+                if previous.get(key) != value and key not in self.identity_fields
+            }
+            if not changed:
+                full.append(doc)
+                continue
+            partial = {
+                key: value
+                for key, value in doc.items()
+                if key in changed
+                or key in self.identity_fields
+                or key in VOLATILE_FIELDS
+            }
+            if (
+                document_size(partial)
+                <= document_size(doc) * self.partial_update_max_ratio
+            ):
+                partials.append(partial)
+            else:
+                full.append(doc)
+
+        if not self.partial_updates_confirmed:
+            for partial in partials:
+                field_hashes.pop(self._get_object_id(partial))
+        return full, partials, field_hashes
+
+    def _record_fields(
+        self,
+        index_name: str,
+        field_hashes: Dict[str, Dict[str, str]],
+        object_ids: List[str],
+    ) -> None:
+        """Record the field hashes of documents written successfully."""
+        if self.hash_store is not None and field_hashes:
+            self.hash_store.set_fields_many(
+                self.name,
+                index_name,
+                {
+                    object_id: field_hashes[object_id]
+                    for object_id in object_ids
+                    if object_id in field_hashes
+                },
+            )
+
+    def _record_written(self, index_name: str, hashes: Dict[str, str]) -> None:
+        """Record the hashes of documents written successfully."""
+        if self.hash_store is not None:
+            self.hash_store.set_many(self.name, index_name, hashes)
+
+    def _forget_written(self, index_name: str, document_ids: List[str]) -> None:
+        """Forget the hashes (and field hashes) of deleted documents."""
+        if self.hash_store is not None:
+            self.hash_store.delete_many(self.name, index_name, document_ids)
+
+    def _forget_partially_written(
+        self, index_name: str, document_ids: List[str]
+    ) -> None:
+        """
+        Forget the document hashes of unconfirmed partial updates.
+
+        The stored hash describes the last full write, so a document changed
+        back to it would otherwise be skipped as unchanged. Field hashes are
+        kept as the base of the next diff.
+        """
+        if self.hash_store is not None:
+            self.hash_store.delete_many(
+                self.name, index_name, document_ids, keep_fields=True
+            )
 
     @abstractmethod
-    def upsert(self, document: Dict[str, Any]) -> None:
+    def upsert(
+        self,
+        document: Dict[str, Any],
+        force: bool = False,
+        consistency: Optional[WriteConsistency] = None,
+    ) -> None:
         """
         Upsert a single document to the search index.
 
         Args:
             document: The document to upsert (as dict)
+            force: Write even if the content is unchanged since the last write
+            consistency: Return on acceptance or wait for visibility
+                (defaults to default_consistency)
         """
         pass
 
     @abstractmethod
-    def upsert_batch(self, documents: List[Dict[str, Any]]) -> None:
+    def upsert_batch(
+        self,
+        documents: List[Dict[str, Any]],
+        force: bool = False,
+        consistency: Optional[WriteConsistency] = None,
+    ) -> Optional[List["ChunkResult"]]:
         """
         Upsert multiple documents to the search index in batch.
 
         Args:
             documents: List of documents to upsert
+            force: Write even if the content is unchanged since the last write
+            consistency: Return on acceptance or wait for visibility
+                (defaults to default_consistency)
+
+        Returns:
+            Per-chunk results for providers that split batches, otherwise None
+
+        Raises:
+            BatchWriteError: If some chunks failed
         """
         pass
 
     @abstractmethod
-    def delete(self, index_name: str, document_id: str) -> None:
+    def delete(
+        self,
+        index_name: str,
+        document_id: str,
+        consistency: Optional[WriteConsistency] = None,
+    ) -> None:
         """
         Delete a document from the search index.
 
         Args:
+            index_name: The index to delete from
             document_id: The ID of the document to delete
+            consistency: Return on acceptance or wait for visibility
+                (defaults to default_consistency)
         """
         pass
 
     @abstractmethod
-    def delete_batch(self, index_name: str, document_ids: List[str]) -> None:
+    def delete_batch(
+        self,
+        index_name: str,
+        document_ids: List[str],
+        consistency: Optional[WriteConsistency] = None,
+    ) -> None:
         """
         Delete multiple documents from the search index in batch.
 
         Args:
+            index_name: The index to delete from
             document_ids: List of document IDs to delete
+            consistency: Return on acceptance or wait for visibility
+                (defaults to default_consistency)
+        """
+        pass
+
+    @abstractmethod
+    def ensure_index(
+        self, index_name: str, index_settings: Optional[IndexSettings] = None
+    ) -> None:
+        """
+        Ensure the index exists with its settings, creating it if necessary.
+
+        Writes call this through _ensure_index_once, so it runs once per new
+        index rather than on every write.
+
+        Args:
+            index_name: The name of the index
+            index_settings: Settings to apply (defaults to IndexSettings())
+        """
+        pass
+
+    @abstractmethod
+    def swap_index(self, shadow_name: str, index_name: str) -> None:
+        """
+        Atomically replace a live index with a shadow index.
+
+        Args:
+            shadow_name: The fully loaded shadow index
+            index_name: The live index to replace
         """
         pass
 
     @abstractmethod
-    def ensure_index(self, index_name: str) -> None:
+    def drop_index(self, index_name: str) -> None:
         """
-        Ensure the index exists, creating it if necessary.
+        Delete an index and forget its stored hashes.
 
         Args:
             index_name: The name of the index
@@ -0,0 +1,147 @@
+"""
+Size-aware chunking and concurrent sending of provider batch writes.
+"""
+
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ChunkResult:
+    """Outcome of sending one chunk of a batch write."""
+
+    index_name: str
+    object_ids: List[str]
+    error: Optional[str] = None
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+
+class BatchWriteError(Exception):
+    """Raised when one or more chunks of a provider batch write failed."""
+
+    def __init__(self, results: List[ChunkResult]):
+        self.results = results
+        failed = [r for r in results if not r.succeeded]
+        super().__init__(
+            f"{len(failed)} of {len(results)} chunks failed: "
+            + "; ".join(f"{r.index_name}: {r.error}" for r in failed)
+        )
+
+    @property
+    def failed_ids(self) -> List[str]:
+        """Object IDs of the chunks that failed."""
+        return [i for r in self.results if not r.succeeded for i in r.object_ids]
+
+    @property
+    def succeeded_ids(self) -> List[str]:
+        """Object IDs of the chunks that were written."""
+        return [i for r in self.results if r.succeeded for i in r.object_ids]
+
+
+def document_size(document: Dict[str, Any]) -> int:
+    """Serialized size of a document in bytes."""
+    return len(json.dumps(document, default=str).encode("utf-8"))
+
+
+def chunk_documents(
+    documents: List[Dict[str, Any]], max_records: int, max_bytes: int
+) -> List[List[Dict[str, Any]]]:
+    """
+    Split documents into chunks under a record count and byte size limit.
+
+    A single document larger than max_bytes is sent in a chunk of its own
+    so the provider reports its error for that record only.
+
+    Args:
+        documents: Documents to split
+        max_records: Maximum records per chunk
+        max_bytes: Maximum serialized bytes per chunk
+
+    Returns:
+        List of chunks, preserving document order
+    """
+    chunks: List[List[Dict[str, Any]]] = []
+    current: List[Dict[str, Any]] = []
+    current_bytes = 0
+
+    for document in documents:
+        size = document_size(document)
+        if current and (
+            len(current) >= max_records or current_bytes + size > max_bytes
+        ):
+            chunks.append(current)
+            current, current_bytes = [], 0
+        current.append(document)
+        current_bytes += size
+
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def send_chunks(
+    chunks: List[Tuple[str, List[Any]]],
+    send: Callable[[str, List[Any]], None],
+    get_id: Callable[[Any], str],
+    max_workers: int,
+) -> List[ChunkResult]:
+    """
+    Send chunks concurrently, capturing the outcome of each one.
+
+    Args:
+        chunks: List of (index name, chunk items)
+        send: Callable writing one chunk to an index
+        get_id: Callable returning the object ID of a chunk item
+        max_workers: Maximum chunks in flight at once
+
+    Returns:
+        One ChunkResult per chunk, in input order
+    """
+
+    def run(index_name: str, items: List[Any]) -> ChunkResult:
+        object_ids = [get_id(item) for item in items]
+        try:
+            send(index_name, items)
+            return ChunkResult(index_name, object_ids)
+        except Exception as e:
+            logger.error(
+                f"Failed to write chunk of {len(items)} objects to {index_name}: {e}"
+            )
+            return ChunkResult(index_name, object_ids, error=str(e))
+
+    if len(chunks) <= 1 or max_workers <= 1:
+        return [run(index_name, items) for index_name, items in chunks]
+
+    with ThreadPoolExecutor(
+        max_workers=min(max_workers, len(chunks)), thread_name_prefix="provider-chunk"
+    ) as executor:
+        futures = [
+            executor.submit(run, index_name, items) for index_name, items in chunks
+        ]
+        return [future.result() for future in futures]
+
+
+def raise_for_failed_chunks(results: List[ChunkResult]) -> List[ChunkResult]:
+    """
+    Raise BatchWriteError if any chunk failed.
+
+    Args:
+        results: Chunk results
+
+    Returns:
+        The results, when every chunk succeeded
+
+    Raises:
+        BatchWriteError: If one or more chunks failed
+    """
+    if any(not result.succeeded for result in results):
+        raise BatchWriteError(results)
+    return results
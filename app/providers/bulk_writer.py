@@ -0,0 +1,393 @@
+"""
+Cross-task write buffer that batches provider writes.
+
+Indexing tasks append upserts and deletes to a durable Redis stream instead of
+writing to the providers one object at a time. A long-running BulkWriter
+consumes the stream, buffers operations per index and flushes them through
+upsert_batch/delete_batch once a buffer reaches its record, byte or age
+threshold. Entries are acknowledged only after every provider accepted the
+flush, so a crashed writer's operations are reclaimed and replayed. A failed
+flush guards its objects, so its entries are dropped instead of replayed
+once newer operations on the same objects were flushed.
+
+Operations are sharded by object key so every write of a given object goes
+through the same stream, keeping them ordered when several writers run.
+"""
+
+import logging
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.config import Settings
+from app.providers.base import SearchProvider, get_index_name
+from app.providers.fanout import fan_out_with_settings
+from app.providers.write_stream import (
+    DELETE,
+    UPSERT,
+    RedisWriteStream,
+    WriteOperation,
+    entry_id_key,
+)
+from app.utils.domain_service_client import DomainServiceClient
+from app.utils.metrics import BULK_WRITER_FLUSH_RECORDS, BULK_WRITER_FLUSHES_TOTAL
+
+logger = logging.getLogger(__name__)
+
+CONSUMER_GROUP = "bulk-writer"
+PRODUCER_NAME = "producer"
+
+
+def get_shard(index_name: str, object_id: str, shards: int) -> int:
+    """
+    Get the shard an object's writes are routed to.
+
+    Args:
+        index_name: The index name
+        object_id: The object ID
+        shards: Total number of shards
+
+    Returns:
+        Shard number in [0, shards)
+    """
+    return zlib.crc32(f"{index_name}:{object_id}".encode("utf-8")) % max(shards, 1)
+
+
+def get_write_stream(
+    settings: Settings, shard: int, consumer: str = PRODUCER_NAME
+) -> RedisWriteStream:
+    """
+    Get the write stream for a shard.
+
+    Args:
+        settings: Application settings
+        shard: Shard number
+        consumer: Consumer name
+
+    Returns:
+        RedisWriteStream for the shard
+    """
+    return RedisWriteStream(
+        f"{settings.bulk_writer_stream}:{shard}", CONSUMER_GROUP, consumer
+    )
+
+
+def enqueue_writes(settings: Settings, operations: List[WriteOperation]) -> None:
+    """
+    Durably enqueue write operations for the bulk writer.
+
+    Args:
+        settings: Application settings
+        operations: Operations to enqueue
+    """
+    by_shard: Dict[int, List[WriteOperation]] = {}
+    for operation in operations:
+        shard = get_shard(
+            operation.index_name, operation.object_id, settings.bulk_writer_shards
+        )
+        by_shard.setdefault(shard, []).append(operation)
+
+    for shard, shard_operations in by_shard.items():
+        get_write_stream(settings, shard).append(shard_operations)
+
+
+def enqueue_upsert(
+    settings: Settings,
+    document: Dict[str, Any],
+    force: bool = False,
+    validators: Optional[Dict[str, Optional[str]]] = None,
+) -> None:
+    """
+    Enqueue a document upsert for the bulk writer.
+
+    Args:
+        settings: Application settings
+        document: The document to upsert
+        force: Write even if the content is unchanged since the last write
+        validators: Entity validators to save once the upsert is flushed
+
+    Raises:
+        ValueError: If the document has no type or source
+    """
+    if not document.get("type"):
+        raise ValueError("Document must have a 'type' field")
+    if not document.get("source"):
+        raise ValueError("Document must have a 'source' field")
+
+    operation = WriteOperation(
+        action=UPSERT,
+        index_name=get_index_name(document["source"], document["type"]),
+        object_id=str(document.get("objectID") or document.get("id")),
+        document=document,
+        force=force,
+        validators=validators,
+    )
+    enqueue_writes(settings, [operation])
+
+
+def enqueue_delete(settings: Settings, index_name: str, object_id: str) -> None:
+    """
+    Enqueue a document delete for the bulk writer.
+
+    Args:
+        settings: Application settings
+        index_name: The index to delete from
+        object_id: The ID of the document to delete
+    """
+    enqueue_writes(
+        settings,
+        [WriteOperation(action=DELETE, index_name=index_name, object_id=object_id)],
+    )
+
+
+@dataclass
+class _IndexBuffer:
+    """Operations buffered for one index, with their stream entries."""
+
+    entries: List[Tuple[RedisWriteStream, str, WriteOperation]] = field(
+        default_factory=list
+    )
+    size_bytes: int = 0
+    first_at: float = 0.0
+
+
+class BulkWriter:
+    """Consumes the write streams and flushes batched writes to providers."""
+
+    def __init__(
+        self,
+        settings: Settings,
+        providers_factory: Callable[[], List[SearchProvider]],
+        consumer: str,
+        shards: Optional[List[int]] = None,
+        providers_refresh_seconds: float = 60.0,
+        streams: Optional[List[RedisWriteStream]] = None,
+        domain_client: Optional[DomainServiceClient] = None,
+    ):
+        """
+        Initialize the bulk writer.
+
+        Args:
+            settings: Application settings (thresholds and stream names)
+            providers_factory: Callable returning the enabled providers
+            consumer: Consumer name, unique per writer process
+            shards: Shards consumed by this writer (defaults to all)
+            providers_refresh_seconds: How often the provider list is rebuilt
+            streams: Streams to consume instead of the bulk writer shards
+            domain_client: Client saving the validators of flushed upserts
+                (created on first use)
+        """
+        self.settings = settings
+        self.max_records = settings.bulk_writer_max_records
+        self.max_bytes = settings.bulk_writer_max_bytes
+        self.max_delay = settings.bulk_writer_max_delay_ms / 1000
+        self.providers_factory = providers_factory
+        self.providers_refresh_seconds = providers_refresh_seconds
+        if streams is None:
+            if shards is None:
+                shards = list(range(settings.bulk_writer_shards))
+            streams = [get_write_stream(settings, shard, consumer) for shard in shards]
+        self.streams = streams
+        self._buffers: Dict[str, _IndexBuffer] = {}
+        self._providers: List[SearchProvider] = []
+        self._providers_loaded_at: Optional[float] = None
+        self._domain_client = domain_client
+
+    def _get_providers(self) -> List[SearchProvider]:
+        """Get the enabled providers, rebuilding the list periodically."""
+        now = time.monotonic()
+        if (
+            self._providers_loaded_at is None
+            or now - self._providers_loaded_at >= self.providers_refresh_seconds
+        ):
+            self._providers = self.providers_factory()
+            self._providers_loaded_at = now
+        return self._providers
+
+    def poll(self) -> None:
+        """Read available operations from every stream into the buffers."""
+        # Wait no longer than the oldest buffer may; reading without blocking
+        # while buffers wait for their delay would spin
+        wait = self.max_delay
+        if self._buffers:
+            oldest = min(buffer.first_at for buffer in self._buffers.values())
+            wait = oldest + self.max_delay - time.monotonic()
+        block_ms = max(int(wait * 1000), 0)
+        # Block on at most one stream so buffered data is not held up
+        for stream in self.streams:
+            for entry_id, operation in stream.read(self.max_records, block_ms):
+                self.add(stream, entry_id, operation)
+            block_ms = 0
+
+    def add(
+        self, stream: RedisWriteStream, entry_id: str, operation: WriteOperation
+    ) -> None:
+        """
+        Buffer an operation, flushing its index if a size threshold is hit.
+
+        Args:
+            stream: Stream the operation was read from
+            entry_id: Stream entry ID
+            operation: The operation
+        """
+        buffer = self._buffers.get(operation.index_name)
+        if buffer is None:
+            buffer = _IndexBuffer(first_at=time.monotonic())
+            self._buffers[operation.index_name] = buffer
+        buffer.entries.append((stream, entry_id, operation))
+        buffer.size_bytes += operation.size_bytes
+
+        if len(buffer.entries) >= self.max_records:
+            self.flush(operation.index_name, "records")
+        elif buffer.size_bytes >= self.max_bytes:
+            self.flush(operation.index_name, "bytes")
+
+    def flush_due(self) -> None:
+        """Flush every buffer older than the delay threshold."""
+        now = time.monotonic()
+        for index_name, buffer in list(self._buffers.items()):
+            if now - buffer.first_at >= self.max_delay:
+                self.flush(index_name, "delay")
+
+    def flush_all(self, reason: str = "shutdown") -> bool:
+        """
+        Flush every buffer regardless of thresholds.
+
+        Args:
+            reason: Reason recorded in metrics
+
+        Returns:
+            bool: True if every flush succeeded
+        """
+        succeeded = True
+        for index_name in list(self._buffers):
+            succeeded = self.flush(index_name, reason) and succeeded
+        return succeeded
+
+    def flush(self, index_name: str, reason: str) -> bool:
+        """
+        Send an index buffer to every provider and acknowledge it.
+
+        Operations on the same object are coalesced so only the latest one
+        (by stream entry ID, as reclaimed entries arrive late) is sent. On
+        failure the entries stay pending in the stream and are reclaimed once
+        idle, unless a later flush supersedes them.
+
+        Args:
+            index_name: The index to flush
+            reason: Threshold that triggered the flush (for metrics)
+
+        Returns:
+            bool: True if the flush succeeded
+        """
+        buffer = self._buffers.pop(index_name, None)
+        if buffer is None or not buffer.entries:
+            return True
+
+        latest: Dict[str, WriteOperation] = {}
+        latest_ids: Dict[str, str] = {}
+        for _, entry_id, operation in buffer.entries:
+            current = latest_ids.get(operation.object_id)
+            if current is not None and entry_id_key(entry_id) < entry_id_key(current):
+                continue
+            latest.pop(operation.object_id, None)
+            latest[operation.object_id] = operation
+            latest_ids[operation.object_id] = entry_id
+
+        forced = [
+            op.document for op in latest.values() if op.action == UPSERT and op.force
+        ]
+        upserts = [
+            op.document
+            for op in latest.values()
+            if op.action == UPSERT and not op.force
+        ]
+        deletes = [op.object_id for op in latest.values() if op.action == DELETE]
+
+        def write(provider: SearchProvider) -> None:
+            if upserts:
+                provider.upsert_batch(upserts)
+            if forced:
+                provider.upsert_batch(forced, force=True)
+            if deletes:
+                provider.delete_batch(index_name, deletes)
+
+        entries_by_stream: Dict[
+            int, Tuple[RedisWriteStream, List[str], Dict[str, str]]
+        ] = {}
+        for stream, entry_id, operation in buffer.entries:
+            _, entry_ids, flushed = entries_by_stream.setdefault(
+                id(stream), (stream, [], {})
+            )
+            entry_ids.append(entry_id)
+            if latest_ids[operation.object_id] == entry_id:
+                flushed[operation.object_key] = entry_id
+
+        results = fan_out_with_settings(
+            self.settings, self._get_providers(), write, "bulk_flush"
+        )
+        if any(not result.succeeded for result in results):
+            logger.error(
+                f"Bulk writer flush of {len(latest)} operations to {index_name} failed"
+            )
+            BULK_WRITER_FLUSHES_TOTAL.labels(reason=reason, status="failure").inc()
+            for stream, _, flushed in entries_by_stream.values():
+                try:
+                    stream.guard(flushed)
+                except Exception as e:
+                    logger.warning(
+                        f"Failed to guard failed writes to {index_name}: {e}"
+                    )
+            return False
+
+        for stream, entry_ids, flushed in entries_by_stream.values():
+            stream.ack(entry_ids, flushed)
+        self._save_validators(latest.values())
+
+        BULK_WRITER_FLUSHES_TOTAL.labels(reason=reason, status="success").inc()
+        BULK_WRITER_FLUSH_RECORDS.observe(len(latest))
+        logger.debug(
+            f"Flushed {len(latest)} operations ({len(buffer.entries)} buffered) "
+            f"to {index_name} on {reason}"
+        )
+        return True
+
+    def _save_validators(self, operations: Iterable[WriteOperation]) -> None:
+        """
+        Save the validators of flushed upserts.
+
+        Validators are only saved once every provider has the document, so a
+        failed or superseded upsert is refetched in full instead of being
+        answered 304 Not Modified.
+
+        Args:
+            operations: The flushed operations
+        """
+        for operation in operations:
+            if operation.action != UPSERT or not operation.validators:
+                continue
+            try:
+                if self._domain_client is None:
+                    self._domain_client = DomainServiceClient()
+                self._domain_client.save_validators(**operation.validators)
+            except Exception as e:
+                logger.warning(
+                    f"Failed to save validators of {operation.object_key}: {e}"
+                )
+
+    def run(self, should_stop: Callable[[], bool]) -> None:
+        """
+        Run the consume/flush loop until should_stop returns True.
+
+        Args:
+            should_stop: Callable checked between iterations
+        """
+        while not should_stop():
+            try:
+                self.poll()
+                self.flush_due()
+            except Exception as e:
+                logger.error(f"Bulk writer loop error: {e}")
+                time.sleep(1)
+        self.flush_all()
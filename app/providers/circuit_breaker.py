@@ -0,0 +1,508 @@
+"""
+Per-provider circuit breaker with a durable spool.
+
+CircuitBreakerProvider wraps a SearchProvider. Consecutive write failures
+open the provider's circuit, and the state is shared by every process
+through Redis. While the circuit is open, writes are appended to a
+per-provider Redis stream (the spool) instead of blocking on a degraded
+provider. The SpoolDrainer replays the spool in large batches once the
+provider's healthcheck passes again and moves the circuit to half-open:
+writes reach the provider again as trials, and the first failure reopens
+the circuit. The drainer keeps replaying what writers spooled before they
+saw the half-open state, and closes the circuit only when the spool is
+empty, in one atomic step. Outages become indexing lag instead of lost
+writes and starved workers.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from redis import Redis
+
+from app.config import Settings
+from app.constants.write_consistency import WriteConsistency
+from app.providers.base import SearchProvider, get_index_name
+from app.providers.bulk_writer import BulkWriter
+from app.providers.index_catalog import IndexSettings
+from app.providers.write_stream import DELETE, UPSERT, RedisWriteStream, WriteOperation
+from app.utils.cache import get_connection_pool
+from app.utils.metrics import CIRCUIT_BREAKER_OPEN, PROVIDER_SPOOLED_TOTAL
+
+logger = logging.getLogger(__name__)
+
+CIRCUIT_KEY_PREFIX = "indexa:circuit"
+SPOOL_GROUP = "spool-drainer"
+
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Closes a half-open circuit (KEYS[1]) if its spool (KEYS[2]) is empty
+_CLOSE_IF_DRAINED_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] and redis.call('XLEN', KEYS[2]) == 0 then
+  redis.call('DEL', KEYS[1])
+  return 1
+end
+return 0
+"""
+
+# Errors caused by the input itself; they say nothing about provider health
+INPUT_ERRORS = (ValueError, TypeError)
+
+
+class CircuitBreaker:
+    """Circuit state of one provider, shared across processes through Redis."""
+
+    def __init__(
+        self,
+        provider_name: str,
+        failure_threshold: int,
+        redis_client: Optional[Redis] = None,
+        state_cache_seconds: float = 1.0,
+    ):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            provider_name: Provider the circuit protects
+            failure_threshold: Consecutive failures that open the circuit
+            redis_client: Optional Redis client (defaults to the shared pool)
+            state_cache_seconds: How long the shared state is cached locally
+        """
+        self.provider_name = provider_name
+        self.failure_threshold = failure_threshold
+        self.redis_client = redis_client or Redis(connection_pool=get_connection_pool())
+        self.state_cache_seconds = state_cache_seconds
+        self.key = f"{CIRCUIT_KEY_PREFIX}:{provider_name}"
+        self._failures = 0
+        self._lock = threading.Lock()
+        self._cached_state: Optional[str] = None
+        self._cached_at: Optional[float] = None
+
+    def get_state(self, refresh: bool = False) -> Optional[str]:
+        """
+        Get the circuit state.
+
+        Args:
+            refresh: Read the shared state even if the local copy is fresh
+
+        Returns:
+            OPEN, HALF_OPEN, or None if the circuit is closed
+        """
+        now = time.monotonic()
+        if (
+            refresh
+            or self._cached_at is None
+            or now - self._cached_at >= self.state_cache_seconds
+        ):
+            try:
+                state = self.redis_client.get(self.key)
+                # Circuits opened before half-open existed hold a timestamp
+                self._cached_state = (
+                    None if state is None else HALF_OPEN if state == HALF_OPEN else OPEN
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Failed to read circuit state of {self.provider_name}: {e}"
+                )
+            self._cached_at = now
+        return self._cached_state
+
+    def is_open(self, refresh: bool = False) -> bool:
+        """
+        Whether writes to the provider should be spooled.
+
+        Args:
+            refresh: Read the shared state even if the local copy is fresh
+
+        Returns:
+            bool: True if the circuit is open (not half-open)
+        """
+        return self.get_state(refresh) == OPEN
+
+    def record_success(self) -> None:
+        """Reset the consecutive failure count."""
+        with self._lock:
+            self._failures = 0
+
+    def record_failure(self) -> bool:
+        """
+        Count a failure, opening the circuit at the threshold, or at once
+        if the failed write was a half-open trial.
+
+        Returns:
+            bool: True if the circuit is now open
+        """
+        if self.get_state() == HALF_OPEN:
+            with self._lock:
+                self._failures = 0
+            self.open()
+            return True
+        with self._lock:
+            self._failures += 1
+            if self._failures < self.failure_threshold:
+                return False
+            self._failures = 0
+        self.open()
+        return True
+
+    def open(self) -> None:
+        """Open the circuit for every process."""
+        self.redis_client.set(self.key, OPEN)
+        self._cached_state, self._cached_at = OPEN, time.monotonic()
+        CIRCUIT_BREAKER_OPEN.labels(provider=self.provider_name).set(1)
+        logger.warning(f"Circuit opened for provider {self.provider_name}")
+
+    def half_open(self) -> None:
+        """Let writes through as trials; the first failure reopens the circuit."""
+        self.redis_client.set(self.key, HALF_OPEN)
+        self._cached_state, self._cached_at = HALF_OPEN, time.monotonic()
+        logger.info(f"Circuit half-open for provider {self.provider_name}")
+
+    def close(self) -> None:
+        """Close the circuit for every process."""
+        self.redis_client.delete(self.key)
+        self._cached_state, self._cached_at = None, time.monotonic()
+        CIRCUIT_BREAKER_OPEN.labels(provider=self.provider_name).set(0)
+        logger.info(f"Circuit closed for provider {self.provider_name}")
+
+    def close_if_drained(self, spool_key: str) -> bool:
+        """
+        Close a half-open circuit if its spool is empty, in one atomic step.
+
+        Args:
+            spool_key: Stream key of the provider's spool
+
+        Returns:
+            bool: True if the circuit was closed
+        """
+        closed = self.redis_client.eval(
+            _CLOSE_IF_DRAINED_SCRIPT, 2, self.key, spool_key, HALF_OPEN
+        )
+        if not closed:
+            self._cached_at = None
+            return False
+        self._cached_state, self._cached_at = None, time.monotonic()
+        CIRCUIT_BREAKER_OPEN.labels(provider=self.provider_name).set(0)
+        logger.info(f"Circuit closed for provider {self.provider_name}")
+        return True
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(settings: Settings, provider_name: str) -> CircuitBreaker:
+    """
+    Get the process-wide circuit breaker of a provider.
+
+    Providers are rebuilt per command, so failure counts live here.
+
+    Args:
+        settings: Application settings
+        provider_name: Provider name
+
+    Returns:
+        The provider's CircuitBreaker
+    """
+    with _breakers_lock:
+        if provider_name not in _breakers:
+            _breakers[provider_name] = CircuitBreaker(
+                provider_name, settings.circuit_breaker_failure_threshold
+            )
+        return _breakers[provider_name]
+
+
+def get_spool_stream(
+    settings: Settings, provider_name: str, consumer: str = "producer"
+) -> RedisWriteStream:
+    """
+    Get the spool stream of a provider.
+
+    Args:
+        settings: Application settings
+        provider_name: Provider name
+        consumer: Consumer name
+
+    Returns:
+        RedisWriteStream holding the provider's spooled writes
+    """
+    return RedisWriteStream(
+        f"{settings.provider_spool_stream}:{provider_name}", SPOOL_GROUP, consumer
+    )
+
+
+def _upsert_operations(
+    documents: List[Dict[str, Any]], force: bool
+) -> List[WriteOperation]:
+    """Build spool operations for upserts, skipping unroutable documents."""
+    return [
+        WriteOperation(
+            action=UPSERT,
+            index_name=get_index_name(doc["source"], doc["type"]),
+            object_id=str(doc.get("objectID") or doc.get("id")),
+            document=doc,
+            force=force,
+        )
+        for doc in documents
+        if doc.get("type") and doc.get("source")
+    ]
+
+
+class CircuitBreakerProvider(SearchProvider):
+    """Wraps a provider, spooling writes while its circuit is open."""
+
+    def __init__(self, provider: SearchProvider, settings: Settings):
+        """
+        Initialize the wrapper.
+
+        Args:
+            provider: The provider to protect
+            settings: Application settings
+        """
+        self.provider = provider
+        self.settings = settings
+        self.breaker = get_circuit_breaker(settings, provider.name)
+        self.default_consistency = provider.default_consistency
+
+    @property
+    def name(self) -> str:
+        """Return the provider name."""
+        return self.provider.name
+
+    def __getattr__(self, attr: str) -> Any:
+        # Provider-specific helpers (search, ...) pass through
+        return getattr(self.provider, attr)
+
+    def _spool(self, operation: str, operations: List[WriteOperation]) -> None:
+        """Append writes to the provider's spool."""
+        get_spool_stream(self.settings, self.name).append(operations)
+        PROVIDER_SPOOLED_TOTAL.labels(provider=self.name, operation=operation).inc(
+            len(operations)
+        )
+        logger.info(f"Spooled {len(operations)} {operation} operations for {self.name}")
+
+    def _guard(
+        self,
+        operation: str,
+        call: Callable[[], Any],
+        spool_operations: Callable[[], List[WriteOperation]],
+    ) -> Any:
+        """
+        Run a write through the circuit.
+
+        While open, the write is spooled without calling the provider. A
+        failure that opens the circuit spools the failed write too; other
+        failures are raised so the caller can retry.
+        """
+        if self.breaker.is_open():
+            self._spool(operation, spool_operations())
+            return None
+
+        try:
+            result = call()
+        except INPUT_ERRORS:
+            raise
+        except Exception:
+            if not self.breaker.record_failure():
+                raise
+            self._spool(operation, spool_operations())
+            return None
+
+        self.breaker.record_success()
+        return result
+
+    def upsert(
+        self,
+        document: Dict[str, Any],
+        force: bool = False,
+        consistency: Optional[WriteConsistency] = None,
+    ) -> None:
+        """Upsert a document, spooling it while the circuit is open."""
+        self._guard(
+            "upsert",
+            lambda: self.provider.upsert(
+                document, force=force, consistency=consistency
+            ),
+            lambda: _upsert_operations([document], force),
+        )
+
+    def upsert_batch(
+        self,
+        documents: List[Dict[str, Any]],
+        force: bool = False,
+        consistency: Optional[WriteConsistency] = None,
+    ) -> Any:
+        """Upsert documents, spooling them while the circuit is open."""
+        return self._guard(
+            "upsert_batch",
+            lambda: self.provider.upsert_batch(
+                documents, force=force, consistency=consistency
+            ),
+            lambda: _upsert_operations(documents, force),
+        )
+
+    def delete(
+        self,
+        index_name: str,
+        document_id: str,
+        consistency: Optional[WriteConsistency] = None,
+    ) -> None:
+        """Delete a document, spooling the delete while the circuit is open."""
+        self._guard(
+            "delete",
+            lambda: self.provider.delete(index_name, document_id, consistency),
+            lambda: [WriteOperation(DELETE, index_name, document_id)],
+        )
+
+    def delete_batch(
+        self,
+        index_name: str,
+        document_ids: List[str],
+        consistency: Optional[WriteConsistency] = None,
+    ) -> None:
+        """Delete documents, spooling the deletes while the circuit is open."""
+        self._guard(
+            "delete_batch",
+            lambda: self.provider.delete_batch(index_name, document_ids, consistency),
+            lambda: [
+                WriteOperation(DELETE, index_name, document_id)
+                for document_id in document_ids
+            ],
+        )
+
+    def with_index_redirects(self, redirects: Dict[str, str]) -> SearchProvider:
+        """Get a copy of the wrapped provider that writes to other indexes."""
+        return self.provider.with_index_redirects(redirects)
+
+    def prepare_shadow_index(
+        self, index_name: str, shadow_name: str, entity_type: Optional[str] = None
+    ) -> None:
+        """Create a shadow index on the wrapped provider."""
+        self.provider.prepare_shadow_index(index_name, shadow_name, entity_type)
+
+    def swap_index(self, shadow_name: str, index_name: str) -> None:
+        """Swap a shadow index over a live index on the wrapped provider."""
+        self.provider.swap_index(shadow_name, index_name)
+
+    def drop_index(self, index_name: str) -> None:
+        """Drop an index on the wrapped provider."""
+        self.provider.drop_index(index_name)
+
+    def ensure_index(
+        self, index_name: str, index_settings: Optional[IndexSettings] = None
+    ) -> None:
+        """Ensure the index exists on the wrapped provider."""
+        self.provider.ensure_index(index_name, index_settings)
+
+    def healthcheck(self) -> bool:
+        """Check the wrapped provider's health."""
+        return self.provider.healthcheck()
+
+
+class SpoolDrainer:
+    """Replays spooled writes to providers whose healthcheck has recovered."""
+
+    def __init__(
+        self,
+        settings: Settings,
+        providers_factory: Callable[[], List[SearchProvider]],
+        consumer: str,
+    ):
+        """
+        Initialize the drainer.
+
+        Args:
+            settings: Application settings
+            providers_factory: Callable returning unwrapped providers
+            consumer: Consumer name, unique per drainer process
+        """
+        self.settings = settings
+        self.providers_factory = providers_factory
+        self.consumer = consumer
+
+    def drain_provider(self, provider: SearchProvider) -> bool:
+        """
+        Replay a provider's spool if its circuit is open and it is healthy.
+
+        An open circuit goes half-open once its spool is replayed; the
+        spool is replayed again after every writer saw the half-open state,
+        and the circuit closed if nothing was spooled since.
+
+        Args:
+            provider: Unwrapped provider
+
+        Returns:
+            bool: True if the spool was emptied and the circuit closed
+        """
+        breaker = get_circuit_breaker(self.settings, provider.name)
+        state = breaker.get_state(refresh=True)
+        if state is None:
+            return False
+        if state == OPEN and not provider.healthcheck():
+            logger.info(f"Provider {provider.name} still unhealthy, keeping spool")
+            return False
+
+        spool = get_spool_stream(self.settings, provider.name, self.consumer)
+        replayed = self._replay(provider, spool)
+        if replayed is None:
+            return False
+        if state == OPEN:
+            breaker.half_open()
+            # Writers caching the open state keep spooling until they notice
+            time.sleep(breaker.state_cache_seconds)
+            more = self._replay(provider, spool)
+            if more is None:
+                return False
+            replayed += more
+
+        if not breaker.close_if_drained(spool.stream_key):
+            # Spooled since, claimed by another drainer, or a trial write
+            # failed and reopened the circuit
+            return False
+        logger.info(f"Replayed {replayed} spooled operations to {provider.name}")
+        return True
+
+    def _replay(
+        self, provider: SearchProvider, spool: RedisWriteStream
+    ) -> Optional[int]:
+        """
+        Replay a spool until no entry is left to read.
+
+        Returns:
+            Number of operations replayed, None if a replay failed
+        """
+        writer = BulkWriter(
+            self.settings, lambda: [provider], self.consumer, streams=[spool]
+        )
+        replayed = 0
+        while True:
+            entries = spool.read(self.settings.bulk_writer_max_records, 0)
+            if not entries:
+                return replayed
+            for entry_id, operation in entries:
+                writer.add(spool, entry_id, operation)
+            if not writer.flush_all("spool"):
+                logger.warning(f"Replaying spool of {provider.name} failed, will retry")
+                return None
+            replayed += len(entries)
+
+    def run_once(self) -> None:
+        """Drain every provider whose circuit is open."""
+        for provider in self.providers_factory():
+            try:
+                self.drain_provider(provider)
+            except Exception as e:
+                logger.error(f"Spool drain of {provider.name} failed: {e}")
+
+    def run(self, should_stop: Callable[[], bool]) -> None:
+        """
+        Drain periodically until should_stop returns True.
+
+        Args:
+            should_stop: Callable checked between iterations
+        """
+        while not should_stop():
+            self.run_once()
+            time.sleep(self.settings.provider_spool_drain_interval_seconds)
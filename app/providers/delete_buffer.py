@@ -0,0 +1,134 @@
+"""
+Redis-backed buffer that coalesces document deletes across tasks.
+
+Indexing tasks add the IDs of deleted entities to one Redis set instead of
+calling the providers one delete at a time. The first delete of a window
+schedules a flush; the flush pops the buffered IDs, groups them by index and
+sends one delete_batch per index to every provider. IDs of a failed flush
+are put back so the next flush retries them. Writing a document removes its
+pending delete, so an entity re-created within the window is not deleted by
+the flush.
+"""
+
+import json
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from redis import Redis
+
+from app.config import Settings
+from app.utils.cache import get_connection_pool
+
+logger = logging.getLogger(__name__)
+
+BUFFER_KEY = "indexa:delete_buffer"
+WINDOW_KEY = "indexa:delete_buffer:window"
+
+# The window expires on its own, so a lost flush task delays buffered deletes
+# by at most this many flush delays
+WINDOW_TTL_FACTOR = 10
+
+
+def _encode(index_name: str, object_id: str) -> str:
+    return json.dumps([index_name, object_id], separators=(",", ":"))
+
+
+def _decode(member: str) -> Tuple[str, str]:
+    index_name, object_id = json.loads(member)
+    return index_name, object_id
+
+
+class DeleteBuffer:
+    """Set of pending (index, object ID) deletes shared by every process."""
+
+    def __init__(self, settings: Settings, redis_client: Optional[Redis] = None):
+        """
+        Initialize the delete buffer.
+
+        Args:
+            settings: Application settings
+            redis_client: Optional Redis client (defaults to the shared pool)
+        """
+        self.settings = settings
+        self.redis_client = redis_client or Redis(connection_pool=get_connection_pool())
+
+    def add(self, index_name: str, object_ids: List[str]) -> bool:
+        """
+        Buffer deletes.
+
+        Args:
+            index_name: The index to delete from
+            object_ids: IDs of the documents to delete
+
+        Returns:
+            bool: True if this add opened a flush window, in which case the
+            caller schedules the flush
+        """
+        if not object_ids:
+            return False
+        pipeline = self.redis_client.pipeline(transaction=False)
+        pipeline.sadd(
+            BUFFER_KEY, *(_encode(index_name, object_id) for object_id in object_ids)
+        )
+        pipeline.set(
+            WINDOW_KEY,
+            "1",
+            nx=True,
+            px=int(self.settings.delete_flush_delay_seconds * 1000 * WINDOW_TTL_FACTOR),
+        )
+        _, opened = pipeline.execute()
+        return bool(opened)
+
+    def discard(self, index_name: str, object_ids: List[str]) -> None:
+        """
+        Drop pending deletes of documents that are written again.
+
+        Args:
+            index_name: The index the documents are written to
+            object_ids: IDs of the written documents
+        """
+        if object_ids:
+            self.redis_client.srem(
+                BUFFER_KEY,
+                *(_encode(index_name, object_id) for object_id in object_ids),
+            )
+
+    def close_window(self) -> None:
+        """Let the next add schedule a new flush. Called when a flush starts."""
+        self.redis_client.delete(WINDOW_KEY)
+
+    def pop(self, count: int) -> Dict[str, List[str]]:
+        """
+        Remove up to count buffered deletes.
+
+        Args:
+            count: Maximum deletes to pop
+
+        Returns:
+            Dict of index name to object IDs
+        """
+        members = self.redis_client.spop(BUFFER_KEY, count) or []
+        ids_by_index: Dict[str, List[str]] = {}
+        for member in members:
+            index_name, object_id = _decode(member)
+            ids_by_index.setdefault(index_name, []).append(object_id)
+        return ids_by_index
+
+    def restore(self, ids_by_index: Dict[str, List[str]]) -> None:
+        """
+        Put back deletes whose flush failed.
+
+        Args:
+            ids_by_index: Dict of index name to object IDs
+        """
+        members = [
+            _encode(index_name, object_id)
+            for index_name, object_ids in ids_by_index.items()
+            for object_id in object_ids
+        ]
+        if members:
+            self.redis_client.sadd(BUFFER_KEY, *members)
+
+    def length(self) -> int:
+        """Number of buffered deletes."""
+        return self.redis_client.scard(BUFFER_KEY)
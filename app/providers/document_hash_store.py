@@ -0,0 +1,252 @@
+"""
+Store of the last-written content hash per (provider, index, objectID).
+
+Used by providers to skip writes of documents whose content did not change.
+Hashes live in one Redis hash per (provider, index) with the 8-byte digest
+stored as raw bytes to keep memory usage small. Providers that send partial
+updates also keep per-field hashes, used to diff a document against the last
+write, along with the time they were recorded so old ones can be ignored.
+
+Redis cannot expire single hash fields on every supported version, so hashes
+are written to generation keys rotated every TTL. Reads look at the current
+and previous generation and each generation key expires once it is no longer
+read, so a hash is kept one to two TTLs after its last write. An expired hash
+only costs one unskipped write.
+"""
+
+import json
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+
+from redis import Redis
+
+from app.utils.cache import get_connection_pool
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "indexa:doc_hash"
+FIELDS_KEY_PREFIX = "indexa:doc_fields"
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+
+
+class DocumentHashStore:
+    """Redis-backed store of last-written document hashes."""
+
+    def __init__(
+        self,
+        redis_client: Optional[Redis] = None,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+    ):
+        """
+        Initialize the hash store.
+
+        Args:
+            redis_client: Optional Redis client (defaults to the shared binary pool)
+            ttl_seconds: Minimum time a hash is kept after its last write
+        """
+        self.redis_client = redis_client or Redis(
+            connection_pool=get_connection_pool(decode_responses=False)
+        )
+        self.ttl_seconds = ttl_seconds
+
+    def _generation(self) -> int:
+        """Get the current key generation."""
+        return int(time.time() // self.ttl_seconds)
+
+    def _keys(self, prefix: str, provider: str, index_name: str) -> Tuple[str, str]:
+        """Build the current and previous generation keys of a provider index."""
+        generation = self._generation()
+        return (
+            f"{prefix}:{provider}:{index_name}:{generation}",
+            f"{prefix}:{provider}:{index_name}:{generation - 1}",
+        )
+
+    def _read(
+        self, prefix: str, provider: str, index_name: str, object_ids: List[str]
+    ) -> List[Optional[bytes]]:
+        """Read values from the current generation, falling back to the previous."""
+        pipeline = self.redis_client.pipeline(transaction=False)
+        for key in self._keys(prefix, provider, index_name):
+            pipeline.hmget(key, object_ids)
+        current, previous = pipeline.execute()
+        return [c if c is not None else p for c, p in zip(current, previous)]
+
+    def _write(
+        self, prefix: str, provider: str, index_name: str, mapping: Dict[str, bytes]
+    ) -> None:
+        """Write values to the current generation, expiring it once unread."""
+        generation = self._generation()
+        key = f"{prefix}:{provider}:{index_name}:{generation}"
+        pipeline = self.redis_client.pipeline(transaction=False)
+        pipeline.hset(key, mapping=mapping)
+        pipeline.expireat(key, (generation + 2) * self.ttl_seconds)
+        pipeline.execute()
+
+    def get_many(
+        self, provider: str, index_name: str, object_ids: List[str]
+    ) -> Dict[str, str]:
+        """
+        Get the last-written hashes for several objects.
+
+        Args:
+            provider: Provider name
+            index_name: Index name
+            object_ids: Object IDs to look up
+
+        Returns:
+            Dict of objectID to hex hash for objects with a stored hash. Empty
+            if the store is unreachable, so callers fall back to writing.
+        """
+        if not object_ids:
+            return {}
+        try:
+            values = self._read(KEY_PREFIX, provider, index_name, object_ids)
+        except Exception as e:
+            logger.warning(f"Failed to read document hashes for {index_name}: {e}")
+            return {}
+        return {
+            object_id: value.hex()
+            for object_id, value in zip(object_ids, values)
+            if value is not None
+        }
+
+    def set_many(self, provider: str, index_name: str, hashes: Dict[str, str]) -> None:
+        """
+        Record the hashes of documents just written.
+
+        Args:
+            provider: Provider name
+            index_name: Index name
+            hashes: Dict of objectID to hex hash
+        """
+        if not hashes:
+            return
+        try:
+            self._write(
+                KEY_PREFIX,
+                provider,
+                index_name,
+                {
+                    object_id: bytes.fromhex(value)
+                    for object_id, value in hashes.items()
+                },
+            )
+        except Exception as e:
+            logger.warning(f"Failed to record document hashes for {index_name}: {e}")
+
+    def get_fields_many(
+        self,
+        provider: str,
+        index_name: str,
+        object_ids: List[str],
+        max_age_seconds: Optional[float] = None,
+    ) -> Dict[str, Dict[str, str]]:
+        """
+        Get the last-written field hashes for several objects.
+
+        Args:
+            provider: Provider name
+            index_name: Index name
+            object_ids: Object IDs to look up
+            max_age_seconds: Ignore field hashes recorded longer ago than this
+
+        Returns:
+            Dict of objectID to field hashes for objects with stored field
+            hashes recent enough. Empty if the store is unreachable, so
+            callers fall back to full writes.
+        """
+        if not object_ids:
+            return {}
+        try:
+            values = self._read(FIELDS_KEY_PREFIX, provider, index_name, object_ids)
+        except Exception as e:
+            logger.warning(f"Failed to read field hashes for {index_name}: {e}")
+            return {}
+        oldest = None if max_age_seconds is None else time.time() - max_age_seconds
+        field_hashes = {}
+        for object_id, value in zip(object_ids, values):
+            if value is None:
+                continue
+            entry = json.loads(value)
+            # Entries recorded without a time are of unknown age
+            written_at = entry.get("written_at")
+            if written_at is None or (oldest is not None and written_at < oldest):
+                continue
+            field_hashes[object_id] = entry["fields"]
+        return field_hashes
+
+    def set_fields_many(
+        self, provider: str, index_name: str, field_hashes: Dict[str, Dict[str, str]]
+    ) -> None:
+        """
+        Record the field hashes of documents just written.
+
+        Args:
+            provider: Provider name
+            index_name: Index name
+            field_hashes: Dict of objectID to field hashes
+        """
+        if not field_hashes:
+            return
+        written_at = time.time()
+        try:
+            self._write(
+                FIELDS_KEY_PREFIX,
+                provider,
+                index_name,
+                {
+                    object_id: json.dumps(
+                        {"written_at": written_at, "fields": fields},
+                        separators=(",", ":"),
+                    )
+                    for object_id, fields in field_hashes.items()
+                },
+            )
+        except Exception as e:
+            logger.warning(f"Failed to record field hashes for {index_name}: {e}")
+
+    def delete_many(
+        self,
+        provider: str,
+        index_name: str,
+        object_ids: List[str],
+        keep_fields: bool = False,
+    ) -> None:
+        """
+        Forget hashes of deleted documents so a re-created object is written.
+
+        Args:
+            provider: Provider name
+            index_name: Index name
+            object_ids: Object IDs to forget
+            keep_fields: Forget the document hashes only, keeping the field
+                hashes as the base of later partial updates
+        """
+        if not object_ids:
+            return
+        try:
+            prefixes = [KEY_PREFIX] if keep_fields else [KEY_PREFIX, FIELDS_KEY_PREFIX]
+            pipeline = self.redis_client.pipeline(transaction=False)
+            for prefix in prefixes:
+                for key in self._keys(prefix, provider, index_name):
+                    pipeline.hdel(key, *object_ids)
+            pipeline.execute()
+        except Exception as e:
+            logger.warning(f"Failed to delete document hashes for {index_name}: {e}")
+
+    def clear_index(self, provider: str, index_name: str) -> None:
+        """
+        Forget every hash of an index (e.g. after it was dropped or replaced).
+
+        Args:
+            provider: Provider name
+            index_name: Index name
+        """
+        try:
+            self.redis_client.unlink(
+                *self._keys(KEY_PREFIX, provider, index_name),
+                *self._keys(FIELDS_KEY_PREFIX, provider, index_name),
+            )
+        except Exception as e:
+            logger.warning(f"Failed to clear document hashes for {index_name}: {e}")
@@ -6,8 +6,11 @@ import logging
 from typing import List
 
 from app.providers.base import SearchProvider
-from app.providers.algolia_provider import AlgoliaProvider
-from app.providers.typesense_provider import TypesenseProvider
+from app.providers.circuit_breaker import CircuitBreakerProvider
+from app.providers.document_hash_store import DocumentHashStore
+from app.providers.index_catalog import get_index_catalog
+from app.providers.registry import PROVIDER_REGISTRY, load_provider_class
+from app.providers.shadow_index import ShadowWriteProvider
 from app.config import Settings
 from app.settings_manager import SettingsManager
 
@@ -15,7 +18,9 @@ logger = logging.getLogger(__name__)
 
 
 def get_providers(
-    settings: Settings, settings_manager: SettingsManager
+    settings: Settings,
+    settings_manager: SettingsManager,
+    with_circuit_breaker: bool = True,
 ) -> List[SearchProvider]:
     """
     Get list of enabled search providers based on configuration.
@@ -28,27 +33,39 @@ def get_providers(
     Args:
         settings: Application settings (from environment variables)
         settings_manager: Settings manager for reading AppSetting model
+        with_circuit_breaker: Wrap providers in a circuit breaker when enabled
+            (the spool drainer needs the raw providers)
 
     Returns:
         List[SearchProvider]: List of enabled provider instances
     """
     providers: List[SearchProvider] = []
 
-    # Check Algolia
-    if is_provider_enabled("algolia", settings, settings_manager):
+    for provider_name in PROVIDER_REGISTRY:
+        if not is_provider_enabled(provider_name, settings, settings_manager):
+            continue
         try:
-            providers.append(AlgoliaProvider(settings))
-            logger.info("Algolia provider enabled")
+            # Provider modules (and their SDKs) are imported on first use
+            providers.append(load_provider_class(provider_name)(settings))
+            logger.info(f"{provider_name} provider enabled")
         except Exception as e:
-            logger.error(f"Failed to initialize Algolia provider: {e}")
+            logger.error(f"Failed to initialize {provider_name} provider: {e}")
 
-    # Check Typesense
-    if is_provider_enabled("typesense", settings, settings_manager):
-        try:
-            providers.append(TypesenseProvider(settings))
-            logger.info("Typesense provider enabled")
-        except Exception as e:
-            logger.error(f"Failed to initialize Typesense provider: {e}")
+    for provider in providers:
+        provider.index_catalog = get_index_catalog(settings, provider.name)
+
+    if settings.change_detection_enabled:
+        hash_store = DocumentHashStore(ttl_seconds=settings.document_hash_ttl_seconds)
+        for provider in providers:
+            provider.hash_store = hash_store
+
+    # Live writes are repeated on the shadow indexes of running rebuilds
+    providers = [ShadowWriteProvider(provider) for provider in providers]
+
+    if with_circuit_breaker and settings.circuit_breaker_enabled:
+        providers = [
+            CircuitBreakerProvider(provider, settings) for provider in providers
+        ]
 
     return providers
 
@@ -72,15 +89,8 @@ def is_provider_enabled(
         bool: True if provider should be enabled
     """
     # Check if provider has required configuration
-    has_config = False
-    if provider_name == "algolia":
-        has_config = bool(settings.algolia_app_id and settings.algolia_api_key)
-    elif provider_name == "typesense":
-        has_config = bool(settings.typesense_host and settings.typesense_api_key)
-    else:
-        return False
-
-    if not has_config:
+    spec = PROVIDER_REGISTRY.get(provider_name)
+    if spec is None or not spec.is_configured(settings):
         return False
 
     # Check enable/disable flag in AppSetting
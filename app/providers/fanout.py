@@ -0,0 +1,272 @@
+"""
+Concurrent fan-out of an operation to every enabled provider.
+
+Each provider runs on its own worker thread with independent retries and a
+deadline, so one slow or failing provider neither delays nor aborts the
+others. Every provider gets its own result. Deadlines start when a call
+starts, after any concurrency slot it waits for, so queueing is never
+reported as a provider timeout.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import Any, Callable, ContextManager, List, Optional, Tuple
+
+from app.config import Settings
+from app.providers.base import SearchProvider
+from app.utils.metrics import PROVIDER_LATENCY_SECONDS, PROVIDER_OPERATIONS_TOTAL
+
+logger = logging.getLogger(__name__)
+
+# Errors caused by the input itself; retrying cannot fix them
+NON_RETRYABLE_ERRORS = (ValueError, TypeError)
+
+
+@dataclass
+class ProviderResult:
+    """Outcome of an operation on one provider."""
+
+    provider: str
+    error: Optional[str] = None
+    attempts: int = 0
+    duration: float = 0.0
+    value: Any = None
+    exception: Optional[Exception] = field(default=None, repr=False)
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None
+
+
+class ProviderFanOutError(Exception):
+    """Raised when an operation failed on one or more providers."""
+
+    def __init__(self, operation: str, results: List[ProviderResult]):
+        self.operation = operation
+        self.results = results
+        super().__init__(
+            f"{operation} failed on "
+            + ", ".join(f"{r.provider} ({r.error})" for r in self.failed)
+        )
+
+    @property
+    def failed(self) -> List[ProviderResult]:
+        """Results of the providers that failed."""
+        return [r for r in self.results if not r.succeeded]
+
+
+class _CallState:
+    """Start of a provider call, shared by its worker and the waiting caller."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = threading.Event()
+        self.started_at = 0.0
+        # Set when the caller stopped waiting for the call to start
+        self.abandoned = False
+
+
+def _call_with_retry(
+    provider: SearchProvider,
+    call: Callable[[SearchProvider], Any],
+    operation: str,
+    max_retries: int,
+    backoff: float,
+    deadline: float,
+) -> ProviderResult:
+    """Run call on a provider, retrying failures until the deadline."""
+    started = time.monotonic()
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            value = call(provider)
+            return ProviderResult(
+                provider.name,
+                attempts=attempt,
+                duration=time.monotonic() - started,
+                value=value,
+            )
+        except Exception as e:
+            delay = backoff * (2 ** (attempt - 1))
+            if (
+                isinstance(e, NON_RETRYABLE_ERRORS)
+                or attempt > max_retries
+                or time.monotonic() + delay >= deadline
+            ):
+                return ProviderResult(
+                    provider.name,
+                    error=str(e) or type(e).__name__,
+                    exception=e,
+                    attempts=attempt,
+                    duration=time.monotonic() - started,
+                )
+            logger.warning(
+                f"{operation} on {provider.name} failed (attempt {attempt}), retrying in {delay}s: {e}"
+            )
+            time.sleep(delay)
+
+
+def _run_call(
+    provider: SearchProvider,
+    call: Callable[[SearchProvider], Any],
+    operation: str,
+    max_retries: int,
+    backoff: float,
+    timeout: float,
+    slot: Optional[Callable[[SearchProvider], ContextManager]],
+    state: _CallState,
+) -> Optional[ProviderResult]:
+    """
+    Run a provider call within its slot, its deadline starting once it runs.
+
+    Returns None without calling the provider if the caller stopped
+    waiting for the slot.
+    """
+    with slot(provider) if slot else nullcontext():
+        with state.lock:
+            if state.abandoned:
+                return None
+            state.started_at = time.monotonic()
+            state.started.set()
+        return _call_with_retry(
+            provider,
+            call,
+            operation,
+            max_retries,
+            backoff,
+            state.started_at + timeout,
+        )
+
+
+def _await_call(
+    provider: SearchProvider, future: Future, state: _CallState, timeout: float
+) -> Tuple[ProviderResult, str]:
+    """Wait for a provider call: timeout seconds to start, then to finish."""
+    if not state.started.wait(timeout):
+        with state.lock:
+            if not state.started.is_set():
+                # The call is never made, so it cannot land after failing
+                state.abandoned = True
+                result = ProviderResult(
+                    provider.name,
+                    error=f"timed out waiting {timeout}s for a write slot",
+                )
+                return result, "timeout"
+
+    remaining = state.started_at + timeout - time.monotonic()
+    try:
+        result = future.result(timeout=max(remaining, 0))
+    except FutureTimeoutError:
+        # The call keeps running in the background; its outcome is ignored
+        result = ProviderResult(
+            provider.name, error=f"timed out after {timeout}s", duration=timeout
+        )
+        return result, "timeout"
+    return result, "success" if result.succeeded else "failure"
+
+
+def fan_out(
+    providers: List[SearchProvider],
+    call: Callable[[SearchProvider], Any],
+    operation: str,
+    timeout: float,
+    max_retries: int = 0,
+    backoff: float = 0.5,
+    slot: Optional[Callable[[SearchProvider], ContextManager]] = None,
+) -> List[ProviderResult]:
+    """
+    Run an operation on every provider concurrently.
+
+    Every call gets a thread of its own, so no call waits in a queue behind
+    other callers' calls. A provider's timeout starts once its call starts.
+
+    Args:
+        providers: Providers to run the operation on
+        call: Callable performing the operation on one provider
+        operation: Operation name for logs and metrics
+        timeout: Seconds each provider has, retries included (and as much
+            again to get its slot)
+        max_retries: Retries per provider after the first attempt
+        backoff: Initial retry delay in seconds, doubled on each retry
+        slot: Optional context manager factory held around each provider's
+            call, such as a concurrency limit; waiting for it does not count
+            against the timeout
+
+    Returns:
+        One ProviderResult per provider, in input order
+    """
+    if not providers:
+        return []
+
+    executor = ThreadPoolExecutor(
+        max_workers=len(providers), thread_name_prefix="provider-fanout"
+    )
+    states = [_CallState() for _ in providers]
+    futures = [
+        executor.submit(
+            _run_call,
+            provider,
+            call,
+            operation,
+            max_retries,
+            backoff,
+            timeout,
+            slot,
+            state,
+        )
+        for provider, state in zip(providers, states)
+    ]
+    # Threads of timed-out calls finish in the background
+    executor.shutdown(wait=False)
+
+    results = []
+    for provider, future, state in zip(providers, futures, states):
+        result, status = _await_call(provider, future, state, timeout)
+        PROVIDER_OPERATIONS_TOTAL.labels(
+            provider=provider.name, operation=operation, status=status
+        ).inc()
+        PROVIDER_LATENCY_SECONDS.labels(
+            provider=provider.name, operation=operation
+        ).observe(result.duration)
+        if not result.succeeded:
+            logger.error(f"{operation} failed on {provider.name}: {result.error}")
+        results.append(result)
+
+    return results
+
+
+def fan_out_with_settings(
+    settings: Settings,
+    providers: List[SearchProvider],
+    call: Callable[[SearchProvider], Any],
+    operation: str,
+    slot: Optional[Callable[[SearchProvider], ContextManager]] = None,
+) -> List[ProviderResult]:
+    """
+    Run an operation on every provider with the configured timeout and retries.
+
+    Args:
+        settings: Application settings
+        providers: Providers to run the operation on
+        call: Callable performing the operation on one provider
+        operation: Operation name for logs and metrics
+        slot: Optional context manager factory held around each provider's call
+
+    Returns:
+        One ProviderResult per provider, in input order
+    """
+    return fan_out(
+        providers,
+        call,
+        operation,
+        timeout=settings.provider_timeout_seconds,
+        max_retries=settings.provider_max_retries,
+        backoff=settings.provider_retry_backoff_seconds,
+        slot=slot,
+    )
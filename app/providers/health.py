@@ -0,0 +1,167 @@
+"""
+Background provider health probing with a shared, cached status.
+
+Healthchecks are slow (Algolia lists every index), so they run in the
+health_prober process instead of inside requests. The prober checks each
+enabled provider periodically and stores its health and latency in Redis,
+where GET /providers reads it. A provider found unhealthy has its circuit
+opened, so the write path spools its writes instead of timing out on it;
+the spool drainer closes the circuit once the provider recovers.
+"""
+
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional
+
+from redis import Redis
+
+from app.config import Settings
+from app.providers.base import SearchProvider
+from app.providers.circuit_breaker import get_circuit_breaker
+from app.utils.cache import get_connection_pool
+from app.utils.metrics import PROVIDER_HEALTHY, PROVIDER_LATENCY_SECONDS
+
+logger = logging.getLogger(__name__)
+
+HEALTH_KEY = "indexa:provider_health"
+
+
+@dataclass
+class ProviderHealth:
+    """Outcome of a provider's last healthcheck."""
+
+    healthy: bool
+    latency_ms: float
+    # Epoch seconds of the check
+    checked_at: float
+    error: Optional[str] = None
+
+    def is_stale(self, max_age_seconds: float) -> bool:
+        """Whether the check is too old to be trusted."""
+        return time.time() - self.checked_at > max_age_seconds
+
+
+class ProviderHealthStore:
+    """Last known health of every provider, shared across processes through Redis."""
+
+    def __init__(self, redis_client: Optional[Redis] = None):
+        """
+        Initialize the store.
+
+        Args:
+            redis_client: Optional Redis client (defaults to the shared pool)
+        """
+        self.redis_client = redis_client or Redis(connection_pool=get_connection_pool())
+
+    def set(self, provider_name: str, health: ProviderHealth) -> None:
+        """Record a provider's health."""
+        self.redis_client.hset(HEALTH_KEY, provider_name, json.dumps(asdict(health)))
+
+    def get_all(self) -> Dict[str, ProviderHealth]:
+        """
+        Get the last known health of every probed provider.
+
+        Returns:
+            Dict of provider name to ProviderHealth; empty if Redis is unreachable
+        """
+        try:
+            stored = self.redis_client.hgetall(HEALTH_KEY) or {}
+        except Exception as e:
+            logger.warning(f"Failed to read provider health: {e}")
+            return {}
+        return {
+            name: ProviderHealth(**json.loads(value)) for name, value in stored.items()
+        }
+
+
+class HealthProber:
+    """Periodically checks provider health and publishes the results."""
+
+    def __init__(
+        self,
+        settings: Settings,
+        providers_factory: Callable[[], List[SearchProvider]],
+        store: Optional[ProviderHealthStore] = None,
+    ):
+        """
+        Initialize the prober.
+
+        Args:
+            settings: Application settings
+            providers_factory: Callable returning the enabled, unwrapped providers
+            store: Optional health store (defaults to the shared one)
+        """
+        self.settings = settings
+        self.providers_factory = providers_factory
+        self.store = store or ProviderHealthStore()
+
+    def probe(self, provider: SearchProvider) -> ProviderHealth:
+        """
+        Check one provider's health and latency.
+
+        Args:
+            provider: The provider to check
+
+        Returns:
+            ProviderHealth of the check
+        """
+        error = None
+        start = time.perf_counter()
+        try:
+            healthy = provider.healthcheck()
+        except Exception as e:
+            healthy, error = False, str(e)
+        duration = time.perf_counter() - start
+        PROVIDER_LATENCY_SECONDS.labels(
+            provider=provider.name, operation="healthcheck"
+        ).observe(duration)
+        PROVIDER_HEALTHY.labels(provider=provider.name).set(1 if healthy else 0)
+        return ProviderHealth(
+            healthy=healthy,
+            latency_ms=round(duration * 1000, 1),
+            checked_at=time.time(),
+            error=error,
+        )
+
+    def run_once(self) -> Dict[str, ProviderHealth]:
+        """
+        Probe every enabled provider and publish the results.
+
+        Returns:
+            Dict of provider name to ProviderHealth
+        """
+        results = {}
+        for provider in self.providers_factory():
+            health = self.probe(provider)
+            results[provider.name] = health
+            try:
+                self.store.set(provider.name, health)
+            except Exception as e:
+                logger.warning(f"Failed to record health of {provider.name}: {e}")
+
+            if health.healthy or not self.settings.circuit_breaker_enabled:
+                continue
+            breaker = get_circuit_breaker(self.settings, provider.name)
+            if not breaker.is_open(refresh=True):
+                logger.warning(
+                    f"Provider {provider.name} failed its healthcheck, "
+                    "spooling its writes"
+                )
+                breaker.open()
+        return results
+
+    def run(self, should_stop: Callable[[], bool]) -> None:
+        """
+        Probe periodically until should_stop returns True.
+
+        Args:
+            should_stop: Callable checked between iterations
+        """
+        while not should_stop():
+            try:
+                self.run_once()
+            except Exception as e:
+                logger.error(f"Provider health probe failed: {e}")
+            time.sleep(self.settings.provider_health_probe_interval_seconds)
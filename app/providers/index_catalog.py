@@ -0,0 +1,248 @@
+"""
+Catalog of known indexes and the settings applied to them.
+
+Providers consult the catalog before writing to an index. The first write to
+a new `{source}-{entity_type}` index pushes its settings (searchable
+attributes, facets, ranking) through ensure_index and records a fingerprint
+of them; later writes find the fingerprint and skip the metadata round trip.
+Fingerprints are cached in-process and shared through Redis, so each index
+is set up once per settings change rather than once per worker. Changing the
+configured settings of an index changes its fingerprint, which re-applies
+them on the next write.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from redis import Redis
+
+from app.config import Settings
+from app.utils.cache import get_connection_pool
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "indexa:index_catalog"
+
+# Key of the configured settings applied to indexes without their own entry
+DEFAULT_SETTINGS_KEY = "*"
+
+
+@dataclass(frozen=True)
+class IndexSettings:
+    """Provider-neutral settings of a search index."""
+
+    # Attributes searched, in priority order; empty searches every attribute
+    searchable_attributes: List[str] = field(default_factory=list)
+    attributes_for_faceting: List[str] = field(
+        default_factory=lambda: ["type", "source"]
+    )
+    # Tie-breaking ranking, e.g. "desc(updated_at)"
+    custom_ranking: List[str] = field(default_factory=list)
+    # Fields set by configuration; the others hold defaults
+    configured: Tuple[str, ...] = ()
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "IndexSettings":
+        """Build settings from configuration, keeping defaults for missing keys."""
+        return cls(
+            **{k: list(v) for k, v in data.items()}, configured=tuple(sorted(data))
+        )
+
+    def fingerprint(self) -> str:
+        """Stable hash of the settings."""
+        canonical = json.dumps(asdict(self), sort_keys=True, separators=(",", ":"))
+        return hashlib.blake2b(canonical.encode("utf-8"), digest_size=8).hexdigest()
+
+    def to_algolia(self, configured_only: bool = False) -> Dict[str, Any]:
+        """
+        Settings payload for the Algolia set_settings call.
+
+        Args:
+            configured_only: Leave out the fields holding defaults, so the
+                payload does not overwrite settings made on the index itself
+
+        Returns:
+            Dict of Algolia setting name to value
+        """
+        payload: Dict[str, Any] = {
+            "attributesForFaceting": self.attributes_for_faceting,
+            "customRanking": self.custom_ranking,
+        }
+        if self.searchable_attributes or "searchable_attributes" in self.configured:
+            payload["searchableAttributes"] = self.searchable_attributes
+        if not configured_only:
+            return payload
+        names = {
+            "searchable_attributes": "searchableAttributes",
+            "attributes_for_faceting": "attributesForFaceting",
+            "custom_ranking": "customRanking",
+        }
+        return {
+            names[name]: payload[names[name]]
+            for name in self.configured
+            if names.get(name) in payload
+        }
+
+
+def load_index_settings(settings: Settings) -> Dict[str, IndexSettings]:
+    """
+    Parse the configured index settings.
+
+    INDEX_SETTINGS is a JSON object keyed by index name, entity type or "*"
+    (every other index), e.g. {"pets": {"searchable_attributes": ["name"]}}.
+
+    Args:
+        settings: Application settings
+
+    Returns:
+        Dict of key to IndexSettings; empty if nothing (valid) is configured
+    """
+    if not settings.index_settings:
+        return {}
+    try:
+        return {
+            key: IndexSettings.from_dict(value)
+            for key, value in json.loads(settings.index_settings).items()
+        }
+    except (ValueError, TypeError) as e:
+        logger.error(f"Invalid INDEX_SETTINGS, using defaults: {e}")
+        return {}
+
+
+class IndexCatalog:
+    """Known indexes of one provider and the fingerprint of their settings."""
+
+    def __init__(
+        self,
+        provider_name: str,
+        index_settings: Optional[Dict[str, IndexSettings]] = None,
+        redis_client: Optional[Redis] = None,
+    ):
+        """
+        Initialize the catalog.
+
+        Args:
+            provider_name: Provider the catalog belongs to
+            index_settings: Configured settings by index name, entity type or "*"
+            redis_client: Optional Redis client sharing the catalog between
+                processes; without one the catalog is process-local
+        """
+        self.provider_name = provider_name
+        self.index_settings = index_settings or {}
+        self.redis_client = redis_client
+        self.key = f"{KEY_PREFIX}:{provider_name}"
+        self._applied: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def settings_for(
+        self, index_name: str, entity_type: Optional[str] = None
+    ) -> IndexSettings:
+        """
+        Get the settings an index should have.
+
+        Args:
+            index_name: The index name
+            entity_type: The entity type stored in the index
+
+        Returns:
+            IndexSettings configured for the index name, else for the entity
+            type, else for "*", else the defaults
+        """
+        for key in (index_name, entity_type, DEFAULT_SETTINGS_KEY):
+            if key in self.index_settings:
+                return self.index_settings[key]
+        return IndexSettings()
+
+    def is_applied(self, index_name: str, index_settings: IndexSettings) -> bool:
+        """
+        Whether the index exists with these settings applied.
+
+        Args:
+            index_name: The index name
+            index_settings: Settings the index should have
+
+        Returns:
+            bool: True if ensure_index can be skipped
+        """
+        fingerprint = index_settings.fingerprint()
+        if self._applied.get(index_name) == fingerprint:
+            return True
+        if self.redis_client is None:
+            return False
+        try:
+            stored = self.redis_client.hget(self.key, index_name)
+        except Exception as e:
+            logger.warning(f"Failed to read index catalog of {self.provider_name}: {e}")
+            return False
+        if stored != fingerprint:
+            return False
+        with self._lock:
+            self._applied[index_name] = fingerprint
+        return True
+
+    def mark_applied(self, index_name: str, index_settings: IndexSettings) -> None:
+        """
+        Record that the index exists with these settings.
+
+        Args:
+            index_name: The index name
+            index_settings: Settings applied to the index
+        """
+        fingerprint = index_settings.fingerprint()
+        with self._lock:
+            self._applied[index_name] = fingerprint
+        if self.redis_client is not None:
+            try:
+                self.redis_client.hset(self.key, index_name, fingerprint)
+            except Exception as e:
+                logger.warning(
+                    f"Failed to record index catalog of {self.provider_name}: {e}"
+                )
+
+    def forget(self, index_name: str) -> None:
+        """
+        Forget an index (e.g. after it was dropped) so the next write sets it up.
+
+        Args:
+            index_name: The index name
+        """
+        with self._lock:
+            self._applied.pop(index_name, None)
+        if self.redis_client is not None:
+            try:
+                self.redis_client.hdel(self.key, index_name)
+            except Exception as e:
+                logger.warning(
+                    f"Failed to update index catalog of {self.provider_name}: {e}"
+                )
+
+
+_catalogs: Dict[str, IndexCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_index_catalog(settings: Settings, provider_name: str) -> IndexCatalog:
+    """
+    Get the process-wide, Redis-shared index catalog of a provider.
+
+    Providers are rebuilt per command, so known indexes live here.
+
+    Args:
+        settings: Application settings
+        provider_name: Provider name
+
+    Returns:
+        The provider's IndexCatalog
+    """
+    with _catalogs_lock:
+        if provider_name not in _catalogs:
+            _catalogs[provider_name] = IndexCatalog(
+                provider_name,
+                load_index_settings(settings),
+                Redis(connection_pool=get_connection_pool()),
+            )
+        return _catalogs[provider_name]
@@ -0,0 +1,428 @@
+"""
+Embedded local search provider backed by SQLite FTS5.
+
+Needs no external service, so it can run in development, CI and load tests,
+and serve as a zero-cost fallback index. Documents are stored as JSON next to
+a full-text representation kept in sync with an external-content FTS5 table.
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.config import Settings
+from app.constants.write_consistency import WriteConsistency
+from app.providers.base import SearchProvider
+from app.providers.batching import ChunkResult, raise_for_failed_chunks
+from app.providers.index_catalog import IndexSettings
+
+logger = logging.getLogger(__name__)
+
+# Core fields that carry no searchable text
+NON_SEARCHABLE_FIELDS = frozenset(
+    {"id", "objectID", "schema_version", "updated_at", "source", "type"}
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    index_name TEXT NOT NULL,
+    object_id TEXT NOT NULL,
+    body TEXT NOT NULL,
+    search_text TEXT NOT NULL,
+    UNIQUE (index_name, object_id)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+    search_text, content='documents', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS documents_ai AFTER INSERT ON documents BEGIN
+    INSERT INTO documents_fts(rowid, search_text) VALUES (new.id, new.search_text);
+END;
+CREATE TRIGGER IF NOT EXISTS documents_ad AFTER DELETE ON documents BEGIN
+    INSERT INTO documents_fts(documents_fts, rowid, search_text)
+    VALUES ('delete', old.id, old.search_text);
+END;
+CREATE TRIGGER IF NOT EXISTS documents_au AFTER UPDATE ON documents BEGIN
+    INSERT INTO documents_fts(documents_fts, rowid, search_text)
+    VALUES ('delete', old.id, old.search_text);
+    INSERT INTO documents_fts(rowid, search_text) VALUES (new.id, new.search_text);
+END;
+"""
+
+UPSERT_SQL = """
+INSERT INTO documents (index_name, object_id, body, search_text)
+VALUES (?, ?, ?, ?)
+ON CONFLICT (index_name, object_id)
+DO UPDATE SET body = excluded.body, search_text = excluded.search_text
+"""
+
+
+# Connections shared by the providers of a process, by path. get_providers
+# builds new providers for every batch, and an in-memory index only exists on
+# the connection that created it.
+_connections: Dict[Tuple[int, str], Tuple[sqlite3.Connection, threading.Lock]] = {}
+_connections_lock = threading.Lock()
+
+
+def get_connection(path: str) -> Tuple[sqlite3.Connection, threading.Lock]:
+    """
+    Get the process-wide connection to a local index, opening it on first use.
+
+    Args:
+        path: SQLite file path, or ":memory:"
+
+    Returns:
+        Tuple of (connection, lock serializing its transactions)
+    """
+    # Keyed by process too, a connection must not be used across a fork
+    key = (os.getpid(), path)
+    with _connections_lock:
+        shared = _connections.get(key)
+        if shared is None:
+            connection = sqlite3.connect(
+                path, check_same_thread=False, isolation_level=None
+            )
+            if path != ":memory:":
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            shared = _connections[key] = (connection, threading.Lock())
+        return shared
+
+
+def close_connections() -> None:
+    """Close the shared connections; in-memory indexes are discarded."""
+    with _connections_lock:
+        for connection, _ in _connections.values():
+            connection.close()
+        _connections.clear()
+
+
+def extract_search_text(value: Any) -> str:
+    """
+    Flatten the searchable text of a document.
+
+    Args:
+        value: Document (or nested value)
+
+    Returns:
+        Space separated text of every string and number in the value
+    """
+    parts: List[str] = []
+
+    def walk(item: Any) -> None:
+        if isinstance(item, dict):
+            for key, nested in item.items():
+                if key not in NON_SEARCHABLE_FIELDS:
+                    walk(nested)
+        elif isinstance(item, (list, tuple)):
+            for nested in item:
+                walk(nested)
+        elif isinstance(item, (str, int, float)) and not isinstance(item, bool):
+            parts.append(str(item))
+
+    walk(value)
+    return " ".join(parts)
+
+
+def build_match_query(query: str) -> str:
+    """
+    Turn free text into an FTS5 MATCH expression.
+
+    Every word is quoted (so FTS5 syntax in user input is inert) and matched
+    as a prefix; all words must match.
+
+    Args:
+        query: Free text query
+
+    Returns:
+        FTS5 query string, empty if the query has no words
+    """
+    terms = re.findall(r"\w+", query)
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+class LocalSearchProvider(SearchProvider):
+    """SQLite FTS5 search provider."""
+
+    # Writes are committed before the call returns
+    default_consistency = WriteConsistency.VISIBLE
+
+    def __init__(self, settings: Settings):
+        """
+        Initialize the local provider.
+
+        Providers of the same path share one connection per process, so an
+        in-memory index is seen by every provider of the process.
+
+        Args:
+            settings: Application settings containing local_search_path
+                (a file path, or ":memory:" for a process-local index)
+        """
+        if not settings.local_search_path:
+            raise ValueError("Local search path must be configured")
+
+        self.path = settings.local_search_path
+        self.connection, self._lock = get_connection(self.path)
+
+    @property
+    def name(self) -> str:
+        """Return the provider name."""
+        return "local"
+
+    def _write(self, statement: str, rows: Iterable[tuple]) -> None:
+        """Run a statement for many rows in one transaction."""
+        with self._lock:
+            self.connection.execute("BEGIN")
+            try:
+                self.connection.executemany(statement, rows)
+                self.connection.execute("COMMIT")
+            except Exception:
+                self.connection.execute("ROLLBACK")
+                raise
+
+    def _upsert_rows(self, index_name: str, documents: List[Dict[str, Any]]) -> None:
+        """Write documents to an index in a single transaction."""
+        self._write(
+            UPSERT_SQL,
+            (
+                (
+                    index_name,
+                    self._get_object_id(doc),
+                    json.dumps(doc, default=str),
+                    extract_search_text(doc),
+                )
+                for doc in documents
+            ),
+        )
+
+    def upsert(
+        self,
+        document: Dict[str, Any],
+        force: bool = False,
+        consistency: Optional[WriteConsistency] = None,
+    ) -> None:
+        """
+        Upsert a single document.
+
+        Args:
+            document: The document to upsert
+            force: Write even if the content is unchanged since the last write
+            consistency: Ignored, writes are visible on return
+        """
+        entity_type = document.get("type")
+        source = document.get("source")
+        if not entity_type:
+            raise ValueError("Document must have a 'type' field")
+
+        if not source:
+            raise ValueError("Document must have a 'source' field")
+
+        index_name = self._get_index_name(source, entity_type)
+        changed, hashes = self._skip_unchanged(index_name, [document], force)
+        if not changed:
+            return
+
+        self._upsert_rows(index_name, changed)
+        self._record_written(index_name, hashes)
+        logger.debug(
+            f"Upserted document {document.get('id')} to local index {index_name}"
+        )
+
+    def upsert_batch(
+        self,
+        documents: List[Dict[str, Any]],
+        force: bool = False,
+        consistency: Optional[WriteConsistency] = None,
+    ) -> List[ChunkResult]:
+        """
+        Upsert multiple documents, one transaction per index.
+
+        Args:
+            documents: List of documents to upsert
+            force: Write even if the content is unchanged since the last write
+            consistency: Ignored, writes are visible on return
+
+        Returns:
+            List[ChunkResult]: Outcome of each index written
+
+        Raises:
+            BatchWriteError: If writing to one or more indexes failed
+        """
+        documents_by_index: Dict[str, List[Dict[str, Any]]] = {}
+        for doc in documents:
+            if not doc.get("type") or not doc.get("source"):
+                logger.warning(
+                    f"Document missing 'type' or 'source' field, skipping: {doc.get('id')}"
+                )
+                continue
+            index_name = self._get_index_name(doc["source"], doc["type"])
+            documents_by_index.setdefault(index_name, []).append(doc)
+
+        results = []
+        for index_name, docs in documents_by_index.items():
+            changed, hashes = self._skip_unchanged(index_name, docs, force)
+            if not changed:
+                continue
+            object_ids = [self._get_object_id(doc) for doc in changed]
+            try:
+                self._upsert_rows(index_name, changed)
+                self._record_written(index_name, hashes)
+                results.append(ChunkResult(index_name, object_ids))
+            except sqlite3.Error as e:
+                logger.error(f"Failed to batch upsert to local index {index_name}: {e}")
+                results.append(ChunkResult(index_name, object_ids, error=str(e)))
+
+        return raise_for_failed_chunks(results)
+
+    def delete(
+        self,
+        index_name: str,
+        document_id: str,
+        consistency: Optional[WriteConsistency] = None,
+    ) -> None:
+        """
+        Delete a document.
+
+        Args:
+            index_name: The index to delete from
+            document_id: The ID of the document to delete
+            consistency: Ignored, writes are visible on return
+        """
+        self.delete_batch(index_name, [document_id])
+
+    def delete_batch(
+        self,
+        index_name: str,
+        document_ids: List[str],
+        consistency: Optional[WriteConsistency] = None,
+    ) -> None:
+        """
+        Delete multiple documents.
+
+        Args:
+            index_name: The index to delete from
+            document_ids: List of document IDs to delete
+            consistency: Ignored, writes are visible on return
+        """
+        if not document_ids:
+            return
+        self._write(
+            "DELETE FROM documents WHERE index_name = ? AND object_id = ?",
+            ((index_name, document_id) for document_id in document_ids),
+        )
+        self._forget_written(index_name, document_ids)
+        logger.debug(
+            f"Deleted {len(document_ids)} documents from local index {index_name}"
+        )
+
+    def search(
+        self, index_name: str, query: str, limit: int = 20, offset: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Full-text search an index, best matches first.
+
+        An empty query lists the index in insertion order.
+
+        Args:
+            index_name: The index to search
+            query: Free text query; every word must match as a prefix
+            limit: Maximum hits to return
+            offset: Hits to skip
+
+        Returns:
+            Dict with "hits" (documents) and "total" (number of matches)
+        """
+        match = build_match_query(query)
+        with self._lock:
+            if match:
+                total = self.connection.execute(
+                    "SELECT count(*) FROM documents_fts f JOIN documents d ON d.id = f.rowid "
+                    "WHERE documents_fts MATCH ? AND d.index_name = ?",
+                    (match, index_name),
+                ).fetchone()[0]
+                rows = self.connection.execute(
+                    "SELECT d.body FROM documents_fts f JOIN documents d ON d.id = f.rowid "
+                    "WHERE documents_fts MATCH ? AND d.index_name = ? "
+                    "ORDER BY bm25(documents_fts) LIMIT ? OFFSET ?",
+                    (match, index_name, limit, offset),
+                ).fetchall()
+            else:
+                total = self.connection.execute(
+                    "SELECT count(*) FROM documents WHERE index_name = ?",
+                    (index_name,),
+                ).fetchone()[0]
+                rows = self.connection.execute(
+                    "SELECT body FROM documents WHERE index_name = ? "
+                    "ORDER BY id LIMIT ? OFFSET ?",
+                    (index_name, limit, offset),
+                ).fetchall()
+
+        return {"hits": [json.loads(row[0]) for row in rows], "total": total}
+
+    def ensure_index(
+        self, index_name: str, index_settings: Optional[IndexSettings] = None
+    ) -> None:
+        """
+        Ensure the index exists. Indexes share one table, so this is a no-op.
+
+        Args:
+            index_name: The name of the index
+            index_settings: Ignored, every text field is searchable
+        """
+
+    def drop_index(self, index_name: str) -> None:
+        """
+        Remove every document of an index and forget its stored hashes.
+
+        Args:
+            index_name: The name of the index
+        """
+        self._write("DELETE FROM documents WHERE index_name = ?", [(index_name,)])
+        if self.hash_store is not None:
+            self.hash_store.clear_index(self.name, index_name)
+        if self.index_catalog is not None:
+            self.index_catalog.forget(index_name)
+
+    def swap_index(self, shadow_name: str, index_name: str) -> None:
+        """
+        Replace a live index with a shadow index in one transaction.
+
+        Args:
+            shadow_name: The fully loaded shadow index
+            index_name: The live index to replace
+        """
+        with self._lock:
+            self.connection.execute("BEGIN")
+            try:
+                self.connection.execute(
+                    "DELETE FROM documents WHERE index_name = ?", (index_name,)
+                )
+                self.connection.execute(
+                    "UPDATE documents SET index_name = ? WHERE index_name = ?",
+                    (index_name, shadow_name),
+                )
+                self.connection.execute("COMMIT")
+            except Exception:
+                self.connection.execute("ROLLBACK")
+                raise
+        self._forget_swapped(index_name, shadow_name)
+
+    def healthcheck(self) -> bool:
+        """
+        Check the database is usable.
+
+        Returns:
+            bool: True if healthy, False otherwise
+        """
+        try:
+            with self._lock:
+                self.connection.execute("SELECT 1").fetchone()
+            return True
+        except Exception as e:
+            logger.error(f"Local search healthcheck failed: {e}")
+            return False
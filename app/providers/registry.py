@@ -0,0 +1,94 @@
+"""
+Registry of known search providers.
+
+Providers are registered by name with the dotted path of their class and a
+check for required configuration. Provider modules (and the SDKs they import)
+are only loaded when a provider is actually instantiated, which keeps the API
+and worker startup free of unused SDK imports.
+"""
+
+import importlib
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Type
+
+from app.config import Settings
+from app.providers.base import SearchProvider
+
+
+@dataclass(frozen=True)
+class ProviderSpec:
+    """Registration entry for a search provider."""
+
+    name: str
+    class_path: str  # "package.module:ClassName"
+    is_configured: Callable[[Settings], bool]
+
+
+PROVIDER_REGISTRY: Dict[str, ProviderSpec] = {}
+
+_provider_classes: Dict[str, Type[SearchProvider]] = {}
+
+
+def register_provider(spec: ProviderSpec) -> None:
+    """
+    Register a search provider.
+
+    Args:
+        spec: The provider specification
+    """
+    PROVIDER_REGISTRY[spec.name] = spec
+    _provider_classes.pop(spec.name, None)
+
+
+def known_providers() -> List[str]:
+    """
+    Get the names of all registered providers.
+
+    Returns:
+        List[str]: Provider names in registration order
+    """
+    return list(PROVIDER_REGISTRY)
+
+
+def load_provider_class(name: str) -> Type[SearchProvider]:
+    """
+    Import and return the class of a registered provider.
+
+    Args:
+        name: Provider name
+
+    Returns:
+        The provider class
+
+    Raises:
+        KeyError: If the provider is not registered
+    """
+    provider_class = _provider_classes.get(name)
+    if provider_class is None:
+        module_path, class_name = PROVIDER_REGISTRY[name].class_path.split(":")
+        provider_class = getattr(importlib.import_module(module_path), class_name)
+        _provider_classes[name] = provider_class
+    return provider_class
+
+
+register_provider(
+    ProviderSpec(
+        name="algolia",
+        class_path="app.providers.algolia_provider:AlgoliaProvider",
+        is_configured=lambda s: bool(s.algolia_app_id and s.algolia_api_key),
+    )
+)
+register_provider(
+    ProviderSpec(
+        name="typesense",
+        class_path="app.providers.typesense_provider:TypesenseProvider",
+        is_configured=lambda s: bool(s.typesense_host and s.typesense_api_key),
+    )
+)
+register_provider(
+    ProviderSpec(
+        name="local",
+        class_path="app.providers.local_provider:LocalSearchProvider",
+        is_configured=lambda s: bool(s.local_search_path),
+    )
+)
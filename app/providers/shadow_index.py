@@ -0,0 +1,419 @@
+"""
+Shadow indexes of zero-downtime rebuilds and dual writes to them.
+
+A rebuild loads every entity into a shadow index (`{index}_tmp_{job_id}`)
+while queries keep hitting the live index, then swaps the shadow over the
+live index. Rebuilds register their shadows in Redis; ShadowWriteProvider
+wraps each provider and, while a shadow is registered, repeats live writes
+and deletes of that index on the shadow so it does not miss live events.
+
+Dual writes stop shortly before the swap (a shadow moved over its live index
+no longer exists under its own name): the registry marks the indexes as
+swapping, and from then on writers record live deletes of them in Redis
+instead. The rebuild replays those deletes on the swapped indexes, and the
+reindex command runs an incremental catch-up pass after the swap for the
+updates of that gap.
+"""
+
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from redis import Redis
+
+from app.constants.write_consistency import WriteConsistency
+from app.providers.base import SearchProvider, get_index_name
+from app.providers.index_catalog import IndexSettings
+from app.utils.cache import get_connection_pool
+
+logger = logging.getLogger(__name__)
+
+REGISTRY_KEY = "indexa:shadow_indexes"
+SWAPPING_KEY = "indexa:swapping_indexes"
+SWAP_DELETES_KEY = "indexa:swap_deletes:{index_name}"
+
+
+def get_shadow_index_name(index_name: str, job_id: Any) -> str:
+    """
+    Get the shadow index a rebuild job loads for a live index.
+
+    Args:
+        index_name: The live index
+        job_id: The rebuild job ID
+
+    Returns:
+        The shadow index name
+    """
+    return f"{index_name}_tmp_{job_id}"
+
+
+class ShadowIndexRegistry:
+    """Shadow indexes receiving dual writes, shared across processes through Redis."""
+
+    def __init__(
+        self, redis_client: Optional[Redis] = None, state_cache_seconds: float = 1.0
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            redis_client: Optional Redis client (defaults to the shared pool)
+            state_cache_seconds: How long the shared state is cached locally
+        """
+        self.redis_client = redis_client or Redis(connection_pool=get_connection_pool())
+        self.state_cache_seconds = state_cache_seconds
+        self._cached: Dict[str, str] = {}
+        self._cached_swapping: Set[str] = set()
+        self._cached_at: Optional[float] = None
+
+    def _refresh(self) -> None:
+        """Read the shared state once the cached copy is older than the cache period."""
+        now = time.monotonic()
+        if (
+            self._cached_at is not None
+            and now - self._cached_at < self.state_cache_seconds
+        ):
+            return
+        try:
+            self._cached = self.redis_client.hgetall(REGISTRY_KEY) or {}
+            self._cached_swapping = set(self.redis_client.smembers(SWAPPING_KEY) or ())
+        except Exception as e:
+            logger.warning(f"Failed to read shadow indexes: {e}")
+        self._cached_at = now
+
+    def get_shadows(self) -> Dict[str, str]:
+        """
+        Get the registered shadows.
+
+        Returns:
+            Dict of live index name to shadow index name
+        """
+        self._refresh()
+        return self._cached
+
+    def get_swapping(self) -> Set[str]:
+        """
+        Get the live indexes whose shadows are being swapped in.
+
+        Returns:
+            Set of live index names
+        """
+        self._refresh()
+        return self._cached_swapping
+
+    def register(self, index_name: str, shadow_name: str) -> None:
+        """Start dual-writing an index to its shadow."""
+        self.redis_client.hset(REGISTRY_KEY, index_name, shadow_name)
+        self._cached_at = None
+
+    def mark_swapping(self, index_name: str) -> None:
+        """Stop dual-writing an index and start recording its deletes."""
+        pipeline = self.redis_client.pipeline(transaction=True)
+        pipeline.sadd(SWAPPING_KEY, index_name)
+        pipeline.hdel(REGISTRY_KEY, index_name)
+        pipeline.execute()
+        self._cached_at = None
+
+    def unregister(self, index_name: str) -> None:
+        """Stop dual-writing an index, or recording its deletes."""
+        pipeline = self.redis_client.pipeline(transaction=True)
+        pipeline.hdel(REGISTRY_KEY, index_name)
+        pipeline.srem(SWAPPING_KEY, index_name)
+        pipeline.execute()
+        self._cached_at = None
+
+    def record_deletes(self, index_name: str, document_ids: List[str]) -> None:
+        """Record live deletes of a swapping index, to replay after the swap."""
+        if document_ids:
+            self.redis_client.sadd(
+                SWAP_DELETES_KEY.format(index_name=index_name), *document_ids
+            )
+
+    def pop_deletes(self, index_name: str) -> List[str]:
+        """
+        Take the deletes recorded for an index.
+
+        Args:
+            index_name: The live index
+
+        Returns:
+            IDs of the documents deleted while the index was swapping
+        """
+        key = SWAP_DELETES_KEY.format(index_name=index_name)
+        pipeline = self.redis_client.pipeline(transaction=True)
+        pipeline.smembers(key)
+        pipeline.delete(key)
+        members, _ = pipeline.execute()
+        return sorted(members or ())
+
+
+_registry: Optional[ShadowIndexRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_shadow_index_registry() -> ShadowIndexRegistry:
+    """Get the process-wide shadow index registry."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ShadowIndexRegistry()
+        return _registry
+
+
+class ShadowWriteProvider(SearchProvider):
+    """Wraps a provider, repeating writes on the shadows of rebuilding indexes."""
+
+    def __init__(
+        self, provider: SearchProvider, registry: Optional[ShadowIndexRegistry] = None
+    ):
+        """
+        Initialize the wrapper.
+
+        Args:
+            provider: The provider writing the live indexes
+            registry: Optional registry (defaults to the process-wide one)
+        """
+        self.provider = provider
+        self.registry = registry or get_shadow_index_registry()
+        self.default_consistency = provider.default_consistency
+
+    @property
+    def name(self) -> str:
+        """Return the provider name."""
+        return self.provider.name
+
+    def __getattr__(self, attr: str) -> Any:
+        # Provider-specific helpers (search, ...) pass through
+        return getattr(self.provider, attr)
+
+    def _shadowed(self, documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Documents of indexes with a registered shadow."""
+        shadows = self.registry.get_shadows()
+        if not shadows:
+            return []
+        return [
+            doc
+            for doc in documents
+            if doc.get("type")
+            and get_index_name(doc.get("source"), doc["type"]) in shadows
+        ]
+
+    def upsert(
+        self,
+        document: Dict[str, Any],
+        force: bool = False,
+        consistency: Optional[WriteConsistency] = None,
+    ) -> None:
+        """Upsert a document, and to its index's shadow if it has one."""
+        self.provider.upsert(document, force=force, consistency=consistency)
+        if self._shadowed([document]):
+            self.with_index_redirects(self.registry.get_shadows()).upsert(
+                document, consistency=consistency
+            )
+
+    def upsert_batch(
+        self,
+        documents: List[Dict[str, Any]],
+        force: bool = False,
+        consistency: Optional[WriteConsistency] = None,
+    ) -> Any:
+        """Upsert documents, and to the shadows of their indexes if any."""
+        result = self.provider.upsert_batch(
+            documents, force=force, consistency=consistency
+        )
+        shadowed = self._shadowed(documents)
+        if shadowed:
+            self.with_index_redirects(self.registry.get_shadows()).upsert_batch(
+                shadowed, consistency=consistency
+            )
+        return result
+
+    def delete(
+        self,
+        index_name: str,
+        document_id: str,
+        consistency: Optional[WriteConsistency] = None,
+    ) -> None:
+        """Delete a document, and from its index's shadow if it has one."""
+        self.provider.delete(index_name, document_id, consistency)
+        self._mirror_deletes(index_name, [document_id], consistency)
+
+    def delete_batch(
+        self,
+        index_name: str,
+        document_ids: List[str],
+        consistency: Optional[WriteConsistency] = None,
+    ) -> None:
+        """Delete documents, and from their index's shadow if it has one."""
+        self.provider.delete_batch(index_name, document_ids, consistency)
+        self._mirror_deletes(index_name, document_ids, consistency)
+
+    def _mirror_deletes(
+        self,
+        index_name: str,
+        document_ids: List[str],
+        consistency: Optional[WriteConsistency],
+    ) -> None:
+        """Repeat live deletes on the index's shadow, or record them while it swaps."""
+        shadow_name = self.registry.get_shadows().get(index_name)
+        if shadow_name:
+            self.provider.delete_batch(shadow_name, document_ids, consistency)
+        elif index_name in self.registry.get_swapping():
+            self.registry.record_deletes(index_name, document_ids)
+
+    def with_index_redirects(self, redirects: Dict[str, str]) -> SearchProvider:
+        """Get a copy of the wrapped provider that writes to other indexes."""
+        return self.provider.with_index_redirects(redirects)
+
+    def prepare_shadow_index(
+        self, index_name: str, shadow_name: str, entity_type: Optional[str] = None
+    ) -> None:
+        """Create a shadow index on the wrapped provider."""
+        self.provider.prepare_shadow_index(index_name, shadow_name, entity_type)
+
+    def swap_index(self, shadow_name: str, index_name: str) -> None:
+        """Swap a shadow index over a live index on the wrapped provider."""
+        self.provider.swap_index(shadow_name, index_name)
+
+    def drop_index(self, index_name: str) -> None:
+        """Drop an index on the wrapped provider."""
+        self.provider.drop_index(index_name)
+
+    def ensure_index(
+        self, index_name: str, index_settings: Optional[IndexSettings] = None
+    ) -> None:
+        """Ensure the index exists on the wrapped provider."""
+        self.provider.ensure_index(index_name, index_settings)
+
+    def healthcheck(self) -> bool:
+        """Check the wrapped provider's health."""
+        return self.provider.healthcheck()
+
+
+class IndexRebuild:
+    """Shadow indexes of one rebuild job, from creation to swap."""
+
+    def __init__(
+        self,
+        providers: List[SearchProvider],
+        job_id: Any,
+        registry: Optional[ShadowIndexRegistry] = None,
+    ):
+        """
+        Initialize the rebuild.
+
+        Args:
+            providers: Providers whose indexes are rebuilt
+            job_id: The rebuild job ID, part of the shadow index names
+            registry: Optional registry (defaults to the process-wide one)
+        """
+        self.providers = providers
+        self.job_id = job_id
+        self.registry = registry or get_shadow_index_registry()
+        self.started_at = datetime.now(timezone.utc)
+        # Live index name -> shadow index name
+        self.shadows: Dict[str, str] = {}
+        self._swapped: Set[Tuple[str, str]] = set()
+        # Reindex workers load pages concurrently
+        self._lock = threading.Lock()
+
+    def shadow_providers(self, documents: List[Dict[str, Any]]) -> List[SearchProvider]:
+        """
+        Get providers writing documents to the shadow indexes.
+
+        Shadows of indexes seen for the first time are created and start
+        receiving dual writes.
+
+        Args:
+            documents: Documents about to be loaded
+
+        Returns:
+            List of provider copies redirected to the shadow indexes
+        """
+        with self._lock:
+            for doc in documents:
+                entity_type = doc.get("type")
+                if not entity_type:
+                    continue
+                index_name = get_index_name(doc.get("source"), entity_type)
+                if index_name in self.shadows:
+                    continue
+                shadow_name = get_shadow_index_name(index_name, self.job_id)
+                # Recorded first, so abort drops the shadows created before
+                # a provider refused to prepare its own
+                self.shadows[index_name] = shadow_name
+                for provider in self.providers:
+                    provider.prepare_shadow_index(index_name, shadow_name, entity_type)
+                self.registry.register(index_name, shadow_name)
+                logger.info(f"Rebuilding index {index_name} into {shadow_name}")
+            shadows = dict(self.shadows)
+        return [provider.with_index_redirects(shadows) for provider in self.providers]
+
+    def stop_dual_writes(self) -> None:
+        """Switch dual writes to recorded deletes and wait until every writer noticed."""
+        for index_name in self.shadows:
+            self.registry.mark_swapping(index_name)
+        # Writers read the registry through a short cache
+        time.sleep(self.registry.state_cache_seconds)
+
+    def swap(self) -> None:
+        """Swap every shadow index over its live index and replay the deletes since."""
+        self.stop_dual_writes()
+        for index_name, shadow_name in self.shadows.items():
+            for provider in self.providers:
+                provider.swap_index(shadow_name, index_name)
+                self._swapped.add((provider.name, index_name))
+        for index_name in self.shadows:
+            self.registry.unregister(index_name)
+        # Writers still seeing the swapping state record their deletes
+        time.sleep(self.registry.state_cache_seconds)
+        for index_name in self.shadows:
+            self._replay_deletes(index_name)
+        logger.info(f"Swapped {len(self.shadows)} rebuilt indexes")
+
+    def _replay_deletes(self, index_name: str) -> None:
+        """
+        Apply the deletes recorded while an index was swapping to the
+        providers that swapped it.
+
+        Those deletes reached the live index that the shadow replaced;
+        deleting a document again is harmless.
+        """
+        document_ids = self.registry.pop_deletes(index_name)
+        if not document_ids:
+            return
+        for provider in self.providers:
+            if (provider.name, index_name) in self._swapped:
+                provider.delete_batch(index_name, document_ids)
+        logger.info(
+            f"Replayed {len(document_ids)} deletes on swapped index {index_name}"
+        )
+
+    def abort(self) -> None:
+        """
+        Stop dual writes, replay the recorded deletes on indexes already
+        swapped and drop the shadow indexes not swapped yet.
+        """
+        for index_name, shadow_name in self.shadows.items():
+            try:
+                self.registry.unregister(index_name)
+            except Exception as e:
+                logger.warning(f"Failed to unregister shadow {shadow_name}: {e}")
+        if self._swapped:
+            time.sleep(self.registry.state_cache_seconds)
+        for index_name, shadow_name in self.shadows.items():
+            try:
+                self._replay_deletes(index_name)
+            except Exception as e:
+                logger.warning(f"Failed to replay deletes on {index_name}: {e}")
+            for provider in self.providers:
+                if (provider.name, index_name) in self._swapped:
+                    continue
+                try:
+                    provider.drop_index(shadow_name)
+                except Exception as e:
+                    logger.warning(
+                        f"Failed to drop shadow {shadow_name} from {provider.name}: {e}"
+                    )
@@ -0,0 +1,156 @@
+"""
+Background confirmation of asynchronous provider indexing tasks.
+
+Providers that return as soon as a write is accepted hand the provider task
+IDs to the ProviderTaskTracker of their provider, one per provider name and
+process (see get_task_tracker). A daemon thread waits for each task to be
+published and records confirmation latency and outcome as Prometheus metrics,
+so workers never block on provider-side indexing. The thread exits once no
+task arrived for a while and is started again by the next task.
+"""
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional
+
+from app.utils.metrics import PROVIDER_TASK_CONFIRMATION_SECONDS, PROVIDER_TASKS_TOTAL
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PendingTask:
+    """A provider task accepted but not yet confirmed as published."""
+
+    index_name: str
+    task_id: int
+    operation: str
+    # Blocks until (index_name, task_id) is published
+    wait_for_task: Callable[[str, int], None]
+    submitted_at: float = field(default_factory=time.monotonic)
+
+
+class ProviderTaskTracker:
+    """Tracks accepted provider tasks until the provider confirms them."""
+
+    def __init__(
+        self,
+        provider_name: str,
+        max_pending: int = 10000,
+        idle_seconds: float = 30.0,
+    ):
+        """
+        Initialize the tracker.
+
+        Args:
+            provider_name: Provider name used as metric label
+            max_pending: Maximum queued tasks; further tasks are not tracked
+            idle_seconds: Time without tasks after which the thread exits
+        """
+        self.provider_name = provider_name
+        self.idle_seconds = idle_seconds
+        self._pending: "queue.Queue[PendingTask]" = queue.Queue(maxsize=max_pending)
+        self._worker: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def track(
+        self,
+        index_name: str,
+        task_id: int,
+        operation: str,
+        wait_for_task: Callable[[str, int], None],
+    ) -> None:
+        """
+        Queue a task for asynchronous confirmation.
+
+        Never blocks; if the queue is full the task is counted as untracked.
+
+        Args:
+            index_name: Index the task belongs to
+            task_id: Provider task ID
+            operation: Operation name (e.g. "upsert_batch")
+            wait_for_task: Callable blocking until (index_name, task_id) is published
+        """
+        try:
+            self._pending.put_nowait(
+                PendingTask(index_name, task_id, operation, wait_for_task)
+            )
+        except queue.Full:
+            PROVIDER_TASKS_TOTAL.labels(
+                provider=self.provider_name, operation=operation, status="untracked"
+            ).inc()
+            return
+        # Queued first, so a thread exiting as idle either sees the task or
+        # has cleared itself for a new one to start
+        self._ensure_worker()
+
+    @property
+    def pending_count(self) -> int:
+        """Number of tasks waiting for confirmation."""
+        return self._pending.qsize()
+
+    def _ensure_worker(self) -> None:
+        """Start the confirmation thread on first use (after any fork)."""
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run,
+                    name=f"{self.provider_name}-task-tracker",
+                    daemon=True,
+                )
+                self._worker.start()
+
+    def _run(self) -> None:
+        """Confirmation loop, returning once idle for idle_seconds."""
+        while True:
+            try:
+                task = self._pending.get(timeout=self.idle_seconds)
+            except queue.Empty:
+                with self._lock:
+                    if self._pending.empty():
+                        self._worker = None
+                        return
+                continue
+            try:
+                task.wait_for_task(task.index_name, task.task_id)
+                status = "published"
+                PROVIDER_TASK_CONFIRMATION_SECONDS.labels(
+                    provider=self.provider_name, operation=task.operation
+                ).observe(time.monotonic() - task.submitted_at)
+            except Exception as e:
+                status = "error"
+                logger.warning(
+                    f"Failed to confirm {self.provider_name} task {task.task_id} "
+                    f"on index {task.index_name}: {e}"
+                )
+            finally:
+                self._pending.task_done()
+            PROVIDER_TASKS_TOTAL.labels(
+                provider=self.provider_name, operation=task.operation, status=status
+            ).inc()
+
+
+_trackers: Dict[str, ProviderTaskTracker] = {}
+_trackers_lock = threading.Lock()
+
+
+def get_task_tracker(provider_name: str) -> ProviderTaskTracker:
+    """
+    Get the task tracker of a provider, shared by every instance in the process.
+
+    Args:
+        provider_name: Provider name
+
+    Returns:
+        The ProviderTaskTracker of the provider
+    """
+    with _trackers_lock:
+        tracker = _trackers.get(provider_name)
+        if tracker is None:
+            tracker = _trackers[provider_name] = ProviderTaskTracker(provider_name)
+        return tracker
@@ -1,18 +1,86 @@
 """
-Typesense search provider implementation (optional, for future use).
+Typesense search provider implementation.
+
+Talks to the Typesense REST API over a pooled HTTP session. Upserts go through
+the JSONL documents/import endpoint (partial updates with action=update),
+deletes are batched with id filters and collections are created on first use
+with an auto-detecting schema.
 """
 
+import json
 import logging
-from typing import Dict, Any, List
-from app.providers.base import SearchProvider
+from typing import Any, Dict, List, Optional, Set
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 from app.config import Settings
+from app.constants.write_consistency import WriteConsistency
+from app.providers.base import SearchProvider
+from app.providers.batching import (
+    ChunkResult,
+    chunk_documents,
+    raise_for_failed_chunks,
+    send_chunks,
+)
+from app.providers.index_catalog import IndexSettings
+from app.utils.compression import compress_request_body
 
 logger = logging.getLogger(__name__)
 
+# Maximum IDs per delete-by-filter request, keeps the query string bounded
+DELETE_FILTER_BATCH_SIZE = 250
+
+
+class TypesenseError(Exception):
+    """Raised when Typesense rejects a request or some imported documents."""
+
+
+def collection_schema(
+    name: str, index_settings: Optional[IndexSettings] = None
+) -> Dict[str, Any]:
+    """
+    Get the schema used to create a collection.
+
+    Indexa core fields are declared explicitly. Facet attributes of the index
+    settings are declared as optional faceted fields. Every other field of the
+    domain documents is typed automatically from the first value seen.
+
+    Args:
+        name: Collection name
+        index_settings: Settings of the index (defaults to IndexSettings())
+
+    Returns:
+        Collection schema payload
+    """
+    index_settings = index_settings or IndexSettings()
+    fields: List[Dict[str, Any]] = [
+        {"name": "type", "type": "string", "facet": True},
+        {"name": "source", "type": "string", "facet": True},
+        {"name": "updated_at", "type": "string", "optional": True},
+    ]
+    declared = {f["name"] for f in fields}
+    fields.extend(
+        {"name": attribute, "type": "auto", "facet": True, "optional": True}
+        for attribute in index_settings.attributes_for_faceting
+        if attribute not in declared
+    )
+    fields.append({"name": ".*", "type": "auto"})
+    return {"name": name, "enable_nested_fields": True, "fields": fields}
+
+
+def _id_filter(document_ids: List[str]) -> str:
+    """Build a filter_by expression matching exact document IDs."""
+    return "id:[" + ",".join(f"`{document_id}`" for document_id in document_ids) + "]"
+
 
 class TypesenseProvider(SearchProvider):
     """Typesense search provider implementation."""
 
+    # Typesense writes are visible once the request returns
+    default_consistency = WriteConsistency.VISIBLE
+
     def __init__(self, settings: Settings):
         """
         Initialize Typesense provider.
@@ -26,46 +94,473 @@ class TypesenseProvider(SearchProvider):
         self.host = settings.typesense_host
         self.api_key = settings.typesense_api_key
         self.port = settings.typesense_port
+        self.base_url = f"{settings.typesense_protocol}://{self.host}:{self.port}"
+        self.timeout = settings.typesense_timeout_seconds
+        self.batch_max_records = settings.provider_batch_max_records
+        self.batch_max_bytes = settings.provider_batch_max_bytes
+        self.write_concurrency = settings.provider_write_concurrency
+        self.settings = settings
+        self.compress_requests = settings.typesense_compress_requests
+        self.alias_migration_enabled = settings.typesense_alias_migration_enabled
+        if settings.partial_updates_enabled:
+            self.partial_update_max_ratio = settings.partial_update_max_ratio
+            self.partial_update_max_age_seconds = (
+                settings.partial_update_max_age_seconds
+            )
 
-        # TODO: Import and initialize Typesense client when needed
-        # from typesense import Client
-        # self.client = Client({
-        #     'nodes': [{
-        #         'host': self.host,
-        #         'port': self.port,
-        #         'protocol': 'https'
-        #     }],
-        #     'api_key': self.api_key,
-        #     'connection_timeout_seconds': 2
-        # })
-
-        logger.warning("TypesenseProvider is not yet fully implemented")
+        self.session = requests.Session()
+        self.session.headers.update({"X-TYPESENSE-API-KEY": self.api_key})
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=max(self.write_concurrency, 1) * 2,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.2,
+                status_forcelist=(502, 503, 504),
+                allowed_methods=None,
+            ),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
     @property
     def name(self) -> str:
         """Return the provider name."""
         return "typesense"
 
-    def upsert(self, document: Dict[str, Any]) -> None:
-        """Upsert a single document to Typesense."""
-        raise NotImplementedError("TypesenseProvider is not yet implemented")
+    def _request(self, method: str, path: str, **kwargs: Any) -> requests.Response:
+        """Send a request to Typesense and return the response."""
+        return self.session.request(
+            method, f"{self.base_url}{path}", timeout=self.timeout, **kwargs
+        )
+
+    def _raise_for_status(self, response: requests.Response, action: str) -> None:
+        """Raise TypesenseError for a non-2xx response."""
+        if not response.ok:
+            raise TypesenseError(
+                f"Typesense {action} failed ({response.status_code}): {response.text}"
+            )
+
+    def _import(
+        self, index_name: str, documents: List[Dict[str, Any]], action: str = "upsert"
+    ) -> List[str]:
+        """
+        Write documents through the JSONL import endpoint.
+
+        Args:
+            index_name: Collection to import into
+            documents: Documents to upsert, or partial documents to update
+            action: Import action, "upsert" or "update"
+
+        Returns:
+            List[str]: IDs of documents an update found missing (never
+            created by an update)
+
+        Raises:
+            TypesenseError: If the request or any document failed
+        """
+        self._ensure_index_once(
+            index_name, documents[0].get("type") if documents else None
+        )
+        body = "\n".join(json.dumps(doc, default=str) for doc in documents).encode(
+            "utf-8"
+        )
+        headers = {"Content-Type": "text/plain"}
+        if self.compress_requests:
+            body, encoding_headers = compress_request_body(body, self.settings)
+            headers.update(encoding_headers)
+        response = self._request(
+            "POST",
+            f"/collections/{index_name}/documents/import",
+            params={"action": action},
+            data=body,
+            headers=headers,
+        )
+        self._raise_for_status(response, f"import into {index_name}")
+
+        # Typesense answers 200 with one JSON result per line
+        errors, missing = [], []
+        for document, line in zip(documents, response.text.splitlines()):
+            result = json.loads(line)
+            if result.get("success"):
+                continue
+            if action == "update" and result.get("code") == 404:
+                missing.append(self._get_object_id(document))
+            else:
+                errors.append(f"{document.get('id')}: {result.get('error')}")
+        if errors:
+            raise TypesenseError(
+                f"{len(errors)} of {len(documents)} documents failed to import "
+                f"into {index_name}: {'; '.join(errors[:5])}"
+            )
+        return missing
+
+    def _update(
+        self,
+        index_name: str,
+        partials: List[Dict[str, Any]],
+        documents_by_id: Dict[str, Dict[str, Any]],
+    ) -> None:
+        """
+        Send partial updates, writing missing documents in full.
+
+        Args:
+            index_name: Collection to update
+            partials: Partial documents
+            documents_by_id: Full documents by ID, for documents found missing
+        """
+        missing = self._import(index_name, partials, action="update")
+        if missing:
+            logger.info(
+                f"{len(missing)} documents missing from Typesense collection {index_name}, writing them in full"
+            )
+            self._import(
+                index_name, [documents_by_id[object_id] for object_id in missing]
+            )
+
+    def upsert(
+        self,
+        document: Dict[str, Any],
+        force: bool = False,
+        consistency: Optional[WriteConsistency] = None,
+    ) -> None:
+        """
+        Upsert a single document to Typesense.
+
+        Args:
+            document: The document to upsert
+            force: Write even if the content is unchanged since the last write
+            consistency: Ignored, Typesense writes are visible on return
+        """
+        entity_type = document.get("type")
+        source = document.get("source")
+        if not entity_type:
+            raise ValueError("Document must have a 'type' field")
+
+        if not source:
+            raise ValueError("Document must have a 'source' field")
+
+        index_name = self._get_index_name(source, entity_type)
+        changed, hashes = self._skip_unchanged(index_name, [document], force)
+        if not changed:
+            logger.debug(
+                f"Document {document.get('id')} unchanged in Typesense collection {index_name}, skipping"
+            )
+            return
+
+        _, partials, field_hashes = self._plan_partial_updates(
+            index_name, changed, force
+        )
+        try:
+            if partials:
+                self._update(
+                    index_name, partials, {self._get_object_id(document): document}
+                )
+            else:
+                self._import(index_name, changed)
+            self._record_written(index_name, hashes)
+            self._record_fields(index_name, field_hashes, list(hashes))
+            logger.debug(
+                f"Upserted document {document.get('id')} to Typesense collection {index_name}"
+            )
+        except (TypesenseError, requests.RequestException) as e:
+            logger.error(f"Failed to upsert document to Typesense: {e}")
+            raise
+
+    def upsert_batch(
+        self,
+        documents: List[Dict[str, Any]],
+        force: bool = False,
+        consistency: Optional[WriteConsistency] = None,
+    ) -> List[ChunkResult]:
+        """
+        Upsert multiple documents to Typesense in batch.
+
+        Args:
+            documents: List of documents to upsert
+            force: Write even if the content is unchanged since the last write
+            consistency: Ignored, Typesense writes are visible on return
+
+        Returns:
+            List[ChunkResult]: Outcome of each chunk sent
+
+        Raises:
+            BatchWriteError: If one or more chunks failed
+        """
+        if not documents:
+            return []
 
-    def upsert_batch(self, documents: List[Dict[str, Any]]) -> None:
-        """Upsert multiple documents to Typesense in batch."""
-        raise NotImplementedError("TypesenseProvider is not yet implemented")
+        documents_by_index: Dict[str, List[Dict[str, Any]]] = {}
+        for doc in documents:
+            if not doc.get("type") or not doc.get("source"):
+                logger.warning(
+                    f"Document missing 'type' or 'source' field, skipping: {doc.get('id')}"
+                )
+                continue
+            index_name = self._get_index_name(doc["source"], doc["type"])
+            documents_by_index.setdefault(index_name, []).append(doc)
 
-    def delete(self, document_id: str) -> None:
-        """Delete a document from Typesense."""
-        raise NotImplementedError("TypesenseProvider is not yet implemented")
+        chunks = []
+        hashes_by_index: Dict[str, Dict[str, str]] = {}
+        field_hashes_by_index: Dict[str, Dict[str, Dict[str, str]]] = {}
+        partial_ids_by_index: Dict[str, Set[str]] = {}
+        documents_by_id: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for index_name, docs in documents_by_index.items():
+            changed, hashes = self._skip_unchanged(index_name, docs, force)
+            if not changed:
+                continue
+            hashes_by_index[index_name] = hashes
+            full, partials, field_hashes = self._plan_partial_updates(
+                index_name, changed, force
+            )
+            field_hashes_by_index[index_name] = field_hashes
+            partial_ids_by_index[index_name] = set(map(self._get_object_id, partials))
+            documents_by_id[index_name] = {
+                self._get_object_id(doc): doc for doc in changed
+            }
+            # Full and partial documents are chunked apart, chunks never mix them
+            for group in (full, partials):
+                for chunk in chunk_documents(
+                    group, self.batch_max_records, self.batch_max_bytes
+                ):
+                    chunks.append((index_name, chunk))
 
-    def delete_batch(self, document_ids: List[str]) -> None:
-        """Delete multiple documents from Typesense in batch."""
-        raise NotImplementedError("TypesenseProvider is not yet implemented")
+        def send(index_name: str, chunk: List[Dict[str, Any]]) -> None:
+            object_ids = [self._get_object_id(doc) for doc in chunk]
+            if object_ids[0] in partial_ids_by_index[index_name]:
+                self._update(index_name, chunk, documents_by_id[index_name])
+            else:
+                self._import(index_name, chunk)
+            hashes = hashes_by_index[index_name]
+            self._record_written(
+                index_name,
+                {
+                    object_id: hashes[object_id]
+                    for object_id in object_ids
+                    if object_id in hashes
+                },
+            )
+            self._record_fields(
+                index_name, field_hashes_by_index[index_name], object_ids
+            )
+            logger.debug(
+                f"Upserted {len(chunk)} documents to Typesense collection {index_name}"
+            )
 
-    def ensure_index(self, index_name: str) -> None:
-        """Ensure the index exists in Typesense."""
-        raise NotImplementedError("TypesenseProvider is not yet implemented")
+        results = send_chunks(chunks, send, self._get_object_id, self.write_concurrency)
+        return raise_for_failed_chunks(results)
+
+    def delete(
+        self,
+        index_name: str,
+        document_id: str,
+        consistency: Optional[WriteConsistency] = None,
+    ) -> None:
+        """
+        Delete a document from Typesense.
+
+        Args:
+            index_name: The collection to delete from
+            document_id: The ID of the document to delete
+            consistency: Ignored, Typesense writes are visible on return
+        """
+        try:
+            response = self._request(
+                "DELETE", f"/collections/{index_name}/documents/{document_id}"
+            )
+            # A missing document is already deleted
+            if response.status_code != 404:
+                self._raise_for_status(response, f"delete from {index_name}")
+            self._forget_written(index_name, [document_id])
+            logger.debug(
+                f"Deleted document {document_id} from Typesense collection {index_name}"
+            )
+        except (TypesenseError, requests.RequestException) as e:
+            logger.error(f"Failed to delete document from Typesense: {e}")
+            raise
+
+    def delete_batch(
+        self,
+        index_name: str,
+        document_ids: List[str],
+        consistency: Optional[WriteConsistency] = None,
+    ) -> None:
+        """
+        Delete multiple documents from Typesense by ID filter.
+
+        Args:
+            index_name: The collection to delete from
+            document_ids: List of document IDs to delete
+            consistency: Ignored, Typesense writes are visible on return
+        """
+        for start in range(0, len(document_ids), DELETE_FILTER_BATCH_SIZE):
+            ids = document_ids[start : start + DELETE_FILTER_BATCH_SIZE]
+            try:
+                response = self._request(
+                    "DELETE",
+                    f"/collections/{index_name}/documents",
+                    params={"filter_by": _id_filter(ids)},
+                )
+                if response.status_code != 404:
+                    self._raise_for_status(response, f"batch delete from {index_name}")
+                self._forget_written(index_name, ids)
+                logger.debug(
+                    f"Deleted {len(ids)} documents from Typesense collection {index_name}"
+                )
+            except (TypesenseError, requests.RequestException) as e:
+                logger.error(
+                    f"Failed to batch delete documents from Typesense collection {index_name}: {e}"
+                )
+                raise
+
+    def ensure_index(
+        self, index_name: str, index_settings: Optional[IndexSettings] = None
+    ) -> None:
+        """
+        Ensure the collection exists in Typesense, creating it if necessary.
+
+        Facets are part of the schema and applied when the collection is
+        created. Searchable attributes and ranking are Typesense search
+        parameters, so there is nothing to push for them.
+
+        Args:
+            index_name: The name of the collection
+            index_settings: Settings of the index (defaults to IndexSettings())
+        """
+        response = self._request("GET", f"/collections/{index_name}")
+        if response.status_code == 404:
+            response = self._request(
+                "POST",
+                "/collections",
+                json=collection_schema(index_name, index_settings),
+            )
+            # 409: created concurrently by another worker
+            if response.status_code != 409:
+                self._raise_for_status(response, f"create collection {index_name}")
+            logger.info(f"Created Typesense collection {index_name}")
+        else:
+            self._raise_for_status(response, f"get collection {index_name}")
+
+    def drop_index(self, index_name: str) -> None:
+        """
+        Drop a collection and forget its stored hashes.
+
+        Args:
+            index_name: The name of the collection
+        """
+        response = self._request("DELETE", f"/collections/{index_name}")
+        if response.status_code != 404:
+            self._raise_for_status(response, f"drop collection {index_name}")
+        if self.index_catalog is not None:
+            self.index_catalog.forget(index_name)
+        if self.hash_store is not None:
+            self.hash_store.clear_index(self.name, index_name)
+
+    def _get_alias_target(self, index_name: str) -> Optional[str]:
+        """Get the collection a name is an alias of, None if it is no alias."""
+        response = self._request("GET", f"/aliases/{index_name}")
+        if response.status_code == 404:
+            return None
+        self._raise_for_status(response, f"get alias {index_name}")
+        return response.json().get("collection_name")
+
+    def _is_collection(self, index_name: str) -> bool:
+        """Whether a name is a real collection (checked after aliases)."""
+        response = self._request("GET", f"/collections/{index_name}")
+        if response.status_code == 404:
+            return False
+        self._raise_for_status(response, f"get collection {index_name}")
+        return True
+
+    def _require_alias(self, index_name: str) -> None:
+        """
+        Raise if the live name is a real collection that a swap cannot alias.
+
+        An alias cannot share its name with a collection, so replacing one
+        means dropping it first, which leaves queries without the index
+        until the alias exists. That needs an explicit one-time migration.
+
+        Raises:
+            TypesenseError: If the name is a collection and
+                TYPESENSE_ALIAS_MIGRATION_ENABLED is not set
+        """
+        if self.alias_migration_enabled:
+            return
+        if self._get_alias_target(index_name) is None and self._is_collection(
+            index_name
+        ):
+            raise self._not_alias_error(index_name)
+
+    @staticmethod
+    def _not_alias_error(index_name: str) -> TypesenseError:
+        """Error of a swap that would have to drop a live collection."""
+        return TypesenseError(
+            f"Typesense collection {index_name} is not an alias yet; swapping "
+            "it would drop the live collection. Rebuild it once with "
+            "TYPESENSE_ALIAS_MIGRATION_ENABLED set, during a maintenance window"
+        )
+
+    def prepare_shadow_index(
+        self, index_name: str, shadow_name: str, entity_type: Optional[str] = None
+    ) -> None:
+        """
+        Create an empty shadow collection, once the live name is known to be
+        swappable, so a rebuild fails before loading anything.
+
+        Args:
+            index_name: The live index
+            shadow_name: The shadow index to create
+            entity_type: The entity type stored in the index
+        """
+        self._require_alias(index_name)
+        super().prepare_shadow_index(index_name, shadow_name, entity_type)
+
+    def swap_index(self, shadow_name: str, index_name: str) -> None:
+        """
+        Point the live name at a shadow collection through an alias.
+
+        Repointing an alias is atomic. The collection the alias pointed to
+        before is dropped. A live name that is still a real collection is
+        only replaced as a one-time migration (TYPESENSE_ALIAS_MIGRATION_ENABLED):
+        the collection is dropped before the alias is created, so queries
+        fail until then.
+
+        Args:
+            shadow_name: The fully loaded shadow collection
+            index_name: The live name to replace
+
+        Raises:
+            TypesenseError: If the live name is a collection and the
+                migration is not enabled
+        """
+        previous = self._get_alias_target(index_name)
+        if previous is None and self._is_collection(index_name):
+            if not self.alias_migration_enabled:
+                raise self._not_alias_error(index_name)
+            logger.warning(
+                f"Dropping Typesense collection {index_name} to replace it with an alias"
+            )
+            self.drop_index(index_name)
+
+        response = self._request(
+            "PUT", f"/aliases/{index_name}", json={"collection_name": shadow_name}
+        )
+        self._raise_for_status(response, f"alias {index_name} to {shadow_name}")
+        if previous and previous != shadow_name:
+            self.drop_index(previous)
+        self._forget_swapped(index_name, shadow_name)
+        logger.info(f"Aliased Typesense collection {index_name} to {shadow_name}")
 
     def healthcheck(self) -> bool:
-        """Check if Typesense is healthy and reachable."""
-        return False
+        """
+        Check if Typesense is healthy and reachable.
+
+        Returns:
+            bool: True if healthy, False otherwise
+        """
+        try:
+            response = self._request("GET", "/health")
+            return response.ok and response.json().get("ok", False)
+        except Exception as e:
+            logger.error(f"Typesense healthcheck failed: {e}")
+            return False
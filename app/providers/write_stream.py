@@ -0,0 +1,282 @@
+"""
+Durable log of provider write operations backed by a Redis stream.
+
+Operations are appended with XADD and consumed through a consumer group, so
+an operation stays pending until a consumer acknowledges it. Operations held
+by a consumer that crashed are reclaimed with XAUTOCLAIM once they have been
+idle long enough.
+
+Entries of a failed flush stay pending too, and newer operations on the same
+objects may be flushed before they are reclaimed. Objects of a failed flush
+are therefore guarded: a hash next to the stream keeps the ID of the last
+entry flushed for them, and reclaimed entries at or below it were superseded
+and are dropped instead of replayed.
+"""
+
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from redis import Redis, ResponseError
+
+from app.utils.cache import get_connection_pool
+
+logger = logging.getLogger(__name__)
+
+UPSERT = "upsert"
+DELETE = "delete"
+
+# Guards of objects with a failed flush expire once no flush failed for a day
+GUARD_TTL_SECONDS = 86400
+
+# Raises the guards that exist to the flushed entry IDs (ARGV: field, ID, ...)
+_ADVANCE_GUARDS_SCRIPT = """
+local function newer(a, b)
+  local am, as = string.match(a, '(%d+)-(%d+)')
+  local bm, bs = string.match(b, '(%d+)-(%d+)')
+  am, as, bm, bs = tonumber(am), tonumber(as), tonumber(bm), tonumber(bs)
+  return am > bm or (am == bm and as > bs)
+end
+for i = 1, #ARGV, 2 do
+  local current = redis.call('HGET', KEYS[1], ARGV[i])
+  if current and newer(ARGV[i + 1], current) then
+    redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+  end
+end
+return 0
+"""
+
+
+def entry_id_key(entry_id: str) -> Tuple[int, int]:
+    """
+    Get a sortable key of a stream entry ID.
+
+    Args:
+        entry_id: Stream entry ID ("<milliseconds>-<sequence>")
+
+    Returns:
+        (milliseconds, sequence)
+    """
+    milliseconds, _, sequence = str(entry_id).partition("-")
+    return int(milliseconds), int(sequence or 0)
+
+
+@dataclass
+class WriteOperation:
+    """A single upsert or delete destined for a provider index."""
+
+    action: str
+    index_name: str
+    object_id: str
+    document: Optional[Dict[str, Any]] = None
+    force: bool = False
+    # Validators (url, etag, last_modified) of the fetched entity, saved once
+    # every provider accepted the upsert
+    validators: Optional[Dict[str, Optional[str]]] = None
+
+    def encode(self) -> Dict[str, str]:
+        """Encode the operation as stream entry fields."""
+        return {
+            "op": json.dumps(
+                {
+                    "action": self.action,
+                    "index_name": self.index_name,
+                    "object_id": self.object_id,
+                    "document": self.document,
+                    "force": self.force,
+                    "validators": self.validators,
+                },
+                default=str,
+            )
+        }
+
+    @classmethod
+    def decode(cls, fields: Dict[str, str]) -> "WriteOperation":
+        """Decode an operation from stream entry fields."""
+        return cls(**json.loads(fields["op"]))
+
+    @property
+    def object_key(self) -> str:
+        """Key of the object the operation writes, unique within a stream."""
+        return f"{self.index_name}:{self.object_id}"
+
+    @property
+    def size_bytes(self) -> int:
+        """Approximate serialized size of the operation payload."""
+        if self.document is None:
+            return len(self.object_id)
+        return len(json.dumps(self.document, default=str))
+
+
+class RedisWriteStream:
+    """Consumer-group access to a Redis stream of WriteOperations."""
+
+    def __init__(
+        self,
+        stream_key: str,
+        group: str,
+        consumer: str,
+        claim_idle_ms: int = 60000,
+        redis_client: Optional[Redis] = None,
+    ):
+        """
+        Initialize the write stream.
+
+        Args:
+            stream_key: Redis stream key
+            group: Consumer group name
+            consumer: Consumer name, unique per process
+            claim_idle_ms: Idle time after which pending entries are reclaimed
+            redis_client: Optional Redis client (defaults to the shared pool)
+        """
+        self.stream_key = stream_key
+        self.group = group
+        self.consumer = consumer
+        self.claim_idle_ms = claim_idle_ms
+        self.redis_client = redis_client or Redis(connection_pool=get_connection_pool())
+        self.guard_key = f"{stream_key}:flushed"
+        self._group_ready = False
+
+    def append(self, operations: List[WriteOperation]) -> List[str]:
+        """
+        Append operations to the stream in one pipelined round trip.
+
+        Args:
+            operations: Operations to append
+
+        Returns:
+            Stream entry IDs
+        """
+        if not operations:
+            return []
+        pipeline = self.redis_client.pipeline(transaction=False)
+        for operation in operations:
+            pipeline.xadd(self.stream_key, operation.encode())
+        return pipeline.execute()
+
+    def ensure_group(self) -> None:
+        """Create the consumer group (and the stream) if missing."""
+        if self._group_ready:
+            return
+        try:
+            self.redis_client.xgroup_create(
+                self.stream_key, self.group, id="0", mkstream=True
+            )
+        except ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._group_ready = True
+
+    def read(self, count: int, block_ms: int) -> List[Tuple[str, WriteOperation]]:
+        """
+        Read operations for this consumer.
+
+        Stale entries left pending by other consumers are reclaimed first,
+        dropping those superseded by a later flush, then new entries are
+        read, blocking up to block_ms.
+
+        Args:
+            count: Maximum entries to return
+            block_ms: Maximum time to block waiting for new entries (0 to not block)
+
+        Returns:
+            List of (entry ID, operation)
+        """
+        self.ensure_group()
+
+        _, claimed, *_ = self.redis_client.xautoclaim(
+            self.stream_key,
+            self.group,
+            self.consumer,
+            min_idle_time=self.claim_idle_ms,
+            start_id="0-0",
+            count=count,
+        )
+        entries = self._drop_superseded([entry for entry in claimed if entry[1]])
+        if not entries:
+            response = self.redis_client.xreadgroup(
+                self.group,
+                self.consumer,
+                {self.stream_key: ">"},
+                count=count,
+                block=block_ms or None,
+            )
+            entries = [
+                entry for _, stream_entries in response for entry in stream_entries
+            ]
+
+        operations = []
+        for entry_id, fields in entries:
+            try:
+                operations.append((entry_id, WriteOperation.decode(fields)))
+            except (KeyError, TypeError, ValueError) as e:
+                logger.error(f"Dropping malformed write operation {entry_id}: {e}")
+                self.ack([entry_id])
+        return operations
+
+    def ack(
+        self, entry_ids: List[str], flushed: Optional[Dict[str, str]] = None
+    ) -> None:
+        """
+        Acknowledge and remove processed entries.
+
+        Args:
+            entry_ids: Stream entry IDs to acknowledge
+            flushed: Object key to the last entry ID flushed for it, raising
+                the guards of objects that had a failed flush
+        """
+        if not entry_ids:
+            return
+        pipeline = self.redis_client.pipeline(transaction=False)
+        pipeline.xack(self.stream_key, self.group, *entry_ids)
+        pipeline.xdel(self.stream_key, *entry_ids)
+        if flushed:
+            arguments = [value for item in flushed.items() for value in item]
+            pipeline.eval(_ADVANCE_GUARDS_SCRIPT, 1, self.guard_key, *arguments)
+        pipeline.execute()
+
+    def guard(self, object_keys: Iterable[str]) -> None:
+        """
+        Guard objects of a failed flush against replays of superseded entries.
+
+        Args:
+            object_keys: Keys of the objects whose flush failed
+        """
+        object_keys = list(object_keys)
+        if not object_keys:
+            return
+        pipeline = self.redis_client.pipeline(transaction=False)
+        for object_key in object_keys:
+            pipeline.hsetnx(self.guard_key, object_key, "0-0")
+        pipeline.expire(self.guard_key, GUARD_TTL_SECONDS)
+        pipeline.execute()
+
+    def _drop_superseded(self, entries: List[Tuple[str, Dict[str, str]]]) -> List:
+        """Acknowledge and leave out reclaimed entries a later flush superseded."""
+        if not entries:
+            return entries
+        keys = []
+        for _, fields in entries:
+            try:
+                keys.append(WriteOperation.decode(fields).object_key)
+            except (KeyError, TypeError, ValueError):
+                keys.append("")
+        flushed = self.redis_client.hmget(self.guard_key, keys)
+        kept, superseded = [], []
+        for entry, last_flushed in zip(entries, flushed):
+            if last_flushed and entry_id_key(entry[0]) <= entry_id_key(last_flushed):
+                superseded.append(entry[0])
+            else:
+                kept.append(entry)
+        if superseded:
+            logger.info(
+                f"Dropping {len(superseded)} superseded write operations "
+                f"from {self.stream_key}"
+            )
+            self.ack(superseded)
+        return kept
+
+    def length(self) -> int:
+        """Number of entries currently in the stream."""
+        return self.redis_client.xlen(self.stream_key)
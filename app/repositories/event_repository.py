@@ -3,6 +3,7 @@ from uuid import UUID
 from sqlalchemy.orm import Query, Session, joinedload
 from app.models.event import Event
 from app.schemas.event import EventCreate, EventUpdate
+from app.repositories.index_outbox_repository import IndexOutboxRepository
 from app.repositories.soft_delete_repository import SoftDeleteRepository
 from app.utils.db.filtering import apply_filters
 
@@ -69,18 +70,22 @@ class EventRepository(SoftDeleteRepository[Event]):
             .order_by(Event.created_at.desc())
         )
 
-    def create_event(self, event: EventCreate) -> Event:
+    def create_event(self, event: EventCreate, enqueue_index: bool = False) -> Event:
         """
         Create a new event.
 
         Args:
             event: The event data to create
+            enqueue_index: Also add an index outbox row in the same transaction
 
         Returns:
             Event: The created event
         """
         db_event = Event(**event.model_dump())
         self.db.add(db_event)
+        if enqueue_index:
+            self.db.flush()
+            IndexOutboxRepository(self.db).add_for_event(db_event)
         self.db.commit()
         self.db.refresh(db_event)
         # Eager load user relationship after refresh
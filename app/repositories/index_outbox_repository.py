@@ -0,0 +1,206 @@
+"""
+Repository for the index outbox (database-only).
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+
+from sqlalchemy import func, or_, tuple_
+from sqlalchemy.orm import Session, aliased
+
+from app.constants.outbox_action import OutboxAction
+from app.models.event import Event
+from app.models.index_outbox import IndexOutbox
+from app.utils.event_router import is_deletion_event
+from app.utils.document_builder import (
+    extract_entity_id_from_subject,
+    extract_entity_type_from_subject,
+)
+
+
+class IndexOutboxRepository:
+    """Repository for adding, claiming and settling index outbox rows."""
+
+    def __init__(self, db: Session):
+        """
+        Initialize the index outbox repository.
+
+        Args:
+            db: Database session
+        """
+        self.db = db
+
+    def add_for_event(
+        self, event: Event, action: Optional[OutboxAction] = None
+    ) -> Optional[IndexOutbox]:
+        """
+        Add an outbox row for an event without committing.
+
+        The caller commits it together with the event.
+
+        Args:
+            event: The event (must be flushed so it has an ID)
+            action: Index action to perform (defaults to DELETE for deletion
+                events, UPSERT otherwise)
+
+        Returns:
+            Optional[IndexOutbox]: The row, or None if the subject names no entity
+        """
+        entity_type = extract_entity_type_from_subject(event.subject)
+        entity_id = extract_entity_id_from_subject(event.subject)
+        if not entity_type or not entity_id:
+            return None
+
+        if action is None:
+            action = (
+                OutboxAction.DELETE
+                if is_deletion_event(event.event_type)
+                else OutboxAction.UPSERT
+            )
+        row = IndexOutbox(
+            event_id=event.id,
+            event_type=event.event_type,
+            action=action,
+            source=event.source,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            attempts=0,
+        )
+        self.db.add(row)
+        return row
+
+    def claim_batch(self, limit: int, max_attempts: int) -> List[IndexOutbox]:
+        """
+        Lock the oldest pending rows for this transaction.
+
+        Only the oldest pending row of each entity is claimed, together with
+        the entity's later rows, so an entity's rows are drained by one
+        drainer at a time and in order. Rows waiting for their retry backoff
+        hold back their entity's later rows. Rows locked by other drainers
+        are skipped, so drainers never block each other. The locks are
+        released on commit or rollback.
+
+        Args:
+            limit: Maximum entities to claim
+            max_attempts: Rows that already failed this many times are left alone
+
+        Returns:
+            List[IndexOutbox]: Claimed rows, oldest first
+        """
+        older = aliased(IndexOutbox)
+        has_older = (
+            self.db.query(older.id)
+            .filter(
+                older.source == IndexOutbox.source,
+                older.entity_type == IndexOutbox.entity_type,
+                older.entity_id == IndexOutbox.entity_id,
+                older.id < IndexOutbox.id,
+                older.attempts < max_attempts,
+            )
+            .exists()
+        )
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        heads = (
+            self.db.query(IndexOutbox)
+            .filter(
+                IndexOutbox.attempts < max_attempts,
+                or_(
+                    IndexOutbox.next_attempt_at.is_(None),
+                    IndexOutbox.next_attempt_at <= now,
+                ),
+                ~has_older,
+            )
+            .order_by(IndexOutbox.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        if not heads:
+            return heads
+
+        # Later rows of a claimed entity wait behind its head, so no other
+        # drainer claims them
+        later = (
+            self.db.query(IndexOutbox)
+            .filter(
+                tuple_(
+                    IndexOutbox.source, IndexOutbox.entity_type, IndexOutbox.entity_id
+                ).in_([(row.source, row.entity_type, row.entity_id) for row in heads]),
+                IndexOutbox.id.notin_([row.id for row in heads]),
+                IndexOutbox.attempts < max_attempts,
+            )
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        return sorted(heads + later, key=lambda row: row.id)
+
+    def lock_rows(self, row_ids: List[int]) -> List[IndexOutbox]:
+        """
+        Lock specific rows for this transaction, skipping rows locked elsewhere.
+
+        Args:
+            row_ids: IDs of the rows to lock
+
+        Returns:
+            List[IndexOutbox]: Locked rows
+        """
+        return (
+            self.db.query(IndexOutbox)
+            .filter(IndexOutbox.id.in_(row_ids))
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+
+    def delete_rows(self, rows: List[IndexOutbox]) -> None:
+        """
+        Delete settled rows without committing.
+
+        Args:
+            rows: Rows to delete
+        """
+        if rows:
+            self.db.query(IndexOutbox).filter(
+                IndexOutbox.id.in_([row.id for row in rows])
+            ).delete(synchronize_session=False)
+
+    def record_failure(
+        self,
+        rows: List[IndexOutbox],
+        error: str,
+        retry_base_seconds: float = 1.0,
+        retry_max_seconds: float = 300.0,
+    ) -> None:
+        """
+        Count a failed attempt on rows without committing, and back them off.
+
+        Args:
+            rows: Rows that failed
+            error: Error message to keep for inspection
+            retry_base_seconds: Backoff after the first failure, doubled on
+                every further failure
+            retry_max_seconds: Longest backoff
+        """
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        for row in rows:
+            row.attempts += 1
+            row.last_error = error[:1000]
+            delay = min(
+                retry_base_seconds * 2 ** min(row.attempts - 1, 30), retry_max_seconds
+            )
+            row.next_attempt_at = now + timedelta(seconds=delay)
+
+    def count_pending(self, max_attempts: int) -> int:
+        """
+        Count rows still waiting to be drained.
+
+        Args:
+            max_attempts: Rows with this many attempts are not counted
+
+        Returns:
+            int: Number of pending rows
+        """
+        return (
+            self.db.query(func.count(IndexOutbox.id))
+            .filter(IndexOutbox.attempts < max_attempts)
+            .scalar()
+        )
@@ -2,14 +2,17 @@
 Repository for managing reindex jobs (database-only).
 """
 
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from sqlalchemy.orm import Query, Session
 
+from app.models.reindex_checkpoint import ReindexCheckpoint
 from app.models.reindex_job import ReindexJob, ReindexJobStatus
 from app.schemas.reindex_job import ReindexJobCreate
 from app.repositories.soft_delete_repository import SoftDeleteRepository
+from app.utils.reindex_checkpoints import Checkpoint
+from app.utils.reindex_progress import ReindexProgress
 
 
 class ReindexRepository(SoftDeleteRepository[ReindexJob]):
@@ -63,23 +66,70 @@ class ReindexRepository(SoftDeleteRepository[ReindexJob]):
         return self.db.query(ReindexJob).order_by(ReindexJob.created_at.desc())
 
     def update_reindex_job_progress(
-        self, job_id: UUID, progress: float, status: Optional[ReindexJobStatus] = None
+        self,
+        job_id: UUID,
+        progress: ReindexProgress,
+        status: Optional[ReindexJobStatus] = None,
     ) -> None:
         """
         Update reindex job progress.
 
         Args:
             job_id: The ID of the job
-            progress: Progress value (0.0 to 1.0)
+            progress: Counters and estimates of the job
             status: Optional status to update
         """
         job = self.get_reindex_job(job_id)
         if job:
-            job.progress = progress
+            job.progress = progress.progress
+            job.entities_fetched = progress.fetched
+            job.entities_indexed = progress.indexed
+            job.entities_failed = progress.failed
+            job.entities_skipped = progress.skipped
+            job.entities_total = progress.total
+            job.docs_per_second = progress.docs_per_second
+            job.eta_seconds = progress.eta_seconds
+            job.progress_updated_at = datetime.now(timezone.utc)
             if status:
                 job.status = status
             self.db.commit()
 
+    def touch_reindex_job(self, job_id: UUID) -> None:
+        """
+        Refresh a job's progress time without changing its counters.
+
+        Args:
+            job_id: The ID of the job
+        """
+        self.db.query(ReindexJob).filter(ReindexJob.id == job_id).update(
+            {ReindexJob.progress_updated_at: datetime.now(timezone.utc)},
+            synchronize_session=False,
+        )
+        self.db.commit()
+
+    def is_reindex_job_stale(self, job: ReindexJob, stale_after_seconds: float) -> bool:
+        """
+        Whether a job's run saved no progress for a while.
+
+        A run saves progress every few seconds, and refreshes it while it
+        swaps and catches up after a rebuild, so a stale job has no run left
+        (its worker died, or a cancelled run ended).
+
+        Args:
+            job: The job
+            stale_after_seconds: Time without progress after which the job is stale
+
+        Returns:
+            bool: True if the job saved no progress for stale_after_seconds
+        """
+        last = job.progress_updated_at or job.started_at or job.updated_at
+        if last is None:
+            return True
+        if last.tzinfo is not None:
+            last = last.astimezone(timezone.utc).replace(tzinfo=None)
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return now - last >= timedelta(seconds=stale_after_seconds)
+
     def update_reindex_job_status(
         self,
         job_id: UUID,
@@ -99,6 +149,10 @@ class ReindexRepository(SoftDeleteRepository[ReindexJob]):
             job.status = status
             job.error_message = error_message
 
+            if status == ReindexJobStatus.PENDING:
+                # Queued again to resume
+                job.completed_at = None
+
             if status == ReindexJobStatus.RUNNING and not job.started_at:
                 job.started_at = datetime.now(timezone.utc)
 
@@ -110,3 +164,79 @@ class ReindexRepository(SoftDeleteRepository[ReindexJob]):
                 job.completed_at = datetime.now(timezone.utc)
 
             self.db.commit()
+
+    def get_checkpoints(self, job_id: UUID) -> List[Checkpoint]:
+        """
+        Get the checkpoints of a reindex job.
+
+        Args:
+            job_id: The ID of the job
+
+        Returns:
+            List[Checkpoint]: One per (service, entity type) the job reached
+        """
+        rows = (
+            self.db.query(ReindexCheckpoint)
+            .filter(ReindexCheckpoint.job_id == job_id)
+            .all()
+        )
+        return [
+            Checkpoint(
+                service_id=str(row.service_id),
+                entity_type=row.entity_type,
+                pages_done=row.pages_done,
+                next_cursor=row.next_cursor,
+                cursor_paged=row.cursor_paged,
+                total_pages=row.total_pages,
+                indexed=row.indexed,
+                failed=row.failed,
+                skipped=row.skipped,
+                completed=row.completed,
+            )
+            for row in rows
+        ]
+
+    def save_checkpoints(self, job_id: UUID, checkpoints: List[Checkpoint]) -> None:
+        """
+        Insert or update checkpoints of a reindex job.
+
+        Args:
+            job_id: The ID of the job
+            checkpoints: The checkpoints to save
+        """
+        rows = {
+            (str(row.service_id), row.entity_type): row
+            for row in self.db.query(ReindexCheckpoint)
+            .filter(ReindexCheckpoint.job_id == job_id)
+            .all()
+        }
+        for checkpoint in checkpoints:
+            row = rows.get(checkpoint.key)
+            if row is None:
+                row = ReindexCheckpoint(
+                    job_id=job_id,
+                    service_id=UUID(checkpoint.service_id),
+                    entity_type=checkpoint.entity_type,
+                )
+                self.db.add(row)
+            row.pages_done = checkpoint.pages_done
+            row.next_cursor = checkpoint.next_cursor
+            row.cursor_paged = checkpoint.cursor_paged
+            row.total_pages = checkpoint.total_pages
+            row.indexed = checkpoint.indexed
+            row.failed = checkpoint.failed
+            row.skipped = checkpoint.skipped
+            row.completed = checkpoint.completed
+        self.db.commit()
+
+    def delete_checkpoints(self, job_id: UUID) -> None:
+        """
+        Delete the checkpoints of a reindex job, so it runs from the start.
+
+        Args:
+            job_id: The ID of the job
+        """
+        self.db.query(ReindexCheckpoint).filter(
+            ReindexCheckpoint.job_id == job_id
+        ).delete()
+        self.db.commit()
@@ -2,6 +2,7 @@
 Router for provider-related endpoints.
 """
 
+from datetime import datetime, timezone
 from typing import Optional
 from fastapi import APIRouter, Depends, Request
 from sqlalchemy.orm import Session
@@ -9,7 +10,9 @@ from sqlalchemy.orm import Session
 from app.db import get_db
 from app.schemas.provider import ProviderStatus
 from app.schemas.common import ListResponse
-from app.providers.factory import get_providers, is_provider_enabled
+from app.providers.factory import is_provider_enabled
+from app.providers.health import ProviderHealthStore
+from app.providers.registry import known_providers
 from app.config import get_settings
 from app.settings_manager import SettingsManager
 from app.auth.rbac import build_rbac_dependencies
@@ -45,37 +48,38 @@ def list_providers(
     Returns information about each provider including:
     - name: The provider name (e.g., "algolia", "typesense")
     - enabled: Whether the provider is enabled (has config and enabled flag)
-    - healthy: Whether the provider is healthy and reachable (only checked if enabled)
+    - healthy: Whether the provider passed its last background healthcheck
+      (only reported for enabled providers; a missing or stale check is
+      reported as unhealthy)
+    - latency_ms / checked_at: Latency and time of that healthcheck
     """
     settings = get_settings()
     settings_manager = SettingsManager(db)
+    # Healthchecks run in the health_prober process; only the result is read here
+    health = ProviderHealthStore().get_all()
 
     provider_statuses = []
 
-    # Check all known providers
-    known_providers = ["algolia", "typesense"]
-
-    for provider_name in known_providers:
+    # Check all registered providers
+    for provider_name in known_providers():
         enabled = is_provider_enabled(provider_name, settings, settings_manager)
-        healthy = False
-
-        # Only check health if provider is enabled
-        if enabled:
-            try:
-                # Get enabled providers and find this one
-                providers = get_providers(settings, settings_manager)
-                provider = next((p for p in providers if p.name == provider_name), None)
-                if provider:
-                    healthy = provider.healthcheck()
-            except Exception:
-                # If healthcheck fails, healthy remains False
-                healthy = False
+        status = health.get(provider_name) if enabled else None
 
         provider_statuses.append(
             ProviderStatus(
                 name=provider_name,
                 enabled=enabled,
-                healthy=healthy,
+                healthy=bool(
+                    status
+                    and status.healthy
+                    and not status.is_stale(settings.provider_health_max_age_seconds)
+                ),
+                latency_ms=status.latency_ms if status else None,
+                checked_at=(
+                    datetime.fromtimestamp(status.checked_at, timezone.utc)
+                    if status
+                    else None
+                ),
             )
         )
 
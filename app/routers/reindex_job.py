@@ -6,6 +6,7 @@ from fastapi_pagination.ext.sqlalchemy import paginate  # type: ignore[import-no
 from sqlalchemy.orm import Session
 
 from app.commands.execute_reindex_command import ExecuteReindexCommand
+from app.config import get_settings
 from app.db import get_db
 from app.routers.utils.dependencies import get_reindex_job_by_id
 from app.schemas.reindex_job import (
@@ -16,7 +17,6 @@ from app.schemas.reindex_job import (
 from app.repositories.reindex_repository import ReindexRepository
 from app.models.reindex_job import ReindexJob as ReindexJobModel, ReindexJobStatus
 from app.auth.rbac import build_rbac_dependencies
-from app.tasks.reindex_task import reindex_task
 from fastapi import Request
 
 router = APIRouter(
@@ -45,6 +45,8 @@ def create_reindex_job(
     _authorized: bool = Depends(rbac["create"]),
 ) -> ReindexJob:
     """Create and trigger a reindex job."""
+    from app.tasks.reindex_task import reindex_task
+
     service = ReindexRepository(db)
     created_job = service.create_reindex_job(job_data)
 
@@ -95,6 +97,51 @@ def cancel_reindex_job(
     # TODO: Cancel the Celery task if running
 
 
+@router.post(
+    "/{job_id}/resume", response_model=ReindexJob, status_code=status.HTTP_202_ACCEPTED
+)
+def resume_reindex_job(
+    job: ReindexJobModel = Depends(get_reindex_job_by_id),
+    db: Session = Depends(get_db),
+    _authorized: bool = Depends(rbac["update"]),
+) -> ReindexJob:
+    """
+    Resume a reindex job from its last checkpoints.
+
+    Failed jobs resume at once. Running and cancelled jobs (cancelling does
+    not stop a run) resume only once stale, so two runs never overlap.
+    """
+    from app.tasks.reindex_task import reindex_task
+
+    if job.status not in (
+        ReindexJobStatus.FAILED,
+        ReindexJobStatus.CANCELLED,
+        ReindexJobStatus.RUNNING,
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Cannot resume job with status {job.status}",
+        )
+
+    repository = ReindexRepository(db)
+    stale_after_seconds = get_settings().reindex_stale_after_seconds
+    if job.status != ReindexJobStatus.FAILED and not repository.is_reindex_job_stale(
+        job, stale_after_seconds
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=(
+                f"Job may still be running; it can be resumed once it saved "
+                f"no progress for {stale_after_seconds:g}s"
+            ),
+        )
+
+    repository.update_reindex_job_status(job.id, ReindexJobStatus.PENDING)
+    reindex_task.delay(str(job.id), resume=True)
+
+    return job
+
+
 @router.post("/{job_id}/run", status_code=status.HTTP_204_NO_CONTENT)
 def run_reindex_job(
     job: ReindexJobModel = Depends(get_reindex_job_by_id),
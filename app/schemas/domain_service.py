@@ -25,6 +25,9 @@ class DomainServiceBase(BaseModel):
     enabled: bool = True
     """Whether the service is enabled. Defaults to True."""
 
+    reindex_concurrency: Optional[int] = Field(default=None, ge=1)
+    """Pages of this service reindexed at once. Defaults to REINDEX_SERVICE_CONCURRENCY."""
+
 
 class DomainServiceCreate(DomainServiceBase):
     """Schema for creating a new domain service."""
@@ -41,6 +44,7 @@ class DomainServiceUpdate(BaseModel):
     indexes_path_prefix: Optional[str] = None
     excluded_entities: Optional[list[str]] = None
     enabled: Optional[bool] = None
+    reindex_concurrency: Optional[int] = Field(default=None, ge=1)
 
 
 class DomainServiceInDB(DomainServiceBase):
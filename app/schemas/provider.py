@@ -2,6 +2,9 @@
 Schemas for provider-related API responses.
 """
 
+from datetime import datetime
+from typing import Optional
+
 from pydantic import BaseModel
 
 
@@ -11,3 +14,6 @@ class ProviderStatus(BaseModel):
     name: str
     enabled: bool
     healthy: bool
+    # Latency and time of the last background healthcheck, if any
+    latency_ms: Optional[float] = None
+    checked_at: Optional[datetime] = None
@@ -1,7 +1,7 @@
 from typing import Optional, List
 from uuid import UUID
 from datetime import datetime
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 from app.constants.reindex_job_status import ReindexJobStatus
 
 
@@ -12,12 +12,20 @@ class ReindexJobBase(BaseModel):
     entity_types: Optional[List[str]] = None
     updated_after: Optional[datetime] = None
     updated_before: Optional[datetime] = None
+    force: bool = False
+    # Load every entity into shadow indexes, then swap them over the live ones
+    rebuild: bool = False
 
 
 class ReindexJobCreate(ReindexJobBase):
     """Schema for creating a new reindex job."""
 
-    pass
+    @model_validator(mode="after")
+    def check_rebuild_filters(self) -> "ReindexJobCreate":
+        """A rebuild replaces whole indexes, so it cannot filter by date."""
+        if self.rebuild and (self.updated_after or self.updated_before):
+            raise ValueError("rebuild jobs cannot filter by updated_after/before")
+        return self
 
 
 class ReindexJobInDB(ReindexJobBase):
@@ -48,5 +56,16 @@ class ReindexJobStatusResponse(BaseModel):
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     error_message: Optional[str] = None
+    # Progress of the job, saved periodically while it runs
+    progress: Optional[float] = None
+    # Entities count once however many providers they are written to
+    entities_fetched: int = 0
+    entities_indexed: int = 0
+    entities_failed: int = 0
+    entities_skipped: int = 0
+    entities_total: Optional[int] = None
+    docs_per_second: Optional[float] = None
+    eta_seconds: Optional[float] = None
+    progress_updated_at: Optional[datetime] = None
 
     model_config = {"from_attributes": True}
@@ -1,12 +1,40 @@
 # Import celery app first
+from celery.signals import worker_init
+
 from app.core.celery_app import celery_app
 from app.tasks.process_nats_event import process_nats_event_task
 from app.tasks.index_entity_task import index_entity_task
 from app.tasks.reindex_task import reindex_task
+from app.tasks.flush_deletes_task import flush_deletes_task
+
+# Modules imported by tasks at run time. The worker parent imports them once
+# before forking so prefork children inherit them instead of importing on
+# their first task.
+TASK_RUNTIME_MODULES = [
+    "app.commands.index_entity_command",
+    "app.commands.execute_reindex_command",
+    "app.commands.flush_deletes_command",
+    "app.repositories.event_repository",
+]
+
+
+@worker_init.connect
+def _init_worker(**kwargs) -> None:
+    """Configure logging and preload task dependencies in the worker parent."""
+    import importlib
+
+    # Initialize logging configuration for Celery workers
+    from app.core.logging_config import LoggingConfig
 
-# Initialize logging configuration for Celery workers
-from app.core.logging_config import LoggingConfig
+    LoggingConfig()
+    for module in TASK_RUNTIME_MODULES:
+        importlib.import_module(module)
 
-LoggingConfig()  # Initialize logging
 
-__all__ = ["celery_app", "process_nats_event_task", "index_entity_task", "reindex_task"]
+__all__ = [
+    "celery_app",
+    "process_nats_event_task",
+    "index_entity_task",
+    "reindex_task",
+    "flush_deletes_task",
+]
@@ -0,0 +1,36 @@
+"""
+Celery task for flushing buffered document deletes.
+"""
+
+from app.config import get_settings
+from app.core.celery_app import celery_app
+from app.core.logging_config import get_logger
+from app.db import SessionLocal
+
+logger = get_logger("flush_deletes_task")
+
+
+@celery_app.task
+def flush_deletes_task() -> None:
+    """Flush the delete buffer to every provider."""
+    # Imported lazily so registering the task does not load the command stack
+    from app.commands.flush_deletes_command import FlushDeletesCommand
+
+    db = SessionLocal()
+    try:
+        deleted = FlushDeletesCommand(db).execute()
+        logger.info(f"Delete flush completed: {deleted} documents deleted")
+    except Exception as e:
+        logger.error(f"Delete flush failed: {e}", exc_info=True)
+        # The popped deletes were put back; flush them again after the delay
+        flush_deletes_task.apply_async(
+            countdown=get_settings().delete_flush_delay_seconds
+        )
+        raise
+    finally:
+        db.close()
+
+
+def schedule_delete_flush() -> None:
+    """Schedule a flush at the end of the current delete window."""
+    flush_deletes_task.apply_async(countdown=get_settings().delete_flush_delay_seconds)
@@ -7,8 +7,6 @@ from uuid import UUID
 from app.core.celery_app import celery_app
 from app.core.logging_config import get_logger
 from app.db import SessionLocal
-from app.commands.index_entity_command import IndexEntityCommand
-from app.repositories.event_repository import EventRepository
 
 logger = get_logger("index_entity_task")
 
@@ -16,6 +14,10 @@ logger = get_logger("index_entity_task")
 @celery_app.task
 def index_entity_task(event_id: str) -> None:
     """Index an entity from an event."""
+    # Imported lazily so registering the task does not load the command stack
+    from app.commands.index_entity_command import IndexEntityCommand
+    from app.repositories.event_repository import EventRepository
+
     logger.info(f"Starting indexing for event: {event_id}")
 
     db = SessionLocal()
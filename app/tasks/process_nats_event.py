@@ -48,8 +48,12 @@ def process_nats_event_task(msg: dict) -> None:
         )
 
         # Create event using EventRepository
+        # With the outbox, the index intent commits atomically with the event
+        settings = get_settings()
         event_repository = EventRepository(db)
-        created_event = event_repository.create_event(event_create)
+        created_event = event_repository.create_event(
+            event_create, enqueue_index=settings.index_outbox_enabled
+        )
 
         # Ensure user is onboarded if user_id is provided
         user_id = msg.get("user_id")
@@ -58,10 +62,11 @@ def process_nats_event_task(msg: dict) -> None:
 
         logger.info(f"Event created successfully: {created_event.id}")
 
-        # Queue indexing task asynchronously
-        from app.tasks.index_entity_task import index_entity_task
+        if not settings.index_outbox_enabled:
+            # Queue indexing task asynchronously
+            from app.tasks.index_entity_task import index_entity_task
 
-        index_entity_task.delay(str(created_event.id))
+            index_entity_task.delay(str(created_event.id))
 
     except Exception as e:
         logger.error(f"Error creating event: {e}", exc_info=True)
@@ -6,20 +6,22 @@ from uuid import UUID
 from app.core.celery_app import celery_app
 from app.core.logging_config import get_logger
 from app.db import SessionLocal
-from app.commands.execute_reindex_command import ExecuteReindexCommand
 
 logger = get_logger("reindex_task")
 
 
 @celery_app.task
-def reindex_task(job_id: str) -> None:
-    """Execute a reindex job."""
-    logger.info(f"Starting reindex job: {job_id}")
+def reindex_task(job_id: str, resume: bool = False) -> None:
+    """Execute a reindex job, or resume it from its checkpoints."""
+    # Imported lazily so registering the task does not load the command stack
+    from app.commands.execute_reindex_command import ExecuteReindexCommand
+
+    logger.info(f"{'Resuming' if resume else 'Starting'} reindex job: {job_id}")
 
     db = SessionLocal()
     try:
         command = ExecuteReindexCommand(db)
-        command.execute(UUID(job_id))
+        command.execute(UUID(job_id), resume=resume)
         logger.info(f"Reindex job {job_id} completed successfully")
     except Exception as e:
         logger.error(f"Reindex job {job_id} failed: {e}", exc_info=True)
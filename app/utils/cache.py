@@ -1,38 +1,132 @@
-import json
 import logging
-from typing import Optional, Any
-from redis import Redis, ConnectionError
+import threading
+from typing import Optional, Any, Dict, Iterable, List, Union
+from redis import ConnectionPool, Redis, ConnectionError
 from app.config import get_settings
+from app.utils.near_cache import MISSING, LocalCache, get_invalidation_bus
+from app.utils.serializers import Serializer, get_serializer
 
 logger = logging.getLogger(__name__)
 
+# Number of keys sent per MGET/UNLINK/SCAN round trip
+BULK_CHUNK_SIZE = 500
+
+_connection_pools: Dict[bool, ConnectionPool] = {}
+_connection_pool_lock = threading.Lock()
+
+
+def get_connection_pool(decode_responses: bool = True) -> ConnectionPool:
+    """
+    Get the process-wide Redis connection pool shared by all cache namespaces.
+
+    The pool is created lazily on first use so importing this module never
+    opens sockets. Binary serializers use a separate pool that returns raw
+    bytes.
+
+    Args:
+        decode_responses: Whether responses are decoded to str
+
+    Returns:
+        ConnectionPool shared by every Cache instance
+    """
+    pool = _connection_pools.get(decode_responses)
+    if pool is None:
+        with _connection_pool_lock:
+            pool = _connection_pools.get(decode_responses)
+            if pool is None:
+                settings = get_settings()
+                pool = ConnectionPool(
+                    host=settings.redis_host,
+                    port=settings.redis_port,
+                    decode_responses=decode_responses,
+                    socket_connect_timeout=5,
+                    socket_timeout=5,
+                )
+                _connection_pools[decode_responses] = pool
+    return pool
+
+
+def _chunked(items: List[str], size: int = BULK_CHUNK_SIZE) -> Iterable[List[str]]:
+    """Yield successive chunks of at most `size` items."""
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
 
 class Cache:
-    """Generic Redis-based cache for any type of data."""
+    """
+    Generic Redis-based cache for any type of data.
 
-    def __init__(self, namespace: str = "cache"):
+    Optionally fronted by an in-process LRU near-cache. Near-cache entries are
+    invalidated across processes over Redis pub/sub, so a namespace should be
+    configured with the near-cache consistently in every process that writes it.
+    """
+
+    def __init__(
+        self,
+        namespace: str = "cache",
+        serializer: Optional[Serializer] = None,
+        near_cache_size: Optional[int] = None,
+        near_cache_ttl: Optional[int] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            namespace: Namespace prepended to every key
+            serializer: Value serializer (defaults to settings.cache_serializer)
+            near_cache_size: Max in-process entries, 0 disables the near-cache
+                (defaults to settings.cache_near_max_entries)
+            near_cache_ttl: Max seconds an entry lives in process memory
+                (defaults to settings.cache_near_ttl)
+        """
         self.settings = get_settings()
+        self.serializer = serializer or get_serializer(self.settings.cache_serializer)
         self.redis_client = Redis(
-            host=self.settings.redis_host,
-            port=self.settings.redis_port,
-            decode_responses=True,
-            socket_connect_timeout=5,
-            socket_timeout=5,
+            connection_pool=get_connection_pool(
+                decode_responses=not self.serializer.binary
+            )
         )
         self.namespace = namespace
         self.default_ttl = 3600  # 1 hour in seconds
 
+        if near_cache_size is None:
+            near_cache_size = self.settings.cache_near_max_entries
+        self.near_cache: Optional[LocalCache] = None
+        if near_cache_size > 0:
+            self.near_cache = LocalCache(
+                max_entries=near_cache_size,
+                ttl=near_cache_ttl or self.settings.cache_near_ttl,
+            )
+            self._invalidation_bus = get_invalidation_bus(
+                lambda: Redis(connection_pool=get_connection_pool())
+            )
+            self._invalidation_bus.register(namespace, self.near_cache)
+
     def _get_cache_key(self, key: str) -> str:
         """Generate cache key with namespace."""
         return f"{self.namespace}:{key}"
 
-    def _serialize_value(self, value: Any) -> str:
-        """Serialize value to JSON string."""
-        return json.dumps(value)
-
-    def _deserialize_value(self, value: str) -> Any:
-        """Deserialize JSON string to value."""
-        return json.loads(value)
+    def _serialize_value(self, value: Any) -> Union[str, bytes]:
+        """Serialize value with the configured serializer."""
+        return self.serializer.dumps(value)
+
+    def _deserialize_value(self, value: Union[str, bytes]) -> Any:
+        """Deserialize value with the configured serializer."""
+        return self.serializer.loads(value)
+
+    def _invalidate_near_cache(
+        self, keys: Optional[List[str]] = None, pattern: Optional[str] = None
+    ) -> None:
+        """Evict keys (or a pattern) locally and in every other process."""
+        if self.near_cache is None:
+            return
+        if pattern is not None:
+            self.near_cache.delete_pattern(pattern)
+        else:
+            self.near_cache.delete_many(keys or [])
+        self._invalidation_bus.publish(
+            self.redis_client, self.namespace, keys=keys, pattern=pattern
+        )
 
     def read(self, key: str) -> Optional[Any]:
         """
@@ -44,13 +138,21 @@ class Cache:
         Returns:
             Cached value if found, None otherwise
         """
+        if self.near_cache is not None:
+            local_value = self.near_cache.get(key)
+            if local_value is not MISSING:
+                return local_value
+
         try:
             cache_key = self._get_cache_key(key)
             cached_value = self.redis_client.get(cache_key)
 
             if cached_value is not None:
                 logger.debug(f"Cache hit for key: {key}")
-                return self._deserialize_value(cached_value)
+                value = self._deserialize_value(cached_value)
+                if self.near_cache is not None:
+                    self.near_cache.set(key, value)
+                return value
 
             logger.debug(f"Cache miss for key: {key}")
             return None
@@ -82,6 +184,9 @@ class Cache:
             success = self.redis_client.setex(cache_key, ttl, serialized_value)
             if success:
                 logger.debug(f"Cached key {key} with TTL {ttl}s")
+                if self.near_cache is not None:
+                    self._invalidate_near_cache(keys=[key])
+                    self.near_cache.set(key, value, ttl)
             return success
 
         except ConnectionError as e:
@@ -104,6 +209,7 @@ class Cache:
         try:
             cache_key = self._get_cache_key(key)
             deleted = self.redis_client.delete(cache_key)
+            self._invalidate_near_cache(keys=[key])
             if deleted:
                 logger.debug(f"Deleted key {key} from cache")
             return bool(deleted)
@@ -115,10 +221,126 @@ class Cache:
             logger.error(f"Error deleting key {key} from cache: {e}")
             return False
 
+    def read_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Read multiple values from cache with MGET.
+
+        Args:
+            keys: Cache keys to read
+
+        Returns:
+            Dict mapping each key found in cache to its value. Missing keys
+            are omitted.
+        """
+        if not keys:
+            return {}
+
+        results: Dict[str, Any] = {}
+        remote_keys = list(keys)
+        if self.near_cache is not None:
+            remote_keys = []
+            for key in keys:
+                local_value = self.near_cache.get(key)
+                if local_value is MISSING:
+                    remote_keys.append(key)
+                else:
+                    results[key] = local_value
+
+        try:
+            for chunk in _chunked(remote_keys):
+                cached_values = self.redis_client.mget(
+                    [self._get_cache_key(key) for key in chunk]
+                )
+                for key, cached_value in zip(chunk, cached_values):
+                    if cached_value is not None:
+                        value = self._deserialize_value(cached_value)
+                        results[key] = value
+                        if self.near_cache is not None:
+                            self.near_cache.set(key, value)
+
+            logger.debug(f"Cache bulk read: {len(results)}/{len(keys)} hits")
+            return results
+
+        except ConnectionError as e:
+            logger.warning(f"Redis connection error while reading keys in bulk: {e}")
+            return {}
+        except Exception as e:
+            logger.error(f"Error reading keys in bulk from cache: {e}")
+            return {}
+
+    def write_many(self, values: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+        """
+        Write multiple values to cache in a single pipelined round trip.
+
+        Args:
+            values: Mapping of cache key to value
+            ttl: Time to live in seconds (defaults to default_ttl)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not values:
+            return True
+
+        try:
+            ttl = ttl or self.default_ttl
+            pipeline = self.redis_client.pipeline(transaction=False)
+            for key, value in values.items():
+                pipeline.setex(
+                    self._get_cache_key(key), ttl, self._serialize_value(value)
+                )
+            results = pipeline.execute()
+            logger.debug(f"Cached {len(values)} keys in bulk with TTL {ttl}s")
+            if self.near_cache is not None:
+                self._invalidate_near_cache(keys=list(values))
+                for key, value in values.items():
+                    self.near_cache.set(key, value, ttl)
+            return all(results)
+
+        except ConnectionError as e:
+            logger.warning(f"Redis connection error while writing keys in bulk: {e}")
+            return False
+        except Exception as e:
+            logger.error(f"Error writing keys in bulk to cache: {e}")
+            return False
+
+    def delete_many(self, keys: List[str]) -> int:
+        """
+        Delete multiple values from cache with non-blocking UNLINK.
+
+        Args:
+            keys: Cache keys to delete
+
+        Returns:
+            Number of keys removed
+        """
+        if not keys:
+            return 0
+
+        try:
+            deleted = 0
+            for chunk in _chunked(list(keys)):
+                deleted += self.redis_client.unlink(
+                    *[self._get_cache_key(key) for key in chunk]
+                )
+            self._invalidate_near_cache(keys=list(keys))
+            logger.debug(f"Deleted {deleted} keys from cache in bulk")
+            return deleted
+
+        except ConnectionError as e:
+            logger.warning(f"Redis connection error while deleting keys in bulk: {e}")
+            return 0
+        except Exception as e:
+            logger.error(f"Error deleting keys in bulk from cache: {e}")
+            return 0
+
     def clear_pattern(self, pattern: str) -> bool:
         """
         Clear all cache entries matching a pattern.
 
+        Walks the keyspace incrementally with SCAN and removes matches with
+        UNLINK so large namespaces never block Redis.
+
         Args:
             pattern: Pattern to match (e.g., "user:*")
 
@@ -127,13 +349,23 @@ class Cache:
         """
         try:
             full_pattern = f"{self.namespace}:{pattern}"
-            keys = self.redis_client.keys(full_pattern)
-            if keys:
-                deleted = self.redis_client.delete(*keys)
+            deleted = 0
+            batch: List[str] = []
+            for key in self.redis_client.scan_iter(
+                match=full_pattern, count=BULK_CHUNK_SIZE
+            ):
+                batch.append(key)
+                if len(batch) >= BULK_CHUNK_SIZE:
+                    deleted += self.redis_client.unlink(*batch)
+                    batch = []
+            if batch:
+                deleted += self.redis_client.unlink(*batch)
+            self._invalidate_near_cache(pattern=pattern)
+
+            if deleted:
                 logger.info(
                     f"Cleared {deleted} cache entries matching pattern: {pattern}"
                 )
-                return True
             return True
 
         except ConnectionError as e:
@@ -216,20 +448,34 @@ class Cache:
 
 
 # Convenience function to create cache instances
-def create_cache(namespace: str = "cache") -> Cache:
+def create_cache(namespace: str = "cache", **kwargs: Any) -> Cache:
     """
     Create a new cache instance with the specified namespace.
 
     Args:
         namespace: Namespace for cache keys
+        **kwargs: Extra Cache options (serializer, near_cache_size, near_cache_ttl)
 
     Returns:
         Cache instance
     """
-    return Cache(namespace)
-
-
-# Common cache instances
-user_cache = Cache("user")
-workspace_cache = Cache("workspace")
-project_cache = Cache("project")
+    return Cache(namespace, **kwargs)
+
+
+# Common cache instances, created on first access so importing this module has
+# no side effects (all share the connection pool above)
+_COMMON_CACHE_NAMESPACES = {
+    "user_cache": "user",
+    "workspace_cache": "workspace",
+    "project_cache": "project",
+}
+_common_caches: Dict[str, Cache] = {}
+
+
+def __getattr__(name: str) -> Cache:
+    namespace = _COMMON_CACHE_NAMESPACES.get(name)
+    if namespace is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if name not in _common_caches:
+        _common_caches[name] = Cache(namespace)
+    return _common_caches[name]
@@ -2,9 +2,14 @@
 Utilities for building search documents from domain service API responses.
 """
 
+import hashlib
+import json
 from typing import Dict, Any
 from datetime import datetime, timezone
 
+# Fields that change on every build and must not affect the content hash
+VOLATILE_FIELDS = frozenset({"updated_at"})
+
 
 def build_document_from_api_response(
     source: str, entity_type: str, entity_id: str, domain_response: Dict[str, Any]
@@ -48,6 +53,51 @@ def build_document_from_api_response(
     return document
 
 
+def compute_document_hash(document: Dict[str, Any]) -> str:
+    """
+    Compute a stable content hash of a search document.
+
+    Volatile fields (see VOLATILE_FIELDS) are ignored and keys are sorted, so
+    two builds of the same entity produce the same hash.
+
+    Args:
+        document: The search document
+
+    Returns:
+        str: 16-character hex digest
+    """
+    content = {k: v for k, v in document.items() if k not in VOLATILE_FIELDS}
+    canonical = json.dumps(
+        content, sort_keys=True, separators=(",", ":"), default=str
+    ).encode("utf-8")
+    return hashlib.blake2b(canonical, digest_size=8).hexdigest()
+
+
+def compute_field_hashes(document: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Compute a stable content hash of each top-level field of a search document.
+
+    Used to find the fields that changed since the last write. Volatile
+    fields are ignored like in compute_document_hash.
+
+    Args:
+        document: The search document
+
+    Returns:
+        Dict[str, str]: Field name to 8-character hex digest
+    """
+    return {
+        key: hashlib.blake2b(
+            json.dumps(
+                value, sort_keys=True, separators=(",", ":"), default=str
+            ).encode("utf-8"),
+            digest_size=4,
+        ).hexdigest()
+        for key, value in document.items()
+        if key not in VOLATILE_FIELDS
+    }
+
+
 def extract_entity_type_from_subject(subject: str) -> str:
     """
     Extract entity type from event subject.
@@ -3,16 +3,42 @@ HTTP client for calling domain service indexing APIs.
 """
 
 import logging
+from dataclasses import dataclass
 from typing import Dict, Any, Optional
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from app.config import get_settings
+from app.utils.cache import create_cache
 from app.utils.m2m_token import M2MTokenClient
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class EntityResponse:
+    """Result of a conditional entity fetch."""
+
+    url: str
+    data: Optional[Dict[str, Any]] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    deleted: bool = False
+
+    @property
+    def not_modified(self) -> bool:
+        """True when the domain service answered 304 Not Modified."""
+        return self.data is None and not self.deleted
+
+    @property
+    def validators(self) -> Optional[Dict[str, Optional[str]]]:
+        """Validators to save once the entity is indexed, None if it has none."""
+        if self.data is None or not (self.etag or self.last_modified):
+            return None
+        return {"url": self.url, "etag": self.etag, "last_modified": self.last_modified}
+
+
 class DomainServiceClient:
     """HTTP client for calling domain service indexing APIs."""
 
@@ -25,7 +51,13 @@ class DomainServiceClient:
             max_retries: Maximum number of retries for failed requests
         """
         self.timeout = timeout
+        self.settings = get_settings()
+        self.validator_cache = create_cache("entity_validators")
         self.session = requests.Session()
+        # Large batch responses travel compressed; requests decodes them
+        self.session.headers["Accept-Encoding"] = (
+            self.settings.domain_service_accept_encoding
+        )
 
         # Configure retry strategy
         retry_strategy = Retry(
@@ -114,6 +146,129 @@ class DomainServiceClient:
             )
             raise
 
+    def get_entity_conditional(
+        self,
+        base_url: str,
+        entity_type: str,
+        entity_id: str,
+        indexes_path_prefix: Optional[str] = None,
+    ) -> EntityResponse:
+        """
+        Get a single entity, revalidating against the last indexed version.
+
+        Sends If-None-Match / If-Modified-Since with the validators stored by
+        save_entity_validators. A 304 response yields an EntityResponse whose
+        not_modified is True and carries no data. A 404 or 410 yields one whose
+        deleted is True, so the entity can be removed from the index.
+
+        Args:
+            base_url: Base URL of the domain service
+            entity_type: Type of entity (e.g., "pets")
+            entity_id: ID of the entity
+            indexes_path_prefix: Path prefix for indexing endpoints
+
+        Returns:
+            EntityResponse with the entity data and its validators
+
+        Raises:
+            requests.RequestException: If the request fails
+        """
+        base_index_url = self._build_index_url(
+            base_url, entity_type, indexes_path_prefix
+        )
+        url = f"{base_index_url}/{entity_id}"
+
+        headers = self._get_auth_headers()
+        headers["Content-Type"] = "application/json"
+
+        if self.settings.domain_conditional_fetch_enabled:
+            validators = self.validator_cache.read(url) or {}
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+
+        try:
+            logger.debug(f"Calling domain service: GET {url} (conditional)")
+            response = self.session.get(url, headers=headers, timeout=self.timeout)
+            if response.status_code == requests.codes.not_modified:
+                logger.debug(f"Entity not modified since last index: {url}")
+                return EntityResponse(url=url)
+            if response.status_code in (requests.codes.not_found, requests.codes.gone):
+                logger.info(f"Entity no longer exists: {url}")
+                return EntityResponse(url=url, deleted=True)
+            response.raise_for_status()
+            return EntityResponse(
+                url=url,
+                data=response.json(),
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+        except requests.exceptions.RequestException as e:
+            logger.error(
+                f"Failed to get entity from domain service {url}: {e}", exc_info=True
+            )
+            raise
+
+    def save_entity_validators(self, entity_response: EntityResponse) -> None:
+        """
+        Remember the validators of an entity once it has been indexed.
+
+        Must only be called after every provider write succeeded, otherwise a
+        later 304 would skip an entity the index never received.
+
+        Args:
+            entity_response: Response returned by get_entity_conditional
+        """
+        validators = entity_response.validators
+        if validators is not None:
+            self.save_validators(**validators)
+
+    def save_validators(
+        self, url: str, etag: Optional[str], last_modified: Optional[str]
+    ) -> None:
+        """
+        Remember the validators of an indexed entity by its URL.
+
+        Same contract as save_entity_validators, for writers that carry the
+        validators instead of the response (e.g. the bulk writer).
+
+        Args:
+            url: URL the entity was fetched from
+            etag: ETag of the indexed version
+            last_modified: Last-Modified of the indexed version
+        """
+        if not self.settings.domain_conditional_fetch_enabled:
+            return
+        if not etag and not last_modified:
+            return
+        self.validator_cache.write(
+            url,
+            {"etag": etag, "last_modified": last_modified},
+            ttl=self.settings.entity_validator_ttl,
+        )
+
+    def forget_entity_validators(
+        self,
+        base_url: str,
+        entity_type: str,
+        entity_id: str,
+        indexes_path_prefix: Optional[str] = None,
+    ) -> None:
+        """
+        Drop stored validators so the next fetch downloads the full entity.
+
+        Args:
+            base_url: Base URL of the domain service
+            entity_type: Type of entity (e.g., "pets")
+            entity_id: ID of the entity
+            indexes_path_prefix: Path prefix for indexing endpoints
+        """
+        base_index_url = self._build_index_url(
+            base_url, entity_type, indexes_path_prefix
+        )
+        self.validator_cache.delete(f"{base_index_url}/{entity_id}")
+
     def get_entities_batch(
         self,
         base_url: str,
@@ -123,18 +278,25 @@ class DomainServiceClient:
         updated_before: Optional[str] = None,
         page: int = 1,
         per_page: int = 100,
+        cursor: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
         Get a batch of entities from a domain service (for reindexing).
 
+        Services page either by offset (page/per_page) or by an opaque
+        cursor: a service supporting cursors returns pagination.next_cursor
+        (null on the last page), which is passed back as `cursor` instead
+        of a page number.
+
         Args:
             base_url: Base URL of the domain service
             indexes_path_prefix: Path prefix for indexing endpoints
             entity_type: Type of entity (e.g., "pets")
             updated_after: ISO 8601 datetime string (optional)
             updated_before: ISO 8601 datetime string (optional)
-            page: Page number (default: 1)
+            page: Page number (default: 1), ignored when a cursor is given
             per_page: Number of items per page (default: 100)
+            cursor: next_cursor of the previous batch (optional)
 
         Returns:
             Dict containing paginated response with entities
@@ -144,10 +306,11 @@ class DomainServiceClient:
         """
         url = self._build_index_url(base_url, entity_type, indexes_path_prefix)
 
-        params: Dict[str, Any] = {
-            "page": page,
-            "per_page": per_page,
-        }
+        params: Dict[str, Any] = {"per_page": per_page}
+        if cursor:
+            params["cursor"] = cursor
+        else:
+            params["page"] = page
         if updated_after:
             params["updated_after"] = updated_after
         if updated_before:
@@ -8,6 +8,9 @@ from app.models.event import Event
 from app.models.domain_service import DomainService
 from app.repositories.domain_service_repository import DomainServiceRepository
 
+# Event type suffixes announcing that the subject entity no longer exists
+DELETION_EVENT_SUFFIXES = (".deleted",)
+
 
 def route_event(
     event: Event, domain_service_repository: DomainServiceRepository
@@ -25,3 +28,16 @@ def route_event(
         Optional[DomainService]: The matching service or None if not found (dead-letter)
     """
     return domain_service_repository.resolve_service_for_event(event.event_type)
+
+
+def is_deletion_event(event_type: str) -> bool:
+    """
+    Check if an event announces the deletion of its subject entity.
+
+    Args:
+        event_type: The event type (e.g., "com.example.pets.deleted")
+
+    Returns:
+        bool: True for deletion events
+    """
+    return event_type.endswith(DELETION_EVENT_SUFFIXES)
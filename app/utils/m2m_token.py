@@ -8,6 +8,13 @@ import httpx
 from typing import Optional, Dict, Any
 from pydantic import BaseModel
 from app.config import get_settings
+from app.utils.near_cache import MISSING, LocalCache
+
+# Seconds subtracted from expires_in so cached tokens are refreshed before expiry
+TOKEN_EXPIRY_MARGIN = 60
+
+# Bearer tokens are kept in process memory only, never in shared Redis
+_token_cache = LocalCache(max_entries=16, ttl=24 * 3600)
 
 
 class M2MTokenRequest(BaseModel):
@@ -150,6 +157,9 @@ class M2MTokenClient:
         """
         Synchronous version of get_token for use in non-async contexts.
 
+        Tokens are cached until shortly before they expire, so repeated calls
+        are served from process memory instead of the OAuth provider.
+
         Args:
             client_id: The OAuth client ID (uses settings.service_account_client_id if not provided)
             client_secret: The OAuth client secret (uses settings.service_account_client_secret if not provided)
@@ -167,6 +177,11 @@ class M2MTokenClient:
             client_id, client_secret, audience
         )
 
+        cache_key = f"{self.provider_domain}:{payload.client_id}:{payload.audience}"
+        cached = _token_cache.get(cache_key)
+        if cached is not MISSING:
+            return cached
+
         with httpx.Client(timeout=timeout) as client:
             response = client.post(
                 f"{self.base_url}/oauth/token",
@@ -176,7 +191,12 @@ class M2MTokenClient:
             response.raise_for_status()
 
             data = response.json()
-            return self._process_token_response(data)
+            token = self._process_token_response(data)
+
+        cache_ttl = token.expires_in - TOKEN_EXPIRY_MARGIN
+        if cache_ttl > 0:
+            _token_cache.set(cache_key, token, ttl=cache_ttl)
+        return token
 
 
 # Convenience function for quick token retrieval
@@ -2,12 +2,6 @@ import time
 from typing import Tuple
 
 from opentelemetry import trace
-from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
-from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
-from opentelemetry.instrumentation.logging import LoggingInstrumentor
-from opentelemetry.sdk.resources import Resource
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
 from prometheus_client import REGISTRY, Counter, Gauge, Histogram
 from prometheus_client.openmetrics.exposition import (
     CONTENT_TYPE_LATEST,
@@ -72,6 +66,48 @@ PROVIDER_LATENCY_SECONDS = Histogram(
     ["provider", "operation"],
 )
 
+PROVIDER_TASKS_TOTAL = Counter(
+    "provider_tasks_total",
+    "Total count of asynchronous provider tasks by outcome",
+    ["provider", "operation", "status"],
+)
+
+PROVIDER_TASK_CONFIRMATION_SECONDS = Histogram(
+    "provider_task_confirmation_seconds",
+    "Histogram of time from write acceptance to provider confirmation (in seconds)",
+    ["provider", "operation"],
+)
+
+CIRCUIT_BREAKER_OPEN = Gauge(
+    "circuit_breaker_open",
+    "Whether a provider's circuit is open (1) or closed (0)",
+    ["provider"],
+)
+
+PROVIDER_HEALTHY = Gauge(
+    "provider_healthy",
+    "Whether a provider passed its last healthcheck (1) or not (0)",
+    ["provider"],
+)
+
+PROVIDER_SPOOLED_TOTAL = Counter(
+    "provider_spooled_total",
+    "Total count of writes spooled while a provider's circuit was open",
+    ["provider", "operation"],
+)
+
+BULK_WRITER_FLUSHES_TOTAL = Counter(
+    "bulk_writer_flushes_total",
+    "Total count of bulk writer flushes by trigger and outcome",
+    ["reason", "status"],
+)
+
+BULK_WRITER_FLUSH_RECORDS = Histogram(
+    "bulk_writer_flush_records",
+    "Histogram of records sent to providers per bulk writer flush",
+    buckets=(1, 10, 50, 100, 250, 500, 1000, 2500),
+)
+
 REINDEX_JOBS_TOTAL = Counter(
     "reindex_jobs_total",
     "Total count of reindex jobs by status",
@@ -84,6 +120,25 @@ REINDEX_PROGRESS = Gauge(
     ["job_id"],
 )
 
+REINDEX_DOCUMENTS_TOTAL = Counter(
+    "reindex_documents_total",
+    "Total count of reindexed entities by outcome "
+    "(fetched, indexed, failed, skipped)",
+    ["outcome"],
+)
+
+REINDEX_THROUGHPUT = Gauge(
+    "reindex_documents_per_second",
+    "Entities written per second by reindex jobs by job_id",
+    ["job_id"],
+)
+
+REINDEX_ETA_SECONDS = Gauge(
+    "reindex_eta_seconds",
+    "Estimated seconds until reindex jobs complete by job_id",
+    ["job_id"],
+)
+
 
 class PrometheusMiddleware(BaseHTTPMiddleware):
     def __init__(self, app: ASGIApp, app_name: str = "fastapi-app") -> None:
@@ -158,6 +213,16 @@ def metrics(request: Request) -> Response:
 def setting_otlp(
     app: ASGIApp, app_name: str, endpoint: str, log_correlation: bool = True
 ) -> None:
+    # OpenTelemetry SDK and exporters are imported lazily to keep startup fast
+    from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import (
+        OTLPSpanExporter,
+    )
+    from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+    from opentelemetry.instrumentation.logging import LoggingInstrumentor
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
     # Setting OpenTelemetry
     # set the service name to show in traces
     resource = Resource.create(attributes={"service.name": app_name})
@@ -0,0 +1,244 @@
+"""
+In-process near-cache that sits in front of the Redis-backed Cache.
+
+A bounded LRU with per-entry TTL keeps hot values in process memory. Entries
+are invalidated across processes through a Redis pub/sub channel so writers
+in one worker evict stale copies held by every other worker.
+"""
+
+import copy
+import fnmatch
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from redis import Redis
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "indexa:cache:invalidate"
+
+# Sentinel returned by LocalCache.get on a miss (None is a valid cached value)
+MISSING = object()
+
+
+class LocalCache:
+    """
+    Thread-safe bounded LRU cache with per-entry expiry.
+
+    Values are deep-copied on set and get so callers mutating a value they
+    stored or read never change what later reads return, as with Redis.
+    """
+
+    def __init__(self, max_entries: int, ttl: int):
+        """
+        Initialize the local cache.
+
+        Args:
+            max_entries: Maximum number of entries kept in memory
+            ttl: Default time to live in seconds for each entry
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        """
+        Get a value, returning MISSING if absent or expired.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached value or MISSING
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return MISSING
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return MISSING
+            self._entries.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """
+        Store a value, evicting the least recently used entry when full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Time to live in seconds (capped at the cache default)
+        """
+        ttl = min(ttl, self.ttl) if ttl else self.ttl
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """Remove a single entry if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_many(self, keys: Iterable[str]) -> None:
+        """Remove several entries if present."""
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def delete_pattern(self, pattern: str) -> None:
+        """Remove all entries whose key matches a glob-style pattern."""
+        with self._lock:
+            for key in [k for k in self._entries if fnmatch.fnmatchcase(k, pattern)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+class InvalidationBus:
+    """Fans out near-cache invalidations to every process over Redis pub/sub."""
+
+    def __init__(self, client_factory: Callable[[], Redis]):
+        """
+        Initialize the invalidation bus.
+
+        Args:
+            client_factory: Callable returning a Redis client used by the listener
+        """
+        self.client_factory = client_factory
+        self.origin = uuid.uuid4().hex
+        self._caches: Dict[str, List[LocalCache]] = {}
+        self._lock = threading.Lock()
+        self._listener: Optional[threading.Thread] = None
+
+    def register(self, namespace: str, local_cache: LocalCache) -> None:
+        """
+        Register a local cache to receive invalidations for a namespace.
+
+        Starts the listener thread on first registration.
+
+        Args:
+            namespace: Cache namespace
+            local_cache: Local cache holding entries for that namespace
+        """
+        with self._lock:
+            self._caches.setdefault(namespace, []).append(local_cache)
+            if self._listener is None:
+                self._listener = threading.Thread(
+                    target=self._listen, name="near-cache-invalidation", daemon=True
+                )
+                self._listener.start()
+
+    def publish(
+        self,
+        redis_client: Redis,
+        namespace: str,
+        keys: Optional[List[str]] = None,
+        pattern: Optional[str] = None,
+    ) -> None:
+        """
+        Publish an invalidation for keys (or a pattern) of a namespace.
+
+        Args:
+            redis_client: Client used to publish
+            namespace: Cache namespace
+            keys: Keys to invalidate
+            pattern: Glob pattern to invalidate instead of explicit keys
+        """
+        message = {"origin": self.origin, "namespace": namespace}
+        if pattern is not None:
+            message["pattern"] = pattern
+        else:
+            message["keys"] = keys or []
+        try:
+            redis_client.publish(INVALIDATION_CHANNEL, json.dumps(message))
+        except Exception as e:
+            logger.warning(f"Failed to publish near-cache invalidation: {e}")
+
+    def handle_message(self, data: Any) -> None:
+        """
+        Apply an invalidation message received from the channel.
+
+        Messages published by this process are ignored since the local cache
+        was already updated by the writer.
+
+        Args:
+            data: Raw message payload
+        """
+        try:
+            message = json.loads(data)
+        except (TypeError, ValueError):
+            logger.warning(f"Ignoring malformed near-cache invalidation: {data!r}")
+            return
+
+        if message.get("origin") == self.origin:
+            return
+
+        with self._lock:
+            caches = list(self._caches.get(message.get("namespace"), []))
+        for local_cache in caches:
+            if "pattern" in message:
+                local_cache.delete_pattern(message["pattern"])
+            else:
+                local_cache.delete_many(message.get("keys", []))
+
+    def _clear_all(self) -> None:
+        """Drop every local entry, used when invalidations may have been missed."""
+        with self._lock:
+            caches = [c for group in self._caches.values() for c in group]
+        for local_cache in caches:
+            local_cache.clear()
+
+    def _listen(self) -> None:
+        """Listener loop; reconnects and flushes local state on failure."""
+        while True:
+            try:
+                pubsub = self.client_factory().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(INVALIDATION_CHANNEL)
+                for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self.handle_message(message.get("data"))
+            except Exception as e:
+                logger.warning(f"Near-cache invalidation listener error: {e}")
+            # Messages may have been lost while disconnected
+            self._clear_all()
+            time.sleep(1)
+
+
+_invalidation_bus: Optional[InvalidationBus] = None
+_invalidation_bus_lock = threading.Lock()
+
+
+def get_invalidation_bus(client_factory: Callable[[], Redis]) -> InvalidationBus:
+    """
+    Get the process-wide invalidation bus, creating it on first use.
+
+    Args:
+        client_factory: Callable returning a Redis client for the listener
+
+    Returns:
+        The shared InvalidationBus
+    """
+    global _invalidation_bus
+    if _invalidation_bus is None:
+        with _invalidation_bus_lock:
+            if _invalidation_bus is None:
+                _invalidation_bus = InvalidationBus(client_factory)
+    return _invalidation_bus
@@ -0,0 +1,181 @@
+"""
+Checkpoints of reindex jobs, so a failed job resumes where it stopped.
+
+A checkpoint per (domain service, entity type) records how many pages are
+written, counting only pages with every earlier page written too (pages
+complete out of order on the pipeline), along with the cursor of the next
+page and whether the entity type is done. Checkpoints are saved at most
+every few seconds from the planning thread, and once more when the run
+ends. A resumed job skips entity types that are done and starts the others
+after their last contiguous written page; pages written past it are written
+again, which upserts make harmless. Counts cover the contiguous pages only,
+so pages written again are not counted twice.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.utils.reindex_planner import PageBatch, UnitResult, WorkUnit, is_last_page
+from app.utils.reindex_progress import ReindexProgress
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Checkpoint:
+    """Progress through one entity type of one domain service."""
+
+    service_id: str
+    entity_type: str
+    # Pages 1..pages_done are written
+    pages_done: int = 0
+    # Cursor of page pages_done + 1, for services paging by cursor
+    next_cursor: Optional[str] = None
+    cursor_paged: bool = False
+    total_pages: Optional[int] = None
+    # Entities of pages 1..pages_done
+    indexed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    completed: bool = False
+    # Written pages past pages_done: page -> (next cursor, last page, result)
+    ahead: Dict[int, Tuple[Optional[str], bool, UnitResult]] = field(
+        default_factory=dict
+    )
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        """Key of the checkpoint."""
+        return self.service_id, self.entity_type
+
+
+class CheckpointTracker:
+    """Tracks written pages of a reindex run and saves checkpoints periodically."""
+
+    def __init__(
+        self,
+        per_page: int,
+        save: Callable[[List[Checkpoint]], None],
+        interval_seconds: float,
+        checkpoints: Iterable[Checkpoint] = (),
+    ):
+        """
+        Initialize the tracker.
+
+        Args:
+            per_page: Page size of the run
+            save: Persists changed checkpoints
+            interval_seconds: Minimum time between saves
+            checkpoints: Checkpoints of a previous run to resume from
+        """
+        self.per_page = per_page
+        self.save = save
+        self.interval_seconds = interval_seconds
+        self._checkpoints: Dict[Tuple[str, str], Checkpoint] = {
+            checkpoint.key: checkpoint for checkpoint in checkpoints
+        }
+        self._dirty: Set[Tuple[str, str]] = set()
+        self._last_save = time.monotonic()
+
+    def resume_units(self, pairs: Iterable[Tuple[Any, str]]) -> List[WorkUnit]:
+        """
+        Plan the units that continue each (service, entity type) pair.
+
+        Args:
+            pairs: (service, entity type) pairs of the job
+
+        Returns:
+            Units starting after the checkpoint of each pair that is not done
+        """
+        units = []
+        for service, entity_type in pairs:
+            checkpoint = self._checkpoints.get((str(service.id), entity_type))
+            if checkpoint is None:
+                units.append(WorkUnit(service, entity_type))
+                continue
+            if checkpoint.completed:
+                continue
+
+            first = checkpoint.pages_done + 1
+            if (
+                checkpoint.total_pages is not None
+                and not checkpoint.cursor_paged
+                and first > 1
+            ):
+                # Only page 1 plans the rest of a counted entity type
+                units.extend(
+                    WorkUnit(service, entity_type, page)
+                    for page in range(first, checkpoint.total_pages + 1)
+                )
+            else:
+                units.append(
+                    WorkUnit(service, entity_type, first, cursor=checkpoint.next_cursor)
+                )
+        return units
+
+    def record(self, unit: WorkUnit, batch: PageBatch, result: UnitResult) -> None:
+        """
+        Record a written page (the planner's on_result hook).
+
+        Args:
+            unit: The written unit
+            batch: Its page
+            result: Its write result
+        """
+        key = (unit.service_key, unit.entity_type)
+        checkpoint = self._checkpoints.get(key)
+        if checkpoint is None:
+            checkpoint = self._checkpoints[key] = Checkpoint(*key)
+
+        checkpoint.cursor_paged = checkpoint.cursor_paged or batch.cursor_paged
+        if batch.total_pages is not None:
+            checkpoint.total_pages = batch.total_pages
+        checkpoint.ahead[unit.page] = (
+            batch.next_cursor,
+            is_last_page(unit, batch, self.per_page),
+            result,
+        )
+        while checkpoint.pages_done + 1 in checkpoint.ahead:
+            next_cursor, last, done = checkpoint.ahead.pop(checkpoint.pages_done + 1)
+            checkpoint.pages_done += 1
+            checkpoint.next_cursor = next_cursor
+            checkpoint.completed = checkpoint.completed or last
+            checkpoint.indexed += done.indexed
+            checkpoint.failed += done.failed
+            checkpoint.skipped += done.skipped
+        self._dirty.add(key)
+
+        if time.monotonic() - self._last_save >= self.interval_seconds:
+            self.flush()
+
+    def totals(self) -> ReindexProgress:
+        """
+        Get the counts of the checkpointed pages, where a resumed run starts.
+
+        Returns:
+            ReindexProgress with the fetched, indexed, failed and skipped counts
+        """
+        progress = ReindexProgress()
+        for checkpoint in self._checkpoints.values():
+            progress.indexed += checkpoint.indexed
+            progress.failed += checkpoint.failed
+            progress.skipped += checkpoint.skipped
+        progress.fetched = progress.indexed + progress.failed + progress.skipped
+        return progress
+
+    def flush(self) -> None:
+        """Save the checkpoints changed since the last save."""
+        if not self._dirty:
+            return
+        changed = [self._checkpoints[key] for key in self._dirty]
+        try:
+            self.save(changed)
+        except Exception as e:
+            # Kept dirty, the next save retries them
+            logger.warning(f"Failed to save reindex checkpoints: {e}")
+            return
+        finally:
+            self._last_save = time.monotonic()
+        self._dirty.clear()
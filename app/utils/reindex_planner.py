@@ -0,0 +1,329 @@
+"""
+Concurrent execution of reindex jobs split into work units.
+
+A job is split into one unit per (service, entity type, page). The first
+page of every entity type is planned up front. Services paging by cursor
+return the cursor of the next page, which plans that page; their pages run
+one after another, as cursors are only known page by page, but deep pages
+stay cheap and stable while rows change. Otherwise page 1 tells how many
+pages there are, and the remaining pages are planned as units of their own.
+Domain services that report neither get one page at a time, each full page
+planning the next.
+
+Units go through a pipeline of three stages, each on its own worker pool:
+fetching the page from the domain service, building its documents and
+writing them to the providers. Follow-up pages are planned as soon as a
+page is fetched, so the next fetch does not wait for the previous write.
+At most a given number of fetches per domain service run at once, writes to
+each provider are limited separately by a ProviderLimiter, and fetching
+pauses while too many fetched pages are waiting to be written, which bounds
+memory.
+"""
+
+import logging
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Pipeline stages
+FETCH = "fetch"
+BUILD = "build"
+WRITE = "write"
+
+
+@dataclass(frozen=True)
+class WorkUnit:
+    """One page of one entity type of one domain service."""
+
+    service: Any
+    entity_type: str
+    page: int = 1
+    # Cursor of the page, for services paging by cursor
+    cursor: Optional[str] = None
+
+    @property
+    def service_key(self) -> str:
+        """Key the per-service concurrency limit applies to."""
+        return str(getattr(self.service, "id", self.service))
+
+
+@dataclass
+class PageBatch:
+    """A fetched page, handed from one pipeline stage to the next."""
+
+    # Entities once fetched, documents once built
+    items: List[Any] = field(default_factory=list)
+    # Items that failed before the write stage
+    failed: int = 0
+    total_in_page: int = 0
+    # Entity count reported by the domain service, if any
+    total: Optional[int] = None
+    # Page count reported by the domain service, if any
+    total_pages: Optional[int] = None
+    # Cursor of the next page reported by the domain service, if any
+    next_cursor: Optional[str] = None
+    # Whether the domain service pages by cursor (a null next_cursor ends
+    # the entity type)
+    cursor_paged: bool = False
+
+
+@dataclass
+class UnitResult:
+    """Outcome of a work unit."""
+
+    indexed: int = 0
+    failed: int = 0
+    # Documents providers left alone as unchanged
+    skipped: int = 0
+
+
+def is_last_page(unit: WorkUnit, batch: PageBatch, per_page: int) -> bool:
+    """
+    Whether a fetched page is the last of its entity type.
+
+    Args:
+        unit: The unit of the page
+        batch: The fetched page
+        per_page: Page size the page was fetched with
+
+    Returns:
+        True if no page follows it
+    """
+    if batch.next_cursor:
+        return False
+    if batch.cursor_paged:
+        return True
+    if batch.total_pages is not None:
+        return unit.page >= batch.total_pages
+    return batch.total_in_page < per_page
+
+
+class ProviderLimiter:
+    """Caps concurrent writes per provider."""
+
+    def __init__(self, limits: Dict[str, int]):
+        """
+        Initialize the limiter.
+
+        Args:
+            limits: Maximum concurrent writes by provider name; providers
+                without a limit are not capped
+        """
+        self.limits = {name: max(limit, 1) for name, limit in limits.items()}
+        self._semaphores = {
+            name: threading.BoundedSemaphore(limit)
+            for name, limit in self.limits.items()
+        }
+
+    @property
+    def max_concurrency(self) -> Optional[int]:
+        """Most writes any provider allows at once, None if none is capped."""
+        return max(self.limits.values(), default=None)
+
+    @contextmanager
+    def slot(self, provider_name: str) -> Iterator[None]:
+        """Hold one of the provider's write slots."""
+        semaphore = self._semaphores.get(provider_name)
+        if semaphore is None:
+            yield
+            return
+        with semaphore:
+            yield
+
+
+class ReindexPlanner:
+    """Pipelines work units through fetch, build and write stages."""
+
+    def __init__(
+        self,
+        fetch_unit: Callable[[WorkUnit], PageBatch],
+        build_unit: Callable[[WorkUnit, PageBatch], PageBatch],
+        write_unit: Callable[[WorkUnit, PageBatch], UnitResult],
+        workers: int,
+        per_page: int,
+        write_workers: Optional[int] = None,
+        build_workers: int = 1,
+        max_buffered_pages: Optional[int] = None,
+        service_limits: Optional[Dict[str, int]] = None,
+        default_service_limit: int = 4,
+        on_result: Optional[Callable[[WorkUnit, PageBatch, UnitResult], None]] = None,
+        on_fetch: Optional[Callable[[WorkUnit, PageBatch], None]] = None,
+    ):
+        """
+        Initialize the planner.
+
+        Args:
+            fetch_unit: Fetches the page of a work unit (stages are called
+                on worker threads)
+            build_unit: Builds the documents of a fetched page
+            write_unit: Writes the documents of a built page
+            workers: Size of the fetch pool
+            per_page: Page size, a shorter page is the last one
+            write_workers: Size of the write pool (defaults to workers)
+            build_workers: Size of the build pool
+            max_buffered_pages: Maximum pages fetched (or being fetched) but
+                not yet written; defaults to twice the write pool
+            service_limits: Maximum fetches in flight by service key
+            default_service_limit: Limit of services without their own
+            on_result: Called on the planning thread with every written unit,
+                its built page and its result
+            on_fetch: Called on the planning thread with every fetched unit
+                and its page
+        """
+        self.fetch_unit = fetch_unit
+        self.build_unit = build_unit
+        self.write_unit = write_unit
+        self.workers = max(workers, 1)
+        self.per_page = per_page
+        self.write_workers = max(write_workers or self.workers, 1)
+        self.build_workers = max(build_workers, 1)
+        self.max_buffered_pages = max(max_buffered_pages or 2 * self.write_workers, 1)
+        self.service_limits = service_limits or {}
+        self.default_service_limit = max(default_service_limit, 1)
+        self.on_result = on_result
+        self.on_fetch = on_fetch
+
+    def _next_units(self, unit: WorkUnit, batch: PageBatch) -> List[WorkUnit]:
+        """Plan the pages that follow a fetched unit."""
+        if batch.next_cursor:
+            return [
+                WorkUnit(
+                    unit.service,
+                    unit.entity_type,
+                    unit.page + 1,
+                    cursor=batch.next_cursor,
+                )
+            ]
+        if batch.cursor_paged:
+            return []  # Last page of a cursor-paged entity type
+        if batch.total_pages is not None:
+            # Page 1 plans every other page at once
+            if unit.page != 1:
+                return []
+            return [
+                WorkUnit(unit.service, unit.entity_type, page)
+                for page in range(2, batch.total_pages + 1)
+            ]
+        if batch.total_in_page < self.per_page:
+            return []  # Last page
+        return [WorkUnit(unit.service, unit.entity_type, unit.page + 1)]
+
+    def run(self, units: List[WorkUnit]) -> UnitResult:
+        """
+        Run units and the pages they plan until none are left.
+
+        Args:
+            units: Initial units, usually page 1 of every entity type
+
+        Returns:
+            UnitResult with the indexed and failed counts of every unit
+
+        Raises:
+            Exception: The first failure of any stage; work in flight is
+                awaited and no new work is started
+        """
+        totals = UnitResult()
+        pending: Deque[WorkUnit] = deque(units)
+        # Pages waiting for a build or write worker
+        to_build: Deque[Tuple[WorkUnit, PageBatch]] = deque()
+        to_write: Deque[Tuple[WorkUnit, PageBatch]] = deque()
+        # Stage, unit and input page of every running stage call
+        in_flight: Dict[Future, Tuple[str, WorkUnit, Optional[PageBatch]]] = {}
+        running = {FETCH: 0, BUILD: 0, WRITE: 0}
+        per_service: Dict[str, int] = {}
+        # Pages being fetched or fetched, and not yet written
+        buffered = 0
+        error: Optional[BaseException] = None
+
+        with (
+            ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="reindex-fetch"
+            ) as fetch_pool,
+            ThreadPoolExecutor(
+                max_workers=self.build_workers, thread_name_prefix="reindex-build"
+            ) as build_pool,
+            ThreadPoolExecutor(
+                max_workers=self.write_workers, thread_name_prefix="reindex-write"
+            ) as write_pool,
+        ):
+            pools = {FETCH: fetch_pool, BUILD: build_pool, WRITE: write_pool}
+
+            def submit(stage: str, fn: Callable, unit: WorkUnit, *args: Any) -> None:
+                running[stage] += 1
+                in_flight[pools[stage].submit(fn, unit, *args)] = (
+                    stage,
+                    unit,
+                    args[0] if args else None,
+                )
+
+            while (error is None and (pending or to_build or to_write)) or in_flight:
+                if error is None:
+                    # Later stages first, writes free buffered pages
+                    while to_write and running[WRITE] < self.write_workers:
+                        submit(WRITE, self.write_unit, *to_write.popleft())
+                    while to_build and running[BUILD] < self.build_workers:
+                        submit(BUILD, self.build_unit, *to_build.popleft())
+
+                    # Fetch every pending unit whose service has a free slot,
+                    # while there is room for its page
+                    deferred: Deque[WorkUnit] = deque()
+                    while (
+                        pending
+                        and running[FETCH] < self.workers
+                        and buffered < self.max_buffered_pages
+                    ):
+                        unit = pending.popleft()
+                        limit = self.service_limits.get(
+                            unit.service_key, self.default_service_limit
+                        )
+                        if per_service.get(unit.service_key, 0) >= limit:
+                            deferred.append(unit)
+                            continue
+                        per_service[unit.service_key] = (
+                            per_service.get(unit.service_key, 0) + 1
+                        )
+                        buffered += 1
+                        submit(FETCH, self.fetch_unit, unit)
+                    pending.extendleft(reversed(deferred))
+
+                if not in_flight:
+                    break
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, unit, batch = in_flight.pop(future)
+                    running[stage] -= 1
+                    if stage == FETCH:
+                        per_service[unit.service_key] -= 1
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.error(
+                            f"Reindexing {unit.entity_type} page {unit.page} "
+                            f"failed at {stage}: {e}"
+                        )
+                        error = error or e
+                        continue
+                    if stage == FETCH:
+                        # Plan the next pages before this one is written
+                        pending.extend(self._next_units(unit, result))
+                        if self.on_fetch:
+                            self.on_fetch(unit, result)
+                        to_build.append((unit, result))
+                    elif stage == BUILD:
+                        to_write.append((unit, result))
+                    else:
+                        buffered -= 1
+                        totals.indexed += result.indexed
+                        totals.failed += result.failed
+                        totals.skipped += result.skipped
+                        if self.on_result:
+                            self.on_result(unit, batch, result)
+
+        if error is not None:
+            raise error
+        return totals
@@ -0,0 +1,202 @@
+"""
+Progress, throughput and ETA of reindex jobs.
+
+The tracker counts the entities a run fetches, indexes, fails and skips as
+unchanged, from the planning thread. Its estimate of the entities left comes
+from what the domain services report on their pages: pagination.total, or
+else total_pages times the page size. Entity types reporting neither are
+known once their last page is fetched, so until then the job has no total
+and no ETA. Throughput is entities written per second since the run started.
+
+Gauges are updated on every written page and removed when the run ends, so
+finished jobs do not leave a series per job behind; the job row is saved at
+most every few seconds, so progress does not cost a commit per page.
+"""
+
+import logging
+import time
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.utils.metrics import (
+    REINDEX_DOCUMENTS_TOTAL,
+    REINDEX_ETA_SECONDS,
+    REINDEX_PROGRESS,
+    REINDEX_THROUGHPUT,
+)
+from app.utils.reindex_planner import PageBatch, UnitResult, WorkUnit, is_last_page
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReindexProgress:
+    """Counters and estimates of a reindex job."""
+
+    fetched: int = 0
+    indexed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    # Entities of the job, once every entity type reported its size
+    total: Optional[int] = None
+    docs_per_second: Optional[float] = None
+    eta_seconds: Optional[float] = None
+    # Fraction of the total done (0.0 to 1.0)
+    progress: Optional[float] = None
+
+
+class ProgressTracker:
+    """Tracks a reindex run and publishes its progress."""
+
+    def __init__(
+        self,
+        job_id: str,
+        units: List[WorkUnit],
+        per_page: int,
+        save: Callable[[ReindexProgress], None],
+        interval_seconds: float,
+        start: Optional[ReindexProgress] = None,
+    ):
+        """
+        Initialize the tracker.
+
+        Args:
+            job_id: ID of the job, labelling its gauges
+            units: Initial units of the run, one or more per entity type
+            per_page: Page size of the run
+            save: Persists a progress snapshot
+            interval_seconds: Minimum time between saves
+            start: Counters of a previous run of the job, when resuming
+        """
+        self.job_id = job_id
+        self.per_page = per_page
+        self.save = save
+        self.interval_seconds = interval_seconds
+        self._start = start or ReindexProgress()
+        self._counts = replace(self._start, total=None)
+        # First page of every entity type in this run, pages before it were
+        # done by a previous run
+        self._first_page: Dict[Tuple[str, str], int] = {}
+        for unit in units:
+            key = (unit.service_key, unit.entity_type)
+            self._first_page[key] = min(self._first_page.get(key, unit.page), unit.page)
+        # Entities this run expects and has fetched by entity type
+        self._expected: Dict[Tuple[str, str], int] = {}
+        self._fetched: Dict[Tuple[str, str], int] = {}
+        # Entities of the pages written in this run
+        self._written = 0
+        self._started = time.monotonic()
+        self._last_save = self._started
+        self._finished = False
+
+    def record_fetch(self, unit: WorkUnit, batch: PageBatch) -> None:
+        """
+        Record a fetched page (the planner's on_fetch hook).
+
+        Args:
+            unit: The fetched unit
+            batch: Its page
+        """
+        key = (unit.service_key, unit.entity_type)
+        self._counts.fetched += batch.total_in_page
+        self._fetched[key] = self._fetched.get(key, 0) + batch.total_in_page
+        REINDEX_DOCUMENTS_TOTAL.labels(outcome="fetched").inc(batch.total_in_page)
+
+        first = self._first_page.get(key, 1)
+        if batch.total is not None:
+            self._expected[key] = max(batch.total - (first - 1) * self.per_page, 0)
+        elif batch.total_pages is not None:
+            self._expected[key] = max(batch.total_pages - first + 1, 0) * self.per_page
+        elif is_last_page(unit, batch, self.per_page):
+            # Pages of entity types that report no size are fetched in order
+            self._expected[key] = self._fetched[key]
+
+    def record(self, unit: WorkUnit, batch: PageBatch, result: UnitResult) -> None:
+        """
+        Record a written page (the planner's on_result hook).
+
+        Args:
+            unit: The written unit
+            batch: Its page
+            result: Its write result
+        """
+        self._counts.indexed += result.indexed
+        self._counts.failed += result.failed
+        self._counts.skipped += result.skipped
+        self._written += batch.total_in_page
+        for outcome in ("indexed", "failed", "skipped"):
+            REINDEX_DOCUMENTS_TOTAL.labels(outcome=outcome).inc(
+                getattr(result, outcome)
+            )
+
+        snapshot = self.snapshot()
+        self._publish(snapshot)
+        if time.monotonic() - self._last_save >= self.interval_seconds:
+            self._save(snapshot)
+
+    def snapshot(self) -> ReindexProgress:
+        """
+        Get the current counters and estimates.
+
+        Returns:
+            ReindexProgress of the job so far
+        """
+        progress = replace(self._counts)
+        elapsed = time.monotonic() - self._started
+        if self._written and elapsed > 0:
+            progress.docs_per_second = round(self._written / elapsed, 1)
+
+        expected = None
+        if self._first_page and set(self._expected) >= set(self._first_page):
+            expected = sum(self._expected.values())
+        if self._finished:
+            expected = self._written
+        if expected is None:
+            return progress
+
+        # Entities fetched by a previous run count as done
+        done = self._start.fetched + self._written
+        progress.total = self._start.fetched + max(expected, self._written)
+        progress.progress = round(done / progress.total, 4) if progress.total else 1.0
+        remaining = max(expected - self._written, 0)
+        if not remaining:
+            progress.eta_seconds = 0.0
+        elif progress.docs_per_second:
+            progress.eta_seconds = round(remaining / (self._written / elapsed), 1)
+        return progress
+
+    def finish(self) -> None:
+        """Mark the run complete, save its final progress and remove its gauges."""
+        self._finished = True
+        self._save(self.snapshot())
+        self.close()
+
+    def close(self) -> None:
+        """Remove the gauges of the job (the job row keeps its progress)."""
+        for gauge in (REINDEX_PROGRESS, REINDEX_THROUGHPUT, REINDEX_ETA_SECONDS):
+            try:
+                gauge.remove(self.job_id)
+            except KeyError:
+                # Never set during the run
+                pass
+
+    def flush(self) -> None:
+        """Save the current progress."""
+        self._save(self.snapshot())
+
+    def _publish(self, snapshot: ReindexProgress) -> None:
+        """Set the gauges of the job."""
+        if snapshot.progress is not None:
+            REINDEX_PROGRESS.labels(job_id=self.job_id).set(snapshot.progress)
+        if snapshot.docs_per_second is not None:
+            REINDEX_THROUGHPUT.labels(job_id=self.job_id).set(snapshot.docs_per_second)
+        if snapshot.eta_seconds is not None:
+            REINDEX_ETA_SECONDS.labels(job_id=self.job_id).set(snapshot.eta_seconds)
+
+    def _save(self, snapshot: ReindexProgress) -> None:
+        """Persist a snapshot, logging failures (the next save retries)."""
+        self._last_save = time.monotonic()
+        try:
+            self.save(snapshot)
+        except Exception as e:
+            logger.warning(f"Failed to save progress of reindex job {self.job_id}: {e}")
@@ -0,0 +1,105 @@
+"""
+Pluggable value serializers for the Redis cache.
+"""
+
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Union
+
+try:  # Optional faster JSON codec
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+try:  # Optional compact binary format
+    import msgpack
+except ImportError:  # pragma: no cover - depends on the environment
+    msgpack = None
+
+
+class Serializer(ABC):
+    """Abstract serializer. Text serializers produce str, binary ones bytes."""
+
+    name = "base"
+    binary = False
+
+    @abstractmethod
+    def dumps(self, value: Any) -> Union[str, bytes]:
+        """Serialize a value."""
+        pass
+
+    @abstractmethod
+    def loads(self, data: Union[str, bytes]) -> Any:
+        """Deserialize a value."""
+        pass
+
+
+class JsonSerializer(Serializer):
+    """Standard library JSON serializer."""
+
+    name = "json"
+
+    def dumps(self, value: Any) -> str:
+        return json.dumps(value)
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonSerializer(Serializer):
+    """JSON serializer backed by orjson (wire-compatible with JsonSerializer)."""
+
+    name = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise ValueError("orjson is not installed")
+
+    def dumps(self, value: Any) -> str:
+        return orjson.dumps(value).decode("utf-8")
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return orjson.loads(data)
+
+
+class MsgpackSerializer(Serializer):
+    """Compact binary serializer backed by msgpack."""
+
+    name = "msgpack"
+    binary = True
+
+    def __init__(self):
+        if msgpack is None:
+            raise ValueError("msgpack is not installed")
+
+    def dumps(self, value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return msgpack.unpackb(data, raw=False)
+
+
+SERIALIZERS = {
+    JsonSerializer.name: JsonSerializer,
+    OrjsonSerializer.name: OrjsonSerializer,
+    MsgpackSerializer.name: MsgpackSerializer,
+}
+
+
+def get_serializer(name: str) -> Serializer:
+    """
+    Get a serializer instance by name.
+
+    Args:
+        name: Serializer name ("json", "orjson" or "msgpack")
+
+    Returns:
+        Serializer instance
+
+    Raises:
+        ValueError: If the serializer is unknown or its library is not installed
+    """
+    serializer_class = SERIALIZERS.get(name)
+    if serializer_class is None:
+        raise ValueError(f"Unknown cache serializer: {name}")
+    return serializer_class()
@@ -0,0 +1,50 @@
+import os
+import signal
+import socket
+
+from app.config import get_settings
+from app.core.logging_config import LoggingConfig, get_logger
+from app.db import SessionLocal
+from app.providers.bulk_writer import BulkWriter
+from app.providers.factory import get_providers
+from app.settings_manager import SettingsManager
+
+# Initialize logging configuration
+LoggingConfig()
+logger = get_logger("bulk_writer")
+
+
+def main() -> None:
+    settings = get_settings()
+
+    # BULK_WRITER_SHARD_IDS="0,2" restricts this process to a subset of shards
+    shard_ids = os.getenv("BULK_WRITER_SHARD_IDS")
+    shards = [int(s) for s in shard_ids.split(",")] if shard_ids else None
+    consumer = os.getenv(
+        "BULK_WRITER_CONSUMER", f"bulk-writer@{socket.gethostname()}-{os.getpid()}"
+    )
+
+    def load_providers():
+        db = SessionLocal()
+        try:
+            return get_providers(settings, SettingsManager(db))
+        finally:
+            db.close()
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        logger.info("Bulk writer stopping, flushing buffers...")
+        stopping = True
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    writer = BulkWriter(settings, load_providers, consumer, shards=shards)
+    logger.info(f"Bulk writer {consumer} consuming {len(writer.streams)} shard(s)")
+    writer.run(lambda: stopping)
+
+
+if __name__ == "__main__":
+    main()
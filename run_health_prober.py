@@ -0,0 +1,43 @@
+import signal
+
+from app.config import get_settings
+from app.core.logging_config import LoggingConfig, get_logger
+from app.db import SessionLocal
+from app.providers.factory import get_providers
+from app.providers.health import HealthProber
+from app.settings_manager import SettingsManager
+
+# Initialize logging configuration
+LoggingConfig()
+logger = get_logger("health_prober")
+
+
+def main() -> None:
+    settings = get_settings()
+
+    def load_providers():
+        db = SessionLocal()
+        try:
+            # Probes must reach the provider, whatever its circuit state
+            return get_providers(
+                settings, SettingsManager(db), with_circuit_breaker=False
+            )
+        finally:
+            db.close()
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        logger.info("Health prober stopping...")
+        stopping = True
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    logger.info("Health prober started")
+    HealthProber(settings, load_providers).run(lambda: stopping)
+
+
+if __name__ == "__main__":
+    main()
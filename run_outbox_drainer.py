@@ -0,0 +1,45 @@
+import signal
+import time
+
+from app.commands.drain_index_outbox_command import DrainIndexOutboxCommand
+from app.config import get_settings
+from app.core.logging_config import LoggingConfig, get_logger
+from app.db import SessionLocal
+
+# Initialize logging configuration
+LoggingConfig()
+logger = get_logger("outbox_drainer")
+
+
+def main() -> None:
+    settings = get_settings()
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        logger.info("Outbox drainer stopping...")
+        stopping = True
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    logger.info("Outbox drainer started")
+    while not stopping:
+        db = SessionLocal()
+        try:
+            counts = DrainIndexOutboxCommand(db).execute()
+        except Exception as e:
+            logger.error(f"Outbox drain failed: {e}", exc_info=True)
+            counts = {"claimed": 0}
+        finally:
+            db.close()
+
+        if counts["claimed"]:
+            logger.info(f"Outbox batch drained: {counts}")
+        else:
+            # Idle: wait for new rows instead of polling in a tight loop
+            time.sleep(settings.index_outbox_poll_interval_seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import os
+import signal
+import socket
+
+from app.config import get_settings
+from app.core.logging_config import LoggingConfig, get_logger
+from app.db import SessionLocal
+from app.providers.circuit_breaker import SpoolDrainer
+from app.providers.factory import get_providers
+from app.settings_manager import SettingsManager
+
+# Initialize logging configuration
+LoggingConfig()
+logger = get_logger("spool_drainer")
+
+
+def main() -> None:
+    settings = get_settings()
+    consumer = os.getenv(
+        "SPOOL_DRAINER_CONSUMER", f"spool-drainer@{socket.gethostname()}-{os.getpid()}"
+    )
+
+    def load_providers():
+        db = SessionLocal()
+        try:
+            # Replays must reach the provider, not the spool
+            return get_providers(
+                settings, SettingsManager(db), with_circuit_breaker=False
+            )
+        finally:
+            db.close()
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        logger.info("Spool drainer stopping...")
+        stopping = True
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    logger.info(f"Spool drainer {consumer} started")
+    SpoolDrainer(settings, load_providers, consumer).run(lambda: stopping)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+"""
+Benchmark provider write throughput against in-process fakes.
+
+Two targets are measured without touching a real search service:
+
+- recording: an in-memory SearchProvider that records every write, which
+  measures the provider layer itself (hashing, chunking, serialization)
+- http-typesense / http-algolia: the real TypesenseProvider talking to a
+  local HTTP stand-in that adds the latency, per-KB transfer time and
+  request size limit of the named service
+
+upsert, upsert_batch and delete_batch are swept over batch sizes, document
+sizes and client concurrency, and records/sec and bytes/sec are reported.
+
+Usage:
+    python scripts/benchmark_providers.py
+    python scripts/benchmark_providers.py --targets recording --records 5000
+    python scripts/benchmark_providers.py --batch-sizes 100 1000 --json out.json
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from itertools import product
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import Settings  # noqa: E402
+from app.constants.write_consistency import WriteConsistency  # noqa: E402
+from app.providers.base import SearchProvider  # noqa: E402
+from app.providers.batching import chunk_documents  # noqa: E402
+from app.providers.index_catalog import IndexSettings  # noqa: E402
+from app.providers.typesense_provider import TypesenseProvider  # noqa: E402
+
+OPERATIONS = ("upsert", "upsert_batch", "delete_batch")
+
+
+@dataclass(frozen=True)
+class StandInProfile:
+    """Latency and limits the HTTP stand-in imitates."""
+
+    name: str
+    # Fixed latency of every request
+    latency_ms: float
+    # Transfer time per KB of request body
+    per_kb_ms: float
+    # Larger request bodies are rejected with 413
+    max_body_bytes: int
+
+
+PROFILES = {
+    "typesense": StandInProfile("typesense", 2.0, 0.005, 100 * 1024 * 1024),
+    "algolia": StandInProfile("algolia", 20.0, 0.02, 10 * 1024 * 1024),
+}
+
+
+@dataclass
+class BenchmarkResult:
+    """Throughput of one benchmark case."""
+
+    target: str
+    operation: str
+    batch_size: int
+    doc_bytes: int
+    concurrency: int
+    records: int
+    errors: int
+    seconds: float
+    bytes_sent: int
+
+    @property
+    def records_per_sec(self) -> float:
+        return self.records / self.seconds if self.seconds else 0.0
+
+    @property
+    def bytes_per_sec(self) -> float:
+        return self.bytes_sent / self.seconds if self.seconds else 0.0
+
+
+class RecordingProvider(SearchProvider):
+    """In-memory provider that records writes and their serialized size."""
+
+    def __init__(self, settings: Settings):
+        self.batch_max_records = settings.provider_batch_max_records
+        self.batch_max_bytes = settings.provider_batch_max_bytes
+        self.documents: Dict[str, Dict[str, Any]] = {}
+        self.calls: List[str] = []
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+
+    @property
+    def name(self) -> str:
+        return "recording"
+
+    def _record(self, operation: str, payload: Any) -> None:
+        size = len(json.dumps(payload, default=str).encode("utf-8"))
+        with self._lock:
+            self.calls.append(operation)
+            self.bytes_sent += size
+
+    def upsert(
+        self,
+        document: Dict[str, Any],
+        force: bool = False,
+        consistency: Optional[WriteConsistency] = None,
+    ) -> None:
+        self.upsert_batch([document], force=force, consistency=consistency)
+
+    def upsert_batch(
+        self,
+        documents: List[Dict[str, Any]],
+        force: bool = False,
+        consistency: Optional[WriteConsistency] = None,
+    ) -> None:
+        by_index: Dict[str, List[Dict[str, Any]]] = {}
+        for doc in documents:
+            by_index.setdefault(
+                self._get_index_name(doc["source"], doc["type"]), []
+            ).append(doc)
+        for index_name, group in by_index.items():
+            self._ensure_index_once(index_name, group[0]["type"])
+            written, _ = self._skip_unchanged(index_name, group, force)
+            for chunk in chunk_documents(
+                written, self.batch_max_records, self.batch_max_bytes
+            ):
+                self._record("upsert_batch", chunk)
+                with self._lock:
+                    for doc in chunk:
+                        self.documents[f"{index_name}/{self._get_object_id(doc)}"] = doc
+
+    def delete(
+        self,
+        index_name: str,
+        document_id: str,
+        consistency: Optional[WriteConsistency] = None,
+    ) -> None:
+        self.delete_batch(index_name, [document_id], consistency)
+
+    def delete_batch(
+        self,
+        index_name: str,
+        document_ids: List[str],
+        consistency: Optional[WriteConsistency] = None,
+    ) -> None:
+        self._record("delete_batch", document_ids)
+        with self._lock:
+            for document_id in document_ids:
+                self.documents.pop(f"{index_name}/{document_id}", None)
+
+    def ensure_index(
+        self, index_name: str, index_settings: Optional[IndexSettings] = None
+    ) -> None:
+        self._record("ensure_index", index_name)
+
+    def swap_index(self, shadow_name: str, index_name: str) -> None:
+        self._record("swap_index", [shadow_name, index_name])
+
+    def drop_index(self, index_name: str) -> None:
+        self._record("drop_index", index_name)
+
+    def healthcheck(self) -> bool:
+        return True
+
+
+class StandInServer:
+    """Local HTTP server answering the Typesense write API with a profile's latency."""
+
+    def __init__(self, profile: StandInProfile):
+        self.profile = profile
+        self.bytes_received = 0
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self) -> "StandInServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _handler(self) -> type:
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out as separate writes; with Nagle on, the
+            # body waits for the client's delayed ACK (~40 ms per request)
+            disable_nagle_algorithm = True
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def _reply(self, status: int, body: str) -> None:
+                payload = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _read_body(self) -> bytes:
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                # Delete IDs travel in the query string
+                sent = len(body) + len(urlparse(self.path).query)
+                with stand_in._lock:
+                    stand_in.bytes_received += sent
+                profile = stand_in.profile
+                time.sleep(
+                    (profile.latency_ms + profile.per_kb_ms * sent / 1024) / 1000
+                )
+                return body
+
+            def do_GET(self) -> None:
+                self._read_body()
+                if self.path == "/health":
+                    self._reply(200, '{"ok": true}')
+                else:
+                    self._reply(200, json.dumps({"name": self.path.split("/")[-1]}))
+
+            def do_POST(self) -> None:
+                body = self._read_body()
+                if len(body) > stand_in.profile.max_body_bytes:
+                    self._reply(413, '{"message": "Request body too large"}')
+                    return
+                lines = body.decode("utf-8").splitlines() if body else []
+                self._reply(200, "\n".join('{"success": true}' for _ in lines))
+
+            def do_DELETE(self) -> None:
+                self._read_body()
+                filter_by = parse_qs(urlparse(self.path).query).get("filter_by", [""])
+                self._reply(
+                    200, json.dumps({"num_deleted": filter_by[0].count("`") // 2})
+                )
+
+        return Handler
+
+
+def make_documents(count: int, doc_bytes: int, run: str) -> List[Dict[str, Any]]:
+    """Build documents of roughly doc_bytes serialized bytes each."""
+    return [
+        {
+            "id": str(i),
+            "objectID": str(i),
+            "type": "pets",
+            "source": f"/bench-{run}",
+            "name": f"Pet {i}",
+            "body": "x" * max(doc_bytes - 120, 0),
+        }
+        for i in range(count)
+    ]
+
+
+def run_case(
+    target: str,
+    provider: SearchProvider,
+    bytes_sent: Callable[[], int],
+    operation: str,
+    batch_size: int,
+    doc_bytes: int,
+    concurrency: int,
+    records: int,
+    run: str,
+) -> BenchmarkResult:
+    """Write records documents with concurrency client threads and time it."""
+    documents = make_documents(records, doc_bytes, run)
+    if operation == "delete_batch":
+        provider.upsert_batch(documents, force=True)
+        ids = [doc["id"] for doc in documents]
+        index_name = provider._get_index_name(documents[0]["source"], "pets")
+        calls = [
+            (
+                lambda chunk=ids[i : i + batch_size]: provider.delete_batch(
+                    index_name, chunk
+                )
+            )
+            for i in range(0, records, batch_size)
+        ]
+    elif operation == "upsert":
+        calls = [
+            (lambda doc=doc: provider.upsert(doc, force=True)) for doc in documents
+        ]
+    else:
+        calls = [
+            (
+                lambda chunk=documents[i : i + batch_size]: provider.upsert_batch(
+                    chunk, force=True
+                )
+            )
+            for i in range(0, records, batch_size)
+        ]
+
+    def call(fn: Callable[[], Any]) -> bool:
+        try:
+            fn()
+            return True
+        except Exception:
+            return False
+
+    sent_before = bytes_sent()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes = list(executor.map(call, calls))
+    seconds = time.perf_counter() - start
+    return BenchmarkResult(
+        target=target,
+        operation=operation,
+        batch_size=1 if operation == "upsert" else batch_size,
+        doc_bytes=doc_bytes,
+        concurrency=concurrency,
+        records=records,
+        errors=outcomes.count(False),
+        seconds=round(seconds, 4),
+        bytes_sent=bytes_sent() - sent_before,
+    )
+
+
+def run_target(target: str, args: argparse.Namespace) -> List[BenchmarkResult]:
+    """Run every case of the sweep against one target."""
+    cases = list(product(args.operations, args.doc_bytes, args.concurrency))
+    results = []
+
+    def sweep(provider: SearchProvider, bytes_sent: Callable[[], int]) -> None:
+        for n, (operation, doc_bytes, concurrency) in enumerate(cases):
+            # Single upserts have no batch size to sweep
+            batch_sizes = [1] if operation == "upsert" else args.batch_sizes
+            for batch_size in batch_sizes:
+                records = (
+                    min(args.records, args.upsert_records)
+                    if (operation == "upsert")
+                    else args.records
+                )
+                result = run_case(
+                    target,
+                    provider,
+                    bytes_sent,
+                    operation,
+                    batch_size,
+                    doc_bytes,
+                    concurrency,
+                    records,
+                    run=f"{n}-{batch_size}",
+                )
+                results.append(result)
+                print_row(result)
+
+    if target == "recording":
+        provider = RecordingProvider(Settings())
+        sweep(provider, lambda: provider.bytes_sent)
+        return results
+
+    profile = PROFILES[target.split("-", 1)[1]]
+    with StandInServer(profile) as server:
+        provider = TypesenseProvider(
+            Settings(
+                typesense_host="127.0.0.1",
+                typesense_port=server.port,
+                typesense_protocol="http",
+                typesense_api_key="bench",
+                partial_updates_enabled=False,
+                provider_write_concurrency=max(args.concurrency),
+            )
+        )
+        sweep(provider, lambda: server.bytes_received)
+    return results
+
+
+HEADER = (
+    f"{'target':<16}{'operation':<14}{'batch':>7}{'doc B':>8}{'conc':>6}"
+    f"{'records':>9}{'errors':>8}{'rec/s':>11}{'MB/s':>9}"
+)
+
+
+def print_row(result: BenchmarkResult) -> None:
+    print(
+        f"{result.target:<16}{result.operation:<14}{result.batch_size:>7}"
+        f"{result.doc_bytes:>8}{result.concurrency:>6}{result.records:>9}"
+        f"{result.errors:>8}{result.records_per_sec:>11.0f}"
+        f"{result.bytes_per_sec / 1e6:>9.2f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--targets",
+        nargs="+",
+        default=["recording", "http-typesense", "http-algolia"],
+        choices=["recording", *(f"http-{name}" for name in PROFILES)],
+    )
+    parser.add_argument(
+        "--operations", nargs="+", default=list(OPERATIONS), choices=OPERATIONS
+    )
+    parser.add_argument(
+        "--batch-sizes", nargs="+", type=int, default=[50, 100, 500, 1000]
+    )
+    parser.add_argument("--doc-bytes", nargs="+", type=int, default=[512, 4096])
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 4])
+    parser.add_argument(
+        "--records", type=int, default=2000, help="Documents per batched case"
+    )
+    parser.add_argument(
+        "--upsert-records", type=int, default=200, help="Documents per upsert case"
+    )
+    parser.add_argument("--json", type=Path, help="Also write results to this file")
+    args = parser.parse_args()
+
+    print(HEADER)
+    results = []
+    for target in args.targets:
+        results.extend(run_target(target, args))
+
+    if args.json:
+        args.json.write_text(
+            json.dumps(
+                [
+                    {
+                        **asdict(result),
+                        "records_per_sec": round(result.records_per_sec, 1),
+                        "bytes_per_sec": round(result.bytes_per_sec, 1),
+                    }
+                    for result in results
+                ],
+                indent=2,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Report the slowest imports of an entry point using `python -X importtime`.
+
+Usage:
+    python scripts/profile_imports.py app.main
+    python scripts/profile_imports.py app.tasks --top 40
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+
+def profile(module: str):
+    """Run a cold import of `module` and return (self_us, cumulative_us, name) rows."""
+    project_root = Path(__file__).parent.parent
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=project_root,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+    if result.returncode != 0:
+        print(result.stderr, file=sys.stderr)
+        sys.exit(result.returncode)
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("module", help="Module to import, e.g. app.main")
+    parser.add_argument("--top", type=int, default=25, help="Rows to show")
+    args = parser.parse_args()
+
+    rows = profile(args.module)
+    total_us = max((cumulative for _, cumulative, _ in rows), default=0)
+
+    print(f"\n=== Cold import of {args.module}: {total_us / 1e6:.3f}s ===\n")
+    print(f"{'cumulative':>12} {'self':>10}  module")
+    for self_us, cumulative_us, name in sorted(rows, key=lambda r: -r[1])[: args.top]:
+        print(f"{cumulative_us / 1e3:>10.1f}ms {self_us / 1e3:>8.1f}ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.commands.batch_index_entities_command import BatchIndexEntitiesCommand
+from app.providers.batching import BatchWriteError, ChunkResult
+from app.providers.fanout import ProviderResult
+
+
+@pytest.fixture
+def command():
+    with (
+        patch("app.commands.batch_index_entities_command.DomainServiceClient"),
+        patch("app.commands.batch_index_entities_command.SettingsManager"),
+    ):
+        return BatchIndexEntitiesCommand(Mock())
+
+
+def _docs(*object_ids):
+    return [{"id": i, "objectID": i, "type": "pets"} for i in object_ids]
+
+
+def _write(command, documents, results):
+    with patch(
+        "app.commands.batch_index_entities_command.fan_out_with_settings",
+        return_value=results,
+    ):
+        return command.write_documents(documents, [Mock(), Mock()])
+
+
+def test_counts_entities_once_across_providers(command):
+    """Test an entity written to two providers counts as one indexed entity."""
+    documents = _docs("1", "2")
+    results = [
+        ProviderResult("algolia", value=[ChunkResult("svc-pets", ["1", "2"])]),
+        ProviderResult("typesense", value=[ChunkResult("svc-pets", ["1", "2"])]),
+    ]
+
+    result = _write(command, documents, results)
+
+    assert (result["indexed"], result["failed"], result["skipped"]) == (2, 0, 0)
+    assert result["providers"]["algolia"]["indexed"] == 2
+    assert result["providers"]["typesense"]["indexed"] == 2
+
+
+def test_entity_failed_on_any_provider_counts_as_failed(command):
+    """Test failures win over writes to other providers."""
+    documents = _docs("1", "2")
+    error = BatchWriteError(
+        [ChunkResult("svc-pets", ["1"]), ChunkResult("svc-pets", ["2"], "timeout")]
+    )
+    results = [
+        ProviderResult("algolia", value=[ChunkResult("svc-pets", ["1", "2"])]),
+        ProviderResult("typesense", error="timeout", exception=error),
+    ]
+
+    result = _write(command, documents, results)
+
+    assert (result["indexed"], result["failed"], result["skipped"]) == (1, 1, 0)
+    assert result["providers"]["typesense"] == {
+        "indexed": 1,
+        "failed": 1,
+        "skipped": 0,
+        "error": "timeout",
+    }
+
+
+def test_entity_is_skipped_only_when_every_provider_skipped_it(command):
+    """Test an entity unchanged on one provider but written to another is indexed."""
+    documents = _docs("1", "2")
+    results = [
+        ProviderResult("algolia", value=[]),
+        ProviderResult("typesense", value=[ChunkResult("svc-pets", ["2"])]),
+    ]
+
+    result = _write(command, documents, results)
+
+    assert (result["indexed"], result["failed"], result["skipped"]) == (1, 0, 1)
+    assert result["providers"]["algolia"]["skipped"] == 2
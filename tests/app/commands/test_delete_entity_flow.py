@@ -0,0 +1,125 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock, Mock, patch
+
+from app.commands.flush_deletes_command import FlushDeletesCommand
+from app.commands.index_entity_command import IndexEntityCommand
+from app.config import Settings
+from app.providers.algolia_provider import AlgoliaProvider
+from app.providers.delete_buffer import DeleteBuffer
+
+ENTITY_ID = "3f2b8c1e-9d4a-4b7e-8f7a-1c2d3e4f5a6b"
+
+
+class _SetRedis:
+    """In-memory stand-in for the Redis set commands of the delete buffer."""
+
+    def __init__(self):
+        self.sets = {}
+
+    def pipeline(self, transaction=False):
+        pipeline = Mock()
+        pipeline.sadd.side_effect = self.sadd
+        pipeline.execute.return_value = [1, True]
+        return pipeline
+
+    def sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(members)
+
+    def scard(self, key):
+        return len(self.sets.get(key, set()))
+
+    def srem(self, key, *members):
+        self.sets.get(key, set()).difference_update(members)
+
+    def spop(self, key, count):
+        members = self.sets.get(key, set())
+        return [members.pop() for _ in range(min(count, len(members)))]
+
+    def delete(self, key):
+        self.sets.pop(key, None)
+
+
+def _service():
+    return SimpleNamespace(
+        name="linden",
+        base_url="http://linden",
+        indexes_path_prefix="indexes",
+        excluded_entities=None,
+    )
+
+
+def _event(action):
+    return SimpleNamespace(
+        event_type=f"com.linden.pets.{action}",
+        subject=f"pets/{ENTITY_ID}",
+        source="/linden",
+    )
+
+
+def test_upsert_within_the_window_cancels_the_buffered_delete():
+    """Test an entity re-created before the flush is not deleted by it."""
+    settings = Settings(algolia_app_id="app", algolia_api_key="key")
+    buffer = DeleteBuffer(settings, redis_client=_SetRedis())
+    provider = Mock()
+    provider.name = "algolia"
+
+    with (
+        patch("app.commands.index_entity_command.route_event", return_value=_service()),
+        patch("app.commands.index_entity_command.DeleteBuffer", return_value=buffer),
+        patch("app.commands.index_entity_command.schedule_delete_flush"),
+        patch(
+            "app.commands.index_entity_command.get_providers", return_value=[provider]
+        ),
+    ):
+        command = IndexEntityCommand(Mock(), nats_publisher=Mock())
+        command.settings = settings
+        command.domain_client = Mock()
+        command.domain_client.get_entity_conditional.return_value = SimpleNamespace(
+            not_modified=False, deleted=False, data={"id": ENTITY_ID, "name": "Rex"}
+        )
+        command.execute(_event("deleted"))
+        assert buffer.length() == 1
+        command.execute(_event("created"))
+
+    provider.upsert.assert_called_once()
+    assert buffer.pop(100) == {}
+
+
+def test_delete_event_reaches_algolia_delete_objects():
+    """Test a deletion event is flushed to Algolia by its bare objectID."""
+    settings = Settings(algolia_app_id="app", algolia_api_key="key")
+    buffer = DeleteBuffer(settings, redis_client=_SetRedis())
+    service, event = _service(), _event("deleted")
+
+    with (
+        patch("app.commands.index_entity_command.route_event", return_value=service),
+        patch("app.commands.index_entity_command.DeleteBuffer", return_value=buffer),
+        patch("app.commands.index_entity_command.schedule_delete_flush") as schedule,
+    ):
+        command = IndexEntityCommand(Mock(), nats_publisher=Mock())
+        command.settings = settings
+        command.domain_client = Mock()
+        command.execute(event)
+
+    schedule.assert_called_once()
+    command.domain_client.forget_entity_validators.assert_called_once_with(
+        base_url="http://linden",
+        entity_type="pets",
+        entity_id=ENTITY_ID,
+        indexes_path_prefix="indexes",
+    )
+
+    with patch("app.providers.algolia_provider.SearchClient") as client_class:
+        client_class.create.return_value = MagicMock()
+        algolia = AlgoliaProvider(settings)
+    algolia.hash_store = None
+    with patch(
+        "app.commands.flush_deletes_command.get_providers", return_value=[algolia]
+    ):
+        deleted = FlushDeletesCommand(Mock(), delete_buffer=buffer).execute()
+
+    assert deleted == 1
+    algolia.client.init_index.assert_called_once_with("linden-pets")
+    algolia.client.init_index.return_value.delete_objects.assert_called_once_with(
+        [ENTITY_ID]
+    )
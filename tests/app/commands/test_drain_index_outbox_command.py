@@ -0,0 +1,93 @@
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.commands.drain_index_outbox_command import DrainIndexOutboxCommand
+from app.constants.outbox_action import OutboxAction
+
+SERVICE = SimpleNamespace(
+    base_url="http://linden",
+    indexes_path_prefix="indexes",
+    excluded_entities=None,
+)
+
+
+@pytest.fixture
+def command():
+    with (
+        patch("app.commands.drain_index_outbox_command.SettingsManager"),
+        patch("app.commands.drain_index_outbox_command.IndexOutboxRepository"),
+        patch("app.commands.drain_index_outbox_command.DomainServiceRepository"),
+        patch("app.commands.drain_index_outbox_command.DomainServiceClient"),
+    ):
+        drain = DrainIndexOutboxCommand(Mock())
+    drain.domain_service_repository.resolve_service_for_event.return_value = SERVICE
+    return drain
+
+
+def _row(action, entity_id="1"):
+    return SimpleNamespace(
+        id=1,
+        source="/linden",
+        entity_type="pets",
+        entity_id=entity_id,
+        action=action,
+        event_type="com.linden.pets.changed",
+    )
+
+
+def _drain(command, rows, provider):
+    command.outbox_repository.claim_batch.return_value = rows
+    with patch(
+        "app.commands.drain_index_outbox_command.get_providers",
+        return_value=[provider],
+    ):
+        return command.execute()
+
+
+def _provider():
+    provider = Mock()
+    provider.name = "algolia"
+    return provider
+
+
+def test_deleted_entities_forget_their_validators(command):
+    """Test a drained delete drops the validators of the entity."""
+    provider = _provider()
+
+    counts = _drain(command, [_row(OutboxAction.DELETE)], provider)
+
+    assert counts["deleted"] == 1
+    provider.delete_batch.assert_called_once_with("linden-pets", ["1"])
+    command.domain_client.forget_entity_validators.assert_called_once_with(
+        base_url="http://linden",
+        entity_type="pets",
+        entity_id="1",
+        indexes_path_prefix="indexes",
+    )
+
+
+def test_entities_gone_from_the_service_forget_their_validators(command):
+    """Test an upsert answered with 404/410 removes the entity and its validators."""
+    command.domain_client.get_entity_conditional.return_value = SimpleNamespace(
+        deleted=True, not_modified=False
+    )
+    provider = _provider()
+
+    counts = _drain(command, [_row(OutboxAction.UPSERT)], provider)
+
+    assert counts["deleted"] == 1
+    command.domain_client.forget_entity_validators.assert_called_once()
+
+
+def test_failed_delete_keeps_validators(command):
+    """Test validators stay when a provider failed the delete."""
+    provider = _provider()
+    provider.delete_batch.side_effect = RuntimeError("down")
+    command.settings = command.settings.model_copy(update={"provider_max_retries": 0})
+
+    counts = _drain(command, [_row(OutboxAction.DELETE)], provider)
+
+    assert counts["failed"] == 1
+    command.domain_client.forget_entity_validators.assert_not_called()
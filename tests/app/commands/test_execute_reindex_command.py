@@ -0,0 +1,215 @@
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+from uuid import uuid4
+
+import pytest
+
+from app.commands.execute_reindex_command import (
+    CATCH_UP_SKEW,
+    ExecuteReindexCommand,
+)
+from app.models.reindex_job import ReindexJobStatus
+from app.utils.reindex_checkpoints import Checkpoint
+from app.utils.reindex_planner import UnitResult, WorkUnit
+
+STARTED_AT = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+
+def _command(job, run_results):
+    command = ExecuteReindexCommand(Mock(), nats_publisher=Mock())
+    command.reindex_repository = Mock()
+    command.reindex_repository.get_reindex_job.return_value = job
+    command._get_services_to_process = Mock(return_value=[])
+    command._get_entity_types_to_process = Mock(return_value=[])
+    command._get_checkpoint_tracker = Mock(return_value=None)
+    command._get_progress_tracker = Mock()
+    command._run_units = Mock(side_effect=run_results)
+    return command
+
+
+def _rebuild_job():
+    return SimpleNamespace(
+        id=uuid4(),
+        rebuild=True,
+        updated_after=None,
+        updated_before=None,
+        force=False,
+    )
+
+
+def _execute(command, job):
+    rebuild = Mock(started_at=STARTED_AT)
+    with (
+        patch("app.commands.execute_reindex_command.get_providers", return_value=[]),
+        patch(
+            "app.commands.execute_reindex_command.IndexRebuild", return_value=rebuild
+        ),
+    ):
+        command.execute(job.id)
+    return rebuild
+
+
+def _final_status(command):
+    return command.reindex_repository.update_reindex_job_status.call_args.args[1]
+
+
+def test_rebuild_swaps_then_catches_up():
+    """Test a rebuild swaps its shadows and indexes the changes since it started."""
+    job = _rebuild_job()
+    command = _command(job, [UnitResult(indexed=10), UnitResult(indexed=2)])
+
+    rebuild = _execute(command, job)
+
+    rebuild.swap.assert_called_once()
+    rebuild.abort.assert_not_called()
+    catch_up = command._run_units.call_args_list[1]
+    assert catch_up.kwargs["updated_after"] == STARTED_AT - CATCH_UP_SKEW
+    assert catch_up.kwargs["force"] is True
+    assert "rebuild" not in catch_up.kwargs
+    assert _final_status(command) == ReindexJobStatus.COMPLETED
+
+
+def test_swap_and_catch_up_run_under_heartbeat():
+    """Test the phases that save no progress keep the job from looking stale."""
+    job = _rebuild_job()
+    command = _command(job, [UnitResult(indexed=10), UnitResult(indexed=2)])
+    phases = []
+
+    @contextmanager
+    def heartbeat(job_id):
+        phases.append("start")
+        yield
+        phases.append("stop")
+
+    command._heartbeat = heartbeat
+    rebuild = _execute(command, job)
+
+    rebuild.swap.assert_called_once()
+    assert command._run_units.call_count == 2
+    assert phases == ["start", "stop", "start", "stop"]
+
+
+def test_heartbeat_refreshes_job_until_phase_ends():
+    """Test the heartbeat touches the job on its own session while running."""
+    job = _rebuild_job()
+    command = _command(job, [])
+    command.settings = command.settings.model_copy(
+        update={"reindex_progress_interval_seconds": 0.01}
+    )
+
+    with (
+        patch("app.commands.execute_reindex_command.SessionLocal") as session_class,
+        patch(
+            "app.commands.execute_reindex_command.ReindexRepository"
+        ) as repository_class,
+    ):
+        with command._heartbeat(job.id):
+            time.sleep(0.1)
+        touches = repository_class.return_value.touch_reindex_job.call_count
+        time.sleep(0.05)
+
+        assert touches > 0
+        assert repository_class.return_value.touch_reindex_job.call_count == touches
+        repository_class.return_value.touch_reindex_job.assert_called_with(job.id)
+        assert session_class.return_value.close.call_count == touches
+
+
+def test_rebuild_with_failed_writes_keeps_live_indexes():
+    """Test failed shadow writes abort the rebuild instead of swapping."""
+    job = _rebuild_job()
+    command = _command(job, [UnitResult(indexed=9, failed=1)])
+
+    with pytest.raises(RuntimeError):
+        _execute(command, job)
+
+    assert command._run_units.call_count == 1
+    assert _final_status(command) == ReindexJobStatus.FAILED
+
+
+def test_failed_swap_aborts_rebuild():
+    """Test a failing swap drops the shadows and fails the job."""
+    job = _rebuild_job()
+    command = _command(job, [UnitResult(indexed=10)])
+    rebuild = Mock(started_at=STARTED_AT)
+    rebuild.swap.side_effect = RuntimeError("move failed")
+
+    with (
+        patch("app.commands.execute_reindex_command.get_providers", return_value=[]),
+        patch(
+            "app.commands.execute_reindex_command.IndexRebuild", return_value=rebuild
+        ),
+        pytest.raises(RuntimeError),
+    ):
+        command.execute(job.id)
+
+    rebuild.abort.assert_called_once()
+    assert command._run_units.call_count == 1
+    assert _final_status(command) == ReindexJobStatus.FAILED
+
+
+def test_failed_catch_up_fails_job():
+    """Test catch-up write failures after the swap fail the job."""
+    job = _rebuild_job()
+    command = _command(job, [UnitResult(indexed=10), UnitResult(failed=3)])
+
+    with pytest.raises(RuntimeError, match="failed to write 3 documents"):
+        _execute(command, job)
+
+    assert _final_status(command) == ReindexJobStatus.FAILED
+    error = command.reindex_repository.update_reindex_job_status.call_args.kwargs
+    assert "Catch-up" in error["error_message"]
+
+
+def test_resume_continues_from_checkpoints():
+    """Test a resumed run starts after the checkpoints and from their counts."""
+    service = SimpleNamespace(id="svc-1")
+    job = SimpleNamespace(
+        id=uuid4(),
+        rebuild=False,
+        updated_after=None,
+        updated_before=None,
+        force=False,
+    )
+    command = _command(job, [UnitResult(indexed=10)])
+    del command._get_checkpoint_tracker  # the real checkpoint handling
+    command._get_entity_types_to_process = Mock(
+        return_value=[(service, "pets"), (service, "toys")]
+    )
+    command.reindex_repository.get_checkpoints.return_value = [
+        Checkpoint("svc-1", "pets", pages_done=4, indexed=400, completed=True),
+        Checkpoint("svc-1", "toys", pages_done=2, indexed=150, skipped=50),
+    ]
+
+    with patch("app.commands.execute_reindex_command.get_providers", return_value=[]):
+        command.execute(job.id, resume=True)
+
+    command.reindex_repository.delete_checkpoints.assert_not_called()
+    (units, *_), kwargs = command._run_units.call_args
+    assert units == [WorkUnit(service, "toys", 3)]
+    assert kwargs["checkpoints"] is not None
+    start = command._get_progress_tracker.call_args.args[2]
+    assert (start.indexed, start.skipped, start.fetched) == (550, 50, 600)
+    assert _final_status(command) == ReindexJobStatus.COMPLETED
+
+
+def test_run_without_resume_drops_checkpoints():
+    """Test a fresh run deletes the checkpoints of earlier runs."""
+    job = SimpleNamespace(
+        id=uuid4(),
+        rebuild=False,
+        updated_after=None,
+        updated_before=None,
+        force=False,
+    )
+    command = _command(job, [UnitResult()])
+    del command._get_checkpoint_tracker  # the real checkpoint handling
+
+    with patch("app.commands.execute_reindex_command.get_providers", return_value=[]):
+        command.execute(job.id)
+
+    command.reindex_repository.delete_checkpoints.assert_called_once_with(job.id)
+    command.reindex_repository.get_checkpoints.assert_not_called()
+    assert command._get_progress_tracker.call_args.args[2] is None
@@ -0,0 +1,318 @@
+import gzip
+import json
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+from algoliasearch.http.requester import Requester
+from algoliasearch.http.transporter import Request
+
+from app.config import Settings
+from app.constants.write_consistency import WriteConsistency
+from app.providers.batching import BatchWriteError
+from app.providers.algolia_provider import AlgoliaProvider, GzipRequester
+from app.providers.index_catalog import IndexCatalog, IndexSettings
+from app.utils.document_builder import compute_document_hash, compute_field_hashes
+
+
+@pytest.fixture
+def provider():
+    settings = Settings(algolia_app_id="app", algolia_api_key="key")
+    with patch("app.providers.algolia_provider.SearchClient") as mock_client_class:
+        mock_client_class.create.return_value = MagicMock()
+        algolia = AlgoliaProvider(settings)
+    algolia.hash_store = Mock()
+    algolia.hash_store.get_fields_many.return_value = {}
+    return algolia
+
+
+def _doc(object_id, name="Rex"):
+    return {
+        "id": object_id,
+        "objectID": object_id,
+        "type": "pets",
+        "source": "/svc",
+        "name": name,
+    }
+
+
+def test_upsert_batch_skips_unchanged_documents(provider):
+    """Test documents whose hash matches the last write are not sent."""
+    unchanged, changed = _doc("1"), _doc("2", name="Max")
+    provider.hash_store.get_many.return_value = {"1": compute_document_hash(unchanged)}
+
+    provider.upsert_batch([unchanged, changed])
+
+    index = provider.client.init_index.return_value
+    index.save_objects.assert_called_once_with([changed])
+    provider.hash_store.set_many.assert_called_once_with(
+        "algolia", "svc-pets", {"2": compute_document_hash(changed)}
+    )
+
+
+def test_upsert_batch_sends_partial_update_for_changed_fields(provider):
+    """Test a document where one small field changed is partially updated."""
+    previous = {**_doc("1"), "description": "x" * 500, "updated_at": "t1"}
+    current = {**previous, "name": "Max", "updated_at": "t2"}
+    provider.hash_store.get_many.return_value = {}
+    provider.hash_store.get_fields_many.return_value = {
+        "1": compute_field_hashes(previous)
+    }
+
+    provider.upsert_batch([current])
+
+    index = provider.client.init_index.return_value
+    index.save_objects.assert_not_called()
+    index.partial_update_objects.assert_called_once_with(
+        [{"id": "1", "objectID": "1", "name": "Max", "updated_at": "t2"}]
+    )
+    provider.hash_store.get_fields_many.assert_called_once_with(
+        "algolia", "svc-pets", ["1"], max_age_seconds=3600.0
+    )
+    # The update may have skipped a missing object, so nothing is recorded and
+    # the hash of the last full write is forgotten
+    provider.hash_store.set_many.assert_not_called()
+    provider.hash_store.set_fields_many.assert_not_called()
+    provider.hash_store.delete_many.assert_called_once_with(
+        "algolia", "svc-pets", ["1"], keep_fields=True
+    )
+
+
+class _MemoryHashStore:
+    """In-memory stand-in for DocumentHashStore."""
+
+    def __init__(self):
+        self.hashes, self.fields = {}, {}
+
+    def get_many(self, provider, index_name, object_ids):
+        return {i: self.hashes[i] for i in object_ids if i in self.hashes}
+
+    def set_many(self, provider, index_name, hashes):
+        self.hashes.update(hashes)
+
+    def get_fields_many(self, provider, index_name, object_ids, max_age_seconds=None):
+        return {i: self.fields[i] for i in object_ids if i in self.fields}
+
+    def set_fields_many(self, provider, index_name, field_hashes):
+        self.fields.update(field_hashes)
+
+    def delete_many(self, provider, index_name, object_ids, keep_fields=False):
+        for object_id in object_ids:
+            self.hashes.pop(object_id, None)
+            if not keep_fields:
+                self.fields.pop(object_id, None)
+
+
+def test_value_changed_back_after_partial_update_is_written(provider):
+    """Test reverting a partially updated value is not skipped as unchanged."""
+    provider.hash_store = _MemoryHashStore()
+    opened = {**_doc("1"), "description": "x" * 500, "status": "open"}
+    closed = {**opened, "status": "closed"}
+    index = provider.client.init_index.return_value
+
+    provider.upsert(opened)
+    provider.upsert(closed)
+    provider.upsert(opened)
+
+    assert index.save_object.call_args_list[-1].args == (opened,)
+    assert index.save_object.call_count == 2
+    index.partial_update_object.assert_called_once()
+
+
+def test_upsert_batch_records_full_writes_next_to_partial_updates(provider):
+    """Test only the fully written documents of a batch are recorded."""
+    previous = {**_doc("1"), "description": "x" * 500}
+    partial = {**previous, "name": "Max"}
+    full = _doc("2")
+    provider.hash_store.get_many.return_value = {}
+    provider.hash_store.get_fields_many.return_value = {
+        "1": compute_field_hashes(previous)
+    }
+
+    provider.upsert_batch([partial, full])
+
+    index = provider.client.init_index.return_value
+    index.save_objects.assert_called_once_with([full])
+    provider.hash_store.set_many.assert_called_once_with(
+        "algolia", "svc-pets", {"2": compute_document_hash(full)}
+    )
+    provider.hash_store.set_fields_many.assert_called_once_with(
+        "algolia", "svc-pets", {"2": compute_field_hashes(full)}
+    )
+
+
+def test_upsert_batch_writes_full_document_when_field_removed(provider):
+    """Test a document that lost a field is written in full."""
+    previous = {**_doc("1"), "description": "x" * 500, "nickname": "R"}
+    current = {**_doc("1", name="Max"), "description": "x" * 500}
+    provider.hash_store.get_many.return_value = {}
+    provider.hash_store.get_fields_many.return_value = {
+        "1": compute_field_hashes(previous)
+    }
+
+    provider.upsert_batch([current])
+
+    index = provider.client.init_index.return_value
+    index.save_objects.assert_called_once_with([current])
+    index.partial_update_objects.assert_not_called()
+
+
+def test_settings_are_pushed_once_per_new_index(provider):
+    """Test a new index gets its settings on the first write only."""
+    provider.hash_store = None
+    provider.index_catalog = IndexCatalog(
+        "algolia",
+        {"pets": IndexSettings.from_dict({"searchable_attributes": ["name"]})},
+    )
+    index = provider.client.init_index.return_value
+    index.exists.return_value = False
+
+    provider.upsert_batch([_doc("1")])
+    provider.upsert_batch([_doc("2")])
+
+    index.exists.assert_called_once()
+    index.set_settings.assert_called_once_with(
+        {
+            "attributesForFaceting": ["type", "source"],
+            "customRanking": [],
+            "searchableAttributes": ["name"],
+        }
+    )
+    index.get_settings.assert_not_called()
+
+
+def test_existing_index_only_gets_configured_settings(provider):
+    """Test defaults never overwrite the settings of an existing index."""
+    index = provider.client.init_index.return_value
+    index.exists.return_value = True
+
+    provider.ensure_index(
+        "svc-pets", IndexSettings.from_dict({"custom_ranking": ["desc(updated_at)"]})
+    )
+    provider.ensure_index("svc-toys", IndexSettings())
+
+    index.set_settings.assert_called_once_with({"customRanking": ["desc(updated_at)"]})
+
+
+def test_upsert_batch_force_writes_everything(provider):
+    """Test force bypasses the stored hashes."""
+    document = _doc("1")
+
+    provider.upsert_batch([document], force=True)
+
+    provider.hash_store.get_many.assert_not_called()
+    provider.client.init_index.return_value.save_objects.assert_called_once_with(
+        [document]
+    )
+
+
+def test_upsert_batch_chunks_by_record_count(provider):
+    """Test large batches are split into chunks of at most max records."""
+    provider.hash_store = None
+    provider.batch_max_records = 2
+    documents = [_doc(str(i)) for i in range(5)]
+
+    results = provider.upsert_batch(documents)
+
+    save_objects = provider.client.init_index.return_value.save_objects
+    assert sorted(len(c.args[0]) for c in save_objects.call_args_list) == [1, 2, 2]
+    assert all(result.succeeded for result in results)
+
+
+def test_upsert_batch_reports_failed_chunks(provider):
+    """Test a failing chunk does not stop the others and is reported."""
+    provider.batch_max_records = 1
+    provider.write_concurrency = 1
+    index = provider.client.init_index.return_value
+    index.save_objects.side_effect = [MagicMock(), Exception("too big")]
+    provider.hash_store.get_many.return_value = {}
+
+    with pytest.raises(BatchWriteError) as exc_info:
+        provider.upsert_batch([_doc("1"), _doc("2")])
+
+    assert exc_info.value.succeeded_ids == ["1"]
+    assert exc_info.value.failed_ids == ["2"]
+    # Only the written chunk has its hash recorded
+    provider.hash_store.set_many.assert_called_once_with(
+        "algolia", "svc-pets", {"1": compute_document_hash(_doc("1"))}
+    )
+
+
+def test_upsert_skips_when_all_unchanged(provider):
+    """Test a single unchanged document never reaches Algolia."""
+    document = _doc("1")
+    provider.hash_store.get_many.return_value = {"1": compute_document_hash(document)}
+
+    provider.upsert(document)
+
+    provider.client.init_index.assert_not_called()
+
+
+def test_accepted_write_does_not_wait(provider):
+    """Test ACCEPTED writes return without waiting and track the task."""
+    provider.hash_store = None
+    provider.task_tracker = Mock()
+    index = provider.client.init_index.return_value
+    response = Mock(raw_responses=[{"taskID": 42}])
+    index.save_object.return_value = response
+
+    provider.upsert(_doc("1"), consistency=WriteConsistency.ACCEPTED)
+
+    response.wait.assert_not_called()
+    provider.task_tracker.track.assert_called_once_with(
+        "svc-pets", 42, "upsert", provider._wait_for_task
+    )
+
+
+def test_visible_write_waits(provider):
+    """Test VISIBLE writes block until Algolia publishes the task."""
+    provider.hash_store = None
+    provider.task_tracker = Mock()
+    index = provider.client.init_index.return_value
+
+    provider.delete_batch(
+        "svc-pets", ["pets_1", "pets_2"], consistency=WriteConsistency.VISIBLE
+    )
+
+    index.delete_objects.return_value.wait.assert_called_once()
+    provider.task_tracker.track.assert_not_called()
+
+
+def test_gzip_requester_compresses_large_bodies():
+    """Test large Algolia request bodies are gzipped and the original request kept."""
+    request = Request("POST", {"X-Algolia-Application-Id": "app"}, None, 2, 5)
+    request.data_as_string = json.dumps({"requests": [_doc(str(i)) for i in range(50)]})
+    original = request.data_as_string
+
+    with patch.object(Requester, "send", return_value="sent") as send:
+        assert GzipRequester(Settings()).send(request) == "sent"
+
+    sent = send.call_args.args[0]
+    assert sent.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(sent.data_as_string).decode("utf-8") == original
+    assert request.data_as_string == original
+    assert "Content-Encoding" not in request.headers
+
+
+def test_delete_uses_bare_object_id(provider):
+    """Test a delete is sent by objectID, as documents are written."""
+    provider.hash_store = None
+
+    provider.delete("linden-pets", "3f2b8c1e-9d4a-4b7e-8f7a-1c2d3e4f5a6b")
+
+    provider.client.init_index.assert_called_once_with("linden-pets")
+    provider.client.init_index.return_value.delete_object.assert_called_once_with(
+        "3f2b8c1e-9d4a-4b7e-8f7a-1c2d3e4f5a6b"
+    )
+
+
+def test_delete_batch_uses_bare_object_ids(provider):
+    """Test batch deletes are sent by objectID and forget the stored hashes."""
+    ids = ["3f2b8c1e-9d4a-4b7e-8f7a-1c2d3e4f5a6b", "42"]
+
+    provider.delete_batch("linden-pets", ids)
+
+    provider.client.init_index.assert_called_once_with("linden-pets")
+    provider.client.init_index.return_value.delete_objects.assert_called_once_with(ids)
+    provider.hash_store.delete_many.assert_called_once_with(
+        "algolia", "linden-pets", ids
+    )
@@ -0,0 +1,49 @@
+from app.providers.batching import chunk_documents, document_size, send_chunks
+
+
+def test_chunk_documents_respects_record_limit():
+    """Test chunks never exceed the record limit."""
+    documents = [{"id": str(i)} for i in range(5)]
+
+    chunks = chunk_documents(documents, max_records=2, max_bytes=10_000)
+
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+    assert [d for chunk in chunks for d in chunk] == documents
+
+
+def test_chunk_documents_respects_byte_limit():
+    """Test chunks are cut before exceeding the byte limit."""
+    documents = [{"id": str(i), "body": "x" * 100} for i in range(4)]
+    size = document_size(documents[0])
+
+    chunks = chunk_documents(documents, max_records=100, max_bytes=size * 2)
+
+    assert [len(chunk) for chunk in chunks] == [2, 2]
+
+
+def test_oversized_document_gets_its_own_chunk():
+    """Test a document larger than the byte limit is isolated."""
+    documents = [{"id": "1"}, {"id": "2", "body": "x" * 1000}, {"id": "3"}]
+
+    chunks = chunk_documents(documents, max_records=100, max_bytes=200)
+
+    assert [[d["id"] for d in chunk] for chunk in chunks] == [["1"], ["2"], ["3"]]
+
+
+def test_send_chunks_captures_each_outcome():
+    """Test failures are reported per chunk, in input order."""
+
+    def send(index_name, items):
+        if index_name == "bad":
+            raise Exception("boom")
+
+    results = send_chunks(
+        [("good", [{"id": "1"}]), ("bad", [{"id": "2"}]), ("good", [{"id": "3"}])],
+        send,
+        lambda item: item["id"],
+        max_workers=3,
+    )
+
+    assert [r.succeeded for r in results] == [True, False, True]
+    assert results[1].object_ids == ["2"]
+    assert results[1].error == "boom"
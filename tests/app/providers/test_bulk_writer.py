@@ -0,0 +1,196 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.config import Settings
+from app.providers.bulk_writer import BulkWriter, enqueue_upsert, get_shard
+from app.providers.write_stream import (
+    DELETE,
+    UPSERT,
+    RedisWriteStream,
+    WriteOperation,
+)
+
+
+@pytest.fixture
+def settings():
+    return Settings(
+        bulk_writer_shards=2,
+        bulk_writer_max_records=3,
+        bulk_writer_max_bytes=10_000,
+        bulk_writer_max_delay_ms=1000,
+        provider_max_retries=0,
+    )
+
+
+@pytest.fixture
+def writer(settings):
+    provider = Mock()
+    with patch("app.providers.bulk_writer.RedisWriteStream"):
+        bulk_writer = BulkWriter(
+            settings, lambda: [provider], "test-consumer", domain_client=Mock()
+        )
+    bulk_writer.provider = provider
+    return bulk_writer
+
+
+def _upsert(object_id, name="Rex", force=False, validators=None):
+    document = {"id": object_id, "type": "pets", "source": "/svc", "name": name}
+    return WriteOperation(UPSERT, "svc-pets", object_id, document, force, validators)
+
+
+def _validators(etag):
+    return {"url": "http://svc/pets/1", "etag": etag, "last_modified": None}
+
+
+def test_write_operation_round_trip():
+    """Test operations survive encoding to stream fields."""
+    operation = _upsert("pets_1", force=True)
+
+    assert WriteOperation.decode(operation.encode()) == operation
+
+    operation = _upsert("pets_1", validators=_validators('"v1"'))
+    assert WriteOperation.decode(operation.encode()) == operation
+
+
+def test_shard_is_stable_per_object():
+    """Test every write of an object is routed to the same shard."""
+    assert get_shard("svc-pets", "pets_1", 4) == get_shard("svc-pets", "pets_1", 4)
+    assert 0 <= get_shard("svc-pets", "pets_1", 4) < 4
+
+
+def test_enqueue_upsert_appends_to_shard_stream(settings):
+    """Test upserts are appended to the stream of their shard."""
+    document = {"id": "pets_1", "type": "pets", "source": "/svc"}
+    with patch("app.providers.bulk_writer.RedisWriteStream") as stream_class:
+        enqueue_upsert(settings, document)
+
+    shard = get_shard("svc-pets", "pets_1", 2)
+    assert stream_class.call_args.args[0] == f"indexa:bulk_writer:{shard}"
+    (operation,) = stream_class.return_value.append.call_args.args[0]
+    assert operation.index_name == "svc-pets"
+    assert operation.document == document
+
+
+def test_enqueue_upsert_requires_type(settings):
+    """Test documents without a type are rejected before enqueueing."""
+    with pytest.raises(ValueError):
+        enqueue_upsert(settings, {"id": "pets_1", "source": "/svc"})
+
+
+def test_flush_on_record_threshold(writer):
+    """Test a buffer is flushed and acknowledged once it reaches max_records."""
+    stream = Mock()
+    writer.add(stream, "1-0", _upsert("pets_1"))
+    writer.add(stream, "2-0", _upsert("pets_2"))
+    writer.provider.upsert_batch.assert_not_called()
+
+    writer.add(stream, "3-0", _upsert("pets_3"))
+
+    (documents,) = writer.provider.upsert_batch.call_args.args
+    assert [d["id"] for d in documents] == ["pets_1", "pets_2", "pets_3"]
+    stream.ack.assert_called_once_with(
+        ["1-0", "2-0", "3-0"],
+        {"svc-pets:pets_1": "1-0", "svc-pets:pets_2": "2-0", "svc-pets:pets_3": "3-0"},
+    )
+    assert writer._buffers == {}
+
+
+def test_flush_coalesces_operations_per_object(writer):
+    """Test only the latest operation on an object is sent."""
+    stream = Mock()
+    writer.add(stream, "1-0", _upsert("pets_1", name="Rex"))
+    writer.add(stream, "2-0", _upsert("pets_1", name="Max"))
+    writer.add(stream, "3-0", WriteOperation(DELETE, "svc-pets", "pets_2"))
+
+    (documents,) = writer.provider.upsert_batch.call_args.args
+    assert documents == [_upsert("pets_1", name="Max").document]
+    writer.provider.delete_batch.assert_called_once_with("svc-pets", ["pets_2"])
+
+
+def test_flush_due_respects_delay(writer):
+    """Test buffers are flushed only after max_delay."""
+    stream = Mock()
+    writer.add(stream, "1-0", _upsert("pets_1"))
+
+    writer.flush_due()
+    writer.provider.upsert_batch.assert_not_called()
+
+    writer._buffers["svc-pets"].first_at -= 2
+    writer.flush_due()
+    writer.provider.upsert_batch.assert_called_once()
+
+
+def test_failed_flush_leaves_entries_pending(writer):
+    """Test entries are not acknowledged, and their objects guarded, on failure."""
+    stream = Mock()
+    writer.provider.upsert_batch.side_effect = Exception("boom")
+    writer.add(stream, "1-0", _upsert("pets_1"))
+
+    assert writer.flush("svc-pets", "delay") is False
+    stream.ack.assert_not_called()
+    stream.guard.assert_called_once_with({"svc-pets:pets_1": "1-0"})
+
+
+def test_flush_saves_validators_of_flushed_upserts(writer):
+    """Test validators are saved after the flush, for the latest upsert only."""
+    stream = Mock()
+    writer.add(stream, "1-0", _upsert("pets_1", validators=_validators('"v1"')))
+    writer.add(stream, "2-0", _upsert("pets_1", validators=_validators('"v2"')))
+    writer.add(stream, "3-0", _upsert("pets_2"))
+
+    writer._domain_client.save_validators.assert_called_once_with(**_validators('"v2"'))
+
+
+def test_failed_flush_does_not_save_validators(writer):
+    """Test a failed flush leaves the entity to be fetched in full again."""
+    stream = Mock()
+    writer.provider.upsert_batch.side_effect = Exception("boom")
+    writer.add(stream, "1-0", _upsert("pets_1", validators=_validators('"v1"')))
+
+    writer.flush("svc-pets", "delay")
+
+    writer._domain_client.save_validators.assert_not_called()
+
+
+def test_flush_keeps_newest_entry_of_reclaimed_operations(writer):
+    """Test an older entry reclaimed after a newer one does not win."""
+    stream = Mock()
+    writer.add(stream, "5-0", _upsert("pets_1", name="Max"))
+    writer.add(stream, "2-0", _upsert("pets_1", name="Rex"))
+
+    writer.flush("svc-pets", "delay")
+
+    (documents,) = writer.provider.upsert_batch.call_args.args
+    assert documents == [_upsert("pets_1", name="Max").document]
+
+
+def test_poll_blocks_until_oldest_buffer_is_due(writer):
+    """Test poll waits for the oldest buffer's deadline instead of spinning."""
+    stream = Mock()
+    stream.read.return_value = []
+    writer.streams = [stream]
+    writer.add(stream, "1-0", _upsert("pets_1"))
+    writer._buffers["svc-pets"].first_at -= 0.4
+
+    writer.poll()
+
+    _, block_ms = stream.read.call_args.args
+    assert 500 <= block_ms <= 600
+
+
+def test_reclaimed_entries_superseded_by_a_flush_are_dropped():
+    """Test reclaimed entries at or below the flushed entry ID are not replayed."""
+    redis_client = Mock()
+    old, new = _upsert("pets_1", name="Rex"), _upsert("pets_2")
+    redis_client.xautoclaim.return_value = (
+        "0-0",
+        [("2-0", old.encode()), ("3-0", new.encode())],
+        [],
+    )
+    redis_client.hmget.return_value = ["5-0", None]
+    stream = RedisWriteStream("s", "g", "c", redis_client=redis_client)
+    stream._group_ready = True
+
+    assert stream.read(10, 0) == [("3-0", new)]
+    redis_client.pipeline.return_value.xack.assert_called_once_with("s", "g", "2-0")
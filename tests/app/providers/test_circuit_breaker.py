@@ -0,0 +1,186 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.config import Settings
+from app.providers.circuit_breaker import (
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitBreakerProvider,
+    SpoolDrainer,
+)
+from app.providers.write_stream import UPSERT, WriteOperation
+
+
+@pytest.fixture
+def settings():
+    return Settings(circuit_breaker_failure_threshold=2, provider_max_retries=0)
+
+
+@pytest.fixture
+def breaker():
+    return CircuitBreaker("algolia", failure_threshold=2, redis_client=Mock())
+
+
+@pytest.fixture
+def wrapped(settings, breaker):
+    provider = Mock()
+    provider.name = "algolia"
+    with patch(
+        "app.providers.circuit_breaker.get_circuit_breaker", return_value=breaker
+    ):
+        wrapper = CircuitBreakerProvider(provider, settings)
+    breaker.redis_client.get.return_value = None
+    return wrapper
+
+
+def _doc(object_id):
+    return {"id": object_id, "type": "pets", "source": "/svc"}
+
+
+def test_breaker_opens_at_threshold(breaker):
+    """Test consecutive failures open the shared circuit."""
+    assert breaker.record_failure() is False
+    assert breaker.record_failure() is True
+
+    breaker.redis_client.set.assert_called_once()
+    assert breaker.is_open() is True
+
+
+def test_success_resets_failure_count(breaker):
+    """Test a success between failures keeps the circuit closed."""
+    breaker.record_failure()
+    breaker.record_success()
+
+    assert breaker.record_failure() is False
+
+
+def test_failures_below_threshold_are_raised(wrapped):
+    """Test failures are raised while the circuit stays closed."""
+    wrapped.provider.upsert.side_effect = Exception("timeout")
+
+    with pytest.raises(Exception, match="timeout"):
+        wrapped.upsert(_doc("1"))
+
+
+@patch("app.providers.circuit_breaker.get_spool_stream")
+def test_failure_that_opens_circuit_is_spooled(get_spool_stream, wrapped):
+    """Test the write that trips the circuit is spooled, not lost."""
+    wrapped.provider.upsert.side_effect = Exception("timeout")
+    with pytest.raises(Exception):
+        wrapped.upsert(_doc("1"))
+
+    wrapped.upsert(_doc("2"))
+
+    (operation,) = get_spool_stream.return_value.append.call_args.args[0]
+    assert (operation.action, operation.object_id) == (UPSERT, "2")
+
+
+@patch("app.providers.circuit_breaker.get_spool_stream")
+def test_open_circuit_spools_without_calling_provider(get_spool_stream, wrapped):
+    """Test writes skip the provider entirely while the circuit is open."""
+    wrapped.breaker.open()
+
+    wrapped.upsert_batch([_doc("1"), _doc("2")])
+    wrapped.delete_batch("svc-pets", ["3"])
+
+    wrapped.provider.upsert_batch.assert_not_called()
+    wrapped.provider.delete_batch.assert_not_called()
+    assert get_spool_stream.return_value.append.call_count == 2
+
+
+def test_validation_errors_do_not_count(wrapped):
+    """Test bad input does not trip the circuit."""
+    wrapped.provider.upsert.side_effect = ValueError("no type")
+
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            wrapped.upsert({})
+
+    assert wrapped.breaker.is_open() is False
+
+
+@patch("app.providers.circuit_breaker.get_spool_stream")
+@patch("app.providers.circuit_breaker.get_circuit_breaker")
+def test_drainer_replays_spool_and_closes_circuit(
+    get_circuit_breaker, get_spool_stream, settings
+):
+    """Test a healthy provider gets its spool replayed in batches."""
+    breaker = get_circuit_breaker.return_value
+    breaker.get_state.return_value = OPEN
+    breaker.state_cache_seconds = 0
+    breaker.close_if_drained.return_value = True
+    spool = get_spool_stream.return_value
+    operation = WriteOperation(UPSERT, "svc-pets", "1", _doc("1"))
+    spool.read.side_effect = [[("1-0", operation)], [], []]
+    provider = Mock()
+    provider.name = "algolia"
+    provider.healthcheck.return_value = True
+
+    assert SpoolDrainer(settings, lambda: [provider], "test").drain_provider(provider)
+
+    provider.upsert_batch.assert_called_once_with([_doc("1")])
+    spool.ack.assert_called_once_with(["1-0"], {"svc-pets:1": "1-0"})
+    breaker.half_open.assert_called_once()
+    breaker.close_if_drained.assert_called_once_with(spool.stream_key)
+
+
+@patch("app.providers.circuit_breaker.get_circuit_breaker")
+def test_drainer_waits_for_healthcheck(get_circuit_breaker, settings):
+    """Test nothing is replayed while the provider is unhealthy."""
+    get_circuit_breaker.return_value.get_state.return_value = OPEN
+    provider = Mock()
+    provider.healthcheck.return_value = False
+
+    assert not SpoolDrainer(settings, lambda: [provider], "test").drain_provider(
+        provider
+    )
+
+    provider.upsert_batch.assert_not_called()
+    get_circuit_breaker.return_value.close_if_drained.assert_not_called()
+
+
+@patch("app.providers.circuit_breaker.get_spool_stream")
+@patch("app.providers.circuit_breaker.get_circuit_breaker")
+def test_drainer_keeps_circuit_half_open_while_spool_grows(
+    get_circuit_breaker, get_spool_stream, settings
+):
+    """Test a write spooled before the close keeps the circuit from closing."""
+    breaker = get_circuit_breaker.return_value
+    breaker.get_state.return_value = HALF_OPEN
+    breaker.close_if_drained.return_value = False
+    get_spool_stream.return_value.read.return_value = []
+    provider = Mock()
+
+    assert not SpoolDrainer(settings, lambda: [provider], "test").drain_provider(
+        provider
+    )
+
+    provider.healthcheck.assert_not_called()
+    breaker.half_open.assert_not_called()
+
+
+def test_half_open_trial_failure_reopens_circuit(breaker):
+    """Test one failed write in the half-open state reopens the circuit."""
+    breaker.half_open()
+
+    assert breaker.is_open() is False
+    assert breaker.record_failure() is True
+    assert breaker.is_open() is True
+
+
+def test_close_if_drained_is_atomic(breaker):
+    """Test the circuit closes through one script checking state and spool."""
+    breaker.redis_client.eval.return_value = 1
+
+    assert breaker.close_if_drained("indexa:spool:algolia") is True
+
+    breaker.redis_client.eval.assert_called_once()
+    assert breaker.redis_client.eval.call_args.args[1:] == (
+        2,
+        "indexa:circuit:algolia",
+        "indexa:spool:algolia",
+        HALF_OPEN,
+    )
+    breaker.redis_client.delete.assert_not_called()
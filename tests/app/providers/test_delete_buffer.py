@@ -0,0 +1,65 @@
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from app.config import Settings
+from app.providers.delete_buffer import BUFFER_KEY, WINDOW_KEY, DeleteBuffer
+
+
+@pytest.fixture
+def buffer():
+    return DeleteBuffer(Settings(delete_flush_delay_seconds=2), redis_client=Mock())
+
+
+def test_add_reports_whether_a_window_was_opened(buffer):
+    """Test only the first add of a window asks for a flush."""
+    pipeline = buffer.redis_client.pipeline.return_value
+    pipeline.execute.return_value = [1, True]
+
+    assert buffer.add("svc-pets", ["1", "2"]) is True
+
+    pipeline.sadd.assert_called_once_with(
+        BUFFER_KEY, '["svc-pets","1"]', '["svc-pets","2"]'
+    )
+    pipeline.set.assert_called_once_with(WINDOW_KEY, "1", nx=True, px=20000)
+
+    pipeline.execute.return_value = [1, None]
+    assert buffer.add("svc-pets", ["3"]) is False
+
+
+def test_add_nothing(buffer):
+    """Test an empty add touches nothing."""
+    assert buffer.add("svc-pets", []) is False
+    buffer.redis_client.pipeline.assert_not_called()
+
+
+def test_pop_groups_ids_by_index(buffer):
+    """Test popped deletes are grouped per index."""
+    buffer.redis_client.spop.return_value = [
+        json.dumps(["svc-pets", "1"]),
+        json.dumps(["svc-owners", "7"]),
+        json.dumps(["svc-pets", "2"]),
+    ]
+
+    ids_by_index = buffer.pop(100)
+
+    buffer.redis_client.spop.assert_called_once_with(BUFFER_KEY, 100)
+    assert {k: sorted(v) for k, v in ids_by_index.items()} == {
+        "svc-pets": ["1", "2"],
+        "svc-owners": ["7"],
+    }
+
+
+def test_restore_puts_deletes_back(buffer):
+    """Test deletes of a failed flush are buffered again."""
+    buffer.restore({"svc-pets": ["1"]})
+
+    buffer.redis_client.sadd.assert_called_once_with(BUFFER_KEY, '["svc-pets","1"]')
+
+
+def test_discard_drops_pending_deletes(buffer):
+    """Test writing a document removes its buffered delete."""
+    buffer.discard("svc-pets", ["1"])
+
+    buffer.redis_client.srem.assert_called_once_with(BUFFER_KEY, '["svc-pets","1"]')
@@ -0,0 +1,120 @@
+import json
+import time
+from unittest.mock import Mock, patch
+
+from app.providers.document_hash_store import DocumentHashStore
+
+
+class _HashRedis:
+    """In-memory stand-in for the Redis hash commands the store uses."""
+
+    def __init__(self):
+        self.hashes = {}
+        self.expire_at = {}
+
+    def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update(mapping)
+
+    def hmget(self, key, fields):
+        if self.expire_at.get(key, float("inf")) <= time.time():
+            self.hashes.pop(key, None)
+        values = self.hashes.get(key, {})
+        return [values.get(field) for field in fields]
+
+    def hdel(self, key, *fields):
+        for field in fields:
+            self.hashes.get(key, {}).pop(field, None)
+
+    def expireat(self, key, when):
+        self.expire_at[key] = when
+
+    def pipeline(self, transaction=True):
+        return _Pipeline(self)
+
+
+class _Pipeline:
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+        self.results = []
+
+    def __getattr__(self, name):
+        command = getattr(self.redis_client, name)
+        return lambda *args, **kwargs: self.results.append(command(*args, **kwargs))
+
+    def execute(self):
+        return self.results
+
+
+def test_field_hashes_round_trip():
+    """Test recorded field hashes are read back."""
+    store = DocumentHashStore(_HashRedis())
+
+    store.set_fields_many("algolia", "svc-pets", {"1": {"name": "abc"}})
+
+    assert store.get_fields_many("algolia", "svc-pets", ["1", "2"]) == {
+        "1": {"name": "abc"}
+    }
+
+
+def test_field_hashes_older_than_max_age_are_ignored():
+    """Test old field hashes are treated as missing."""
+    store = DocumentHashStore(_HashRedis())
+    with patch("app.providers.document_hash_store.time.time", return_value=1000.0):
+        store.set_fields_many("algolia", "svc-pets", {"1": {"name": "abc"}})
+
+    with patch("app.providers.document_hash_store.time.time", return_value=1100.0):
+        recent = store.get_fields_many(
+            "algolia", "svc-pets", ["1"], max_age_seconds=200
+        )
+        old = store.get_fields_many("algolia", "svc-pets", ["1"], max_age_seconds=50)
+
+    assert recent == {"1": {"name": "abc"}}
+    assert old == {}
+
+
+def test_field_hashes_without_write_time_are_ignored():
+    """Test field hashes recorded without a time are treated as missing."""
+    redis_client = _HashRedis()
+    store = DocumentHashStore(redis_client)
+    redis_client.hset(
+        f"indexa:doc_fields:algolia:svc-pets:{store._generation()}",
+        {"1": json.dumps({"name": "abc"})},
+    )
+
+    assert store.get_fields_many("algolia", "svc-pets", ["1"]) == {}
+
+
+def test_unreachable_store_returns_no_field_hashes():
+    """Test a Redis failure falls back to full writes."""
+    redis_client = Mock()
+    redis_client.pipeline.return_value.execute.side_effect = ConnectionError("down")
+    store = DocumentHashStore(redis_client)
+
+    assert store.get_fields_many("algolia", "svc-pets", ["1"]) == {}
+
+
+def test_hashes_are_kept_one_to_two_ttls_after_their_last_write():
+    """Test hashes survive one generation rotation and expire after the next."""
+    store = DocumentHashStore(_HashRedis(), ttl_seconds=100)
+    with patch("app.providers.document_hash_store.time.time", return_value=1050.0):
+        store.set_many("algolia", "svc-pets", {"1": "00ff"})
+
+    with patch("app.providers.document_hash_store.time.time", return_value=1150.0):
+        assert store.get_many("algolia", "svc-pets", ["1"]) == {"1": "00ff"}
+    with patch("app.providers.document_hash_store.time.time", return_value=1200.0):
+        assert store.get_many("algolia", "svc-pets", ["1"]) == {}
+
+
+def test_delete_forgets_hashes_of_every_generation():
+    """Test a delete clears hashes written before and after a rotation."""
+    store = DocumentHashStore(_HashRedis(), ttl_seconds=100)
+    with patch("app.providers.document_hash_store.time.time", return_value=1050.0):
+        store.set_many("algolia", "svc-pets", {"1": "00ff"})
+        store.set_fields_many("algolia", "svc-pets", {"1": {"name": "abc"}})
+
+    with patch("app.providers.document_hash_store.time.time", return_value=1150.0):
+        store.set_many("algolia", "svc-pets", {"1": "ff00"})
+        store.delete_many("algolia", "svc-pets", ["1"])
+
+        assert store.get_many("algolia", "svc-pets", ["1"]) == {}
+        assert store.get_fields_many("algolia", "svc-pets", ["1"]) == {}
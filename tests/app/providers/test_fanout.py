@@ -0,0 +1,135 @@
+import threading
+import time
+from unittest.mock import Mock
+
+from app.providers.fanout import ProviderFanOutError, fan_out
+
+
+def _provider(name, side_effect=None):
+    provider = Mock()
+    provider.name = name
+    provider.upsert.side_effect = side_effect
+    return provider
+
+
+def test_fan_out_runs_providers_concurrently():
+    """Test total latency is that of the slowest provider, not the sum."""
+    barrier = threading.Barrier(2, timeout=1)
+    providers = [
+        _provider("algolia", lambda doc: barrier.wait()),
+        _provider("typesense", lambda doc: barrier.wait()),
+    ]
+
+    results = fan_out(providers, lambda p: p.upsert({}), "upsert", timeout=2)
+
+    assert [r.succeeded for r in results] == [True, True]
+
+
+def test_failure_does_not_abort_other_providers():
+    """Test one provider failing leaves the others' results intact."""
+    providers = [_provider("algolia", Exception("down")), _provider("typesense")]
+
+    results = fan_out(providers, lambda p: p.upsert({}), "upsert", timeout=1)
+
+    assert [(r.provider, r.succeeded) for r in results] == [
+        ("algolia", False),
+        ("typesense", True),
+    ]
+    providers[1].upsert.assert_called_once()
+    assert "algolia (down)" in str(ProviderFanOutError("upsert", results))
+
+
+def test_retries_are_per_provider():
+    """Test a transient failure is retried without touching other providers."""
+    flaky = _provider("algolia", [Exception("blip"), None])
+    steady = _provider("typesense")
+
+    results = fan_out(
+        [flaky, steady],
+        lambda p: p.upsert({}),
+        "upsert",
+        timeout=1,
+        max_retries=2,
+        backoff=0.01,
+    )
+
+    assert [r.attempts for r in results] == [2, 1]
+    assert all(r.succeeded for r in results)
+
+
+def test_validation_errors_are_not_retried():
+    """Test errors caused by the input fail immediately."""
+    provider = _provider("algolia", ValueError("no type"))
+
+    (result,) = fan_out(
+        [provider], lambda p: p.upsert({}), "upsert", timeout=1, max_retries=3
+    )
+
+    assert result.attempts == 1
+    assert isinstance(result.exception, ValueError)
+
+
+def test_slow_provider_times_out():
+    """Test a provider exceeding its timeout is reported without waiting."""
+    provider = _provider("algolia", lambda doc: time.sleep(0.5))
+
+    started = time.monotonic()
+    (result,) = fan_out([provider], lambda p: p.upsert({}), "upsert", timeout=0.05)
+
+    assert time.monotonic() - started < 0.4
+    assert "timed out" in result.error
+
+
+def test_waiting_for_a_slot_does_not_count_against_the_timeout():
+    """Test the deadline starts once the call holds its slot."""
+    slot = threading.Semaphore(0)
+    provider = _provider("algolia", lambda doc: time.sleep(0.1))
+    threading.Timer(0.15, slot.release).start()
+
+    (result,) = fan_out(
+        [provider],
+        lambda p: p.upsert({}),
+        "upsert",
+        timeout=0.2,
+        slot=lambda p: slot,
+    )
+
+    assert result.succeeded
+
+
+def test_call_abandoned_while_waiting_for_a_slot_is_never_made():
+    """Test a call that never got its slot fails without writing later."""
+    slot = threading.Semaphore(0)
+    provider = _provider("algolia")
+
+    (result,) = fan_out(
+        [provider], lambda p: p.upsert({}), "upsert", timeout=0.05, slot=lambda p: slot
+    )
+    slot.release()
+    time.sleep(0.05)
+
+    assert "write slot" in result.error
+    provider.upsert.assert_not_called()
+
+
+def test_calls_do_not_queue_behind_other_callers():
+    """Test concurrent fan-outs each get their own threads."""
+    release = threading.Event()
+    blocked = _provider("algolia", lambda doc: release.wait(1))
+    callers = [
+        threading.Thread(
+            target=fan_out, args=([blocked], lambda p: p.upsert({}), "upsert", 2)
+        )
+        for _ in range(10)
+    ]
+    for caller in callers:
+        caller.start()
+
+    (result,) = fan_out(
+        [_provider("typesense")], lambda p: p.upsert({}), "upsert", timeout=0.2
+    )
+
+    release.set()
+    for caller in callers:
+        caller.join()
+    assert result.succeeded
@@ -0,0 +1,83 @@
+import json
+import time
+from unittest.mock import Mock
+
+import pytest
+
+import app.providers.health as health_module
+from app.config import Settings
+from app.providers.health import HealthProber, ProviderHealth, ProviderHealthStore
+
+
+def _provider(name, healthy=True):
+    provider = Mock()
+    provider.name = name
+    if isinstance(healthy, Exception):
+        provider.healthcheck.side_effect = healthy
+    else:
+        provider.healthcheck.return_value = healthy
+    return provider
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    breaker = Mock()
+    breaker.is_open.return_value = False
+    monkeypatch.setattr(
+        health_module, "get_circuit_breaker", lambda settings, name: breaker
+    )
+    return breaker
+
+
+def test_run_once_records_health_of_every_provider(breaker):
+    """Test each provider's health and latency is published."""
+    store = Mock()
+    prober = HealthProber(Settings(), lambda: [_provider("algolia")], store)
+
+    results = prober.run_once()
+
+    assert results["algolia"].healthy is True
+    assert results["algolia"].latency_ms >= 0
+    store.set.assert_called_once_with("algolia", results["algolia"])
+    breaker.open.assert_not_called()
+
+
+def test_unhealthy_provider_opens_its_circuit(breaker):
+    """Test a failed or raising healthcheck routes writes to the spool."""
+    store = Mock()
+    prober = HealthProber(
+        Settings(), lambda: [_provider("typesense", RuntimeError("down"))], store
+    )
+
+    results = prober.run_once()
+
+    assert results["typesense"].healthy is False
+    assert results["typesense"].error == "down"
+    breaker.open.assert_called_once()
+
+
+def test_unhealthy_provider_with_open_circuit_is_left_alone(breaker):
+    """Test an already open circuit is not reopened."""
+    breaker.is_open.return_value = True
+    prober = HealthProber(Settings(), lambda: [_provider("algolia", False)], Mock())
+
+    prober.run_once()
+
+    breaker.open.assert_not_called()
+
+
+def test_store_round_trip_and_staleness():
+    """Test stored health is read back and ages out."""
+    redis_client = Mock()
+    checked_at = time.time() - 120
+    redis_client.hgetall.return_value = {
+        "algolia": json.dumps(
+            {"healthy": True, "latency_ms": 8.0, "checked_at": checked_at}
+        )
+    }
+
+    health = ProviderHealthStore(redis_client).get_all()["algolia"]
+
+    assert health == ProviderHealth(True, 8.0, checked_at)
+    assert health.is_stale(60)
+    assert not health.is_stale(300)
@@ -0,0 +1,75 @@
+from unittest.mock import Mock
+
+from app.config import Settings
+from app.providers.index_catalog import (
+    IndexCatalog,
+    IndexSettings,
+    load_index_settings,
+)
+
+
+def test_settings_for_prefers_index_then_entity_type_then_default():
+    """Test the most specific configured settings win."""
+    by_index = IndexSettings(searchable_attributes=["a"])
+    by_type = IndexSettings(searchable_attributes=["b"])
+    default = IndexSettings(searchable_attributes=["c"])
+    catalog = IndexCatalog(
+        "algolia", {"svc-pets": by_index, "pets": by_type, "*": default}
+    )
+
+    assert catalog.settings_for("svc-pets", "pets") is by_index
+    assert catalog.settings_for("other-pets", "pets") is by_type
+    assert catalog.settings_for("svc-toys", "toys") is default
+    assert IndexCatalog("algolia").settings_for("svc-toys") == IndexSettings()
+
+
+def test_changed_settings_are_applied_again():
+    """Test an index is only current for the settings it was set up with."""
+    catalog = IndexCatalog("algolia")
+    catalog.mark_applied("svc-pets", IndexSettings())
+
+    assert catalog.is_applied("svc-pets", IndexSettings())
+    assert not catalog.is_applied(
+        "svc-pets", IndexSettings(searchable_attributes=["name"])
+    )
+
+
+def test_catalog_is_shared_through_redis():
+    """Test an index set up by another process is found in Redis once."""
+    redis_client = Mock()
+    redis_client.hget.return_value = IndexSettings().fingerprint()
+    catalog = IndexCatalog("algolia", redis_client=redis_client)
+
+    assert catalog.is_applied("svc-pets", IndexSettings())
+    assert catalog.is_applied("svc-pets", IndexSettings())
+
+    redis_client.hget.assert_called_once_with(
+        "indexa:index_catalog:algolia", "svc-pets"
+    )
+
+
+def test_forget_drops_the_index():
+    """Test a forgotten index is set up again."""
+    catalog = IndexCatalog("algolia", redis_client=Mock())
+    catalog.mark_applied("svc-pets", IndexSettings())
+    catalog.redis_client.hget.return_value = None
+
+    catalog.forget("svc-pets")
+
+    assert not catalog.is_applied("svc-pets", IndexSettings())
+    catalog.redis_client.hdel.assert_called_once_with(
+        "indexa:index_catalog:algolia", "svc-pets"
+    )
+
+
+def test_load_index_settings():
+    """Test INDEX_SETTINGS is parsed, and invalid JSON falls back to defaults."""
+    settings = Settings(
+        index_settings='{"pets": {"searchable_attributes": ["name", "breed"]}}'
+    )
+
+    loaded = load_index_settings(settings)
+
+    assert loaded["pets"].searchable_attributes == ["name", "breed"]
+    assert loaded["pets"].attributes_for_faceting == ["type", "source"]
+    assert load_index_settings(Settings(index_settings="not json")) == {}
@@ -0,0 +1,118 @@
+from unittest.mock import Mock
+
+import pytest
+
+from app.config import Settings
+from app.providers.local_provider import (
+    LocalSearchProvider,
+    build_match_query,
+    close_connections,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_index():
+    # Providers share the in-memory index of the process
+    yield
+    close_connections()
+
+
+@pytest.fixture
+def provider():
+    return LocalSearchProvider(Settings(local_search_path=":memory:"))
+
+
+def _doc(object_id, name, tags=None):
+    return {
+        "id": object_id,
+        "objectID": object_id,
+        "type": "pets",
+        "source": "/svc",
+        "name": name,
+        "tags": tags or [],
+    }
+
+
+def test_upsert_batch_then_search(provider):
+    """Test batched documents are searchable by any text field."""
+    provider.upsert_batch([_doc("1", "Rex", ["dog"]), _doc("2", "Whiskers", ["cat"])])
+
+    result = provider.search("svc-pets", "dog")
+
+    assert result["total"] == 1
+    assert result["hits"][0]["name"] == "Rex"
+
+
+def test_search_matches_prefixes_and_ignores_syntax(provider):
+    """Test words match as prefixes and FTS5 operators are inert."""
+    provider.upsert(_doc("1", "Whiskers"))
+
+    assert provider.search("svc-pets", "whisk")["total"] == 1
+    assert provider.search("svc-pets", 'whisk" OR NOT')["total"] == 0
+
+
+def test_upsert_replaces_existing_document(provider):
+    """Test re-upserting an object updates both body and full-text index."""
+    provider.upsert(_doc("1", "Rex"))
+    provider.upsert(_doc("1", "Max"))
+
+    assert provider.search("svc-pets", "rex")["total"] == 0
+    assert provider.search("svc-pets", "max")["hits"][0]["name"] == "Max"
+    assert provider.search("svc-pets", "")["total"] == 1
+
+
+def test_delete_batch_removes_documents(provider):
+    """Test batched deletes remove documents from search results."""
+    provider.upsert_batch([_doc(str(i), "Rex") for i in range(3)])
+
+    provider.delete_batch("svc-pets", ["0", "1"])
+
+    result = provider.search("svc-pets", "rex")
+    assert [hit["id"] for hit in result["hits"]] == ["2"]
+
+
+def test_indexes_are_isolated(provider):
+    """Test searches only return documents of the requested index."""
+    provider.upsert({**_doc("1", "Rex"), "type": "toys"})
+
+    assert provider.search("svc-pets", "rex")["total"] == 0
+    assert provider.search("svc-toys", "rex")["total"] == 1
+
+
+def test_unchanged_documents_are_skipped(provider):
+    """Test change detection applies to the local provider."""
+    provider.hash_store = Mock()
+    provider.hash_store.get_many.return_value = {}
+    provider.upsert(_doc("1", "Rex"))
+
+    provider.hash_store.set_many.assert_called_once()
+
+
+def test_redirected_copy_writes_to_shadow_index(provider):
+    """Test a redirected copy writes the shadow and the swap replaces the live index."""
+    provider.upsert_batch([_doc("1", "Rex"), _doc("2", "Max")])
+    shadow = provider.with_index_redirects({"svc-pets": "svc-pets_tmp_1"})
+
+    shadow.upsert(_doc("3", "Bella"))
+    assert provider.search("svc-pets", "")["total"] == 2
+
+    provider.swap_index("svc-pets_tmp_1", "svc-pets")
+
+    result = provider.search("svc-pets", "")
+    assert [hit["id"] for hit in result["hits"]] == ["3"]
+    assert provider.search("svc-pets_tmp_1", "")["total"] == 0
+
+
+def test_build_match_query():
+    assert build_match_query("big dog") == '"big"* "dog"*'
+    assert build_match_query("  ") == ""
+
+
+def test_providers_of_a_process_share_the_in_memory_index(provider):
+    """Test a document written by one provider is found by another."""
+    provider.upsert(_doc("1", "Rex"))
+
+    other = LocalSearchProvider(Settings(local_search_path=":memory:"))
+
+    assert other.connection is provider.connection
+    assert other.search("svc-pets", "rex")["total"] == 1
@@ -0,0 +1,204 @@
+from unittest.mock import MagicMock, Mock
+
+import pytest
+
+from app.config import Settings
+from app.providers.local_provider import LocalSearchProvider, close_connections
+from app.providers.shadow_index import (
+    REGISTRY_KEY,
+    SWAPPING_KEY,
+    IndexRebuild,
+    ShadowIndexRegistry,
+    ShadowWriteProvider,
+    get_shadow_index_name,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_local_index():
+    # Local providers share the in-memory index of the process
+    yield
+    close_connections()
+
+
+def _doc(object_id, name="Rex"):
+    return {
+        "id": object_id,
+        "objectID": object_id,
+        "type": "pets",
+        "source": "/svc",
+        "name": name,
+    }
+
+
+class _RegistryRedis:
+    """In-memory stand-in for the Redis hash and set commands of the registry."""
+
+    def __init__(self, shadows=None):
+        self.hashes = {REGISTRY_KEY: dict(shadows or {})}
+        self.sets = {}
+
+    def pipeline(self, transaction=True):
+        return _Pipeline(self)
+
+    def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def hset(self, key, field, value):
+        self.hashes.setdefault(key, {})[field] = value
+
+    def hdel(self, key, field):
+        return int(self.hashes.get(key, {}).pop(field, None) is not None)
+
+    def smembers(self, key):
+        return set(self.sets.get(key, set()))
+
+    def sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(members)
+
+    def srem(self, key, *members):
+        self.sets.get(key, set()).difference_update(members)
+
+    def delete(self, key):
+        self.sets.pop(key, None)
+
+
+class _Pipeline:
+    """Queues stand-in commands until execute, like a Redis pipeline."""
+
+    def __init__(self, redis_client):
+        self.redis_client = redis_client
+        self.commands = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.commands.append((name, args))
+
+    def execute(self):
+        return [getattr(self.redis_client, n)(*args) for n, args in self.commands]
+
+
+def _registry(shadows=None):
+    return ShadowIndexRegistry(_RegistryRedis(shadows), state_cache_seconds=0)
+
+
+def _ids(provider, index_name):
+    return [hit["id"] for hit in provider.search(index_name, "")["hits"]]
+
+
+def test_shadow_index_name():
+    """Test shadow indexes are named after the live index and the job."""
+    assert get_shadow_index_name("svc-pets", "abc") == "svc-pets_tmp_abc"
+
+
+def test_registry_caches_shared_state():
+    """Test the registry reads Redis at most once per cache period."""
+    redis_client = MagicMock()
+    redis_client.hgetall.return_value = {"svc-pets": "svc-pets_tmp_1"}
+    registry = ShadowIndexRegistry(redis_client, state_cache_seconds=60)
+
+    assert registry.get_shadows() == {"svc-pets": "svc-pets_tmp_1"}
+    assert registry.get_shadows() == {"svc-pets": "svc-pets_tmp_1"}
+    redis_client.hgetall.assert_called_once()
+
+
+def test_writes_are_mirrored_to_registered_shadows():
+    """Test live writes and deletes are repeated on the shadow index."""
+    local = LocalSearchProvider(Settings(local_search_path=":memory:"))
+    provider = ShadowWriteProvider(local, _registry({"svc-pets": "svc-pets_tmp_1"}))
+
+    provider.upsert_batch([_doc("1"), _doc("2"), {**_doc("3"), "type": "toys"}])
+    provider.delete("svc-pets", "1")
+
+    assert _ids(local, "svc-pets") == ["2"]
+    assert _ids(local, "svc-pets_tmp_1") == ["2"]
+    assert _ids(local, "svc-toys") == ["3"]
+
+
+def test_writes_without_shadows_only_reach_live_index():
+    """Test no extra writes are made while nothing is rebuilding."""
+    inner = Mock()
+    provider = ShadowWriteProvider(inner, _registry())
+
+    provider.upsert_batch([_doc("1")])
+    provider.delete_batch("svc-pets", ["1"])
+
+    inner.upsert_batch.assert_called_once()
+    inner.delete_batch.assert_called_once()
+    inner.with_index_redirects.assert_not_called()
+
+
+def test_rebuild_loads_shadow_then_swaps():
+    """Test a rebuild loads a shadow index and swaps it over the live one."""
+    local = LocalSearchProvider(Settings(local_search_path=":memory:"))
+    local.upsert_batch([_doc("1"), _doc("stale")])
+    registry = _registry()
+    rebuild = IndexRebuild([local], "job", registry)
+
+    for shadow in rebuild.shadow_providers([_doc("1"), _doc("2")]):
+        shadow.upsert_batch([_doc("1"), _doc("2")])
+
+    assert registry.get_shadows() == {"svc-pets": "svc-pets_tmp_job"}
+    assert _ids(local, "svc-pets") == ["1", "stale"]
+
+    rebuild.swap()
+
+    assert registry.get_shadows() == {}
+    assert registry.get_swapping() == set()
+    assert _ids(local, "svc-pets") == ["1", "2"]
+
+
+def test_deletes_while_swapping_are_replayed_after_swap():
+    """Test live deletes made once dual writes stopped reach the swapped index."""
+    local = LocalSearchProvider(Settings(local_search_path=":memory:"))
+    registry = _registry()
+    rebuild = IndexRebuild([local], "job", registry)
+    for shadow in rebuild.shadow_providers([_doc("1"), _doc("2")]):
+        shadow.upsert_batch([_doc("1"), _doc("2")])
+    writer = ShadowWriteProvider(local, registry)
+
+    original_swap = local.swap_index
+
+    def swap_index(shadow_name, index_name):
+        # A live event lands between the end of dual writes and the swap
+        assert registry.get_swapping() == {"svc-pets"}
+        writer.delete("svc-pets", "1")
+        original_swap(shadow_name, index_name)
+
+    local.swap_index = swap_index
+    rebuild.swap()
+
+    assert _ids(local, "svc-pets") == ["2"]
+    assert registry.redis_client.smembers(SWAPPING_KEY) == set()
+    assert registry.redis_client.hgetall(REGISTRY_KEY) == {}
+
+
+def test_abort_drops_shadows_not_swapped():
+    """Test an aborted rebuild drops its shadows and keeps the live indexes."""
+    swapped, failing = Mock(), Mock()
+    swapped.name, failing.name = "algolia", "typesense"
+    failing.swap_index.side_effect = RuntimeError("down")
+    rebuild = IndexRebuild([swapped, failing], "job", _registry())
+    rebuild.shadow_providers([_doc("1")])
+
+    try:
+        rebuild.swap()
+    except RuntimeError:
+        rebuild.abort()
+
+    swapped.drop_index.assert_not_called()
+    failing.drop_index.assert_called_once_with("svc-pets_tmp_job")
+
+
+def test_abort_drops_shadows_created_before_a_provider_refused():
+    """Test shadows already created are dropped when another provider cannot rebuild."""
+    ready, refusing = Mock(), Mock()
+    ready.name, refusing.name = "algolia", "typesense"
+    refusing.prepare_shadow_index.side_effect = RuntimeError("not an alias")
+    rebuild = IndexRebuild([ready, refusing], "job", _registry())
+
+    try:
+        rebuild.shadow_providers([_doc("1")])
+    except RuntimeError:
+        rebuild.abort()
+
+    ready.drop_index.assert_called_once_with("svc-pets_tmp_job")
@@ -0,0 +1,66 @@
+from unittest.mock import Mock
+
+from app.providers.task_tracker import ProviderTaskTracker, get_task_tracker
+
+
+def test_tracker_confirms_tasks_in_background():
+    """Test tracked tasks are confirmed by the background thread."""
+    wait_for_task = Mock()
+    tracker = ProviderTaskTracker("algolia")
+
+    tracker.track("svc-pets", 1, "upsert", wait_for_task)
+    tracker.track("svc-pets", 2, "upsert", wait_for_task)
+    tracker._pending.join()
+
+    assert [c.args for c in wait_for_task.call_args_list] == [
+        ("svc-pets", 1),
+        ("svc-pets", 2),
+    ]
+    assert tracker.pending_count == 0
+
+
+def test_tracker_survives_confirmation_errors():
+    """Test a failing confirmation does not stop later ones."""
+    wait_for_task = Mock(side_effect=[Exception("boom"), None])
+    tracker = ProviderTaskTracker("algolia")
+
+    tracker.track("svc-pets", 1, "upsert", wait_for_task)
+    tracker.track("svc-pets", 2, "upsert", wait_for_task)
+    tracker._pending.join()
+
+    assert wait_for_task.call_count == 2
+
+
+def test_tracker_never_blocks_when_full():
+    """Test tracking is dropped instead of blocking when the queue is full."""
+    tracker = ProviderTaskTracker("algolia", max_pending=1)
+    tracker._ensure_worker = Mock()  # keep the queue from draining
+
+    tracker.track("svc-pets", 1, "upsert", Mock())
+    tracker.track("svc-pets", 2, "upsert", Mock())
+
+    assert tracker.pending_count == 1
+
+
+def test_tracker_thread_exits_when_idle_and_restarts():
+    """Test the thread stops once idle and the next task starts a new one."""
+    wait_for_task = Mock()
+    tracker = ProviderTaskTracker("algolia", idle_seconds=0.01)
+
+    tracker.track("svc-pets", 1, "upsert", wait_for_task)
+    worker = tracker._worker
+    worker.join(timeout=2)
+
+    assert not worker.is_alive()
+    assert tracker._worker is None
+
+    tracker.track("svc-pets", 2, "upsert", wait_for_task)
+    tracker._pending.join()
+
+    assert wait_for_task.call_count == 2
+
+
+def test_get_task_tracker_is_shared_per_provider():
+    """Test every provider instance of a name shares one tracker."""
+    assert get_task_tracker("algolia") is get_task_tracker("algolia")
+    assert get_task_tracker("algolia") is not get_task_tracker("typesense")
@@ -0,0 +1,284 @@
+import gzip
+import json
+import os
+import uuid
+from unittest.mock import Mock
+
+import pytest
+
+from app.config import Settings
+from app.providers.batching import BatchWriteError
+from app.providers.index_catalog import IndexCatalog, IndexSettings
+from app.providers.typesense_provider import TypesenseError, TypesenseProvider
+from app.utils.document_builder import compute_field_hashes
+
+
+def _response(status_code=200, text="", json_body=None):
+    response = Mock(status_code=status_code, text=text, ok=200 <= status_code < 300)
+    response.json.return_value = json_body
+    return response
+
+
+def _doc(object_id, name="Rex"):
+    return {
+        "id": object_id,
+        "objectID": object_id,
+        "type": "pets",
+        "source": "/svc",
+        "name": name,
+    }
+
+
+@pytest.fixture
+def provider():
+    settings = Settings(
+        typesense_host="localhost",
+        typesense_api_key="key",
+        typesense_port=8108,
+        typesense_protocol="http",
+    )
+    typesense = TypesenseProvider(settings)
+    typesense.session = Mock()
+    typesense.index_catalog = IndexCatalog("typesense")
+    typesense.index_catalog.mark_applied("svc-pets", IndexSettings())
+    return typesense
+
+
+def test_upsert_batch_imports_jsonl(provider):
+    """Test documents are sent as JSONL with action=upsert."""
+    provider.session.request.return_value = _response(
+        text='{"success": true}\n{"success": true}'
+    )
+
+    results = provider.upsert_batch([_doc("1"), _doc("2")])
+
+    method, url = provider.session.request.call_args.args
+    kwargs = provider.session.request.call_args.kwargs
+    assert (method, url) == (
+        "POST",
+        "http://localhost:8108/collections/svc-pets/documents/import",
+    )
+    assert kwargs["params"] == {"action": "upsert"}
+    lines = kwargs["data"].decode("utf-8").splitlines()
+    assert [json.loads(line)["id"] for line in lines] == ["1", "2"]
+    assert [r.succeeded for r in results] == [True]
+
+
+def test_large_imports_are_gzipped_when_enabled(provider):
+    """Test import bodies are compressed when the setting is on."""
+    provider.compress_requests = True
+    documents = [_doc(str(i), "Rex" * 50) for i in range(20)]
+    provider.session.request.return_value = _response(
+        text="\n".join('{"success": true}' for _ in documents)
+    )
+
+    provider.upsert_batch(documents)
+
+    kwargs = provider.session.request.call_args.kwargs
+    assert kwargs["headers"]["Content-Encoding"] == "gzip"
+    lines = gzip.decompress(kwargs["data"]).decode("utf-8").splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [d["id"] for d in documents]
+
+
+def test_partial_update_writes_missing_documents_in_full(provider):
+    """Test partial updates use action=update and fall back for missing documents."""
+    previous = {**_doc("1"), "description": "x" * 500}
+    current = {**previous, "name": "Max"}
+    provider.hash_store = Mock()
+    provider.hash_store.get_many.return_value = {}
+    provider.hash_store.get_fields_many.return_value = {
+        "1": compute_field_hashes(previous)
+    }
+    provider.session.request.side_effect = [
+        _response(text='{"success": false, "code": 404, "error": "Not found"}'),
+        _response(text='{"success": true}'),
+    ]
+
+    provider.upsert_batch([current])
+
+    update, upsert = provider.session.request.call_args_list
+    assert update.kwargs["params"] == {"action": "update"}
+    assert json.loads(update.kwargs["data"]) == {
+        "id": "1",
+        "objectID": "1",
+        "name": "Max",
+    }
+    assert upsert.kwargs["params"] == {"action": "upsert"}
+    assert json.loads(upsert.kwargs["data"]) == current
+
+
+def test_upsert_batch_reports_rejected_documents(provider):
+    """Test per-document import errors fail the chunk."""
+    provider.session.request.return_value = _response(
+        text='{"success": true}\n{"success": false, "error": "bad field"}'
+    )
+
+    with pytest.raises(BatchWriteError) as exc_info:
+        provider.upsert_batch([_doc("1"), _doc("2")])
+
+    assert "bad field" in str(exc_info.value)
+
+
+def test_ensure_index_creates_missing_collection(provider):
+    """Test a missing collection is created with the auto schema."""
+    provider.session.request.side_effect = [_response(404), _response(201)]
+
+    provider.ensure_index("svc-toys")
+
+    create = provider.session.request.call_args_list[1]
+    assert create.args == ("POST", "http://localhost:8108/collections")
+    assert create.kwargs["json"]["name"] == "svc-toys"
+
+
+def test_new_collection_is_set_up_once(provider):
+    """Test only the first import into a new collection checks and creates it."""
+    toy = {**_doc("1"), "source": "/shop", "type": "toys"}
+    provider.session.request.side_effect = [
+        _response(404),
+        _response(201),
+        _response(text='{"success": true}'),
+        _response(text='{"success": true}'),
+    ]
+
+    provider.upsert(toy)
+    provider.upsert({**toy, "name": "Max"})
+
+    methods = [c.args[0] for c in provider.session.request.call_args_list]
+    assert methods == ["GET", "POST", "POST", "POST"]
+    create = provider.session.request.call_args_list[1].kwargs["json"]
+    assert {"name": "type", "type": "string", "facet": True} in create["fields"]
+
+
+def test_swap_index_repoints_alias_and_drops_previous_collection(provider):
+    """Test a swap repoints the alias, then drops the collection it replaced."""
+    provider.session.request.side_effect = [
+        _response(json_body={"collection_name": "svc-pets_tmp_1"}),
+        _response(),
+        _response(),
+    ]
+
+    provider.swap_index("svc-pets_tmp_2", "svc-pets")
+
+    calls = [c.args for c in provider.session.request.call_args_list]
+    assert calls == [
+        ("GET", "http://localhost:8108/aliases/svc-pets"),
+        ("PUT", "http://localhost:8108/aliases/svc-pets"),
+        ("DELETE", "http://localhost:8108/collections/svc-pets_tmp_1"),
+    ]
+    put = provider.session.request.call_args_list[1]
+    assert put.kwargs["json"] == {"collection_name": "svc-pets_tmp_2"}
+    assert not provider.index_catalog.is_applied("svc-pets", IndexSettings())
+
+
+def test_swap_refuses_to_drop_live_collection(provider):
+    """Test a live name that is still a collection is never dropped by default."""
+    provider.session.request.side_effect = [
+        _response(404),
+        _response(json_body={"name": "svc-pets"}),
+    ]
+
+    with pytest.raises(TypesenseError, match="TYPESENSE_ALIAS_MIGRATION_ENABLED"):
+        provider.swap_index("svc-pets_tmp_1", "svc-pets")
+
+    calls = [c.args[0] for c in provider.session.request.call_args_list]
+    assert calls == ["GET", "GET"]
+
+
+def test_first_swap_migrates_collection_to_alias_when_enabled(provider):
+    """Test the one-time migration drops the collection before aliasing its name."""
+    provider.alias_migration_enabled = True
+    provider.session.request.side_effect = [
+        _response(404),
+        _response(json_body={"name": "svc-pets"}),
+        _response(),
+        _response(),
+    ]
+
+    provider.swap_index("svc-pets_tmp_1", "svc-pets")
+
+    calls = [c.args[0] for c in provider.session.request.call_args_list]
+    assert calls == ["GET", "GET", "DELETE", "PUT"]
+
+
+def test_rebuild_of_unmigrated_collection_fails_before_loading(provider):
+    """Test no shadow collection is created for a live name that cannot be swapped."""
+    provider.session.request.side_effect = [
+        _response(404),
+        _response(json_body={"name": "svc-pets"}),
+    ]
+
+    with pytest.raises(TypesenseError):
+        provider.prepare_shadow_index("svc-pets", "svc-pets_tmp_1", "pets")
+
+    assert provider.session.request.call_count == 2
+
+
+def test_delete_batch_uses_id_filter(provider):
+    """Test batched deletes filter on exact IDs."""
+    provider.session.request.return_value = _response(json_body={"num_deleted": 2})
+
+    provider.delete_batch("svc-pets", ["1", "2"])
+
+    assert provider.session.request.call_args.kwargs["params"] == {
+        "filter_by": "id:[`1`,`2`]"
+    }
+
+
+def test_delete_ignores_missing_document(provider):
+    """Test deleting an absent document is not an error."""
+    provider.session.request.return_value = _response(404)
+
+    provider.delete("svc-pets", "1")
+
+
+def test_delete_raises_on_server_error(provider):
+    """Test server errors surface as TypesenseError."""
+    provider.session.request.return_value = _response(500, text="boom")
+
+    with pytest.raises(TypesenseError):
+        provider.delete("svc-pets", "1")
+
+
+def test_healthcheck(provider):
+    """Test the health endpoint drives healthcheck."""
+    provider.session.request.return_value = _response(json_body={"ok": True})
+
+    assert provider.healthcheck() is True
+
+
+# Integration tests against a local Typesense container, e.g.
+#   docker run -p 8108:8108 typesense/typesense:27.1 --data-dir /tmp --api-key=xyz
+#   TYPESENSE_TEST_HOST=localhost TYPESENSE_TEST_API_KEY=xyz pytest ...
+requires_typesense = pytest.mark.skipif(
+    not os.getenv("TYPESENSE_TEST_HOST"), reason="TYPESENSE_TEST_HOST not set"
+)
+
+
+@pytest.fixture
+def live_provider():
+    settings = Settings(
+        typesense_host=os.getenv("TYPESENSE_TEST_HOST"),
+        typesense_api_key=os.getenv("TYPESENSE_TEST_API_KEY", "xyz"),
+        typesense_port=int(os.getenv("TYPESENSE_TEST_PORT", "8108")),
+        typesense_protocol="http",
+    )
+    typesense = TypesenseProvider(settings)
+    source = f"/test{uuid.uuid4().hex[:8]}"
+    yield typesense, source
+    typesense.drop_index(typesense._get_index_name(source, "pets"))
+
+
+@requires_typesense
+def test_live_upsert_and_delete(live_provider):
+    """Test a round trip against a real Typesense server."""
+    typesense, source = live_provider
+    documents = [{**_doc(str(i)), "source": source} for i in range(3)]
+    index_name = typesense._get_index_name(source, "pets")
+
+    typesense.upsert_batch(documents)
+    typesense.delete_batch(index_name, ["0", "1"])
+    typesense.delete(index_name, "2")
+
+    assert typesense.healthcheck() is True
+    response = typesense._request("GET", f"/collections/{index_name}")
+    assert response.json()["num_documents"] == 0
@@ -0,0 +1,112 @@
+from datetime import timezone
+
+from app.constants.outbox_action import OutboxAction
+from app.models.event import Event
+from app.models.index_outbox import IndexOutbox
+from app.repositories.index_outbox_repository import IndexOutboxRepository
+
+
+def _create_event(db, faker, subject: str) -> Event:
+    event = Event(
+        source=faker.uri(),
+        spec_version="1.0",
+        event_type="pets.updated",
+        event_data={},
+        data_content_type="application/json",
+        subject=subject,
+        time=faker.date_time(tzinfo=timezone.utc),
+    )
+    db.add(event)
+    db.flush()
+    return event
+
+
+def test_add_for_event_extracts_entity(db, faker):
+    repository = IndexOutboxRepository(db)
+    event = _create_event(db, faker, "pets/123")
+
+    row = repository.add_for_event(event)
+    db.commit()
+
+    assert row.id is not None
+    assert row.entity_type == "pets"
+    assert row.entity_id == "123"
+    assert row.action == OutboxAction.UPSERT
+    assert row.attempts == 0
+
+
+def test_add_for_event_without_entity_id(db, faker):
+    repository = IndexOutboxRepository(db)
+    event = _create_event(db, faker, "pets")
+
+    assert repository.add_for_event(event) is None
+
+
+def test_claim_batch_skips_exhausted_rows(db, faker):
+    repository = IndexOutboxRepository(db)
+    first = repository.add_for_event(_create_event(db, faker, "pets/1"))
+    second = repository.add_for_event(_create_event(db, faker, "pets/2"))
+    second.attempts = 3
+    db.commit()
+
+    claimed = repository.claim_batch(limit=10, max_attempts=3)
+
+    assert [row.id for row in claimed] == [first.id]
+    assert repository.count_pending(max_attempts=3) == 1
+
+
+def test_record_failure_and_delete_rows(db, faker):
+    repository = IndexOutboxRepository(db)
+    row = repository.add_for_event(_create_event(db, faker, "pets/1"))
+    db.commit()
+
+    repository.record_failure([row], "boom")
+    db.commit()
+    assert row.attempts == 1
+    assert row.last_error == "boom"
+
+    repository.delete_rows([row])
+    db.commit()
+    assert db.query(IndexOutbox).filter(IndexOutbox.id == row.id).first() is None
+
+
+def test_record_failure_backs_off_exponentially(db, faker):
+    repository = IndexOutboxRepository(db)
+    row = repository.add_for_event(_create_event(db, faker, "pets/1"))
+    db.commit()
+
+    repository.record_failure([row], "boom", retry_base_seconds=10)
+    first_delay = row.next_attempt_at - row.updated_at
+    repository.record_failure([row], "boom", retry_base_seconds=10)
+    db.commit()
+
+    assert row.attempts == 2
+    assert repository.claim_batch(limit=10, max_attempts=3) == []
+    assert row.next_attempt_at - row.updated_at > first_delay
+
+
+def test_claim_batch_takes_every_row_of_an_entity_behind_its_head(db, faker):
+    repository = IndexOutboxRepository(db)
+    head = repository.add_for_event(_create_event(db, faker, "pets/1"))
+    other = repository.add_for_event(_create_event(db, faker, "pets/2"))
+    later = repository.add_for_event(_create_event(db, faker, "pets/1"))
+    later.source = head.source
+    db.commit()
+
+    claimed = repository.claim_batch(limit=1, max_attempts=3)
+
+    assert [row.id for row in claimed] == [head.id, later.id]
+    assert other.id not in [row.id for row in claimed]
+
+
+def test_backed_off_head_holds_back_later_rows(db, faker):
+    repository = IndexOutboxRepository(db)
+    head = repository.add_for_event(_create_event(db, faker, "pets/1"))
+    later = repository.add_for_event(_create_event(db, faker, "pets/1"))
+    later.source = head.source
+    db.commit()
+
+    repository.record_failure([head], "boom", retry_base_seconds=60)
+    db.commit()
+
+    assert repository.claim_batch(limit=10, max_attempts=3) == []
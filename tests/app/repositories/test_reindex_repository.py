@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from app.constants.reindex_job_status import ReindexJobStatus
+from app.repositories.reindex_repository import ReindexRepository
+from app.schemas.reindex_job import ReindexJobCreate
+from app.utils.reindex_checkpoints import Checkpoint
+from app.utils.reindex_progress import ReindexProgress
+
+
+def test_save_checkpoints_inserts_then_updates(db):
+    repository = ReindexRepository(db)
+    job = repository.create_reindex_job(ReindexJobCreate())
+    service_id = str(uuid4())
+
+    repository.save_checkpoints(
+        job.id, [Checkpoint(service_id, "pets", pages_done=2, next_cursor="c3")]
+    )
+    repository.save_checkpoints(
+        job.id,
+        [
+            Checkpoint(service_id, "pets", pages_done=5, indexed=500, completed=True),
+            Checkpoint(service_id, "toys", pages_done=1, total_pages=4),
+        ],
+    )
+
+    checkpoints = {c.entity_type: c for c in repository.get_checkpoints(job.id)}
+    assert checkpoints["pets"].pages_done == 5
+    assert checkpoints["pets"].next_cursor is None
+    assert checkpoints["pets"].completed
+    assert checkpoints["toys"].total_pages == 4
+
+
+def test_delete_checkpoints(db):
+    repository = ReindexRepository(db)
+    job = repository.create_reindex_job(ReindexJobCreate())
+    repository.save_checkpoints(job.id, [Checkpoint(str(uuid4()), "pets")])
+
+    repository.delete_checkpoints(job.id)
+
+    assert repository.get_checkpoints(job.id) == []
+
+
+def test_pending_status_clears_completed_at(db):
+    repository = ReindexRepository(db)
+    job = repository.create_reindex_job(ReindexJobCreate())
+    repository.update_reindex_job_status(job.id, ReindexJobStatus.FAILED, "boom")
+
+    repository.update_reindex_job_status(job.id, ReindexJobStatus.PENDING)
+
+    assert job.completed_at is None
+    assert job.error_message is None
+
+
+def test_update_reindex_job_progress(db):
+    repository = ReindexRepository(db)
+    job = repository.create_reindex_job(ReindexJobCreate())
+
+    repository.update_reindex_job_progress(
+        job.id,
+        ReindexProgress(
+            fetched=300,
+            indexed=250,
+            failed=10,
+            skipped=40,
+            total=1000,
+            docs_per_second=50.0,
+            eta_seconds=14.0,
+            progress=0.3,
+        ),
+    )
+
+    assert job.progress == 0.3
+    assert (job.entities_fetched, job.entities_skipped) == (300, 40)
+    assert job.eta_seconds == 14.0
+    assert job.progress_updated_at is not None
+
+
+def test_running_job_is_stale_without_recent_progress(db):
+    repository = ReindexRepository(db)
+    job = repository.create_reindex_job(ReindexJobCreate())
+    repository.update_reindex_job_status(job.id, ReindexJobStatus.RUNNING)
+    repository.update_reindex_job_progress(job.id, ReindexProgress(fetched=10))
+
+    assert not repository.is_reindex_job_stale(job, stale_after_seconds=300)
+
+    job.progress_updated_at = datetime.now(timezone.utc) - timedelta(minutes=10)
+    db.commit()
+
+    assert repository.is_reindex_job_stale(job, stale_after_seconds=300)
+
+    repository.touch_reindex_job(job.id)
+    db.refresh(job)
+
+    assert not repository.is_reindex_job_stale(job, stale_after_seconds=300)
@@ -1,22 +1,29 @@
-def test_list_providers_returns_statuses(client, monkeypatch):
-    class DummyProvider:
-        name = "algolia"
+import time
+
 
-        def healthcheck(self):
-            return True
+def test_list_providers_returns_statuses(client, monkeypatch):
+    from app.providers.health import ProviderHealth
+
+    class DummyHealthStore:
+        def get_all(self):
+            return {
+                "algolia": ProviderHealth(
+                    healthy=True, latency_ms=12.5, checked_at=time.time()
+                ),
+                "typesense": ProviderHealth(
+                    healthy=True, latency_ms=3.0, checked_at=time.time()
+                ),
+            }
 
     def fake_is_provider_enabled(provider_name, settings, settings_manager):
         return provider_name == "algolia"
 
-    def fake_get_providers(settings, settings_manager):
-        return [DummyProvider()]
-
     import app.routers.provider as provider_router
 
     monkeypatch.setattr(
         provider_router, "is_provider_enabled", fake_is_provider_enabled
     )
-    monkeypatch.setattr(provider_router, "get_providers", fake_get_providers)
+    monkeypatch.setattr(provider_router, "ProviderHealthStore", DummyHealthStore)
 
     response = client.get("/providers")
 
@@ -26,5 +33,30 @@ def test_list_providers_returns_statuses(client, monkeypatch):
 
     assert items["algolia"]["enabled"] is True
     assert items["algolia"]["healthy"] is True
+    assert items["algolia"]["latency_ms"] == 12.5
     assert items["typesense"]["enabled"] is False
     assert items["typesense"]["healthy"] is False
+
+
+def test_list_providers_reports_stale_health_as_unhealthy(client, monkeypatch):
+    from app.providers.health import ProviderHealth
+
+    class DummyHealthStore:
+        def get_all(self):
+            return {
+                "algolia": ProviderHealth(
+                    healthy=True, latency_ms=12.5, checked_at=time.time() - 3600
+                )
+            }
+
+    import app.routers.provider as provider_router
+
+    monkeypatch.setattr(provider_router, "is_provider_enabled", lambda *args: True)
+    monkeypatch.setattr(provider_router, "ProviderHealthStore", DummyHealthStore)
+
+    response = client.get("/providers")
+
+    items = {item["name"]: item for item in response.json()["items"]}
+    assert items["algolia"]["healthy"] is False
+    assert items["typesense"]["healthy"] is False
+    assert items["typesense"]["checked_at"] is None
@@ -0,0 +1,67 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+
+from app.constants.reindex_job_status import ReindexJobStatus
+from app.repositories.reindex_repository import ReindexRepository
+from app.schemas.reindex_job import ReindexJobCreate
+from app.utils.reindex_progress import ReindexProgress
+
+
+@pytest.fixture
+def reindex_task():
+    with patch("app.tasks.reindex_task.reindex_task") as task:
+        yield task
+
+
+def _job(db, status, progress_age=None):
+    repository = ReindexRepository(db)
+    job = repository.create_reindex_job(ReindexJobCreate())
+    repository.update_reindex_job_status(job.id, status)
+    if progress_age is not None:
+        repository.update_reindex_job_progress(job.id, ReindexProgress())
+        job.progress_updated_at = datetime.now(timezone.utc) - progress_age
+        db.commit()
+    return job
+
+
+def test_resume_failed_job_queues_resumed_run(client, db, reindex_task):
+    job = _job(db, ReindexJobStatus.FAILED)
+
+    response = client.post(f"/reindex-jobs/{job.id}/resume")
+
+    assert response.status_code == 202
+    assert job.status == ReindexJobStatus.PENDING
+    reindex_task.delay.assert_called_once_with(str(job.id), resume=True)
+
+
+def test_resume_stale_running_job(client, db, reindex_task):
+    job = _job(db, ReindexJobStatus.RUNNING, progress_age=timedelta(hours=1))
+
+    response = client.post(f"/reindex-jobs/{job.id}/resume")
+
+    assert response.status_code == 202
+    reindex_task.delay.assert_called_once_with(str(job.id), resume=True)
+
+
+@pytest.mark.parametrize(
+    "status", [ReindexJobStatus.RUNNING, ReindexJobStatus.CANCELLED]
+)
+def test_resume_rejects_job_still_making_progress(client, db, reindex_task, status):
+    job = _job(db, status, progress_age=timedelta(seconds=5))
+
+    response = client.post(f"/reindex-jobs/{job.id}/resume")
+
+    assert response.status_code == 409
+    assert job.status == status
+    reindex_task.delay.assert_not_called()
+
+
+def test_resume_rejects_completed_job(client, db, reindex_task):
+    job = _job(db, ReindexJobStatus.COMPLETED)
+
+    response = client.post(f"/reindex-jobs/{job.id}/resume")
+
+    assert response.status_code == 400
+    reindex_task.delay.assert_not_called()
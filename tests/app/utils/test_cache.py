@@ -181,37 +181,127 @@ def test_ttl_key_not_exists(cache, mock_redis):
 
 def test_clear_pattern_success(cache, mock_redis):
     """Test clearing cache entries matching a pattern."""
-    mock_redis.keys.return_value = ["test:user1", "test:user2"]
-    mock_redis.delete.return_value = 2
+    mock_redis.scan_iter.return_value = iter(["test:user1", "test:user2"])
+    mock_redis.unlink.return_value = 2
 
     result = cache.clear_pattern("user*")
 
     assert result is True
-    mock_redis.keys.assert_called_once_with("test:user*")
-    mock_redis.delete.assert_called_once_with("test:user1", "test:user2")
+    mock_redis.scan_iter.assert_called_once_with(match="test:user*", count=500)
+    mock_redis.unlink.assert_called_once_with("test:user1", "test:user2")
+    mock_redis.keys.assert_not_called()
 
 
 def test_clear_pattern_empty(cache, mock_redis):
     """Test clearing pattern when no keys match."""
-    mock_redis.keys.return_value = []
+    mock_redis.scan_iter.return_value = iter([])
 
     result = cache.clear_pattern("nonexistent*")
 
     assert result is True
-    mock_redis.keys.assert_called_once_with("test:nonexistent*")
-    mock_redis.delete.assert_not_called()
+    mock_redis.scan_iter.assert_called_once_with(match="test:nonexistent*", count=500)
+    mock_redis.unlink.assert_not_called()
+
+
+def test_clear_pattern_unlinks_in_chunks(cache, mock_redis):
+    """Test clearing a large pattern unlinks keys in bounded batches."""
+    keys = [f"test:key{i}" for i in range(1200)]
+    mock_redis.scan_iter.return_value = iter(keys)
+    mock_redis.unlink.side_effect = lambda *batch: len(batch)
+
+    result = cache.clear_pattern("*")
+
+    assert result is True
+    assert mock_redis.unlink.call_count == 3
+    assert [len(c.args) for c in mock_redis.unlink.call_args_list] == [500, 500, 200]
 
 
 def test_clear_all(cache, mock_redis):
     """Test clearing all cache entries."""
-    mock_redis.keys.return_value = ["test:key1", "test:key2"]
-    mock_redis.delete.return_value = 2
+    mock_redis.scan_iter.return_value = iter(["test:key1", "test:key2"])
+    mock_redis.unlink.return_value = 2
 
     result = cache.clear_all()
 
     assert result is True
-    mock_redis.keys.assert_called_once_with("test:*")
-    mock_redis.delete.assert_called_once_with("test:key1", "test:key2")
+    mock_redis.scan_iter.assert_called_once_with(match="test:*", count=500)
+    mock_redis.unlink.assert_called_once_with("test:key1", "test:key2")
+
+
+def test_read_many(cache, mock_redis):
+    """Test reading several keys with a single MGET."""
+    mock_redis.mget.return_value = [json.dumps({"a": 1}), None, json.dumps([2])]
+
+    result = cache.read_many(["k1", "k2", "k3"])
+
+    assert result == {"k1": {"a": 1}, "k3": [2]}
+    mock_redis.mget.assert_called_once_with(["test:k1", "test:k2", "test:k3"])
+
+
+def test_read_many_empty(cache, mock_redis):
+    """Test bulk read with no keys does not hit Redis."""
+    assert cache.read_many([]) == {}
+    mock_redis.mget.assert_not_called()
+
+
+def test_read_many_redis_error(cache, mock_redis):
+    """Test bulk read when Redis connection fails."""
+    from redis import ConnectionError
+
+    mock_redis.mget.side_effect = ConnectionError("Connection failed")
+
+    assert cache.read_many(["k1"]) == {}
+
+
+def test_write_many(cache, mock_redis):
+    """Test writing several keys through a pipeline."""
+    pipeline = Mock()
+    pipeline.execute.return_value = [True, True]
+    mock_redis.pipeline.return_value = pipeline
+
+    result = cache.write_many({"k1": {"a": 1}, "k2": "v"}, ttl=60)
+
+    assert result is True
+    mock_redis.pipeline.assert_called_once_with(transaction=False)
+    assert pipeline.setex.call_count == 2
+    first = pipeline.setex.call_args_list[0][0]
+    assert first[0] == "test:k1"
+    assert first[1] == 60
+    assert json.loads(first[2]) == {"a": 1}
+    pipeline.execute.assert_called_once()
+
+
+def test_write_many_redis_error(cache, mock_redis):
+    """Test bulk write when Redis connection fails."""
+    from redis import ConnectionError
+
+    pipeline = Mock()
+    pipeline.execute.side_effect = ConnectionError("Connection failed")
+    mock_redis.pipeline.return_value = pipeline
+
+    assert cache.write_many({"k1": 1}) is False
+
+
+def test_delete_many(cache, mock_redis):
+    """Test deleting several keys with UNLINK."""
+    mock_redis.unlink.return_value = 2
+
+    result = cache.delete_many(["k1", "k2"])
+
+    assert result == 2
+    mock_redis.unlink.assert_called_once_with("test:k1", "test:k2")
+
+
+def test_caches_share_connection_pool(mock_redis):
+    """Test that every namespace reuses the same connection pool."""
+    from app.utils.cache import get_connection_pool
+
+    with patch("app.utils.cache.Redis") as mock_redis_class:
+        Cache("one")
+        Cache("two")
+
+    pools = [c.kwargs["connection_pool"] for c in mock_redis_class.call_args_list]
+    assert pools[0] is pools[1] is get_connection_pool()
 
 
 def test_ping_success(cache, mock_redis):
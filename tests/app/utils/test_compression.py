@@ -0,0 +1,25 @@
+import gzip
+
+from app.config import Settings
+from app.utils.compression import compress_request_body
+
+
+def test_small_bodies_are_sent_as_is():
+    """Test bodies under the threshold are not compressed."""
+    body, headers = compress_request_body(b'{"id": "1"}', Settings())
+
+    assert body == b'{"id": "1"}'
+    assert headers == {}
+
+
+def test_large_bodies_are_gzipped():
+    """Test large bodies are gzipped with a Content-Encoding header."""
+    payload = '{"name": "Rex"}\n' * 1000
+
+    body, headers = compress_request_body(
+        payload, Settings(request_compression_level=9)
+    )
+
+    assert headers == {"Content-Encoding": "gzip"}
+    assert len(body) < len(payload) / 10
+    assert gzip.decompress(body).decode("utf-8") == payload
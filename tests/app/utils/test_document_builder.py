@@ -1,4 +1,7 @@
 from app.utils.document_builder import (
+    build_document_from_api_response,
+    compute_document_hash,
+    compute_field_hashes,
     extract_entity_type_from_subject,
     extract_entity_id_from_subject,
 )
@@ -172,3 +175,45 @@ class TestExtractEntityIdFromSubject:
         subject = "/pets/xxxx"
         result = extract_entity_id_from_subject(subject)
         assert result == "xxxx"
+
+
+class TestComputeDocumentHash:
+    """Test cases for compute_document_hash function."""
+
+    def test_ignores_volatile_fields(self):
+        """Test that rebuilding the same entity yields the same hash."""
+        first = build_document_from_api_response("/svc", "pets", "1", {"name": "Rex"})
+        second = build_document_from_api_response("/svc", "pets", "1", {"name": "Rex"})
+        second["updated_at"] = "2099-01-01T00:00:00+00:00"
+
+        assert compute_document_hash(first) == compute_document_hash(second)
+
+    def test_is_independent_of_key_order(self):
+        """Test that key order does not affect the hash."""
+        assert compute_document_hash({"a": 1, "b": 2}) == compute_document_hash(
+            {"b": 2, "a": 1}
+        )
+
+    def test_changes_with_content(self):
+        """Test that a content change produces a different hash."""
+        assert compute_document_hash({"name": "Rex"}) != compute_document_hash(
+            {"name": "Max"}
+        )
+
+
+class TestComputeFieldHashes:
+    """Test cases for compute_field_hashes function."""
+
+    def test_only_changed_fields_differ(self):
+        """Test that a field change changes only that field's hash."""
+        first = compute_field_hashes({"name": "Rex", "tags": ["a", "b"]})
+        second = compute_field_hashes({"name": "Max", "tags": ["a", "b"]})
+
+        assert first["name"] != second["name"]
+        assert first["tags"] == second["tags"]
+
+    def test_ignores_volatile_fields(self):
+        """Test that volatile fields are not hashed."""
+        assert "updated_at" not in compute_field_hashes(
+            {"name": "Rex", "updated_at": "2099-01-01T00:00:00+00:00"}
+        )
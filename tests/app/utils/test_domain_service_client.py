@@ -0,0 +1,122 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.utils.domain_service_client import DomainServiceClient, EntityResponse
+
+
+@pytest.fixture
+def client():
+    with patch("app.utils.domain_service_client.create_cache") as mock_create_cache:
+        mock_create_cache.return_value = Mock()
+        domain_client = DomainServiceClient()
+    domain_client.session = Mock()
+    with patch.object(
+        DomainServiceClient,
+        "_get_auth_headers",
+        return_value={"Authorization": "Bearer token"},
+    ):
+        yield domain_client
+
+
+def _response(status_code, json_data=None, headers=None):
+    response = Mock()
+    response.status_code = status_code
+    response.json.return_value = json_data
+    response.headers = headers or {}
+    return response
+
+
+def test_get_entity_conditional_sends_stored_validators(client):
+    """Test stored validators are sent as conditional request headers."""
+    client.validator_cache.read.return_value = {
+        "etag": '"abc"',
+        "last_modified": "Wed, 21 Oct 2026 07:28:00 GMT",
+    }
+    client.session.get.return_value = _response(304)
+
+    result = client.get_entity_conditional("http://svc", "pets", "1")
+
+    assert result.not_modified is True
+    headers = client.session.get.call_args.kwargs["headers"]
+    assert headers["If-None-Match"] == '"abc"'
+    assert headers["If-Modified-Since"] == "Wed, 21 Oct 2026 07:28:00 GMT"
+    client.validator_cache.read.assert_called_once_with("http://svc/pets/1")
+
+
+def test_get_entity_conditional_returns_body_and_validators(client):
+    """Test a 200 response carries the entity and its validators."""
+    client.validator_cache.read.return_value = None
+    client.session.get.return_value = _response(
+        200, {"id": "1"}, {"ETag": '"v2"', "Last-Modified": "lm"}
+    )
+
+    result = client.get_entity_conditional("http://svc", "pets", "1", "indexes")
+
+    assert result.not_modified is False
+    assert result.data == {"id": "1"}
+    assert result.url == "http://svc/indexes/pets/1"
+    assert result.etag == '"v2"'
+    headers = client.session.get.call_args.kwargs["headers"]
+    assert "If-None-Match" not in headers
+
+
+@pytest.mark.parametrize("status_code", [404, 410])
+def test_get_entity_conditional_reports_deleted_entity(client, status_code):
+    """Test a missing entity is reported as deleted rather than raised."""
+    client.validator_cache.read.return_value = None
+    client.session.get.return_value = _response(status_code)
+
+    result = client.get_entity_conditional("http://svc", "pets", "1")
+
+    assert result.deleted is True
+    assert result.not_modified is False
+    assert result.data is None
+
+
+def test_save_entity_validators(client):
+    """Test validators are stored only for fetched responses that carry them."""
+    client.save_entity_validators(EntityResponse(url="u"))
+    client.save_entity_validators(EntityResponse(url="u", data={"id": "1"}))
+    client.validator_cache.write.assert_not_called()
+
+    client.save_entity_validators(EntityResponse(url="u", data={}, etag='"v"'))
+
+    client.validator_cache.write.assert_called_once()
+    key, value = client.validator_cache.write.call_args.args
+    assert key == "u"
+    assert value == {"etag": '"v"', "last_modified": None}
+
+
+def test_save_validators_requires_a_validator(client):
+    """Test validators carried by the bulk writer are stored by URL."""
+    client.save_validators("u", None, None)
+    client.validator_cache.write.assert_not_called()
+
+    client.save_validators("u", None, "Tue, 01 Sep 2026 00:00:00 GMT")
+
+    key, value = client.validator_cache.write.call_args.args
+    assert key == "u"
+    assert value == {"etag": None, "last_modified": "Tue, 01 Sep 2026 00:00:00 GMT"}
+
+
+def test_client_advertises_compressed_responses():
+    """Test the session asks domain services for compressed responses."""
+    with patch("app.utils.domain_service_client.create_cache"):
+        domain_client = DomainServiceClient()
+
+    assert domain_client.session.headers["Accept-Encoding"] == "gzip, deflate"
+
+
+def test_get_entities_batch_sends_cursor_instead_of_page(client):
+    """Test a cursor replaces the page number in batch requests."""
+    client.session.get.return_value = _response(
+        200, {"data": [], "pagination": {"next_cursor": None}}
+    )
+
+    client.get_entities_batch("http://svc", "pets", cursor="abc", per_page=50)
+
+    assert client.session.get.call_args.kwargs["params"] == {
+        "per_page": 50,
+        "cursor": "abc",
+    }
@@ -0,0 +1,49 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.utils import m2m_token
+from app.utils.m2m_token import M2MTokenClient
+from app.utils.near_cache import LocalCache
+
+
+@pytest.fixture(autouse=True)
+def token_cache():
+    with patch.object(m2m_token, "_token_cache", LocalCache(16, 3600)) as cache:
+        yield cache
+
+
+def _client(expires_in=3600):
+    http = MagicMock()
+    http.__enter__.return_value.post.return_value.json.return_value = {
+        "access_token": "secret",
+        "token_type": "Bearer",
+        "expires_in": expires_in,
+    }
+    return http
+
+
+def test_tokens_are_cached_in_process_only():
+    """Test a token is reused from process memory without touching Redis."""
+    http = _client()
+    with (
+        patch("app.utils.m2m_token.httpx.Client", return_value=http) as client_class,
+        patch("app.utils.cache.Redis") as redis_class,
+    ):
+        client = M2MTokenClient("auth.example.com")
+        first = client.get_token_sync("id", "secret", "api")
+        second = client.get_token_sync("id", "secret", "api")
+
+    assert first.access_token == second.access_token == "secret"
+    assert client_class.call_count == 1
+    redis_class.assert_not_called()
+
+
+def test_short_lived_tokens_are_not_cached():
+    """Test tokens expiring within the margin are fetched again."""
+    with patch("app.utils.m2m_token.httpx.Client", return_value=_client(30)) as client:
+        token_client = M2MTokenClient("auth.example.com")
+        token_client.get_token_sync("id", "secret", "api")
+        token_client.get_token_sync("id", "secret", "api")
+
+    assert client.call_count == 2
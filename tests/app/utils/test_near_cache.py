@@ -0,0 +1,136 @@
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+
+from app.utils.cache import Cache
+from app.utils.near_cache import MISSING, InvalidationBus, LocalCache
+from app.utils.serializers import JsonSerializer, Serializer, get_serializer
+
+
+@pytest.fixture
+def mock_redis():
+    with patch("app.utils.cache.Redis") as mock_redis_class:
+        mock_redis_instance = Mock()
+        mock_redis_class.return_value = mock_redis_instance
+        yield mock_redis_instance
+
+
+@pytest.fixture
+def near_cache(mock_redis):
+    with patch("app.utils.cache.get_invalidation_bus") as mock_bus_factory:
+        mock_bus_factory.return_value = Mock()
+        yield Cache("test", near_cache_size=2, near_cache_ttl=30)
+
+
+def test_local_cache_evicts_least_recently_used():
+    """Test the LRU drops the oldest untouched entry when full."""
+    local = LocalCache(max_entries=2, ttl=30)
+    local.set("a", 1)
+    local.set("b", 2)
+    local.get("a")
+    local.set("c", 3)
+
+    assert local.get("a") == 1
+    assert local.get("b") is MISSING
+    assert local.get("c") == 3
+
+
+def test_local_cache_expires_entries():
+    """Test entries are dropped once their TTL has passed."""
+    local = LocalCache(max_entries=10, ttl=30)
+    with patch("app.utils.near_cache.time.monotonic", return_value=100.0):
+        local.set("a", None, ttl=5)
+    with patch("app.utils.near_cache.time.monotonic", return_value=104.0):
+        assert local.get("a") is None
+    with patch("app.utils.near_cache.time.monotonic", return_value=106.0):
+        assert local.get("a") is MISSING
+
+
+def test_local_cache_values_are_isolated_from_callers():
+    """Test mutating a stored or returned value does not change the next read."""
+    local = LocalCache(max_entries=2, ttl=30)
+    stored = {"tags": ["a"]}
+    local.set("k", stored)
+    stored["tags"].append("b")
+
+    value = local.get("k")
+    value["tags"].append("c")
+
+    assert local.get("k") == {"tags": ["a"]}
+
+
+def test_local_cache_delete_pattern():
+    """Test glob-style pattern eviction."""
+    local = LocalCache(max_entries=10, ttl=30)
+    local.set("user:1", 1)
+    local.set("user:2", 2)
+    local.set("org:1", 3)
+
+    local.delete_pattern("user:*")
+
+    assert len(local) == 1
+    assert local.get("org:1") == 3
+
+
+def test_invalidation_bus_ignores_own_messages():
+    """Test invalidations published by this process are not re-applied."""
+    bus = InvalidationBus(client_factory=Mock())
+    local = LocalCache(max_entries=10, ttl=30)
+    local.set("k", "v")
+    bus._caches["test"] = [local]
+
+    bus.handle_message(
+        json.dumps({"origin": bus.origin, "namespace": "test", "keys": ["k"]})
+    )
+    assert local.get("k") == "v"
+
+    bus.handle_message(
+        json.dumps({"origin": "other", "namespace": "test", "keys": ["k"]})
+    )
+    assert local.get("k") is MISSING
+
+
+def test_near_cache_serves_repeat_reads_locally(near_cache, mock_redis):
+    """Test a second read is answered without a Redis round trip."""
+    mock_redis.get.return_value = json.dumps({"id": 1})
+
+    assert near_cache.read("k") == {"id": 1}
+    assert near_cache.read("k") == {"id": 1}
+
+    mock_redis.get.assert_called_once_with("test:k")
+
+
+def test_near_cache_write_publishes_invalidation(near_cache, mock_redis):
+    """Test writes populate the local tier and notify other processes."""
+    mock_redis.setex.return_value = True
+
+    assert near_cache.write("k", "v") is True
+    assert near_cache.read("k") == "v"
+
+    mock_redis.get.assert_not_called()
+    near_cache._invalidation_bus.publish.assert_called_once_with(
+        mock_redis, "test", keys=["k"], pattern=None
+    )
+
+
+def test_near_cache_read_many_only_fetches_misses(near_cache, mock_redis):
+    """Test bulk reads only MGET keys missing from the local tier."""
+    near_cache.near_cache.set("k1", 1)
+    mock_redis.mget.return_value = [json.dumps(2)]
+
+    assert near_cache.read_many(["k1", "k2"]) == {"k1": 1, "k2": 2}
+    mock_redis.mget.assert_called_once_with(["test:k2"])
+
+
+def test_get_serializer():
+    """Test serializer lookup by name."""
+    assert isinstance(get_serializer("json"), JsonSerializer)
+    with pytest.raises(ValueError):
+        get_serializer("unknown")
+
+
+def test_serializer_is_abstract():
+    """Test serializers must implement dumps and loads."""
+    with pytest.raises(TypeError):
+        Serializer()
@@ -0,0 +1,134 @@
+from types import SimpleNamespace
+
+from app.utils.reindex_checkpoints import Checkpoint, CheckpointTracker
+from app.utils.reindex_planner import PageBatch, UnitResult, WorkUnit
+
+SERVICE = SimpleNamespace(id="svc-1")
+
+
+def _tracker(checkpoints=(), interval_seconds=3600.0):
+    saved = []
+    tracker = CheckpointTracker(
+        10, lambda changed: saved.append(list(changed)), interval_seconds, checkpoints
+    )
+    return tracker, saved
+
+
+def _record(tracker, page, size=10, **pagination):
+    tracker.record(
+        WorkUnit(SERVICE, "pets", page, cursor=pagination.pop("cursor", None)),
+        PageBatch(items=[1] * size, total_in_page=size, **pagination),
+        UnitResult(indexed=size),
+    )
+
+
+def test_only_contiguous_pages_are_done():
+    """Test a page written out of order waits for the pages before it."""
+    tracker, saved = _tracker()
+
+    _record(tracker, 1, total_pages=3)
+    _record(tracker, 3, total_pages=3)
+    tracker.flush()
+    assert saved[-1][0].pages_done == 1
+    assert not saved[-1][0].completed
+
+    _record(tracker, 2, total_pages=3)
+    tracker.flush()
+    assert saved[-1][0].pages_done == 3
+    assert saved[-1][0].completed
+    assert saved[-1][0].indexed == 30
+
+
+def test_cursor_checkpoint_keeps_next_cursor():
+    """Test the cursor of the page after the checkpoint is kept."""
+    tracker, saved = _tracker()
+
+    _record(tracker, 1, next_cursor="c2", cursor_paged=True)
+    _record(tracker, 2, cursor="c2", next_cursor="c3", cursor_paged=True)
+    tracker.flush()
+
+    (checkpoint,) = saved[-1]
+    assert (checkpoint.pages_done, checkpoint.next_cursor) == (2, "c3")
+    assert checkpoint.cursor_paged
+
+
+def test_saves_are_throttled():
+    """Test checkpoints are saved at most once per interval."""
+    tracker, saved = _tracker()
+
+    _record(tracker, 1)
+    _record(tracker, 2)
+    assert saved == []
+
+    tracker.interval_seconds = 0
+    _record(tracker, 3, size=4)
+    assert len(saved) == 1
+    assert saved[0][0].completed
+
+
+def test_failed_save_is_retried():
+    """Test checkpoints stay pending when saving them fails."""
+    attempts = []
+
+    def save(changed):
+        attempts.append(len(changed))
+        if len(attempts) == 1:
+            raise RuntimeError("database down")
+
+    tracker = CheckpointTracker(10, save, 3600.0)
+    _record(tracker, 1)
+
+    tracker.flush()
+    tracker.flush()
+    tracker.flush()
+
+    assert attempts == [1, 1]
+
+
+def test_resume_units_continue_after_checkpoints():
+    """Test resumed units skip done entity types and continue the others."""
+    other = SimpleNamespace(id="svc-2")
+    tracker, _ = _tracker(
+        [
+            Checkpoint("svc-1", "pets", pages_done=4, completed=True),
+            Checkpoint("svc-1", "toys", pages_done=2, total_pages=4),
+            Checkpoint(
+                "svc-1", "food", pages_done=7, next_cursor="c8", cursor_paged=True
+            ),
+            Checkpoint("svc-2", "pets", pages_done=3),
+        ]
+    )
+
+    units = tracker.resume_units(
+        [
+            (SERVICE, "pets"),
+            (SERVICE, "toys"),
+            (SERVICE, "food"),
+            (other, "pets"),
+            (other, "toys"),
+        ]
+    )
+
+    assert [(u.service.id, u.entity_type, u.page, u.cursor) for u in units] == [
+        ("svc-1", "toys", 3, None),
+        ("svc-1", "toys", 4, None),
+        ("svc-1", "food", 8, "c8"),
+        ("svc-2", "pets", 4, None),
+        ("svc-2", "toys", 1, None),
+    ]
+
+
+def test_pages_past_the_checkpoint_are_not_counted():
+    """Test only contiguous pages count, so a resume does not count pages twice."""
+    tracker, saved = _tracker()
+
+    _record(tracker, 1, total_pages=3)
+    _record(tracker, 3, total_pages=3)
+    tracker.flush()
+
+    (checkpoint,) = saved[-1]
+    assert (checkpoint.pages_done, checkpoint.indexed) == (1, 10)
+
+    resumed, _ = _tracker([checkpoint])
+    assert resumed.totals().indexed == 10
+    assert resumed.totals().fetched == 10
@@ -0,0 +1,293 @@
+import threading
+import time
+
+import pytest
+
+from app.utils.reindex_planner import (
+    PageBatch,
+    ProviderLimiter,
+    ReindexPlanner,
+    UnitResult,
+    WorkUnit,
+)
+
+
+def _build(unit, batch):
+    return batch
+
+
+def _write(unit, batch):
+    return UnitResult(indexed=len(batch.items), failed=batch.failed)
+
+
+def _pages(total_pages=None, sizes=None, per_page=10, delay=0.0):
+    """fetch_unit serving pages of an entity type, recording what was fetched."""
+    ran = []
+    lock = threading.Lock()
+
+    def fetch_unit(unit):
+        time.sleep(delay)
+        with lock:
+            ran.append((unit.service, unit.entity_type, unit.page))
+        size = sizes[unit.page - 1] if sizes else per_page
+        return PageBatch(
+            items=[unit.page] * size, total_in_page=size, total_pages=total_pages
+        )
+
+    return fetch_unit, ran
+
+
+def test_page_one_plans_every_reported_page():
+    """Test the page count of page 1 plans the remaining pages at once."""
+    fetch_unit, ran = _pages(total_pages=4)
+    planner = ReindexPlanner(fetch_unit, _build, _write, workers=4, per_page=10)
+
+    totals = planner.run([WorkUnit("pets-svc", "pets"), WorkUnit("pets-svc", "toys")])
+
+    assert totals.indexed == 80
+    assert sorted(ran) == sorted(
+        ("pets-svc", entity_type, page)
+        for entity_type in ("pets", "toys")
+        for page in range(1, 5)
+    )
+
+
+def test_pages_without_count_continue_until_short_page():
+    """Test services without a page count are paged until a short page."""
+    fetch_unit, ran = _pages(sizes=[10, 10, 3])
+    planner = ReindexPlanner(fetch_unit, _build, _write, workers=4, per_page=10)
+
+    totals = planner.run([WorkUnit("svc", "pets")])
+
+    assert totals.indexed == 23
+    assert [page for _, _, page in ran] == [1, 2, 3]
+
+
+def test_cursor_pages_follow_next_cursor():
+    """Test cursor-paged services are paged by their cursors, not offsets."""
+    cursors = {None: "c2", "c2": "c3", "c3": None}
+    ran = []
+
+    def fetch_unit(unit):
+        ran.append((unit.page, unit.cursor))
+        return PageBatch(
+            items=[unit.page] * 10,
+            total_in_page=10,
+            total_pages=9,
+            next_cursor=cursors[unit.cursor],
+            cursor_paged=True,
+        )
+
+    planner = ReindexPlanner(fetch_unit, _build, _write, workers=4, per_page=10)
+
+    totals = planner.run([WorkUnit("svc", "pets")])
+
+    assert totals.indexed == 30
+    assert ran == [(1, None), (2, "c2"), (3, "c3")]
+
+
+def test_build_failures_are_counted():
+    """Test items failing at the build stage are counted as failed."""
+    fetch_unit, _ = _pages(sizes=[10, 4])
+
+    def build_unit(unit, batch):
+        return PageBatch(items=batch.items[1:], failed=1, total_in_page=10)
+
+    planner = ReindexPlanner(fetch_unit, build_unit, _write, workers=2, per_page=10)
+
+    totals = planner.run([WorkUnit("svc", "pets")])
+
+    assert (totals.indexed, totals.failed) == (12, 2)
+
+
+def test_on_result_gets_written_pages():
+    """Test on_result is called with every written unit and its built page."""
+    fetch_unit, _ = _pages(sizes=[10, 3])
+    seen = []
+
+    planner = ReindexPlanner(
+        fetch_unit,
+        _build,
+        _write,
+        workers=2,
+        per_page=10,
+        on_result=lambda unit, batch, result: seen.append(
+            (unit.page, batch.total_in_page, result.indexed)
+        ),
+    )
+
+    planner.run([WorkUnit("svc", "pets")])
+
+    assert sorted(seen) == [(1, 10, 10), (2, 3, 3)]
+
+
+def test_on_fetch_gets_fetched_pages_and_skips_are_totalled():
+    """Test on_fetch sees every fetched page and skipped writes are summed."""
+    fetch_unit, _ = _pages(sizes=[10, 3])
+    fetched = []
+
+    def write_unit(unit, batch):
+        return UnitResult(indexed=len(batch.items) - 1, skipped=1)
+
+    planner = ReindexPlanner(
+        fetch_unit,
+        _build,
+        write_unit,
+        workers=2,
+        per_page=10,
+        on_fetch=lambda unit, batch: fetched.append((unit.page, batch.total_in_page)),
+    )
+
+    totals = planner.run([WorkUnit("svc", "pets")])
+
+    assert sorted(fetched) == [(1, 10), (2, 3)]
+    assert (totals.indexed, totals.skipped) == (11, 2)
+
+
+def test_next_page_is_fetched_while_previous_is_written():
+    """Test fetching the next page does not wait for the previous write."""
+    fetch_unit, ran = _pages(sizes=[10, 10, 3])
+    second_fetched = threading.Event()
+    overlapped = []
+
+    def write_unit(unit, batch):
+        if unit.page == 1:
+            # Page 2 is fetched while page 1 is still being written
+            overlapped.append(second_fetched.wait(1))
+        return _write(unit, batch)
+
+    def tracking_fetch(unit):
+        batch = fetch_unit(unit)
+        if unit.page == 2:
+            second_fetched.set()
+        return batch
+
+    planner = ReindexPlanner(tracking_fetch, _build, write_unit, workers=1, per_page=10)
+
+    totals = planner.run([WorkUnit("svc", "pets")])
+
+    assert totals.indexed == 23
+    assert overlapped == [True]
+
+
+def test_buffered_pages_bound_fetching_ahead():
+    """Test fetching pauses while too many pages wait to be written."""
+    lock = threading.Lock()
+    buffered, peak = [0], [0]
+    fetch_unit, _ = _pages(total_pages=12)
+
+    def counting_fetch(unit):
+        with lock:
+            buffered[0] += 1
+            peak[0] = max(peak[0], buffered[0])
+        return fetch_unit(unit)
+
+    def slow_write(unit, batch):
+        time.sleep(0.01)
+        with lock:
+            buffered[0] -= 1
+        return _write(unit, batch)
+
+    planner = ReindexPlanner(
+        counting_fetch,
+        _build,
+        slow_write,
+        workers=8,
+        per_page=10,
+        write_workers=1,
+        max_buffered_pages=3,
+        default_service_limit=8,
+    )
+
+    totals = planner.run([WorkUnit("svc", "pets")])
+
+    assert totals.indexed == 120
+    assert peak[0] <= 3
+
+
+def test_service_limit_caps_fetches_in_flight():
+    """Test no more pages of a service are fetched at once than its limit."""
+    active, peak = {}, {}
+    lock = threading.Lock()
+
+    def fetch_unit(unit):
+        with lock:
+            active[unit.service] = active.get(unit.service, 0) + 1
+            peak[unit.service] = max(peak.get(unit.service, 0), active[unit.service])
+        time.sleep(0.01)
+        with lock:
+            active[unit.service] -= 1
+        return PageBatch(items=[1], total_in_page=1, total_pages=6)
+
+    planner = ReindexPlanner(
+        fetch_unit,
+        _build,
+        _write,
+        workers=8,
+        per_page=1,
+        service_limits={"slow": 1},
+        default_service_limit=3,
+    )
+
+    planner.run([WorkUnit("slow", "pets"), WorkUnit("fast", "pets")])
+
+    assert peak == {"slow": 1, "fast": 3}
+
+
+def test_failure_stops_planning_and_is_raised():
+    """Test a failed fetch is raised and no further pages are started."""
+    ran = []
+
+    def fetch_unit(unit):
+        ran.append(unit.page)
+        if unit.page == 2:
+            raise RuntimeError("domain service down")
+        return PageBatch(items=[1] * 10, total_in_page=10)
+
+    planner = ReindexPlanner(fetch_unit, _build, _write, workers=1, per_page=10)
+
+    with pytest.raises(RuntimeError, match="domain service down"):
+        planner.run([WorkUnit("svc", "pets")])
+    assert ran == [1, 2]
+
+
+def test_write_failure_is_raised():
+    """Test a failed write is raised."""
+    fetch_unit, _ = _pages(sizes=[10, 3])
+
+    def write_unit(unit, batch):
+        raise RuntimeError("provider down")
+
+    planner = ReindexPlanner(fetch_unit, _build, write_unit, workers=1, per_page=10)
+
+    with pytest.raises(RuntimeError, match="provider down"):
+        planner.run([WorkUnit("svc", "pets")])
+
+
+def test_provider_limiter_caps_concurrent_writes():
+    """Test a provider's writes are capped and unknown providers are not."""
+    limiter = ProviderLimiter({"algolia": 1})
+    entered = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        with limiter.slot("algolia"):
+            entered.set()
+            release.wait(1)
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    entered.wait(1)
+
+    assert not limiter._semaphores["algolia"].acquire(blocking=False)
+    with limiter.slot("typesense"):
+        pass
+
+    release.set()
+    thread.join()
+
+
+def test_provider_limiter_max_concurrency():
+    """Test the largest provider limit is reported, None without limits."""
+    assert ProviderLimiter({"algolia": 2, "typesense": 6}).max_concurrency == 6
+    assert ProviderLimiter({}).max_concurrency is None
@@ -0,0 +1,124 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.utils.metrics import REINDEX_PROGRESS, REINDEX_THROUGHPUT
+from app.utils.reindex_progress import ProgressTracker, ReindexProgress
+from app.utils.reindex_planner import PageBatch, UnitResult, WorkUnit
+
+SERVICE = SimpleNamespace(id="svc-1")
+
+
+def _tracker(units, start=None, interval_seconds=3600.0):
+    saved = []
+    tracker = ProgressTracker("job-1", units, 10, saved.append, interval_seconds, start)
+    return tracker, saved
+
+
+def _page(tracker, entity_type, page, size=10, indexed=None, skipped=0, **pagination):
+    unit = WorkUnit(SERVICE, entity_type, page)
+    batch = PageBatch(items=[1] * size, total_in_page=size, **pagination)
+    tracker.record_fetch(unit, batch)
+    tracker.record(
+        unit,
+        batch,
+        UnitResult(
+            indexed=size - skipped if indexed is None else indexed, skipped=skipped
+        ),
+    )
+
+
+def test_counts_and_estimates_from_reported_totals():
+    """Test progress and ETA follow the totals domain services report."""
+    tracker, _ = _tracker([WorkUnit(SERVICE, "pets"), WorkUnit(SERVICE, "toys")])
+
+    _page(tracker, "pets", 1, total=40, skipped=2)
+    assert tracker.snapshot().total is None  # toys has not reported yet
+
+    _page(tracker, "toys", 1, total_pages=1)
+    snapshot = tracker.snapshot()
+
+    assert (snapshot.fetched, snapshot.indexed, snapshot.skipped) == (20, 18, 2)
+    assert snapshot.total == 50
+    assert snapshot.progress == pytest.approx(0.4)
+    assert snapshot.docs_per_second > 0
+    assert snapshot.eta_seconds == pytest.approx(30 / snapshot.docs_per_second, abs=0.1)
+
+
+def test_unreported_size_is_known_at_last_page():
+    """Test entity types without totals are sized once their last page is fetched."""
+    tracker, _ = _tracker([WorkUnit(SERVICE, "pets")])
+
+    _page(tracker, "pets", 1)
+    assert tracker.snapshot().eta_seconds is None
+
+    _page(tracker, "pets", 2, size=5)
+    snapshot = tracker.snapshot()
+
+    assert (snapshot.total, snapshot.progress, snapshot.eta_seconds) == (15, 1.0, 0.0)
+
+
+def test_resume_counts_previous_run():
+    """Test a resumed run continues the counters and skips the pages done."""
+    tracker, _ = _tracker(
+        [WorkUnit(SERVICE, "pets", 3)], start=ReindexProgress(fetched=20, indexed=20)
+    )
+
+    _page(tracker, "pets", 3, total=40)
+    snapshot = tracker.snapshot()
+
+    assert (snapshot.fetched, snapshot.indexed) == (30, 30)
+    assert snapshot.total == 40
+    assert snapshot.progress == pytest.approx(0.75)
+
+
+def test_saves_are_throttled_and_finish_saves():
+    """Test progress is saved at most once per interval, and when finished."""
+    tracker, saved = _tracker([WorkUnit(SERVICE, "pets")])
+
+    _page(tracker, "pets", 1)
+    _page(tracker, "pets", 2)
+    assert saved == []
+
+    tracker.finish()
+
+    assert len(saved) == 1
+    assert (saved[0].fetched, saved[0].progress, saved[0].eta_seconds) == (
+        20,
+        1.0,
+        0.0,
+    )
+
+
+def _job_samples(gauge, job_id):
+    return [
+        sample
+        for metric in gauge.collect()
+        for sample in metric.samples
+        if sample.labels.get("job_id") == job_id
+    ]
+
+
+def test_finish_removes_job_gauges():
+    """Test the gauges of a job are dropped once it finishes."""
+    tracker, _ = _tracker([WorkUnit(SERVICE, "pets")])
+    _page(tracker, "pets", 1, total=20)
+    assert _job_samples(REINDEX_PROGRESS, "job-1")
+
+    tracker.finish()
+
+    assert _job_samples(REINDEX_PROGRESS, "job-1") == []
+    assert _job_samples(REINDEX_THROUGHPUT, "job-1") == []
+    tracker.close()  # Closing twice is harmless
+
+
+def test_failed_save_is_logged():
+    """Test a failing save does not fail the run."""
+
+    def save(progress):
+        raise RuntimeError("database down")
+
+    tracker = ProgressTracker("job-1", [WorkUnit(SERVICE, "pets")], 10, save, 0.0)
+
+    _page(tracker, "pets", 1)
+    tracker.finish()
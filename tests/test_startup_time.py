@@ -0,0 +1,85 @@
+"""
+Cold-import budgets for the API and worker entry points.
+
+Each check runs in a fresh interpreter so nothing is already cached in
+sys.modules. Budgets can be tuned per environment with
+API_IMPORT_BUDGET_SECONDS and WORKER_IMPORT_BUDGET_SECONDS. Use
+scripts/profile_imports.py to find what regressed.
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+API_IMPORT_BUDGET_SECONDS = float(os.getenv("API_IMPORT_BUDGET_SECONDS", "4.0"))
+WORKER_IMPORT_BUDGET_SECONDS = float(os.getenv("WORKER_IMPORT_BUDGET_SECONDS", "3.0"))
+
+# Heavy SDKs that must only be imported when actually used
+LAZY_SDK_MODULES = [
+    "algoliasearch",
+    "rollbar",
+    "opentelemetry.sdk",
+    "opentelemetry.exporter.otlp.proto.grpc",
+]
+
+
+def _cold_import(module: str) -> dict:
+    """Import a module in a fresh interpreter and report time and loaded modules."""
+    code = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"import {module}\n"
+        "elapsed = time.perf_counter() - start\n"
+        "print(json.dumps({'seconds': elapsed, 'modules': sorted(sys.modules)}))\n"
+    )
+    env = {**os.environ, "ENV": "test", "OTEL_ENABLED": "false"}
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=PROJECT_ROOT,
+        check=True,
+    )
+    # Logging setup prints to stdout, the report is the last line
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.fixture(scope="module")
+def api_import():
+    return _cold_import("app.main")
+
+
+@pytest.fixture(scope="module")
+def worker_import():
+    return _cold_import("app.tasks")
+
+
+def test_api_cold_import_within_budget(api_import):
+    """Importing the API app stays under its startup budget."""
+    assert api_import["seconds"] < API_IMPORT_BUDGET_SECONDS
+
+
+def test_api_startup_does_not_import_sdks(api_import):
+    """Provider SDKs, Rollbar and OTel exporters are not loaded at API startup."""
+    loaded = set(api_import["modules"])
+    assert not [m for m in LAZY_SDK_MODULES if m in loaded]
+
+
+def test_worker_cold_import_within_budget(worker_import):
+    """Importing the worker tasks stays under its startup budget."""
+    assert worker_import["seconds"] < WORKER_IMPORT_BUDGET_SECONDS
+
+
+def test_worker_startup_does_not_import_command_stack(worker_import):
+    """Registering tasks does not load commands or provider SDKs."""
+    loaded = set(worker_import["modules"])
+    assert "app.commands.execute_reindex_command" not in loaded
+    assert "app.commands.index_entity_command" not in loaded
+    assert not [m for m in LAZY_SDK_MODULES if m in loaded]